@@ -0,0 +1,236 @@
+"""
+Bellek Uyumlu (Adaptif) Batch Boyutu
+====================================
+Sabit BATCH_SIZE yerine batch'leri bir bellek bütçesine göre oluşturur.
+
+- Her metnin token sayısından aktivasyon belleği tahmin edilir
+  (batch x sekans x (hidden katsayısı + attention skorları))
+- Metinler uzundan kısaya sıralanır; uzun metinler küçük, kısa metinler
+  büyük batch'lerde işlenir (padding de azalır)
+- Bellek yetmezse (OOM) tahmin katsayısı büyütülür ve batch ikiye bölünerek
+  tekrar denenir
+- Her batch sonrası ölçülen bellek ile katsayı güncellenir; yer varsa
+  katsayı küçülür ve batch'ler büyür
+
+Ölçüm: GPU'da torch.cuda tepe belleği, CPU'da (Linux/macOS) tepe RSS artışı.
+
+NOT: Bu modül tüm retriever sistem klasörlerinde birebir aynıdır.
+"""
+
+import gc
+import os
+import sys
+from typing import Any, Callable, List, Optional, Sequence
+
+# Tek bir transformer katmanında token başına tutulan ara çıktı sayısı
+# (hidden cinsinden): Q, K, V, attention çıktısı, residual ve FFN (4 x hidden)
+ACTIVATION_FACTOR = 9
+
+# Bütçe verilmezse kullanılabilir belleğin bu oranı kullanılır
+AUTO_BUDGET_FRACTION = {"cuda": 0.8, "cpu": 0.5}
+
+# Ölçüm ile katsayı güncellemesinde yeni ölçümün ağırlığı
+CALIBRATION_SMOOTHING = 0.3
+MIN_CALIBRATION = 0.25
+
+
+def is_oom_error(error: BaseException) -> bool:
+    """Hata bellek yetersizliğinden mi? (CUDA OOM, CPU allocator hatası, MemoryError)"""
+    if isinstance(error, MemoryError):
+        return True
+    if isinstance(error, RuntimeError):
+        message = str(error).lower()
+        return (
+            "out of memory" in message
+            or "can't allocate memory" in message
+            or "cannot allocate memory" in message
+        )
+    return False
+
+
+def available_memory_bytes(device: str) -> Optional[int]:
+    """Cihazda kullanılabilir bellek (bilinmiyorsa None)"""
+    if device.startswith("cuda"):
+        import torch
+        free, _ = torch.cuda.mem_get_info(torch.device(device))
+        return free
+
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Sürecin anlık RSS'i (sadece Linux)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Sürecin tepe RSS'i"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS byte döndürür
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class AdaptiveBatchSizer:
+    """Token sayılarına ve bellek bütçesine göre batch oluşturur"""
+
+    def __init__(
+        self,
+        hidden_size: int,
+        num_heads: int,
+        device: str = "cpu",
+        memory_budget_mb: Optional[float] = None,
+        budget_fraction: float = 1.0,
+        max_batch_size: int = 256,
+        bytes_per_value: int = 4
+    ):
+        """
+        Args:
+            hidden_size: Modelin hidden boyutu
+            num_heads: Attention head sayısı
+            device: "cpu" veya "cuda[:n]"
+            memory_budget_mb: Aktivasyonlar için bellek bütçesi (None ise otomatik)
+            budget_fraction: Bütçenin bu sürece düşen payı (örn: 1 / worker sayısı)
+            max_batch_size: Batch boyutu üst sınırı
+            bytes_per_value: Aktivasyon değeri başına byte (fp32: 4, fp16: 2)
+        """
+        self.hidden_size = hidden_size
+        self.num_heads = num_heads
+        self.device = str(device)
+        self.max_batch_size = max_batch_size
+        self.bytes_per_value = bytes_per_value
+
+        if memory_budget_mb is not None:
+            budget = memory_budget_mb * 1024 * 1024
+        else:
+            kind = "cuda" if self.device.startswith("cuda") else "cpu"
+            available = available_memory_bytes(self.device)
+            # Ölçülemiyorsa 2 GB varsay
+            budget = (available or 2 * 1024 ** 3) * AUTO_BUDGET_FRACTION[kind]
+        self.budget_bytes = int(budget * budget_fraction)
+
+        # Tahmin düzeltme katsayısı (ölçüm ve OOM'lara göre güncellenir)
+        self.calibration = 1.0
+        self.oom_count = 0
+
+    # =========================================================================
+    # TAHMİN
+    # =========================================================================
+
+    def raw_estimate_bytes(self, batch_size: int, seq_len: int) -> int:
+        """Düzeltilmemiş aktivasyon belleği tahmini (tek katmanın tepe değeri)"""
+        per_token = ACTIVATION_FACTOR * self.hidden_size + self.num_heads * seq_len
+        return batch_size * seq_len * per_token * self.bytes_per_value
+
+    def estimate_bytes(self, batch_size: int, seq_len: int) -> int:
+        """Katsayı ile düzeltilmiş aktivasyon belleği tahmini"""
+        return int(self.raw_estimate_bytes(batch_size, seq_len) * self.calibration)
+
+    def batch_size_for(self, seq_len: int) -> int:
+        """Bu sekans uzunluğunda bütçeye sığan en büyük batch boyutu"""
+        per_item = max(1, self.estimate_bytes(1, seq_len))
+        return max(1, min(self.max_batch_size, self.budget_bytes // per_item))
+
+    # =========================================================================
+    # ÇALIŞTIRMA
+    # =========================================================================
+
+    def run(self, lengths: Sequence[int], encode_fn: Callable[[List[int]], List[Any]]) -> List[Any]:
+        """
+        Tüm metinleri adaptif batch'lerle işle
+
+        Args:
+            lengths: Metin başına token sayısı
+            encode_fn: İndeks listesi alıp aynı sırada çıktı listesi döndüren fonksiyon
+
+        Returns:
+            Giriş sırasıyla çıktılar
+        """
+        order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+        results: List[Any] = [None] * len(lengths)
+        pos = 0
+
+        while pos < len(order):
+            seq_len = lengths[order[pos]]
+            size = self.batch_size_for(seq_len)
+            indices = order[pos:pos + size]
+
+            try:
+                outputs = self._measured_call(encode_fn, indices, seq_len)
+            except Exception as e:
+                if not is_oom_error(e) or len(indices) <= 1:
+                    raise
+                self._on_oom(len(indices), seq_len)
+                continue
+
+            for i, output in zip(indices, outputs):
+                results[i] = output
+            pos += len(indices)
+
+        return results
+
+    def _measured_call(self, encode_fn: Callable, indices: List[int], seq_len: int) -> List[Any]:
+        """Batch'i çalıştır ve ölçülen tepe bellekle katsayıyı güncelle"""
+        cuda = self.device.startswith("cuda")
+
+        if cuda:
+            import torch
+            torch.cuda.reset_peak_memory_stats(self.device)
+            baseline = torch.cuda.memory_allocated(self.device)
+        else:
+            baseline = _current_rss_bytes()
+            peak_before = _peak_rss_bytes()
+
+        outputs = encode_fn(indices)
+
+        # upper_bound: ölçüm gerçek tepe değil, sadece üst sınır
+        upper_bound = False
+        if cuda:
+            observed = torch.cuda.max_memory_allocated(self.device) - baseline
+        elif baseline is None or peak_before is None:
+            observed = None
+        else:
+            # Tepe RSS süreç ömrü boyunca tutulur; artmadıysa batch eski tepenin altında kalmıştır
+            peak_after = _peak_rss_bytes()
+            upper_bound = peak_after <= peak_before
+            observed = peak_after - baseline
+
+        if observed is not None and observed > 0:
+            ratio = observed / max(1, self.raw_estimate_bytes(len(indices), seq_len))
+            if not upper_bound or ratio < self.calibration:
+                self.calibration = max(
+                    MIN_CALIBRATION,
+                    (1 - CALIBRATION_SMOOTHING) * self.calibration + CALIBRATION_SMOOTHING * ratio
+                )
+
+        return outputs
+
+    def _on_oom(self, batch_size: int, seq_len: int):
+        """OOM sonrası: belleği boşalt, bir sonraki deneme en fazla yarı boyutta olsun"""
+        self.oom_count += 1
+        gc.collect()
+        if self.device.startswith("cuda"):
+            import torch
+            torch.cuda.empty_cache()
+
+        half = max(1, batch_size // 2)
+        self.calibration = max(
+            self.calibration * 2,
+            self.budget_bytes / max(1, self.raw_estimate_bytes(half, seq_len))
+        )
+        print(f"⚠️  Bellek yetersiz (batch={batch_size}, sekans={seq_len}), "
+              f"yeni batch boyutu: {self.batch_size_for(seq_len)}")
@@ -0,0 +1,108 @@
+"""
+BGE-M3 ColBERT (Multi-Vektör) Modülü
+====================================
+BGE-M3, dense ve sparse vektörlerin yanında her token için ayrı bir vektör
+de üretir (ColBERT tarzı late interaction). Token vektörleri, son katman
+token çıktılarına uygulanan lineer katmandan (colbert_linear.pt) gelir ve
+normalize edilir.
+
+Dense / sparse ile aynı forward pass kullanılır; ek model çağrısı gerekmez.
+
+Budama (pruning): Uzun tariflerde tüm token'ları saklamak pahalıdır. Tarif
+başına en fazla max_tokens token tutulur; hangi token'ların kalacağını
+BGE-M3'ün sparse (lexical) ağırlıkları belirler (önemli kelimeler kalır,
+bağlaçlar / noktalama atılır).
+
+Skor (MaxSim): her sorgu token'ı için dokümandaki en benzer token'ın
+benzerliği alınır, sorgu token'ları üzerinden ortalaması skordur.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+# BGE-M3 reposundaki ColBERT katman ağırlıkları
+COLBERT_HEAD_FILE = "colbert_linear.pt"
+
+
+def load_colbert_head(model_name: str):
+    """
+    ColBERT katmanını yükle (hidden_size -> colbert boyutu)
+
+    Args:
+        model_name: HuggingFace model adı (örn: "BAAI/bge-m3")
+
+    Returns:
+        torch.nn.Linear katmanı (eval modunda)
+    """
+    import torch
+    from huggingface_hub import hf_hub_download
+
+    path = hf_hub_download(repo_id=model_name, filename=COLBERT_HEAD_FILE)
+    state = torch.load(path, map_location="cpu")
+
+    out_dim, in_dim = state["weight"].shape
+    head = torch.nn.Linear(in_dim, out_dim)
+    head.load_state_dict(state)
+    head.eval()
+
+    print(f"✅ ColBERT katmanı yüklendi: {model_name}/{COLBERT_HEAD_FILE} ({out_dim} boyut)")
+    return head
+
+
+def colbert_vectors(
+    token_embeddings,
+    input_ids,
+    attention_mask,
+    head,
+    skip_ids: Iterable[int],
+    sparse_head=None,
+    max_tokens: Optional[int] = None
+) -> np.ndarray:
+    """
+    Tek bir metnin token çıktılarından ColBERT vektörleri üret
+
+    Args:
+        token_embeddings: (seq_len, hidden_size) son katman çıktıları
+        input_ids: (seq_len,) token id'leri
+        attention_mask: (seq_len,) padding maskesi
+        head: load_colbert_head ile yüklenen katman
+        skip_ids: Atlanacak token id'leri (CLS, EOS, PAD, ...)
+        sparse_head: Budama için sparse ağırlık katmanı (None ise ilk token'lar tutulur)
+        max_tokens: Tutulacak en fazla token (None ise budama yapılmaz)
+
+    Returns:
+        (token_sayısı, boyut) float32 normalize vektörler (metin sırasıyla)
+    """
+    import torch
+
+    if head.weight.device != token_embeddings.device:
+        head.to(token_embeddings.device)
+
+    keep = attention_mask.bool() & ~torch.isin(
+        input_ids, torch.tensor(list(skip_ids), device=input_ids.device)
+    )
+    positions = keep.nonzero().squeeze(-1)
+
+    with torch.no_grad():
+        if max_tokens is not None and len(positions) > max_tokens:
+            if sparse_head is not None:
+                if sparse_head.weight.device != token_embeddings.device:
+                    sparse_head.to(token_embeddings.device)
+                weights = torch.relu(sparse_head(token_embeddings[positions].float())).squeeze(-1)
+                # En önemli token'lar, metindeki sıraları korunarak
+                positions = positions[weights.topk(max_tokens).indices.sort().values]
+            else:
+                positions = positions[:max_tokens]
+
+        vectors = head(token_embeddings[positions].float())
+        vectors = torch.nn.functional.normalize(vectors, dim=-1)
+
+    return vectors.cpu().numpy().astype(np.float32)
+
+
+def maxsim(query_vectors: np.ndarray, doc_vectors: np.ndarray) -> float:
+    """Tek doküman için MaxSim skoru (sorgu token'ları üzerinden ortalama)"""
+    if not len(query_vectors) or not len(doc_vectors):
+        return 0.0
+    return float((query_vectors @ doc_vectors.T).max(axis=1).mean())
@@ -0,0 +1,416 @@
+"""
+Sıkıştırılmış ColBERT (Late Interaction) Index'i
+================================================
+Tarif başına yüzlerce token vektörünü float32 saklamak (~0.5 MB / tarif)
+20 bin tarif için pratik değildir. Vektörler ColBERTv2 tarzı sıkıştırılır:
+
+    vektör ≈ normalize(centroid[kod] + residual)
+
+- Centroid'ler: Token vektörü örnekleri üzerinde küresel (cosine) k-means
+- Kod: Token başına en yakın centroid (uint16, 2 byte)
+- Residual: Her boyutun centroid'den farkı nbits bit'e kovalanır
+  (kova sınırları ve kova değerleri residual dağılımının quantile'larından)
+
+1024 boyut ve 2 bit ile token başına 2 + 256 = 258 byte (float32: 4096 byte).
+
+Dosyalar (index klasöründe):
+    codes.bin        : uint16 centroid kodları (tüm token'lar ardışık)
+    residuals.bin    : uint8 paketlenmiş residual kovaları
+    doc_offsets.npy  : Doküman → token aralığı (CSR offset'leri)
+    doc_ids.npy      : Yazım sırası → doküman ID'si (ID'ler sıra numarası değilse)
+    codec.npz        : Centroid'ler, kova sınırları ve değerleri
+    meta.json        : Boyut, bit sayısı, doküman / token sayısı
+
+codes.bin ve residuals.bin np.memmap ile açılır; aramada yalnızca aday
+dokümanların token'ları diskten okunur ve açılır.
+"""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+SUPPORTED_BITS = (1, 2, 4, 8)
+
+CODES_FILE = "codes.bin"
+RESIDUALS_FILE = "residuals.bin"
+OFFSETS_FILE = "doc_offsets.npy"
+DOC_IDS_FILE = "doc_ids.npy"
+CODEC_FILE = "codec.npz"
+META_FILE = "meta.json"
+
+# k-means atamasında tek seferde işlenen vektör sayısı (bellek sınırı)
+ASSIGN_CHUNK = 8192
+
+# Kova sınırları için kullanılan en fazla residual değeri
+QUANTILE_SAMPLES = 1_000_000
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Satırları birim uzunluğa getir"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class ResidualCodec:
+    """Centroid + residual sıkıştırma"""
+
+    def __init__(self, centroids: np.ndarray, nbits: int, bucket_cutoffs: np.ndarray, bucket_weights: np.ndarray):
+        if nbits not in SUPPORTED_BITS:
+            raise ValueError(f"Desteklenmeyen residual bit sayısı: {nbits} (seçenekler: {SUPPORTED_BITS})")
+        if len(centroids) > np.iinfo(np.uint16).max + 1:
+            raise ValueError(f"En fazla 65536 centroid desteklenir: {len(centroids)}")
+        if (centroids.shape[1] * nbits) % 8:
+            raise ValueError(f"Boyut x bit sayısı 8'in katı olmalı: {centroids.shape[1]} x {nbits}")
+
+        self.centroids = centroids.astype(np.float32)
+        self.nbits = nbits
+        self.bucket_cutoffs = bucket_cutoffs.astype(np.float32)
+        self.bucket_weights = bucket_weights.astype(np.float32)
+
+    @property
+    def dim(self) -> int:
+        return self.centroids.shape[1]
+
+    @property
+    def packed_dim(self) -> int:
+        """Token başına residual byte sayısı"""
+        return self.dim * self.nbits // 8
+
+    @classmethod
+    def train(
+        cls,
+        sample: np.ndarray,
+        n_centroids: int,
+        nbits: int = 2,
+        iters: int = 10,
+        seed: int = 0
+    ) -> "ResidualCodec":
+        """
+        Token vektörü örnekleri üzerinde codec'i eğit
+
+        Args:
+            sample: (n, dim) normalize token vektörleri
+            n_centroids: Centroid sayısı (örnek sayısından büyükse küçültülür)
+            nbits: Boyut başına residual bit sayısı
+            iters: k-means iterasyon sayısı
+            seed: Başlangıç centroid seçimi için seed
+        """
+        sample = np.ascontiguousarray(sample, dtype=np.float32)
+        n_centroids = min(n_centroids, len(sample))
+        rng = np.random.default_rng(seed)
+
+        centroids = sample[rng.choice(len(sample), n_centroids, replace=False)].copy()
+        print(f"🎯 ColBERT centroid'leri eğitiliyor ({len(sample):,} token, {n_centroids} centroid)...")
+
+        for _ in range(iters):
+            codes = cls._assign(sample, centroids)
+            # Küme toplamları: koda göre sırala, ardışık blokları topla
+            order = np.argsort(codes, kind="stable")
+            filled, starts = np.unique(codes[order], return_index=True)
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            # Boş kalan centroid'ler eski yerinde bırakılır
+            centroids[filled] = _normalize(sums)
+
+        # Residual dağılımından kova sınırları ve kova değerleri
+        residuals = (sample - centroids[cls._assign(sample, centroids)]).ravel()
+        if len(residuals) > QUANTILE_SAMPLES:
+            residuals = rng.choice(residuals, QUANTILE_SAMPLES, replace=False)
+        n_buckets = 2 ** nbits
+        cutoffs = np.quantile(residuals, np.arange(1, n_buckets) / n_buckets)
+        weights = np.quantile(residuals, (np.arange(n_buckets) + 0.5) / n_buckets)
+
+        return cls(centroids, nbits, cutoffs, weights)
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Her vektörün en yakın (cosine) centroid'i"""
+        codes = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), ASSIGN_CHUNK):
+            chunk = vectors[start:start + ASSIGN_CHUNK]
+            codes[start:start + len(chunk)] = (chunk @ centroids.T).argmax(axis=1)
+        return codes
+
+    # =========================================================================
+    # SIKIŞTIRMA
+    # =========================================================================
+
+    def compress(self, vectors: np.ndarray):
+        """
+        Token vektörlerini sıkıştır
+
+        Returns:
+            (uint16 kodlar, (n, packed_dim) uint8 paketlenmiş residual'lar)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        codes = self._assign(vectors, self.centroids)
+        residuals = vectors - self.centroids[codes]
+        buckets = np.searchsorted(self.bucket_cutoffs, residuals).astype(np.uint8)
+        return codes.astype(np.uint16), self._pack(buckets)
+
+    def decompress(self, codes: np.ndarray, packed: np.ndarray) -> np.ndarray:
+        """Kod ve residual'lardan normalize token vektörlerini geri oluştur"""
+        buckets = self._unpack(np.asarray(packed))
+        vectors = self.centroids[np.asarray(codes, dtype=np.int64)] + self.bucket_weights[buckets]
+        return _normalize(vectors)
+
+    def _pack(self, buckets: np.ndarray) -> np.ndarray:
+        """(n, dim) kova indekslerini byte'lara paketle"""
+        per_byte = 8 // self.nbits
+        grouped = buckets.reshape(len(buckets), self.packed_dim, per_byte)
+        shifts = (np.arange(per_byte, dtype=np.uint8) * self.nbits)[::-1]
+        return np.bitwise_or.reduce(grouped << shifts, axis=2).astype(np.uint8)
+
+    def _unpack(self, packed: np.ndarray) -> np.ndarray:
+        """Paketlenmiş byte'lardan (n, dim) kova indeksleri"""
+        per_byte = 8 // self.nbits
+        shifts = (np.arange(per_byte, dtype=np.uint8) * self.nbits)[::-1]
+        mask = np.uint8(2 ** self.nbits - 1)
+        buckets = (packed[:, :, None] >> shifts) & mask
+        return buckets.reshape(len(packed), self.dim)
+
+    # =========================================================================
+    # KAYIT
+    # =========================================================================
+
+    def save(self, path: Path):
+        np.savez(
+            path,
+            centroids=self.centroids,
+            nbits=np.array(self.nbits),
+            bucket_cutoffs=self.bucket_cutoffs,
+            bucket_weights=self.bucket_weights
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "ResidualCodec":
+        data = np.load(path)
+        return cls(data["centroids"], int(data["nbits"]), data["bucket_cutoffs"], data["bucket_weights"])
+
+
+class ColbertIndexWriter:
+    """
+    Doküman token vektörlerini sıkıştırıp diske yazar
+
+    Dokümanlar varsayılan olarak eklendikleri sırayla 0, 1, 2, ... ID alır;
+    add() ile açık ID'ler (Qdrant point ID'leri) verilebilir. Yazma geçici
+    klasörde yapılır; commit() ile eski index'in yerine geçer.
+    """
+
+    def __init__(self, path: Path, codec: ResidualCodec):
+        self.path = Path(path)
+        self.codec = codec
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+
+        if self.tmp_path.exists():
+            shutil.rmtree(self.tmp_path)
+        self.tmp_path.mkdir(parents=True)
+
+        self._codes = open(self.tmp_path / CODES_FILE, "wb")
+        self._residuals = open(self.tmp_path / RESIDUALS_FILE, "wb")
+        self._lengths: List[int] = []
+        self._doc_ids: List[int] = []
+
+    @property
+    def num_docs(self) -> int:
+        return len(self._lengths)
+
+    def add(self, doc_vectors: Sequence[np.ndarray], doc_ids: Optional[Sequence[int]] = None):
+        """
+        Dokümanları ekle (doküman başına (token_sayısı, dim) vektörler)
+
+        Args:
+            doc_vectors: Token vektörleri
+            doc_ids: Doküman ID'leri (None ise sıradaki ID'ler)
+        """
+        if not len(doc_vectors):
+            return
+
+        if doc_ids is None:
+            doc_ids = range(self.num_docs, self.num_docs + len(doc_vectors))
+        if len(doc_ids) != len(doc_vectors):
+            raise ValueError(f"{len(doc_vectors)} doküman için {len(doc_ids)} ID verildi")
+        self._doc_ids.extend(int(i) for i in doc_ids)
+
+        lengths = [len(v) for v in doc_vectors]
+        non_empty = [v for v in doc_vectors if len(v)]
+        if non_empty:
+            codes, packed = self.codec.compress(np.concatenate(non_empty))
+            self._codes.write(codes.tobytes())
+            self._residuals.write(packed.tobytes())
+        self._lengths.extend(lengths)
+
+    def commit(self) -> "ColbertIndex":
+        """Dosyaları kapat ve index'i yerine taşı"""
+        self._close_files()
+
+        offsets = np.zeros(len(self._lengths) + 1, dtype=np.int64)
+        np.cumsum(self._lengths, out=offsets[1:])
+        np.save(self.tmp_path / OFFSETS_FILE, offsets)
+
+        # Yazım sırası ID sırası değilse (point ID'leri) eşleme ayrıca saklanır
+        doc_ids = np.asarray(self._doc_ids, dtype=np.int64)
+        if len(np.unique(doc_ids)) != len(doc_ids):
+            raise ValueError("Doküman ID'leri tekrar ediyor")
+        if not np.array_equal(doc_ids, np.arange(len(doc_ids))):
+            np.save(self.tmp_path / DOC_IDS_FILE, doc_ids)
+        self.codec.save(self.tmp_path / CODEC_FILE)
+
+        meta = {
+            "dim": self.codec.dim,
+            "nbits": self.codec.nbits,
+            "n_centroids": len(self.codec.centroids),
+            "num_docs": len(self._lengths),
+            "num_tokens": int(offsets[-1])
+        }
+        with open(self.tmp_path / META_FILE, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        if self.path.exists():
+            shutil.rmtree(self.path)
+        self.tmp_path.rename(self.path)
+
+        print(f"💾 ColBERT index kaydedildi: {self.path} "
+              f"({meta['num_docs']:,} doküman, {meta['num_tokens']:,} token)")
+        return ColbertIndex(self.path)
+
+    def abort(self):
+        """Yazmayı iptal et (geçici dosyalar silinir)"""
+        self._close_files()
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+    def _close_files(self):
+        self._codes.close()
+        self._residuals.close()
+
+
+class ColbertIndex:
+    """Diskteki sıkıştırılmış index (memmap) üzerinde MaxSim skorlama"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        if not (self.path / META_FILE).exists():
+            raise FileNotFoundError(f"ColBERT index bulunamadı: {self.path}")
+
+        with open(self.path / META_FILE, "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        self.codec = ResidualCodec.load(self.path / CODEC_FILE)
+        self.offsets = np.load(self.path / OFFSETS_FILE)
+
+        # Doküman ID'si → yazım sırası (index'te olmayan ID: -1)
+        if (self.path / DOC_IDS_FILE).exists():
+            doc_ids = np.load(self.path / DOC_IDS_FILE)
+            self._rows = np.full(int(doc_ids.max()) + 1 if len(doc_ids) else 0, -1, dtype=np.int64)
+            self._rows[doc_ids] = np.arange(len(doc_ids))
+        else:
+            self._rows = np.arange(self.num_docs, dtype=np.int64)
+
+        num_tokens = self.meta["num_tokens"]
+        if num_tokens:
+            self.codes = np.memmap(self.path / CODES_FILE, dtype=np.uint16, mode="r", shape=(num_tokens,))
+            self.residuals = np.memmap(
+                self.path / RESIDUALS_FILE, dtype=np.uint8, mode="r",
+                shape=(num_tokens, self.codec.packed_dim)
+            )
+        else:
+            # Boş dosyalar memmap ile açılamaz
+            self.codes = np.zeros(0, dtype=np.uint16)
+            self.residuals = np.zeros((0, self.codec.packed_dim), dtype=np.uint8)
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_tokens(self) -> int:
+        return int(self.offsets[-1])
+
+    def _token_ranges(self, doc_ids: np.ndarray):
+        """Dokümanların token aralıkları (başlangıç, uzunluk); index'te olmayan doküman boş aralık"""
+        rows = np.full(len(doc_ids), -1, dtype=np.int64)
+        known = (doc_ids >= 0) & (doc_ids < len(self._rows))
+        rows[known] = self._rows[doc_ids[known]]
+        found = rows >= 0
+        starts = np.where(found, self.offsets[rows], 0)
+        lengths = np.where(found, self.offsets[rows + 1] - starts, 0)
+        return starts, lengths
+
+    def doc_vectors(self, doc_id: int) -> np.ndarray:
+        """Tek dokümanın açılmış token vektörleri"""
+        starts, lengths = self._token_ranges(np.asarray([doc_id], dtype=np.int64))
+        start, end = starts[0], starts[0] + lengths[0]
+        return self.codec.decompress(self.codes[start:end], self.residuals[start:end])
+
+    def maxsim(self, query_vectors: np.ndarray, doc_ids: Sequence[int]) -> np.ndarray:
+        """
+        Aday dokümanların MaxSim skorları (vektörel)
+
+        Tüm adayların token'ları tek seferde açılır, sorgu ile tek bir
+        matris çarpımı yapılır; doküman başına maksimum np.maximum.reduceat
+        ile alınır.
+
+        Args:
+            query_vectors: (sorgu_token, dim) normalize vektörler
+            doc_ids: Aday doküman ID'leri
+
+        Returns:
+            Doküman başına skor (sorgu token'ları üzerinden ortalama, 0-1 arası)
+        """
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        scores = np.zeros(len(doc_ids), dtype=np.float32)
+        if not len(doc_ids) or not len(query_vectors):
+            return scores
+
+        starts, lengths = self._token_ranges(doc_ids)
+        total = int(lengths.sum())
+        if not total:
+            return scores
+
+        # Aday token'larının global indeksleri (aralıkların birleşimi)
+        seg_starts = np.zeros(len(doc_ids), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=seg_starts[1:])
+        token_idx = np.repeat(starts - seg_starts, lengths) + np.arange(total)
+
+        # memmap'ten sıralı okuma
+        order = np.argsort(token_idx, kind="stable")
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(total)
+        sorted_idx = token_idx[order]
+        vectors = self.codec.decompress(self.codes[sorted_idx], self.residuals[sorted_idx])[inverse]
+
+        sims = np.asarray(query_vectors, dtype=np.float32) @ vectors.T
+        non_empty = lengths > 0
+        best = np.maximum.reduceat(sims, seg_starts[non_empty], axis=1)
+        scores[non_empty] = best.mean(axis=0)
+        return scores
+
+    def memory_stats(self) -> Dict[str, Any]:
+        """Disk / bellek kullanımı (doküman başına byte dahil)"""
+        files = {
+            name: (self.path / name).stat().st_size
+            for name in (CODES_FILE, RESIDUALS_FILE, OFFSETS_FILE, CODEC_FILE)
+        }
+        total = sum(files.values())
+        num_docs = max(1, self.num_docs)
+        return {
+            "num_docs": self.num_docs,
+            "num_tokens": self.num_tokens,
+            "tokens_per_doc": self.num_tokens / num_docs,
+            "bytes_per_token": self.codec.packed_dim + 2,
+            "total_bytes": total,
+            "bytes_per_doc": total / num_docs,
+            # Sıkıştırmasız float32 token vektörleri
+            "float32_bytes_per_doc": self.num_tokens * self.codec.dim * 4 / num_docs,
+            "files": files
+        }
+
+
+def open_colbert_index(path: Path) -> Optional[ColbertIndex]:
+    """Index varsa aç, yoksa None"""
+    try:
+        return ColbertIndex(path)
+    except FileNotFoundError:
+        return None
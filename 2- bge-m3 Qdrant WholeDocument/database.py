@@ -6,6 +6,11 @@ Vektör veritabanı işlemleri
 
 import sys
 import os
+import json
+import shutil
+import copy
+import re
+import hashlib
 
 # Windows terminal için UTF-8 encoding
 if sys.platform == 'win32':
@@ -14,63 +19,429 @@ if sys.platform == 'win32':
         sys.stdout.reconfigure(encoding='utf-8')
         sys.stderr.reconfigure(encoding='utf-8')
 
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance, 
     VectorParams, 
     PointStruct,
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
     Filter,
     FieldCondition,
     MatchAny,
-    MatchText
+    MatchText,
+    HasIdCondition,
+    PointIdsList,
+    SparseVectorParams,
+    SparseVector,
+    Prefetch,
+    FusionQuery,
+    Fusion,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    QuantizationSearchParams,
+    QueryRequest,
+    BinaryQuantization,
+    BinaryQuantizationConfig
 )
 from config import (
     QDRANT_PATH, 
     COLLECTION_NAME, 
+    COLLECTION_KEEP_VERSIONS,
     EMBEDDING_DIM, 
     DISTANCE_METRIC,
-    INDEX_BATCH_SIZE
+    INDEX_BATCH_SIZE,
+    UPLOAD_PARALLEL,
+    SPARSE_VECTORS,
+    SPARSE_VECTOR_NAME,
+    SEARCH_MODE,
+    HYBRID_PREFETCH_LIMIT,
+    COLBERT_INDEX_DIR,
+    DB_BACKEND,
+    LOCAL_DB_PATH,
+    LOCAL_INDEX_MMAP,
+    LOCAL_INDEX_TYPE,
+    HNSW_M,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
+    IVF_NLIST,
+    IVF_NPROBE,
+    PQ_M,
+    IVF_RERANK,
+    QUANTIZATION,
+    QUANTIZATION_QUANTILE,
+    QUANTIZATION_OVERSAMPLING
 )
+from ingredient_index import IngredientIndex, IngredientFilter, parse_filter
+
+
+# Desteklenen arama modları (bkz. config.SEARCH_MODE)
+SEARCH_MODES = ("dense", "sparse", "hybrid", "binary")
+
+# Arama sonucunda dönen özet alanlar (tam tarif hydrate ile doküman deposundan)
+SUMMARY_FIELDS = ("title",)
+
+# Artımlı indexleme için kayıt başına saklanan anahtar alanları (bkz. recipe_key, content_hash)
+INDEX_KEY_FIELDS = ("recipe_key", "content_hash")
+
+# Collection'daki anahtarlar okunurken tek istekte gelen point sayısı
+SCROLL_BATCH_SIZE = 1000
+
+
+def to_sparse_vector(weights: Dict[int, float]) -> SparseVector:
+    """{token_id: ağırlık} sözlüğünü Qdrant SparseVector'e çevir"""
+    return SparseVector(indices=list(weights.keys()), values=list(weights.values()))
+
+
+def recipe_key(recipe: Dict[str, Any]) -> str:
+    """Tarifin kalıcı anahtarı: URL'in hash'i (URL yoksa başlığın)"""
+    source = recipe.get("url") or recipe.get("title", "")
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def content_hash(recipe: Dict[str, Any]) -> str:
+    """Tarif içeriğinin hash'i (artımlı indexlemede değişen tarifleri bulmak için)"""
+    content = json.dumps(recipe, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def recipe_payload(recipe: Dict[str, Any]) -> Dict[str, Any]:
+    """Tarifin saklanan alanları (Qdrant payload'ı / doküman deposu kaydı)"""
+    return {
+        "title": recipe.get("title", ""),
+        "url": recipe.get("url", ""),
+        "ingredients": recipe.get("ingredients", []),
+        "instructions": recipe.get("instructions", []),
+        # Arama için ek alanlar
+        "ingredient_count": len(recipe.get("ingredients", [])),
+        "instruction_count": len(recipe.get("instructions", [])),
+        # Artımlı indexleme
+        "recipe_key": recipe_key(recipe),
+        "content_hash": content_hash(recipe)
+    }
+
+
+def recipe_index_payload(recipe: Dict[str, Any]) -> Dict[str, Any]:
+    """Doküman deposu olan collection'larda Qdrant payload'ı (tam tarif depoda)"""
+    return {
+        "title": recipe.get("title", ""),
+        "ingredient_count": len(recipe.get("ingredients", [])),
+        "instruction_count": len(recipe.get("instructions", [])),
+        "recipe_key": recipe_key(recipe),
+        "content_hash": content_hash(recipe)
+    }
+
+
+def recipe_summary(point_id: int, payload: Dict[str, Any], score: Optional[float] = None) -> Dict[str, Any]:
+    """Arama sonucu özeti (ID, skor, başlık) - tarifin geri kalanı hydrate ile eklenir"""
+    result = {"id": point_id}
+    if score is not None:
+        result["score"] = score
+    result.update({field: payload.get(field, "") for field in SUMMARY_FIELDS})
+    return result
+
+
+def recipe_result(point_id: int, payload: Dict[str, Any], score: Optional[float] = None) -> Dict[str, Any]:
+    """Saklanan alanlardan arama sonucu / tarif dictionary'si oluştur"""
+    result = {"id": point_id}
+    if score is not None:
+        result["score"] = score
+    result.update({
+        "title": payload.get("title", ""),
+        "url": payload.get("url", ""),
+        "ingredients": payload.get("ingredients", []),
+        "instructions": payload.get("instructions", [])
+    })
+    return result
+
+
+def quantization_config():
+    """Qdrant collection'ının kuantizasyon ayarı (config.QUANTIZATION)"""
+    if not QUANTIZATION:
+        return None
+    if QUANTIZATION == "int8":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=QUANTIZATION_QUANTILE, always_ram=True)
+        )
+    if QUANTIZATION == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    raise ValueError(f"Bilinmeyen kuantizasyon: {QUANTIZATION} (seçenekler: int8, binary)")
+
+
+def version_name(version: int) -> str:
+    """Sürümlü collection adı (COLLECTION_NAME alias'ı bunlardan birini gösterir)"""
+    return f"{COLLECTION_NAME}_v{version}"
+
+
+def parse_version(name: str) -> Optional[int]:
+    """Sürümlü collection adındaki sürüm numarası (sürümlü değilse None)"""
+    match = re.fullmatch(rf"{re.escape(COLLECTION_NAME)}_v(\d+)", name)
+    return int(match.group(1)) if match else None
 
 
 class RecipeDatabase:
     """Qdrant vektör veritabanı işlemleri"""
     
-    def __init__(self):
-        """Veritabanı bağlantısı oluştur"""
-        print(f"🔄 Qdrant veritabanına bağlanılıyor: {QDRANT_PATH}")
-        import warnings
-        warnings.filterwarnings("ignore", category=UserWarning)
-        self.client = QdrantClient(path=str(QDRANT_PATH))
-        print("✅ Veritabanı bağlantısı başarılı!")
+    def __init__(self, collection: Optional[str] = None, client: Optional[QdrantClient] = None):
+        """
+        Veritabanı bağlantısı oluştur
+        
+        Args:
+            collection: Açılacak collection (None ise COLLECTION_NAME alias'ının gösterdiği sürüm)
+            client: Paylaşılan istemci (gömülü Qdrant klasörü tek istemciyle açılabilir)
+        """
+        if client is None:
+            print(f"🔄 Qdrant veritabanına bağlanılıyor: {QDRANT_PATH}")
+            import warnings
+            warnings.filterwarnings("ignore", category=UserWarning)
+            client = QdrantClient(path=str(QDRANT_PATH))
+            print("✅ Veritabanı bağlantısı başarılı!")
+        self.client = client
+        
+        # Fiziksel collection (sürüm); aramalar alias yerine doğrudan buna gider
+        self.collection = collection or self._resolve_alias()
+        
+        # Boyut indirgeme projeksiyonu (collection metadata'sından yüklenir)
+        self.projector = None
+        self._load_projector()
+        
+        # Collection'da sparse vektör alanı var mı (eski collection'larda yok)
+        self.has_sparse = self._detect_sparse()
+        
+        # Collection'da binary kodlar var mı ("binary" arama modu için)
+        self.has_binary = self._detect_binary()
+        
+        # Tam tarifler ayrı doküman deposunda mı (eski collection'larda payload'da)
+        self.docs = None
+        self._open_doc_store()
+        
+        # Malzeme ters index'i (malzeme filtresi için; eski collection'larda yok)
+        self.ingredients = self._load_ingredient_index()
+    
+    def _projection_path(self) -> Path:
+        """Projeksiyon parametrelerinin kaydedildiği dosya"""
+        return Path(QDRANT_PATH) / f"{self.collection}_projection.npz"
+    
+    def _doc_store_path(self) -> Path:
+        """Tam tariflerin saklandığı doküman deposu (Qdrant payload'ı sadece özet tutar)"""
+        return Path(QDRANT_PATH) / f"{self.collection}_docs.sqlite"
+    
+    def _ingredient_index_path(self) -> Path:
+        """Malzeme ters index'inin kaydedildiği dosya"""
+        return Path(QDRANT_PATH) / f"{self.collection}_ingredients.npz"
+    
+    def _load_ingredient_index(self) -> Optional[IngredientIndex]:
+        """Kayıtlı malzeme index'ini yükle (yoksa None)"""
+        if not self.collection_exists() or not self._ingredient_index_path().exists():
+            return None
+        return IngredientIndex.load(self._ingredient_index_path())
+    
+    def colbert_index_path(self) -> Path:
+        """Collection'ın ColBERT (late interaction) index klasörü"""
+        return Path(COLBERT_INDEX_DIR) / self.collection
+    
+    def _load_projector(self):
+        """Collection metadata'sında kayıtlı projeksiyonu yükle"""
+        self.projector = None
+        if not self.collection_exists():
+            return
+        
+        info = self.client.get_collection(self.collection)
+        metadata = getattr(info.config, "metadata", None) or {}
+        projection = metadata.get("projection")
+        
+        if projection:
+            from dim_reduction import VectorProjector
+            self.projector = VectorProjector.load(Path(QDRANT_PATH) / projection["file"])
+            print(f"📐 Boyut indirgeme: {projection['method']} "
+                  f"{projection['input_dim']} → {projection['output_dim']}")
+    
+    def _open_doc_store(self):
+        """Collection metadata'sında kayıtlı doküman deposunu aç"""
+        if not self.collection_exists():
+            return
+        
+        info = self.client.get_collection(self.collection)
+        metadata = getattr(info.config, "metadata", None) or {}
+        
+        if metadata.get("doc_store"):
+            from doc_store import DocumentStore
+            self.docs = DocumentStore(Path(QDRANT_PATH) / metadata["doc_store"])
+    
+    def _close_doc_store(self, remove: bool = False):
+        """Doküman deposunu kapat (remove=True ise dosyayı da sil)"""
+        if getattr(self, "docs", None) is not None:
+            self.docs.close()
+            self.docs = None
+        if remove and self._doc_store_path().exists():
+            self._doc_store_path().unlink()
+    
+    def _detect_sparse(self) -> bool:
+        """Collection'da SPARSE_VECTOR_NAME sparse alanı var mı kontrol et"""
+        if not self.collection_exists():
+            return False
+        
+        info = self.client.get_collection(self.collection)
+        sparse_config = info.config.params.sparse_vectors or {}
+        return SPARSE_VECTOR_NAME in sparse_config
+    
+    def _detect_binary(self) -> bool:
+        """Collection binary kuantizasyonla mı oluşturulmuş"""
+        if not self.collection_exists():
+            return False
+        
+        info = self.client.get_collection(self.collection)
+        return isinstance(info.config.quantization_config, BinaryQuantization)
     
     def close(self):
-        """Veritabanı bağlantısını kapat"""
+        """Veritabanı bağlantısını ve doküman deposunu kapat"""
+        self._close_doc_store()
         try:
             if hasattr(self, 'client') and self.client is not None:
                 self.client.close()
         except Exception:
             pass  # Kapanış hatalarını yoksay
     
+    def flush(self):
+        """Malzeme index'ini diske yaz (Qdrant'ta upsert zaten kalıcıdır)"""
+        if self.ingredients is not None:
+            self.ingredients.save(self._ingredient_index_path())
+    
+    def index_needs_training(self) -> bool:
+        """Index vektör eklenmeden önce eğitilmeli mi (Qdrant'ta hayır)"""
+        return False
+    
+    def train_index(self, vectors):
+        """Index'i örnek vektörlerle eğit (Qdrant'ta gerekmez)"""
+        pass
+    
     def collection_exists(self) -> bool:
         """Collection var mı kontrol et"""
-        collections = self.client.get_collections().collections
-        return any(c.name == COLLECTION_NAME for c in collections)
+        return self.collection in self._collection_names()
     
-    def create_collection(self, recreate: bool = False):
+    def _collection_names(self) -> List[str]:
+        """Veritabanındaki tüm collection'lar"""
+        return [c.name for c in self.client.get_collections().collections]
+    
+    def _alias_target(self) -> Optional[str]:
+        """COLLECTION_NAME alias'ının gösterdiği collection (alias yoksa None)"""
+        for alias in self.client.get_aliases().aliases:
+            if alias.alias_name == COLLECTION_NAME:
+                return alias.collection_name
+        return None
+    
+    def _resolve_alias(self) -> str:
+        """Açılacak collection: alias'ın gösterdiği sürüm, alias yoksa eski (sürümsüz) collection"""
+        return self._alias_target() or COLLECTION_NAME
+    
+    def _point_alias(self, collection: str):
+        """Alias'ı collection'a çevir (silme ve oluşturma tek istekte, atomik)"""
+        operations = []
+        if self._alias_target() is not None:
+            operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=COLLECTION_NAME)))
+        operations.append(CreateAliasOperation(
+            create_alias=CreateAlias(collection_name=collection, alias_name=COLLECTION_NAME)
+        ))
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+    
+    def _open_collection(self, collection: str) -> "RecipeDatabase":
+        """Aynı istemciyle başka bir collection'ı aç"""
+        return RecipeDatabase(collection, client=self.client)
+    
+    def _release(self):
+        """Collection'a ait açık dosyaları kapat (istemci açık kalır)"""
+        self._close_doc_store()
+    
+    def versions(self) -> List[str]:
+        """Sürümlü collection'lar (eskiden yeniye)"""
+        return sorted(
+            (name for name in self._collection_names() if parse_version(name) is not None),
+            key=parse_version
+        )
+    
+    def staging(self) -> "RecipeDatabase":
+        """
+        Tam indexleme için yeni bir sürüm aç ({COLLECTION_NAME}_v{n+1})
+        
+        Arama promote çağrılana kadar mevcut sürümden devam eder.
+        """
+        name = version_name(max((parse_version(v) for v in self.versions()), default=0) + 1)
+        print(f"🏗️  Yeni sürüm: {name} (arama {self.collection} üzerinden devam ediyor)")
+        return self._open_collection(name)
+    
+    def promote(self, staging: "RecipeDatabase", keep: int = COLLECTION_KEEP_VERSIONS):
+        """
+        İndexlenip doğrulanmış sürümü yayına al
+        
+        Bu nesne (aramada kullanılan singleton) yeni sürümün durumunu tek
+        sözlük güncellemesiyle devralır, ardından alias yeni sürüme çevrilir
+        (yeni açılan bağlantılar alias üzerinden yeni sürümü görür) ve eski
+        sürümler silinir. Alias'tan önceki düzende oluşturulmuş sürümsüz
+        collection için bkz. _retire_legacy.
+        
+        Args:
+            staging: staging() ile açılıp indexlenmiş sürüm
+            keep: Saklanacak eski sürüm sayısı (geri dönüş için)
+        """
+        retired = copy.copy(self)
+        vars(self).update(vars(staging))
+        retired._release()
+        
+        if COLLECTION_NAME in self._collection_names():
+            self._retire_legacy()
+        
+        self._point_alias(self.collection)
+        print(f"🔀 Alias güncellendi: {COLLECTION_NAME} → {self.collection}")
+        self.drop_old_versions(keep)
+    
+    def drop_old_versions(self, keep: int = COLLECTION_KEEP_VERSIONS):
+        """Aktif sürümden eski sürümleri sil (en yeni keep tanesi kalır; daha yeni sürümlere dokunulmaz)"""
+        current = parse_version(self.collection)
+        if current is None:
+            return
+        
+        older = [name for name in self.versions() if parse_version(name) < current]
+        for name in older[:max(len(older) - keep, 0)]:
+            self._drop_version(name)
+    
+    def _drop_version(self, name: str):
+        """Eski bir sürümü ve dosyalarını sil"""
+        self._open_collection(name).delete_collection()
+    
+    def _retire_legacy(self):
+        """
+        Sürümsüz eski collection'ı kaldır
+        
+        Qdrant'ta collection yeniden adlandırılamaz ve alias bir collection ile
+        aynı adı taşıyamaz; bu yüzden eski collection ilk promote'ta hemen
+        silinir (COLLECTION_KEEP_VERSIONS kapsamında saklanmaz, bu sürüme geri
+        dönülemez).
+        """
+        print(f"🗑️  Sürümsüz eski collection kaldırılıyor (geri dönüş için saklanmaz): {COLLECTION_NAME}")
+        self._open_collection(COLLECTION_NAME).delete_collection()
+    
+    def create_collection(self, recreate: bool = False, projector=None):
         """
         Collection oluştur
         
         Args:
             recreate: True ise mevcut collection silinip yeniden oluşturulur
+            projector: Boyut indirgeme projeksiyonu (VectorProjector, isteğe bağlı)
         """
         if self.collection_exists():
             if recreate:
-                print(f"🗑️  Mevcut collection siliniyor: {COLLECTION_NAME}")
-                self.client.delete_collection(COLLECTION_NAME)
+                print(f"🗑️  Mevcut collection siliniyor: {self.collection}")
+                self.client.delete_collection(self.collection)
+                self._close_doc_store(remove=True)
+                self._ingredient_index_path().unlink(missing_ok=True)
             else:
-                print(f"ℹ️  Collection zaten mevcut: {COLLECTION_NAME}")
+                print(f"ℹ️  Collection zaten mevcut: {self.collection}")
                 return
         
         # Distance metric mapping
@@ -80,14 +451,44 @@ class RecipeDatabase:
             "Dot": Distance.DOT
         }
         
-        print(f"📦 Collection oluşturuluyor: {COLLECTION_NAME}")
+        # Projeksiyon varsa parametreleri kaydet ve metadata'ya yaz
+        vector_size = EMBEDDING_DIM
+        extra_params = {}
+        if projector is not None:
+            projector.save(self._projection_path())
+            vector_size = projector.output_dim
+            extra_params["metadata"] = {
+                "projection": projector.to_metadata(self._projection_path().name)
+            }
+        
+        # Tam tarifler doküman deposunda; payload'da sadece özet alanlar kalır
+        extra_params.setdefault("metadata", {})["doc_store"] = self._doc_store_path().name
+        
+        # BGE-M3 sparse vektörleri için ayrı alan (dense vektör isimsiz kalır)
+        if SPARSE_VECTORS:
+            extra_params["sparse_vectors_config"] = {SPARSE_VECTOR_NAME: SparseVectorParams()}
+        
+        # Skaler kuantizasyon (aramada kodlarla aday seçimi + tam vektörle yeniden skorlama)
+        if QUANTIZATION:
+            extra_params["quantization_config"] = quantization_config()
+        
+        print(f"📦 Collection oluşturuluyor: {self.collection} ({vector_size} boyut)")
         self.client.create_collection(
-            collection_name=COLLECTION_NAME,
+            collection_name=self.collection,
             vectors_config=VectorParams(
-                size=EMBEDDING_DIM,
+                size=vector_size,
                 distance=distance_map.get(DISTANCE_METRIC, Distance.COSINE)
-            )
+            ),
+            **extra_params
         )
+        self.projector = projector
+        self.has_sparse = SPARSE_VECTORS
+        self.has_binary = QUANTIZATION == "binary"
+        
+        from doc_store import DocumentStore
+        self.docs = DocumentStore(self._doc_store_path())
+        self.docs.clear()
+        self.ingredients = IngredientIndex()
         print("✅ Collection başarıyla oluşturuldu!")
     
     def get_collection_info(self) -> Dict[str, Any]:
@@ -95,18 +496,42 @@ class RecipeDatabase:
         if not self.collection_exists():
             return {"exists": False}
         
-        info = self.client.get_collection(COLLECTION_NAME)
+        info = self.client.get_collection(self.collection)
         return {
             "exists": True,
             "points_count": info.points_count,
+            "vector_dim": self.projector.output_dim if self.projector else EMBEDDING_DIM,
+            "projection": self.projector.method if self.projector else None,
+            "sparse": self.has_sparse,
+            "late_interaction": (self.colbert_index_path() / "meta.json").exists(),
+            "quantization": QUANTIZATION if info.config.quantization_config else None,
+            "doc_store_bytes": self.docs.size_bytes() if self.docs is not None else None,
             "status": info.status
         }
     
+    def _upload(self, points: List[PointStruct]):
+        """
+        Point'leri toplu yükle
+        
+        upload_points listeyi INDEX_BATCH_SIZE'lık parçalara böler;
+        UPLOAD_PARALLEL > 1 ise parçalar paralel süreçlerle gönderilir.
+        """
+        self.client.upload_points(
+            collection_name=self.collection,
+            points=points,
+            batch_size=INDEX_BATCH_SIZE,
+            parallel=UPLOAD_PARALLEL,
+            wait=True
+        )
+    
     def insert_recipes(
         self, 
         recipes: List[Dict[str, Any]], 
         vectors: List[List[float]],
-        start_id: int = 0
+        start_id: int = 0,
+        sparse_vectors: Optional[List[Dict[int, float]]] = None,
+        ids: Optional[Sequence[int]] = None,
+        replace: bool = False
     ) -> int:
         """
         Tarifleri veritabanına ekle
@@ -115,127 +540,833 @@ class RecipeDatabase:
             recipes: Tarif listesi
             vectors: Embedding vektörleri
             start_id: Başlangıç ID'si
+            sparse_vectors: BGE-M3 sparse vektörleri (collection'da sparse alan varsa yazılır)
+            ids: Tarif başına point ID'si (verilirse start_id yok sayılır)
+            replace: True ise mevcut kayıtların üzerine yazılır (eski malzeme kelimeleri silinir)
         
         Returns:
             Eklenen kayıt sayısı
         """
+        point_ids = [int(i) for i in ids] if ids is not None else list(range(start_id, start_id + len(recipes)))
+        
+        # Boyut indirgeme (sorgularla aynı projeksiyon)
+        if self.projector is not None:
+            vectors = self.projector.transform_list(vectors)
+        
+        # Doküman deposu varsa tam tarif depoya, payload'a sadece özet
+        payload_of = recipe_payload
+        if self.docs is not None:
+            self.docs.put_many(zip(point_ids, (recipe_payload(r) for r in recipes)))
+            payload_of = recipe_index_payload
+        
+        # Malzeme kelimeleri ters index'e (flush ile kaydedilir)
+        if self.ingredients is not None:
+            if replace:
+                self.ingredients.remove(point_ids)
+            self.ingredients.add_many((i, r.get("ingredients", [])) for i, r in zip(point_ids, recipes))
+        
         points = []
         
         for i, (recipe, vector) in enumerate(zip(recipes, vectors)):
+            # Dense vektör isimsiz ("") alanda, sparse vektör kendi alanında
+            if sparse_vectors is not None and self.has_sparse:
+                vector = {"": vector, SPARSE_VECTOR_NAME: to_sparse_vector(sparse_vectors[i])}
+            
             point = PointStruct(
-                id=start_id + i,
+                id=point_ids[i],
                 vector=vector,
-                payload={
-                    "title": recipe.get("title", ""),
-                    "url": recipe.get("url", ""),
-                    "ingredients": recipe.get("ingredients", []),
-                    "instructions": recipe.get("instructions", []),
-                    # Arama için ek alanlar
-                    "ingredient_count": len(recipe.get("ingredients", [])),
-                    "instruction_count": len(recipe.get("instructions", []))
-                }
+                payload=payload_of(recipe)
             )
             points.append(point)
         
         # Batch olarak ekle
-        self.client.upsert(
-            collection_name=COLLECTION_NAME,
-            points=points
-        )
+        self._upload(points)
         
         return len(points)
     
+    def delete_recipes(self, ids: Sequence[int]) -> int:
+        """
+        Tarifleri veritabanından sil (point, doküman deposu kaydı ve malzeme kelimeleri)
+        
+        Returns:
+            Silinen kayıt sayısı
+        """
+        ids = [int(i) for i in ids]
+        if not ids:
+            return 0
+        
+        self.client.delete(
+            collection_name=self.collection,
+            points_selector=PointIdsList(points=ids),
+            wait=True
+        )
+        if self.docs is not None:
+            self.docs.delete_many(ids)
+        if self.ingredients is not None:
+            self.ingredients.remove(ids)
+        return len(ids)
+    
+    def indexed_recipes(self) -> List[Tuple[int, Optional[str], Optional[str]]]:
+        """
+        Collection'daki tariflerin anahtarları (artımlı indexleme için)
+        
+        Returns:
+            [(point ID, recipe_key, content_hash), ...] - anahtarsız (eski) kayıtlarda None
+        """
+        result = []
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection,
+                limit=SCROLL_BATCH_SIZE,
+                offset=offset,
+                with_payload=list(INDEX_KEY_FIELDS),
+                with_vectors=False
+            )
+            result.extend(
+                (int(point.id), point.payload.get("recipe_key"), point.payload.get("content_hash"))
+                for point in points
+            )
+            if offset is None:
+                return result
+    
     def search(
         self, 
-        query_vector: List[float], 
+        query_vector: Optional[List[float]] = None, 
         top_k: int = 5,
         score_threshold: Optional[float] = None,
-        ingredient_filter: Optional[List[str]] = None
+        ingredient_filter: Optional[IngredientFilter] = None,
+        sparse_vector: Optional[Dict[int, float]] = None,
+        mode: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Vektör araması yap
         
         Args:
-            query_vector: Sorgu vektörü
+            query_vector: Sorgu vektörü (dense / hybrid)
             top_k: Döndürülecek sonuç sayısı
-            score_threshold: Minimum benzerlik skoru
-            ingredient_filter: Belirli malzemeleri içeren tarifleri filtrele
+            score_threshold: Minimum benzerlik skoru (sadece dense / binary modda)
+            ingredient_filter: Malzeme filtresi - liste (herhangi biri) veya
+                {"any": [...], "all": [...], "none": [...]} (bkz. ingredient_index.py)
+            sparse_vector: Sorgunun sparse vektörü (sparse / hybrid)
+            mode: "dense", "sparse", "hybrid" veya "binary" (None ise config'den)
         
         Returns:
             Bulunan tarifler listesi
         """
+        mode = mode or SEARCH_MODE
+        self._check_search_mode(mode)
+        
+        # Boyut indirgeme (index ile aynı projeksiyon)
+        if self.projector is not None and query_vector is not None:
+            query_vector = self.projector.transform(query_vector).tolist()
+        
         # Filtre oluştur (isteğe bağlı)
         query_filter = None
         if ingredient_filter:
-            # Malzeme filtreleme - herhangi biri içeren
-            query_filter = Filter(
-                should=[
-                    FieldCondition(
-                        key="ingredients",
-                        match=MatchText(text=ing)
-                    )
-                    for ing in ingredient_filter
-                ]
-            )
+            query_filter = self._ingredient_filter(ingredient_filter)
         
         # Yeni Qdrant API - query_points kullan
         response = self.client.query_points(
-            collection_name=COLLECTION_NAME,
-            query=query_vector,
+            collection_name=self.collection,
             limit=top_k,
-            score_threshold=score_threshold,
-            query_filter=query_filter
+            query_filter=query_filter,
+            **self._query_args(mode, top_k, query_vector, sparse_vector, score_threshold, query_filter)
         )
         
-        # Sonuçları düzenle
-        formatted_results = []
-        for result in response.points:
-            formatted_results.append({
-                "id": result.id,
-                "score": result.score,
-                "title": result.payload.get("title", ""),
-                "url": result.payload.get("url", ""),
-                "ingredients": result.payload.get("ingredients", []),
-                "instructions": result.payload.get("instructions", [])
-            })
+        # Sonuçları düzenle (doküman deposu varsa özet, tarif hydrate ile)
+        to_result = recipe_summary if self.docs is not None else recipe_result
+        return [to_result(result.id, result.payload, result.score) for result in response.points]
+    
+    def search_batch(
+        self,
+        query_vectors: Optional[Sequence[List[float]]] = None,
+        top_k: int = 5,
+        score_threshold: Optional[float] = None,
+        ingredient_filters: Optional[Sequence[Optional[IngredientFilter]]] = None,
+        sparse_vectors: Optional[Sequence[Dict[int, float]]] = None,
+        mode: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla sorguyu tek istekte ara (query_batch_points)
+        
+        Args:
+            query_vectors: Sorgu vektörleri (dense / hybrid)
+            top_k: Sorgu başına sonuç sayısı
+            score_threshold: Minimum benzerlik skoru (sadece dense / binary modda)
+            ingredient_filters: Sorgu başına malzeme filtresi (None: filtre yok)
+            sparse_vectors: Sorguların sparse vektörleri (sparse / hybrid)
+            mode: "dense", "sparse", "hybrid" veya "binary" (None ise config'den)
+        
+        Returns:
+            Sorgu başına bulunan tarifler listesi (sorgu sırasıyla)
+        """
+        mode = mode or SEARCH_MODE
+        self._check_search_mode(mode)
+        
+        count = len(query_vectors) if query_vectors is not None else len(sparse_vectors)
+        if not count:
+            return []
+        
+        # Boyut indirgeme (tüm sorgular tek matris çarpımıyla)
+        if self.projector is not None and query_vectors is not None:
+            query_vectors = self.projector.transform(query_vectors).tolist()
+        
+        query_vectors = query_vectors if query_vectors is not None else [None] * count
+        sparse_vectors = sparse_vectors if sparse_vectors is not None else [None] * count
+        ingredient_filters = ingredient_filters if ingredient_filters is not None else [None] * count
+        
+        requests = []
+        for query_vector, sparse_vector, ingredient_filter in zip(query_vectors, sparse_vectors, ingredient_filters):
+            query_filter = self._ingredient_filter(ingredient_filter) if ingredient_filter else None
+            args = self._query_args(mode, top_k, query_vector, sparse_vector, score_threshold, query_filter)
+            # QueryRequest'te arama ayarının adı "params"
+            args["params"] = args.pop("search_params", None)
+            requests.append(QueryRequest(limit=top_k, filter=query_filter, with_payload=True, **args))
+        
+        responses = self.client.query_batch_points(collection_name=self.collection, requests=requests)
+        
+        to_result = recipe_summary if self.docs is not None else recipe_result
+        return [
+            [to_result(result.id, result.payload, result.score) for result in response.points]
+            for response in responses
+        ]
+    
+    def _ingredient_ids(self, ingredient_filter: IngredientFilter) -> Sequence[int]:
+        """Malzeme filtresine uyan tarif ID'leri (ters index; yoksa doküman deposu taranır)"""
+        if self.ingredients is not None:
+            return self.ingredients.match(ingredient_filter)
+        
+        clauses = parse_filter(ingredient_filter)
+        if set(clauses) - {"any"}:
+            raise ValueError(
+                "'all' / 'none' malzeme filtreleri için malzeme index'i gerekli "
+                "(collection'ı yeniden indexleyin)"
+            )
+        return self.docs.ids_matching_any("ingredients", clauses.get("any", []))
+    
+    def _ingredient_filter(self, ingredient_filter: IngredientFilter) -> Filter:
+        """Malzeme filtresi (ID koşulu; eski collection'larda payload üzerinde MatchText)"""
+        if self.ingredients is not None or self.docs is not None:
+            ids = self._ingredient_ids(ingredient_filter)
+            return Filter(must=[HasIdCondition(has_id=[int(point_id) for point_id in ids])])
+        
+        clauses = parse_filter(ingredient_filter)
+        conditions = {
+            key: [FieldCondition(key="ingredients", match=MatchText(text=ing)) for ing in clauses.get(key, [])]
+            for key in ("any", "all", "none")
+        }
+        return Filter(
+            should=conditions["any"] or None,
+            must=conditions["all"] or None,
+            must_not=conditions["none"] or None
+        )
+    
+    def hydrate(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Arama sonuçlarına tam tarif bilgilerini ekle (doküman deposundan tek sorguda)
+        
+        Sadece gösterilecek / LLM'e gönderilecek sonuçlar için çağrılır.
+        Tarifi zaten içeren sonuçlar (eski collection'lar) olduğu gibi kalır.
+        
+        Args:
+            results: search() sonuçları (yerinde güncellenir)
+        
+        Returns:
+            Aynı liste (tarif alanları eklenmiş)
+        """
+        missing = [r["id"] for r in results if "instructions" not in r]
+        if not missing or self.docs is None:
+            return results
+        
+        docs = self.docs.get_many(missing)
+        for result in results:
+            if "instructions" not in result:
+                result.update(recipe_result(result["id"], docs.get(int(result["id"]), {})))
+        return results
+    
+    def _check_search_mode(self, mode: str):
+        """Arama modunu ve collection'ın bu modu destekleyip desteklemediğini kontrol et"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Bilinmeyen arama modu: {mode} (seçenekler: {', '.join(SEARCH_MODES)})")
+        if mode == "binary" and not self.has_binary:
+            raise ValueError(
+                "'binary' araması için collection'da binary kod yok "
+                "(QUANTIZATION=\"binary\" ile yeniden indexleyin)"
+            )
+        if mode in ("sparse", "hybrid") and not self.has_sparse:
+            raise ValueError(
+                f"'{mode}' araması için collection'da sparse vektör yok "
+                f"(SPARSE_VECTORS=True ile yeniden indexleyin)"
+            )
+    
+    def _search_params(self, mode: str) -> Optional[SearchParams]:
+        """
+        Dense aramanın kuantizasyon ayarı
+        
+        int8 collection'da kodlarla aday seçilip tam vektörle yeniden skorlanır.
+        Binary kodlar sadece "binary" modda kullanılır, "dense" mod tam vektörlerle arar.
+        """
+        if mode == "binary":
+            return SearchParams(
+                quantization=QuantizationSearchParams(rescore=True, oversampling=QUANTIZATION_OVERSAMPLING)
+            )
+        if self.has_binary:
+            return SearchParams(quantization=QuantizationSearchParams(ignore=True))
+        if QUANTIZATION:
+            return SearchParams(
+                quantization=QuantizationSearchParams(rescore=True, oversampling=QUANTIZATION_OVERSAMPLING)
+            )
+        return None
+    
+    def _query_args(
+        self,
+        mode: str,
+        limit: int,
+        query_vector: Optional[List[float]],
+        sparse_vector: Optional[Dict[int, float]],
+        score_threshold: Optional[float],
+        query_filter: Optional[Filter]
+    ) -> Dict[str, Any]:
+        """
+        Arama moduna göre query_points parametrelerini oluştur
+        
+        Sparse ve RRF skorları cosine ölçeğinde olmadığı için
+        score_threshold sadece dense modda uygulanır.
+        """
+        if mode in ("dense", "binary"):
+            return {"query": query_vector, "score_threshold": score_threshold, "search_params": self._search_params(mode)}
+        
+        if mode == "sparse":
+            return {"query": to_sparse_vector(sparse_vector), "using": SPARSE_VECTOR_NAME}
         
-        return formatted_results
+        # Hybrid: iki kanaldan aday al, sıralamaları RRF ile birleştir
+        prefetch_limit = max(HYBRID_PREFETCH_LIMIT, limit)
+        return {
+            "prefetch": [
+                Prefetch(
+                    query=query_vector,
+                    limit=prefetch_limit,
+                    filter=query_filter,
+                    params=self._search_params("dense")
+                ),
+                Prefetch(
+                    query=to_sparse_vector(sparse_vector),
+                    using=SPARSE_VECTOR_NAME,
+                    limit=prefetch_limit,
+                    filter=query_filter
+                )
+            ],
+            "query": FusionQuery(fusion=Fusion.RRF)
+        }
     
     def get_recipe_by_id(self, recipe_id: int) -> Optional[Dict[str, Any]]:
         """ID ile tarif getir"""
+        if self.docs is not None:
+            doc = self.docs.get(recipe_id)
+            return recipe_result(recipe_id, doc) if doc is not None else None
+        
         results = self.client.retrieve(
-            collection_name=COLLECTION_NAME,
+            collection_name=self.collection,
             ids=[recipe_id]
         )
         
         if results:
-            point = results[0]
+            return recipe_result(results[0].id, results[0].payload)
+        return None
+    
+    def delete_collection(self):
+        """Collection sil"""
+        if self.collection_exists():
+            self.client.delete_collection(self.collection)
+            self._close_doc_store(remove=True)
+            self._ingredient_index_path().unlink(missing_ok=True)
+            self._projection_path().unlink(missing_ok=True)
+            self.ingredients = None
+            print(f"🗑️  Collection silindi: {self.collection}")
+            
+            # Collection'a ait ColBERT index'i de geçersiz
+            if self.colbert_index_path().exists():
+                shutil.rmtree(self.colbert_index_path())
+        else:
+            print(f"ℹ️  Collection bulunamadı: {self.collection}")
+
+
+class LocalRecipeDatabase(RecipeDatabase):
+    """
+    Süreç içi NumPy vektör index'i + SQLite doküman deposu (Qdrant yerine)
+    
+    Qdrant'ın gömülü modu her sorguda point'leri Python'da skorlar; burada
+    vektörler bitişik bir float32 matriste tutulur ve sorgu tek matris-vektör
+    çarpımı ile cevaplanır. Arayüz RecipeDatabase ile aynıdır.
+    
+    Klasör yapısı (LOCAL_DB_PATH / <sürüm>, örn: recipes_v3; bkz. RecipeDatabase.promote):
+        collection.json  : Collection metadata'sı (projeksiyon)
+        vectors/         : Vektör index'i (flat / HNSW / IVF-PQ / kuantize, bkz. vector_index.py)
+        docs.sqlite      : Tarifler (bkz. doc_store.py)
+        projection.npz   : Boyut indirgeme parametreleri (varsa)
+    
+    Sadece dense arama desteklenir (sparse / hybrid için Qdrant backend'i).
+    """
+    
+    def __init__(self, collection: Optional[str] = None):
+        """
+        Collection klasörünü aç (yoksa create_collection ile oluşturulur)
+        
+        Args:
+            collection: Açılacak collection klasörü (None ise alias dosyasının gösterdiği sürüm)
+        """
+        self.collection = collection or self._resolve_alias()
+        print(f"🔄 Yerel vektör index'i açılıyor: {self._collection_path()}")
+        self.index = None
+        self.docs = None
+        self.ingredients = None
+        self.projector = None
+        self.has_sparse = False
+        self.has_binary = False
+        self._open()
+    
+    def _collection_path(self) -> Path:
+        """Collection klasörü"""
+        return Path(LOCAL_DB_PATH) / self.collection
+    
+    def _metadata_path(self) -> Path:
+        return self._collection_path() / "collection.json"
+    
+    def _projection_path(self) -> Path:
+        """Projeksiyon parametrelerinin kaydedildiği dosya"""
+        return self._collection_path() / "projection.npz"
+    
+    def _ingredient_index_path(self) -> Path:
+        """Malzeme ters index'inin kaydedildiği dosya"""
+        return self._collection_path() / "ingredients.npz"
+    
+    def _open(self):
+        """Mevcut collection'ın index'ini, doküman deposunu ve projeksiyonunu yükle"""
+        if not self.collection_exists():
+            return
+        
+        from vector_index import open_vector_index
+        from doc_store import DocumentStore
+        
+        self.index = open_vector_index(
+            self._collection_path() / "vectors",
+            mmap=LOCAL_INDEX_MMAP,
+            ef_search=HNSW_EF_SEARCH,
+            nprobe=IVF_NPROBE,
+            rerank=IVF_RERANK,
+            oversampling=QUANTIZATION_OVERSAMPLING
+        )
+        self.docs = DocumentStore(self._collection_path() / "docs.sqlite")
+        self.ingredients = self._load_ingredient_index()
+        self._load_projector()
+        self.has_binary = getattr(self.index, "quantization", None) == "binary"
+        print(f"✅ Yerel index hazır ({len(self.index):,} vektör)")
+    
+    def _index_type(self) -> str:
+        """Yeni index'in türü (kuantizasyon açıksa kuantize flat index)"""
+        if not QUANTIZATION:
+            return LOCAL_INDEX_TYPE
+        if LOCAL_INDEX_TYPE != "flat":
+            raise ValueError(f"Kuantizasyon sadece flat index ile kullanılabilir (LOCAL_INDEX_TYPE={LOCAL_INDEX_TYPE})")
+        return "quantized"
+    
+    def _index_params(self) -> Dict[str, Any]:
+        """Yeni index'in türüne özel kurulum parametreleri"""
+        index_type = self._index_type()
+        if index_type == "hnsw":
+            return {"M": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION, "ef_search": HNSW_EF_SEARCH}
+        if index_type == "ivf_pq":
+            return {"nlist": IVF_NLIST, "m": PQ_M, "nprobe": IVF_NPROBE, "rerank": IVF_RERANK}
+        if index_type == "quantized":
             return {
-                "id": point.id,
-                "title": point.payload.get("title", ""),
-                "url": point.payload.get("url", ""),
-                "ingredients": point.payload.get("ingredients", []),
-                "instructions": point.payload.get("instructions", [])
+                "quantization": QUANTIZATION,
+                "quantile": QUANTIZATION_QUANTILE,
+                "oversampling": QUANTIZATION_OVERSAMPLING
             }
-        return None
+        return {}
+    
+    def _read_metadata(self) -> Dict[str, Any]:
+        with open(self._metadata_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    
+    def _load_projector(self):
+        """Collection metadata'sında kayıtlı projeksiyonu yükle"""
+        self.projector = None
+        projection = self._read_metadata().get("projection")
+        
+        if projection:
+            from dim_reduction import VectorProjector
+            self.projector = VectorProjector.load(self._collection_path() / projection["file"])
+            print(f"📐 Boyut indirgeme: {projection['method']} "
+                  f"{projection['input_dim']} → {projection['output_dim']}")
+    
+    def close(self):
+        """Index ve doküman deposunu kapat"""
+        if self.index is not None:
+            self.index.close()
+        if self.docs is not None:
+            self.docs.close()
+            self.docs = None
+    
+    def flush(self):
+        """Index'in bellekteki yapılarını (örn: HNSW grafı) ve malzeme index'ini diske yaz"""
+        if self.index is not None:
+            self.index.flush()
+        if self.ingredients is not None:
+            self.ingredients.save(self._ingredient_index_path())
+    
+    def index_needs_training(self) -> bool:
+        """Index vektör eklenmeden önce eğitilmeli mi (örn: IVF-PQ)"""
+        return self.index is not None and not self.index.is_trained
+    
+    def train_index(self, vectors):
+        """
+        Index'i örnek vektörlerle eğit (indirgenmemiş embedding'ler)
+        
+        Args:
+            vectors: (n, EMBEDDING_DIM) örnekler (örn: embedding deposundan)
+        """
+        if self.projector is not None:
+            vectors = self.projector.transform(vectors)
+        self.index.train(vectors)
+    
+    def collection_exists(self) -> bool:
+        """Collection var mı kontrol et"""
+        return self._metadata_path().exists()
+    
+    def _alias_path(self) -> Path:
+        """COLLECTION_NAME alias'ı: gösterdiği sürüm klasörünün adını tutan dosya"""
+        return Path(LOCAL_DB_PATH) / f"{COLLECTION_NAME}.alias"
+    
+    def _collection_names(self) -> List[str]:
+        """LOCAL_DB_PATH altındaki collection klasörleri"""
+        root = Path(LOCAL_DB_PATH)
+        return [path.name for path in root.iterdir() if path.is_dir()] if root.exists() else []
+    
+    def _alias_target(self) -> Optional[str]:
+        """Alias dosyasındaki sürüm (dosya yoksa None)"""
+        if not self._alias_path().exists():
+            return None
+        return self._alias_path().read_text(encoding="utf-8").strip()
+    
+    def _point_alias(self, collection: str):
+        """Alias dosyasını yeniden yaz (os.replace ile atomik: okuyan eski veya yeni adı görür)"""
+        from vector_index import write_atomic
+        write_atomic(self._alias_path(), lambda f: f.write(collection.encode("utf-8")))
+    
+    def _open_collection(self, collection: str) -> "LocalRecipeDatabase":
+        """Başka bir collection klasörünü aç"""
+        return LocalRecipeDatabase(collection)
+    
+    def _release(self):
+        """Collection'ın index'ini ve doküman deposunu kapat"""
+        self.close()
+    
+    def _drop_version(self, name: str):
+        """Eski sürümün klasörünü sil (index ve doküman deposu açılmaz)"""
+        shutil.rmtree(Path(LOCAL_DB_PATH) / name)
+        colbert_path = Path(COLBERT_INDEX_DIR) / name
+        if colbert_path.exists():
+            shutil.rmtree(colbert_path)
+        print(f"🗑️  Collection silindi: {name}")
+    
+    def _retire_legacy(self):
+        """
+        Sürümsüz eski collection'ı sürüm 0 olarak sakla
+        
+        Alias ayrı bir dosya olduğundan klasör adı çakışmaz; klasör yeniden
+        adlandırılır ve diğer eski sürümler gibi COLLECTION_KEEP_VERSIONS'a
+        göre saklanır / silinir.
+        """
+        target = version_name(0)
+        if target in self._collection_names():
+            return super()._retire_legacy()
+        
+        (Path(LOCAL_DB_PATH) / COLLECTION_NAME).rename(Path(LOCAL_DB_PATH) / target)
+        colbert_path = Path(COLBERT_INDEX_DIR) / COLLECTION_NAME
+        if colbert_path.exists():
+            colbert_path.rename(Path(COLBERT_INDEX_DIR) / target)
+        print(f"📦 Sürümsüz eski collection saklandı: {COLLECTION_NAME} → {target}")
+    
+    def create_collection(self, recreate: bool = False, projector=None):
+        """
+        Collection oluştur
+        
+        Args:
+            recreate: True ise mevcut collection silinip yeniden oluşturulur
+            projector: Boyut indirgeme projeksiyonu (VectorProjector, isteğe bağlı)
+        """
+        from vector_index import create_vector_index
+        from doc_store import DocumentStore
+        
+        if self.collection_exists():
+            if recreate:
+                print(f"🗑️  Mevcut collection siliniyor: {self.collection}")
+                self.close()
+                shutil.rmtree(self._collection_path())
+            else:
+                print(f"ℹ️  Collection zaten mevcut: {self.collection}")
+                return
+        
+        self._collection_path().mkdir(parents=True, exist_ok=True)
+        
+        # Projeksiyon varsa parametreleri kaydet ve metadata'ya yaz
+        vector_size = EMBEDDING_DIM
+        metadata = {}
+        if projector is not None:
+            projector.save(self._projection_path())
+            vector_size = projector.output_dim
+            metadata["projection"] = projector.to_metadata(self._projection_path().name)
+        
+        print(f"📦 Collection oluşturuluyor: {self.collection} ({vector_size} boyut, yerel)")
+        self.index = create_vector_index(
+            self._collection_path() / "vectors",
+            self._index_type(),
+            vector_size,
+            metric=DISTANCE_METRIC,
+            mmap=LOCAL_INDEX_MMAP,
+            **self._index_params()
+        )
+        self.has_binary = getattr(self.index, "quantization", None) == "binary"
+        self.docs = DocumentStore(self._collection_path() / "docs.sqlite")
+        self.ingredients = IngredientIndex()
+        
+        # Metadata en son yazılır (collection_exists bu dosyaya bakar)
+        with open(self._metadata_path(), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+        
+        self.projector = projector
+        print("✅ Collection başarıyla oluşturuldu!")
+    
+    def get_collection_info(self) -> Dict[str, Any]:
+        """Collection bilgilerini getir"""
+        if not self.collection_exists():
+            return {"exists": False}
+        
+        stats = self.index.stats()
+        return {
+            "exists": True,
+            "backend": "local",
+            "points_count": stats["count"],
+            "vector_dim": stats["dim"],
+            "projection": self.projector.method if self.projector else None,
+            "sparse": False,
+            "late_interaction": (self.colbert_index_path() / "meta.json").exists(),
+            "index_type": stats["type"],
+            "ef_search": stats.get("ef_search"),
+            "nprobe": stats.get("nprobe"),
+            "quantization": stats.get("quantization"),
+            "oversampling": stats.get("oversampling"),
+            "graph_bytes": stats.get("graph_bytes"),
+            "index_ram_bytes": stats["ram_bytes"],
+            "vector_bytes": stats["vector_bytes"],
+            "doc_store_bytes": self.docs.size_bytes(),
+            "status": "green"
+        }
+    
+    def insert_recipes(
+        self, 
+        recipes: List[Dict[str, Any]], 
+        vectors: List[List[float]],
+        start_id: int = 0,
+        sparse_vectors: Optional[List[Dict[int, float]]] = None,
+        ids: Optional[Sequence[int]] = None,
+        replace: bool = False
+    ) -> int:
+        """
+        Tarifleri index'e ve doküman deposuna ekle
+        
+        Args:
+            recipes: Tarif listesi
+            vectors: Embedding vektörleri
+            start_id: Başlangıç ID'si
+            sparse_vectors: Yok sayılır (yerel backend sparse vektör saklamaz)
+            ids: Tarif başına ID (verilirse start_id yok sayılır)
+            replace: True ise mevcut kayıtların üzerine yazılır
+        
+        Returns:
+            Eklenen kayıt sayısı
+        """
+        point_ids = [int(i) for i in ids] if ids is not None else list(range(start_id, start_id + len(recipes)))
+        
+        # Boyut indirgeme (sorgularla aynı projeksiyon)
+        if self.projector is not None:
+            vectors = self.projector.transform_list(vectors)
+        
+        self.docs.put_many(zip(point_ids, (recipe_payload(r) for r in recipes)))
+        if self.ingredients is not None:
+            if replace:
+                self.ingredients.remove(point_ids)
+            self.ingredients.add_many((i, r.get("ingredients", [])) for i, r in zip(point_ids, recipes))
+        return self.index.add(point_ids, vectors)
+    
+    def delete_recipes(self, ids: Sequence[int]) -> int:
+        """Tarifleri index'ten, doküman deposundan ve malzeme index'inden sil"""
+        ids = [int(i) for i in ids]
+        if not ids:
+            return 0
+        
+        self.docs.delete_many(ids)
+        if self.ingredients is not None:
+            self.ingredients.remove(ids)
+        return self.index.delete(ids)
+    
+    def indexed_recipes(self) -> List[Tuple[int, Optional[str], Optional[str]]]:
+        """Doküman deposundaki tariflerin anahtarları: [(ID, recipe_key, content_hash), ...]"""
+        docs = self.docs.get_many(self.docs.all_ids(), fields=INDEX_KEY_FIELDS)
+        return [(doc_id, doc.get("recipe_key"), doc.get("content_hash")) for doc_id, doc in docs.items()]
+    
+    def search(
+        self, 
+        query_vector: Optional[List[float]] = None, 
+        top_k: int = 5,
+        score_threshold: Optional[float] = None,
+        ingredient_filter: Optional[IngredientFilter] = None,
+        sparse_vector: Optional[Dict[int, float]] = None,
+        mode: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Vektör araması yap (RecipeDatabase.search ile aynı arayüz, sadece dense)
+        
+        Returns:
+            Bulunan tarifler listesi
+        """
+        mode = mode or SEARCH_MODE
+        self._check_search_mode(mode)
+        
+        # Boyut indirgeme (index ile aynı projeksiyon)
+        if self.projector is not None:
+            query_vector = self.projector.transform(query_vector)
+        
+        # Malzeme filtresi izin verilen ID'lere çevrilir (ters index'te bitmap işlemleri)
+        allowed_ids = None
+        if ingredient_filter:
+            allowed_ids = self._ingredient_ids(ingredient_filter)
+        
+        ids, scores = self._index_search(mode)(
+            query_vector,
+            top_k,
+            allowed_ids=allowed_ids,
+            score_threshold=score_threshold
+        )
+        
+        # Özet alanlar tek sorguda (tam tarif hydrate ile)
+        docs = self.docs.get_many(ids, fields=SUMMARY_FIELDS)
+        return [
+            recipe_summary(int(point_id), docs.get(int(point_id), {}), float(score))
+            for point_id, score in zip(ids, scores)
+        ]
+    
+    def search_batch(
+        self,
+        query_vectors: Optional[Sequence[List[float]]] = None,
+        top_k: int = 5,
+        score_threshold: Optional[float] = None,
+        ingredient_filters: Optional[Sequence[Optional[IngredientFilter]]] = None,
+        sparse_vectors: Optional[Sequence[Dict[int, float]]] = None,
+        mode: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla sorguyu birlikte ara (RecipeDatabase.search_batch ile aynı arayüz)
+        
+        Sorgular tek bir matris-matris çarpımıyla skorlanır, özet alanlar
+        tüm sonuçlar için tek sorguda okunur.
+        
+        Returns:
+            Sorgu başına bulunan tarifler listesi (sorgu sırasıyla)
+        """
+        mode = mode or SEARCH_MODE
+        self._check_search_mode(mode)
+        
+        if query_vectors is None or not len(query_vectors):
+            return []
+        
+        # Boyut indirgeme (tüm sorgular tek matris çarpımıyla)
+        if self.projector is not None:
+            query_vectors = self.projector.transform(query_vectors)
+        
+        allowed_ids = None
+        if ingredient_filters is not None:
+            allowed_ids = [self._ingredient_ids(f) if f else None for f in ingredient_filters]
+        
+        hits = self._index_search_batch(mode)(
+            query_vectors,
+            top_k,
+            allowed_ids=allowed_ids,
+            score_threshold=score_threshold
+        )
+        
+        docs = self.docs.get_many({int(point_id) for ids, _ in hits for point_id in ids}, fields=SUMMARY_FIELDS)
+        return [
+            [
+                recipe_summary(int(point_id), docs.get(int(point_id), {}), float(score))
+                for point_id, score in zip(ids, scores)
+            ]
+            for ids, scores in hits
+        ]
+    
+    def _check_search_mode(self, mode: str):
+        """Arama modunu kontrol et (yerel backend dense ve binary arar)"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Bilinmeyen arama modu: {mode} (seçenekler: {', '.join(SEARCH_MODES)})")
+        if mode in ("sparse", "hybrid"):
+            raise ValueError(f"'{mode}' araması yerel backend'de desteklenmiyor (DB_BACKEND=\"qdrant\" kullanın)")
+        if mode == "binary" and not self.has_binary:
+            raise ValueError(
+                "'binary' araması için index'te binary kod yok "
+                "(QUANTIZATION=\"binary\" ile yeniden indexleyin)"
+            )
+    
+    def _index_search(self, mode: str):
+        """Moda göre index arama fonksiyonu (binary kodlar sadece "binary" modda)"""
+        if self.has_binary and mode != "binary":
+            return self.index.exact_search
+        return self.index.search
+    
+    def _index_search_batch(self, mode: str):
+        """Moda göre index batch arama fonksiyonu"""
+        if self.has_binary and mode != "binary":
+            return self.index.exact_search_batch
+        return self.index.search_batch
+    
+    def get_recipe_by_id(self, recipe_id: int) -> Optional[Dict[str, Any]]:
+        """ID ile tarif getir"""
+        doc = self.docs.get(recipe_id) if self.docs is not None else None
+        return recipe_result(recipe_id, doc) if doc is not None else None
     
     def delete_collection(self):
         """Collection sil"""
         if self.collection_exists():
-            self.client.delete_collection(COLLECTION_NAME)
-            print(f"🗑️  Collection silindi: {COLLECTION_NAME}")
+            self.close()
+            shutil.rmtree(self._collection_path())
+            if self._alias_target() == self.collection:
+                self._alias_path().unlink()
+            self.index = None
+            self.ingredients = None
+            print(f"🗑️  Collection silindi: {self.collection}")
+            
+            # Collection'a ait ColBERT index'i de geçersiz
+            if self.colbert_index_path().exists():
+                shutil.rmtree(self.colbert_index_path())
         else:
-            print(f"ℹ️  Collection bulunamadı: {COLLECTION_NAME}")
+            print(f"ℹ️  Collection bulunamadı: {self.collection}")
+
 
+# Desteklenen backend'ler (bkz. config.DB_BACKEND)
+DB_BACKENDS = {"qdrant": RecipeDatabase, "local": LocalRecipeDatabase}
 
 # Singleton instance
 _db_instance = None
 
 def get_database() -> RecipeDatabase:
-    """Database singleton instance döndür"""
+    """Database singleton instance döndür (DB_BACKEND'e göre)"""
     global _db_instance
     if _db_instance is None:
-        _db_instance = RecipeDatabase()
+        if DB_BACKEND not in DB_BACKENDS:
+            raise ValueError(f"Bilinmeyen veritabanı backend'i: {DB_BACKEND} "
+                             f"(seçenekler: {', '.join(DB_BACKENDS)})")
+        _db_instance = DB_BACKENDS[DB_BACKEND]()
     return _db_instance
 
 
@@ -5,20 +5,162 @@ Tarif metinlerini vektörlere dönüştürme işlemleri
 (sentence-transformers ile)
 """
 
-from typing import List, Dict, Any
-from sentence_transformers import SentenceTransformer
-from config import MODEL_NAME, BATCH_SIZE
+import asyncio
+import hashlib
+import inspect
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+import numpy as np
+from model_registry import acquire_model, release_model
+from thread_tuning import load_thread_config, apply_thread_config
+from adaptive_batch import AdaptiveBatchSizer
+from query_batcher import QueryBatcher
+from embedding_store import file_sha1
+from sparse_encoder import load_sparse_head, lexical_weights
+from colbert_encoder import load_colbert_head, colbert_vectors
+from config import (
+    MODEL_NAME,
+    MODEL_BACKEND,
+    BATCH_SIZE,
+    ADAPTIVE_BATCHING,
+    EMBED_MEMORY_BUDGET_MB,
+    ADAPTIVE_MAX_BATCH_SIZE,
+    THREAD_CONFIG_FILE,
+    MAX_SEQ_LENGTH,
+    TRUNCATION_STRATEGY,
+    MAX_INSTRUCTION_TOKENS,
+    QUERY_BATCHING,
+    QUERY_BATCH_MAX_WAIT_MS,
+    QUERY_BATCH_MAX_SIZE,
+    SPARSE_VECTORS,
+    COLBERT_MAX_TOKENS
+)
+
+# Desteklenen kırpma stratejileri
+TRUNCATION_STRATEGIES = ("head", "head_tail", "instructions")
+
+# Embedding metnini belirleyen metotlar (değişirlerse depodaki embedding'ler yeniden üretilir)
+TEXT_BUILDERS = ("create_recipe_text", "cap_instructions", "apply_truncation")
+
+# Isınma encode'unda kullanılan örnek metin
+WARMUP_TEXT = "tavuklu sebze yemeği"
 
 
 class RecipeEmbedder:
     """BGE-M3 ile tarif embedding işlemleri"""
     
-    def __init__(self):
-        """Model yükle"""
+    def __init__(
+        self,
+        max_seq_length: int = None,
+        truncation_strategy: str = None,
+        max_instruction_tokens: int = None,
+        apply_thread_settings: bool = True,
+        memory_budget_fraction: float = 1.0
+    ):
+        """
+        Model yükle
+        
+        Args:
+            max_seq_length: Model girdisi için en fazla token (None ise config'den)
+            truncation_strategy: "head", "head_tail" veya "instructions" (None ise config'den)
+            max_instruction_tokens: "instructions" stratejisinde yapılış token sınırı
+            apply_thread_settings: THREAD_CONFIG_FILE'daki thread ayarını uygula
+                (thread sayısını kendisi belirleyen worker süreçlerinde False)
+            memory_budget_fraction: Adaptif batch bellek bütçesinin bu sürece düşen payı
+        """
+        self.max_seq_length = max_seq_length or MAX_SEQ_LENGTH
+        self.truncation_strategy = truncation_strategy or TRUNCATION_STRATEGY
+        self.max_instruction_tokens = max_instruction_tokens or MAX_INSTRUCTION_TOKENS
+        
+        if self.truncation_strategy not in TRUNCATION_STRATEGIES:
+            raise ValueError(f"Bilinmeyen kırpma stratejisi: {self.truncation_strategy}")
+        
+        # Bu makine için ölçülmüş thread ayarı ('python main.py tune')
+        self.batch_size = BATCH_SIZE
+        if apply_thread_settings:
+            thread_settings = load_thread_config(THREAD_CONFIG_FILE)
+            if apply_thread_config(thread_settings):
+                self.batch_size = thread_settings["batch_size"]
+        
         print(f"🔄 BGE-M3 modeli yükleniyor: {MODEL_NAME}")
-        self.model = SentenceTransformer(MODEL_NAME)
+        # Aynı model süreç içinde bir kez yüklenir (diğer sistemlerle paylaşılır)
+        self.model = acquire_model(MODEL_NAME, MODEL_BACKEND)
         print("✅ Model başarıyla yüklendi!")
         print(f"📊 Embedding boyutu: {self.model.get_sentence_embedding_dimension()}")
+        
+        # Model bu uzunluktan sonrasını kırpar ("head"); paylaşılan model
+        # olduğu için her encode öncesi tekrar ayarlanır (bkz. _encode)
+        self.model.max_seq_length = self.max_seq_length
+        print(f"📊 Max sekans uzunluğu: {self.max_seq_length} ({self.truncation_strategy})")
+        
+        # Bellek bütçesine göre batch boyutu (kapalıysa sabit self.batch_size)
+        self.batch_sizer = None
+        if ADAPTIVE_BATCHING:
+            model_config = self.model[0].auto_model.config
+            self.batch_sizer = AdaptiveBatchSizer(
+                hidden_size=model_config.hidden_size,
+                num_heads=model_config.num_attention_heads,
+                device=str(self.model.device),
+                memory_budget_mb=EMBED_MEMORY_BUDGET_MB,
+                budget_fraction=memory_budget_fraction,
+                max_batch_size=ADAPTIVE_MAX_BATCH_SIZE,
+                bytes_per_value=next(self.model.parameters()).element_size()
+            )
+            print(f"📊 Adaptif batch bütçesi: {self.batch_sizer.budget_bytes / 1024 ** 2:,.0f} MB")
+        
+        # Sparse / ColBERT katmanları ilk kullanımda yüklenir
+        self.sparse_head = None
+        self.colbert_head = None
+        
+        # Eşzamanlı sorgular için mikro-batching (isteğe bağlı)
+        self.query_batcher = None
+        if QUERY_BATCHING:
+            self.enable_query_batching()
+    
+    # =========================================================================
+    # KIRPMA
+    # =========================================================================
+    
+    def truncate_tokens(self, text: str, max_tokens: int, keep_tail: bool = False) -> str:
+        """
+        Metni token sayısına göre kırp
+        
+        Args:
+            text: Kırpılacak metin
+            max_tokens: En fazla token sayısı (özel token'lar hariç)
+            keep_tail: True ise metnin başından ve sonundan yarı yarıya token tutulur
+        """
+        tokenizer = self.model.tokenizer
+        token_ids = tokenizer.encode(text, add_special_tokens=False)
+        
+        if len(token_ids) <= max_tokens:
+            return text
+        
+        if not keep_tail:
+            return tokenizer.decode(token_ids[:max_tokens])
+        
+        tail = max_tokens // 2
+        head = max_tokens - tail
+        return tokenizer.decode(token_ids[:head]) + " " + tokenizer.decode(token_ids[-tail:])
+    
+    def cap_instructions(self, instructions_text: str) -> str:
+        """Yapılış metnini "instructions" stratejisinde token sınırına indir"""
+        if self.truncation_strategy == "instructions":
+            return self.truncate_tokens(instructions_text, self.max_instruction_tokens)
+        return instructions_text
+    
+    def apply_truncation(self, text: str) -> str:
+        """
+        "head_tail" stratejisini uygula
+        
+        "head" için kırpmayı model yapar (max_seq_length), burada dokunulmaz.
+        """
+        if self.truncation_strategy == "head_tail":
+            # CLS/SEP özel token'ları için yer bırak
+            return self.truncate_tokens(text, self.max_seq_length - 2, keep_tail=True)
+        return text
     
     def create_recipe_text(self, recipe: Dict[str, Any]) -> str:
         """
@@ -36,8 +178,8 @@ class RecipeEmbedder:
         # Malzemeleri temizle ve birleştir
         ingredients_text = ", ".join(ingredients)
         
-        # Talimatları birleştir
-        instructions_text = " ".join(instructions)
+        # Talimatları birleştir (strateji gerektiriyorsa token sınırına indir)
+        instructions_text = self.cap_instructions(" ".join(instructions))
         
         # Final metin
         text = f"""Tarif: {title}
@@ -46,20 +188,50 @@ Malzemeler: {ingredients_text}
 
 Yapılışı: {instructions_text}"""
         
-        return text
+        return self.apply_truncation(text)
+    
+    def _encode(self, texts, **kwargs):
+        """Paylaşılan model ile encode et (bu embedder'ın sekans uzunluğu ile)"""
+        self.model.max_seq_length = self.max_seq_length
+        return self.model.encode(texts, convert_to_numpy=True, **kwargs)
+    
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        """Metinlerin model girdisindeki token sayıları (kırpma dahil)"""
+        encoded = self.model.tokenizer(texts, truncation=True, max_length=self.max_seq_length)
+        return [len(ids) for ids in encoded["input_ids"]]
+    
+    def _encode_batched(self, texts: List[str], encode_fn) -> list:
+        """
+        Metinleri batch'ler halinde encode et
+        
+        Adaptif batching açıksa batch'ler bellek bütçesine göre oluşturulur
+        (OOM'da küçültülüp tekrar denenir), değilse self.batch_size kullanılır.
+        
+        Args:
+            texts: Metinler
+            encode_fn: (metinler, batch_size) alıp metin başına çıktı döndüren fonksiyon
+        
+        Returns:
+            Giriş sırasıyla metin başına çıktılar
+        """
+        if self.batch_sizer is None or len(texts) <= 1:
+            return list(encode_fn(texts, self.batch_size))
+        
+        return self.batch_sizer.run(
+            self._token_lengths(texts),
+            lambda indices: list(encode_fn([texts[i] for i in indices], len(indices)))
+        )
     
     def embed_single(self, text: str) -> List[float]:
         """Tek bir metni vektöre dönüştür"""
-        embedding = self.model.encode(text, convert_to_numpy=True)
+        embedding = self._encode(text)
         return embedding.tolist()
     
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Birden fazla metni vektörlere dönüştür"""
-        embeddings = self.model.encode(
-            texts, 
-            batch_size=BATCH_SIZE,
-            show_progress_bar=False,
-            convert_to_numpy=True
+        embeddings = self._encode_batched(
+            texts,
+            lambda batch, batch_size: self._encode(batch, batch_size=batch_size, show_progress_bar=False)
         )
         return [emb.tolist() for emb in embeddings]
     
@@ -73,26 +245,273 @@ Yapılışı: {instructions_text}"""
         texts = [self.create_recipe_text(r) for r in recipes]
         return self.embed_batch(texts)
     
+    def load_heads(self, sparse: bool = False, colbert: bool = False):
+        """Sparse / ColBERT katmanlarını şimdi yükle (normalde ilk kullanımda)"""
+        if sparse:
+            self._get_sparse_head()
+        if colbert:
+            self._get_colbert_head()
+    
+    def _get_sparse_head(self):
+        """Sparse ağırlık katmanını yükle (ilk kullanımda)"""
+        if self.sparse_head is None:
+            self.sparse_head = load_sparse_head(MODEL_NAME)
+        return self.sparse_head
+    
+    def embed_batch_hybrid(self, texts: List[str]) -> Tuple[List[List[float]], List[Dict[int, float]]]:
+        """
+        Metinlerin dense ve sparse vektörlerini tek forward pass ile üret
+        
+        Returns:
+            (dense vektörler, {token_id: ağırlık} sparse vektörler)
+        """
+        head = self._get_sparse_head()
+        skip_ids = self.model.tokenizer.all_special_ids
+        
+        # output_value=None: sentence_embedding ile birlikte token çıktıları da döner
+        self.model.max_seq_length = self.max_seq_length
+        outputs = self._encode_batched(
+            texts,
+            lambda batch, batch_size: self.model.encode(
+                batch,
+                batch_size=batch_size,
+                show_progress_bar=False,
+                output_value=None
+            )
+        )
+        
+        dense, sparse = [], []
+        for output in outputs:
+            dense.append(output["sentence_embedding"].float().cpu().tolist())
+            sparse.append(lexical_weights(
+                output["token_embeddings"],
+                output["input_ids"],
+                output["attention_mask"],
+                head,
+                skip_ids
+            ))
+        
+        return dense, sparse
+    
+    def embed_recipes_hybrid(
+        self,
+        recipes: List[Dict[str, Any]]
+    ) -> Tuple[List[List[float]], List[Dict[int, float]]]:
+        """Birden fazla tarifin dense ve sparse vektörlerini üret"""
+        texts = [self.create_recipe_text(r) for r in recipes]
+        return self.embed_batch_hybrid(texts)
+    
+    def embed_query_sparse(self, query: str) -> Dict[int, float]:
+        """Kullanıcı sorgusunu sparse vektöre dönüştür"""
+        _, sparse = self.embed_batch_hybrid([query])
+        return sparse[0]
+    
+    def embed_query_hybrid(self, query: str) -> Tuple[List[float], Dict[int, float]]:
+        """Kullanıcı sorgusunun dense ve sparse vektörlerini birlikte üret"""
+        dense, sparse = self.embed_batch_hybrid([query])
+        return dense[0], sparse[0]
+    
+    def _get_colbert_head(self):
+        """ColBERT katmanını yükle (ilk kullanımda)"""
+        if self.colbert_head is None:
+            self.colbert_head = load_colbert_head(MODEL_NAME)
+        return self.colbert_head
+    
+    def embed_batch_colbert(
+        self,
+        texts: List[str],
+        max_tokens: int = None
+    ) -> Tuple[List[List[float]], List[np.ndarray]]:
+        """
+        Metinlerin dense ve ColBERT token vektörlerini tek forward pass ile üret
+        
+        Args:
+            texts: Metinler
+            max_tokens: Metin başına tutulacak en fazla token (sparse ağırlığına göre budanır)
+        
+        Returns:
+            (dense vektörler, metin başına (token_sayısı, boyut) float32 vektörler)
+        """
+        head = self._get_colbert_head()
+        sparse_head = self._get_sparse_head() if max_tokens else None
+        skip_ids = self.model.tokenizer.all_special_ids
+        
+        self.model.max_seq_length = self.max_seq_length
+        outputs = self._encode_batched(
+            texts,
+            lambda batch, batch_size: self.model.encode(
+                batch,
+                batch_size=batch_size,
+                show_progress_bar=False,
+                output_value=None
+            )
+        )
+        
+        dense, token_vectors = [], []
+        for output in outputs:
+            dense.append(output["sentence_embedding"].float().cpu().tolist())
+            token_vectors.append(colbert_vectors(
+                output["token_embeddings"],
+                output["input_ids"],
+                output["attention_mask"],
+                head,
+                skip_ids,
+                sparse_head=sparse_head,
+                max_tokens=max_tokens
+            ))
+        
+        return dense, token_vectors
+    
+    def embed_recipes_colbert(self, recipes: List[Dict[str, Any]]) -> Tuple[List[List[float]], List[np.ndarray]]:
+        """Tariflerin dense ve budanmış ColBERT vektörlerini üret"""
+        texts = [self.create_recipe_text(r) for r in recipes]
+        return self.embed_batch_colbert(texts, max_tokens=COLBERT_MAX_TOKENS)
+    
+    def embed_query_colbert(self, query: str) -> Tuple[List[float], np.ndarray]:
+        """Kullanıcı sorgusunun dense ve ColBERT vektörlerini birlikte üret (budama yok)"""
+        dense, token_vectors = self.embed_batch_colbert([query])
+        return dense[0], token_vectors[0]
+    
     def embed_query(self, query: str) -> List[float]:
         """Kullanıcı sorgusunu vektöre dönüştür"""
+        if self.query_batcher is not None:
+            return self.query_batcher.embed(query)
         return self.embed_single(query)
     
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Birden fazla sorguyu tek batch'te vektöre dönüştür (örn: değerlendirme)"""
+        return self.embed_batch(queries)
+    
+    async def embed_query_async(self, query: str) -> List[float]:
+        """Kullanıcı sorgusunu asyncio içinden vektöre dönüştür"""
+        if self.query_batcher is not None:
+            return await self.query_batcher.embed_async(query)
+        return await asyncio.to_thread(self.embed_single, query)
+    
+    def enable_query_batching(
+        self,
+        max_wait_ms: float = QUERY_BATCH_MAX_WAIT_MS,
+        max_batch_size: int = QUERY_BATCH_MAX_SIZE
+    ):
+        """
+        Eşzamanlı embed_query çağrılarını mikro-batch'lere topla
+        
+        Aynı anda gelen sorgular birkaç milisaniye beklenip tek bir
+        model.encode çağrısı ile embed edilir.
+        """
+        if self.query_batcher is None:
+            self.query_batcher = QueryBatcher(
+                self.embed_batch,
+                max_wait_ms=max_wait_ms,
+                max_batch_size=max_batch_size
+            )
+        return self.query_batcher
+    
+    def disable_query_batching(self):
+        """Mikro-batching'i kapat (bekleyen sorgular işlenir)"""
+        if self.query_batcher is not None:
+            self.query_batcher.close()
+            self.query_batcher = None
+    
     def get_embedding_dimension(self) -> int:
         """Embedding boyutunu döndür"""
         return self.model.get_sentence_embedding_dimension()
+    
+    def close(self, unload: bool = False):
+        """
+        Modeli bırak
+        
+        Args:
+            unload: True ise başka kullanan yoksa model bellekten atılır
+        """
+        self.disable_query_batching()
+        if self.model is not None:
+            release_model(MODEL_NAME, MODEL_BACKEND, unload=unload)
+            self.model = None
 
 
 # Singleton instance
 _embedder_instance = None
+_embedder_lock = threading.Lock()
+_warmup_thread = None
 
 def get_embedder() -> RecipeEmbedder:
-    """Embedder singleton instance döndür"""
+    """
+    Embedder singleton instance döndür
+    
+    Model arka planda yükleniyorsa yükleme bitene kadar bekler.
+    """
     global _embedder_instance
     if _embedder_instance is None:
-        _embedder_instance = RecipeEmbedder()
+        with _embedder_lock:
+            if _embedder_instance is None:
+                _embedder_instance = RecipeEmbedder()
     return _embedder_instance
 
 
+def is_embedder_ready() -> bool:
+    """Model yüklenip ısınma encode'u tamamlandı mı?"""
+    return _embedder_instance is not None and (
+        _warmup_thread is None or not _warmup_thread.is_alive()
+    )
+
+
+def _warmup():
+    """Modeli yükle ve ilk sorgu gecikmesini almak için bir kez encode et"""
+    try:
+        start_time = time.perf_counter()
+        embedder = get_embedder()
+        embedder.embed_batch([WARMUP_TEXT])
+        print(f"🔥 Model ısındı ({time.perf_counter() - start_time:.1f}s)")
+    except Exception as e:
+        # Hata ilk sorguda get_embedder() ile tekrar yüzeye çıkar
+        print(f"⚠️  Arka plan model yüklemesi başarısız: {e}")
+
+
+def start_background_warmup() -> threading.Thread:
+    """
+    Modeli arka plan thread'inde yükle ve ısıt
+    
+    Prompt hemen açılır; ilk sorgu yalnızca model henüz hazır
+    değilse get_embedder() içinde bekler.
+    """
+    global _warmup_thread
+    if _warmup_thread is None:
+        _warmup_thread = threading.Thread(target=_warmup, name="model-warmup", daemon=True)
+        _warmup_thread.start()
+    return _warmup_thread
+
+
+def release_embedder(unload: bool = False):
+    """Singleton embedder'ı bırak (unload=True ise model bellekten atılır)"""
+    global _embedder_instance
+    if _embedder_instance is not None:
+        _embedder_instance.close(unload=unload)
+        _embedder_instance = None
+
+
+def embedding_signature(data_file: Path) -> Dict[str, Any]:
+    """
+    Embedding'leri belirleyen ayarların imzası (model yüklenmeden hesaplanır)
+    
+    Embedding deposunda aynı imzalı bir sürüm varsa indexleme model
+    çalıştırmadan bu sürümden kurulur.
+    """
+    template_source = "".join(inspect.getsource(getattr(RecipeEmbedder, name)) for name in TEXT_BUILDERS)
+    
+    return {
+        "model": MODEL_NAME,
+        "prefix": None,
+        "text_template_hash": hashlib.sha1(template_source.encode("utf-8")).hexdigest()[:16],
+        "max_seq_length": MAX_SEQ_LENGTH,
+        "truncation_strategy": TRUNCATION_STRATEGY,
+        "max_instruction_tokens": MAX_INSTRUCTION_TOKENS,
+        "sparse": SPARSE_VECTORS,
+        "data_file": Path(data_file).name,
+        "data_sha1": file_sha1(data_file)
+    }
+
+
 if __name__ == "__main__":
     # Test
     embedder = get_embedder()
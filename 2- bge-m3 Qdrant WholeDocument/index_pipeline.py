@@ -0,0 +1,200 @@
+"""
+Indexleme Pipeline'ı
+====================
+Okuma → embedding → yazma aşamalarını ayrı thread'lerde çalıştırır ve
+sınırlı kuyruklarla (queue.Queue(maxsize)) birbirine bağlar. Model bir
+batch'i encode ederken önceki batch depoya / veritabanına yazılır, sonraki
+batch dosyadan okunur; toplam süreyi en yavaş aşama (genelde embedding)
+belirler. Torch ve Qdrant / SQLite çağrıları GIL'i bıraktığı için thread'ler
+gerçekten örtüşür.
+
+- Her aşama tek thread'dir: batch'ler giriş sırasıyla işlenir (ID'ler sıralı kalır)
+- Kuyruk kapasitesi bellekte bekleyen batch sayısını sınırlar (backpressure)
+- Bir aşamada hata olursa tüm aşamalar durur, hata çağırana iletilir
+- Aşama başına meşgul süre ve tek başına throughput raporlanır
+
+NOT: Bu modül tüm retriever sistem klasörlerinde birebir aynıdır.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+# Kuyruk sonu işareti
+_DONE = object()
+
+# Durma kontrolü için kuyruk bekleme aralığı (saniye)
+_POLL_INTERVAL = 0.1
+
+
+@dataclass
+class StageStats:
+    """Bir aşamanın sayaçları"""
+    name: str
+    batches: int = 0
+    items: int = 0
+    busy_s: float = 0.0  # Aşamanın kendi işinde geçen süre (kuyruk beklemesi hariç)
+
+    @property
+    def throughput(self) -> float:
+        """Aşamanın tek başına hızı (öğe / saniye)"""
+        return self.items / self.busy_s if self.busy_s > 0 else 0.0
+
+
+@dataclass
+class PipelineResult:
+    """Pipeline çıktısı: aşama istatistikleri ve toplam süre"""
+    stages: List[StageStats]
+    wall_s: float
+
+    @property
+    def items(self) -> int:
+        return self.stages[-1].items if self.stages else 0
+
+    def bottleneck(self) -> StageStats:
+        """En çok meşgul olan aşama (toplam süreyi belirleyen)"""
+        return max(self.stages, key=lambda stage: stage.busy_s)
+
+    def report(self, unit: str = "öğe"):
+        """Aşama başına throughput tablosunu yazdır"""
+        print(f"\n📊 Pipeline aşamaları ({self.wall_s:.1f}s toplam):")
+        print(f"   {'Aşama':<14} {'Batch':>7} {unit.capitalize():>9} {'Meşgul':>9} {f'{unit}/s':>10}")
+        for stage in self.stages:
+            print(f"   {stage.name:<14} {stage.batches:>7,} {stage.items:>9,} "
+                  f"{stage.busy_s:>8.1f}s {stage.throughput:>10.1f}")
+
+        slowest = self.bottleneck()
+        if self.wall_s > 0:
+            print(f"   ⏱️  Darboğaz: {slowest.name} (toplam süre içinde %{100 * slowest.busy_s / self.wall_s:.0f} meşgul)")
+
+
+class _Stopped(Exception):
+    """Başka bir aşama hata verdiği için durduruldu"""
+
+
+def _put(q: queue.Queue, item, stop: threading.Event):
+    """Kuyruğa yaz (dolu kuyrukta beklerken durma isteği kontrol edilir)"""
+    while True:
+        if stop.is_set():
+            raise _Stopped()
+        try:
+            q.put(item, timeout=_POLL_INTERVAL)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """Kuyruktan oku (boş kuyrukta beklerken durma isteği kontrol edilir)"""
+    while True:
+        if stop.is_set():
+            raise _Stopped()
+        try:
+            return q.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+
+
+def run_pipeline(
+    source: Iterable[Any],
+    stages: Sequence[Tuple[str, Callable[[Any], Any]]],
+    source_name: str = "okuma",
+    queue_size: int = 2,
+    size: Callable[[Any], int] = len,
+    on_done: Optional[Callable[[int], None]] = None
+) -> PipelineResult:
+    """
+    Kaynağı ve aşamaları ayrı thread'lerde çalıştır
+
+    Args:
+        source: Batch üreten iterable (kendi thread'inde tüketilir)
+        stages: (ad, fonksiyon) listesi; her fonksiyon önceki aşamanın çıktısını alır
+        source_name: Kaynak aşamasının raporlardaki adı
+        queue_size: Aşamalar arası kuyruk kapasitesi (batch)
+        size: Kaynak batch'inin öğe sayısı (sonraki aşamalara taşınır)
+        on_done: Son aşama bir batch'i bitirince öğe sayısıyla çağrılır (örn: ilerleme çubuğu)
+
+    Returns:
+        PipelineResult
+    """
+    stats = [StageStats(source_name)] + [StageStats(name) for name, _ in stages]
+    queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+    stop = threading.Event()
+    errors = []
+
+    def fail(error: BaseException):
+        errors.append(error)
+        stop.set()
+
+    def read():
+        stage = stats[0]
+        try:
+            iterator = iter(source)
+            while True:
+                start = time.perf_counter()
+                try:
+                    batch = next(iterator)
+                except StopIteration:
+                    break
+                count = size(batch)
+                stage.busy_s += time.perf_counter() - start
+                stage.batches += 1
+                stage.items += count
+                _put(queues[0], (count, batch), stop)
+            _put(queues[0], _DONE, stop)
+        except _Stopped:
+            pass
+        except BaseException as e:
+            fail(e)
+
+    def work(index: int, fn: Callable[[Any], Any]):
+        stage = stats[index + 1]
+        last = index == len(stages) - 1
+        try:
+            while True:
+                item = _get(queues[index], stop)
+                if item is _DONE:
+                    if not last:
+                        _put(queues[index + 1], _DONE, stop)
+                    return
+
+                count, batch = item
+                start = time.perf_counter()
+                output = fn(batch)
+                stage.busy_s += time.perf_counter() - start
+                stage.batches += 1
+                stage.items += count
+
+                if last:
+                    if on_done is not None:
+                        on_done(count)
+                else:
+                    _put(queues[index + 1], (count, output), stop)
+        except _Stopped:
+            pass
+        except BaseException as e:
+            fail(e)
+
+    threads = [threading.Thread(target=read, name=f"pipeline-{source_name}", daemon=True)]
+    threads += [
+        threading.Thread(target=work, args=(i, fn), name=f"pipeline-{name}", daemon=True)
+        for i, (name, fn) in enumerate(stages)
+    ]
+
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(_POLL_INTERVAL)
+    except BaseException:
+        # Ctrl+C: aşamalar bir sonraki kuyruk işleminde durur
+        stop.set()
+        raise
+
+    if errors:
+        raise errors[0]
+    return PipelineResult(stats, time.perf_counter() - start_time)
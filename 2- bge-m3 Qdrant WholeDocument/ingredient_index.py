@@ -0,0 +1,172 @@
+"""
+Malzeme Ters Index'i (Inverted Index)
+=====================================
+Normalize edilmiş malzeme kelimelerinden tarif ID'lerine index. Malzeme
+filtresi (ingredient_filter) her sorguda tüm tariflerin malzeme listelerini
+taramak yerine bitmap işlemleriyle (OR / AND / NOT) çözülür; sonuç vektör
+aramasına izin verilen ID'ler olarak verilir.
+
+- Kelimeler: Türkçe küçük harf (İ → i, I → ı), sadece harf dizileri;
+  miktarlar (rakamlar) ve tek harfli parçalar atlanır
+- Kelime başına sıralı tarif ID listesi (CSR: vocab sırasıyla bitişik ID'ler)
+- Sorgu kelimesi index kelimelerinin önekiyle eşleşir ("domates" →
+  "domatesi", "domatesler"); sözlük sıralı olduğundan eşleşen kelimelerin
+  ID'leri tek bir dilimdir ve tek atamayla bitmap'e (tarif başına 1 byte) yazılır
+- Çok kelimeli terimlerde ("zeytin yağı") tüm kelimeler aynı tarifte olmalıdır
+- Filtre: liste (herhangi biri) veya {"any": [...], "all": [...], "none": [...]}
+
+Dosya (.npz): vocab, indptr, ids, size
+
+NOT: Bu modül tüm retriever sistem klasörlerinde birebir aynıdır.
+"""
+
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+# Filtre sözlüğü anahtarları: herhangi biri / hepsi / hiçbiri
+FILTER_KEYS = ("any", "all", "none")
+
+_WORD = re.compile(r"[^\W\d_]+")
+_TURKISH_UPPER = str.maketrans({"İ": "i", "I": "ı"})
+
+IngredientFilter = Union[Sequence[str], Dict[str, Sequence[str]]]
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Metnin normalize kelimeleri (Türkçe küçük harf, rakamsız, en az 2 harf)"""
+    return [word for word in _WORD.findall(text.translate(_TURKISH_UPPER).lower()) if len(word) > 1]
+
+
+def parse_filter(ingredient_filter: IngredientFilter) -> Dict[str, List[str]]:
+    """
+    Malzeme filtresini {"any" / "all" / "none": terimler} biçimine çevir
+
+    Liste verilirse terimlerden herhangi birini içeren tarifler aranır
+    (önceki ingredient_filter anlamı).
+    """
+    if not ingredient_filter:
+        return {}
+    if not isinstance(ingredient_filter, dict):
+        return {"any": list(ingredient_filter)}
+
+    unknown = set(ingredient_filter) - set(FILTER_KEYS)
+    if unknown:
+        raise ValueError(f"Bilinmeyen malzeme filtresi anahtarı: {', '.join(sorted(unknown))} "
+                         f"(seçenekler: {', '.join(FILTER_KEYS)})")
+    return {key: list(terms) for key, terms in ingredient_filter.items() if terms}
+
+
+class IngredientIndex:
+    """Malzeme kelimesi → tarif ID'leri index'i"""
+
+    def __init__(self):
+        self.vocab: List[str] = []
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.ids = np.zeros(0, dtype=np.int32)
+        self.size = 0  # En büyük ID + 1 (bitmap uzunluğu)
+        self._pending: Dict[str, List[int]] = defaultdict(list)
+
+    @classmethod
+    def load(cls, path: Path) -> "IngredientIndex":
+        """Kayıtlı index'i yükle"""
+        index = cls()
+        with np.load(path) as data:
+            index.vocab = data["vocab"].tolist()
+            index.indptr = data["indptr"]
+            index.ids = data["ids"]
+            index.size = int(data["size"])
+        return index
+
+    def save(self, path: Path):
+        """Index'i .npz olarak kaydet"""
+        self._merge()
+        np.savez(path, vocab=np.array(self.vocab, dtype=str), indptr=self.indptr, ids=self.ids, size=self.size)
+
+    def add(self, doc_id: int, ingredients: Iterable[str]):
+        """Tarifin malzeme kelimelerini ekle (sorgu veya kayıtta işlenir)"""
+        doc_id = int(doc_id)
+        for token in {token for line in ingredients for token in normalize_tokens(line)}:
+            self._pending[token].append(doc_id)
+        self.size = max(self.size, doc_id + 1)
+
+    def add_many(self, items: Iterable[Tuple[int, Iterable[str]]]):
+        """(ID, malzemeler) çiftlerini ekle"""
+        for doc_id, ingredients in items:
+            self.add(doc_id, ingredients)
+
+    def remove(self, doc_ids: Iterable[int]):
+        """Tariflerin tüm kelimelerini index'ten sil (güncellenen veya silinen tarifler)"""
+        doc_ids = np.unique(np.asarray(list(doc_ids), dtype=np.int64))
+        if not len(doc_ids):
+            return
+
+        self._merge()
+        keep = ~np.isin(self.ids, doc_ids)
+        rows = np.repeat(np.arange(len(self.vocab)), np.diff(self.indptr))
+        counts = np.bincount(rows[keep], minlength=len(self.vocab))
+        self.ids = self.ids[keep]
+        self.indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def _merge(self):
+        """Bekleyen eklemeleri sıralı ID listelerine işle"""
+        if not self._pending:
+            return
+
+        vocab = sorted(set(self.vocab).union(self._pending))
+        old_rows = {token: row for row, token in enumerate(self.vocab)}
+        postings = []
+        for token in vocab:
+            ids = self._pending.get(token, [])
+            if token in old_rows:
+                row = old_rows[token]
+                ids = np.concatenate([self.ids[self.indptr[row]:self.indptr[row + 1]], ids])
+            postings.append(np.unique(np.asarray(ids, dtype=np.int32)))
+
+        self.vocab = vocab
+        self.indptr = np.concatenate([[0], np.cumsum([len(p) for p in postings])]).astype(np.int64)
+        self.ids = np.concatenate(postings).astype(np.int32) if postings else np.zeros(0, dtype=np.int32)
+        self._pending = defaultdict(list)
+
+    def term_mask(self, term: str) -> np.ndarray:
+        """Terimi içeren tariflerin bitmap'i (kelimeler önekle eşleşir, hepsi bulunmalı)"""
+        self._merge()
+        words = normalize_tokens(term)
+        mask = np.full(self.size, bool(words))
+        for word in words:
+            lo = bisect_left(self.vocab, word)
+            hi = bisect_left(self.vocab, word + "\uffff")
+            word_mask = np.zeros(self.size, dtype=bool)
+            word_mask[self.ids[self.indptr[lo]:self.indptr[hi]]] = True
+            mask &= word_mask
+        return mask
+
+    def mask(self, ingredient_filter: IngredientFilter) -> np.ndarray:
+        """Filtreye uyan tariflerin bitmap'i (uzunluk: size)"""
+        clauses = parse_filter(ingredient_filter)
+        mask = np.ones(self.size, dtype=bool)
+
+        if clauses.get("any"):
+            mask &= np.logical_or.reduce([self.term_mask(term) for term in clauses["any"]])
+        for term in clauses.get("all", []):
+            mask &= self.term_mask(term)
+        for term in clauses.get("none", []):
+            mask &= ~self.term_mask(term)
+        return mask
+
+    def match(self, ingredient_filter: IngredientFilter) -> np.ndarray:
+        """Filtreye uyan tarif ID'leri (sıralı)"""
+        return np.flatnonzero(self.mask(ingredient_filter))
+
+    def stats(self) -> Dict[str, Any]:
+        """Sözlük ve index boyutu"""
+        self._merge()
+        return {
+            "tokens": len(self.vocab),
+            "postings": len(self.ids),
+            "ram_bytes": self.indptr.nbytes + self.ids.nbytes
+        }
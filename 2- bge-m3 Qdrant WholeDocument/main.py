@@ -5,8 +5,13 @@ BGE-M3 + Qdrant ile akıllı tarif arama
 
 Kullanım:
     python main.py index      # Tarifleri indexle
+    python main.py index --workers 8   # 8 süreçle CPU indexleme
+    python main.py index --reembed     # Embedding deposunu yok sayıp yeniden embed et
+    python main.py index --incremental # Sadece yeni / değişen / silinen tarifleri işle
+    python main.py index-colbert       # Sıkıştırılmış ColBERT (late interaction) index'ini kur
     python main.py search     # İnteraktif arama modu
     python main.py info       # Veritabanı bilgisi
+    python main.py tune       # Thread ayarını ölç (thread_config.json)
 """
 
 import sys
@@ -49,24 +54,81 @@ def show_banner():
     console.print(banner, style="bold cyan")
 
 
+def get_option(name: str, default=None):
+    """Komut satırından '--isim değer' seçeneğini oku"""
+    if name in sys.argv:
+        idx = sys.argv.index(name)
+        if idx + 1 < len(sys.argv):
+            return sys.argv[idx + 1]
+    return default
+
+
 def cmd_index():
     """Tarifleri indexle"""
-    from indexer import index_all_recipes, verify_index
+    from indexer import index_all_recipes, index_incremental, verify_index
+    
+    # Çok süreçli CPU embedding (örn: --workers 8)
+    workers = get_option("--workers")
+    workers = int(workers) if workers is not None else None
     
-    console.print("\n[bold yellow]⚠️  Bu işlem mevcut veritabanını silip yeniden oluşturacak![/bold yellow]")
+    # Depodaki embedding'leri yok sayıp modeli yeniden çalıştır
+    reembed = "--reembed" in sys.argv
+    
+    # Sadece veri dosyasındaki değişiklikleri uygula (collection silinmez)
+    if "--incremental" in sys.argv:
+        index_incremental()
+        verify_index()
+        return
+    
+    from config import COLLECTION_KEEP_VERSIONS
+    console.print("\n[bold yellow]⚠️  Yeni bir collection sürümü oluşturulup doğrulandıktan sonra yayına alınacak.[/bold yellow]")
+    console.print(f"[yellow]   Arama bu sırada mevcut sürümden devam eder; en yeni {COLLECTION_KEEP_VERSIONS} eski sürüm "
+                  f"saklanır, daha eskileri silinir.[/yellow]")
     confirm = Prompt.ask("Devam etmek istiyor musunuz?", choices=["e", "h"], default="h")
     
     if confirm == "e":
-        index_all_recipes(recreate=True)
+        index_all_recipes(recreate=True, workers=workers, reembed=reembed)
         verify_index()
     else:
         console.print("[yellow]İşlem iptal edildi.[/yellow]")
 
 
+def cmd_index_colbert():
+    """ColBERT (late interaction) index'ini kur (Qdrant collection'ına dokunmaz)"""
+    from indexer import index_colbert, stable_ids
+    from database import get_database
+    
+    db = get_database()
+    if not db.collection_exists():
+        console.print("[red]❌ Önce 'python main.py index' ile collection oluşturun.[/red]")
+        return
+    
+    # Doküman ID'leri collection'daki point ID'leriyle aynı olmalı
+    index_colbert(db=db, ids=stable_ids(db))
+
+
+def cmd_tune():
+    """Bu makine için torch thread sayılarını ve batch boyutunu ölç"""
+    from thread_tuning import run_tuning
+    from config import THREAD_CONFIG_FILE, DATA_FILE, TUNE_BATCH_SIZES
+    
+    # Denenecek thread sayıları (örn: --threads 1,2,4,8)
+    threads = get_option("--threads")
+    threads = [int(t) for t in threads.split(",")] if threads else None
+    
+    console.print("\n[bold yellow]⏱️  Her thread kombinasyonu ayrı süreçte model yükleyerek ölçülür, birkaç dakika sürebilir.[/bold yellow]")
+    run_tuning(
+        THREAD_CONFIG_FILE,
+        DATA_FILE,
+        thread_candidates=threads,
+        batch_sizes=TUNE_BATCH_SIZES
+    )
+
+
 def cmd_info():
     """Veritabanı bilgilerini göster"""
     from database import get_database
-    from config import COLLECTION_NAME, QDRANT_PATH, MODEL_NAME
+    from config import COLLECTION_NAME, QDRANT_PATH, LOCAL_DB_PATH, DB_BACKEND, MODEL_NAME
     
     db = get_database()
     info = db.get_collection_info()
@@ -76,12 +138,23 @@ def cmd_info():
     table.add_column("Değer", style="green")
     
     table.add_row("Collection Adı", COLLECTION_NAME)
-    table.add_row("Veritabanı Yolu", str(QDRANT_PATH))
+    table.add_row("Aktif Sürüm", db.collection)
+    table.add_row("Backend", DB_BACKEND)
+    table.add_row("Veritabanı Yolu", str(LOCAL_DB_PATH if DB_BACKEND == "local" else QDRANT_PATH))
     table.add_row("Embedding Modeli", MODEL_NAME)
     table.add_row("Collection Durumu", "✅ Mevcut" if info.get("exists") else "❌ Yok")
     
     if info.get("exists"):
         table.add_row("Vektör Sayısı", f"{info.get('points_count', 0):,}")
+        projection = info.get("projection")
+        table.add_row("Vektör Boyutu", f"{info.get('vector_dim')}" + (f" ({projection})" if projection else ""))
+        if info.get("index_type"):
+            params = ", ".join(f"{name}={info[name]}" for name in ("ef_search", "nprobe", "oversampling") if info.get(name))
+            table.add_row("Vektör Index'i", info["index_type"] + (f" ({params})" if params else ""))
+        if info.get("quantization"):
+            table.add_row("Kuantizasyon", info["quantization"])
+        table.add_row("Sparse Vektör", "✅ Var" if info.get("sparse") else "❌ Yok")
+        table.add_row("ColBERT Index", "✅ Var" if info.get("late_interaction") else "❌ Yok")
         table.add_row("Durum", str(info.get("status", "N/A")))
     
     console.print(table)
@@ -90,6 +163,11 @@ def cmd_info():
 
 def cmd_search():
     """İnteraktif arama modu"""
+    from embedder import start_background_warmup, is_embedder_ready
+    
+    # Model (torch + sentence-transformers) arka planda yüklenir, prompt beklemez
+    start_background_warmup()
+    
     from searcher import get_searcher, format_search_results
     from database import get_database
     
@@ -103,8 +181,10 @@ def cmd_search():
     
     console.print(f"\n[green]✅ Veritabanı hazır: {info.get('points_count', 0):,} tarif[/green]")
     
-    # Searcher başlat
-    searcher = get_searcher()
+    # Searcher başlat (model ilk sorguda hazır değilse beklenir)
+    searcher = get_searcher(lazy=True)
+    if not is_embedder_ready():
+        console.print("[dim]🔥 Model arka planda yükleniyor, aramaya başlayabilirsiniz...[/dim]")
     
     console.print(Panel("""
 [bold]Arama Komutları:[/bold]
@@ -129,6 +209,9 @@ def cmd_search():
                 console.print("[yellow]👋 Görüşmek üzere![/yellow]")
                 break
             
+            if not query.startswith("/detay ") and not is_embedder_ready():
+                console.print("[dim]⏳ Model hazırlanıyor, ilk sorgu biraz bekleyebilir...[/dim]")
+            
             # Komut kontrolü
             if query.startswith("/malzeme "):
                 ingredients = [i.strip() for i in query[9:].split(",")]
@@ -219,10 +302,18 @@ def show_help():
 
 [bold]Komutlar:[/bold]
     index     Tarifleri veritabanına indexle (ilk kurulumda)
+    index-colbert  Late interaction ("colbert" arama modu) için token index'ini kur
     search    İnteraktif arama modunu başlat
     info      Veritabanı bilgilerini göster
+    tune      CPU thread / batch ayarını bu makinede ölç ve kaydet
     help      Bu yardım mesajını göster
 
+[bold]Seçenekler:[/bold]
+    --workers N   index: N süreçli CPU embedding havuzu kullan
+    --reembed     index: kayıtlı embedding'leri yok say, modeli yeniden çalıştır
+    --incremental index: sadece yeni / değişen / silinen tarifleri işle
+    --threads L   tune: denenecek intra-op thread sayıları (örn: 1,2,4,8)
+
 [bold]Örnekler:[/bold]
     python main.py index      # Tüm tarifleri indexle
     python main.py search     # Arama modunu başlat
@@ -242,10 +333,14 @@ def main():
     
     if command == "index":
         cmd_index()
+    elif command == "index-colbert":
+        cmd_index_colbert()
     elif command == "search":
         cmd_search()
     elif command == "info":
         cmd_info()
+    elif command == "tune":
+        cmd_tune()
     elif command in ["help", "-h", "--help"]:
         show_help()
     else:
@@ -0,0 +1,129 @@
+"""
+Paylaşılan Model Kayıt Defteri
+==============================
+Aynı embedding modelinin süreç başına bir kez yüklenmesini sağlar.
+
+- Modeller (model adı, backend) anahtarı ile tutulur
+- Her acquire referans sayısını artırır, release azaltır
+- Referansı kalmayan model unload ile bellekten atılabilir
+
+NOT: Bu modül tüm retriever sistem klasörlerinde birebir aynıdır.
+Evaluator sistem modüllerini temizlerken bu modüle dokunmaz; böylece
+aynı süreçte yüklenen tüm sistemler (WholeDocument, ParentChild, ...)
+tek bir kayıt defterini paylaşır.
+"""
+
+import gc
+import sys
+import threading
+from typing import Any, Dict, List, Tuple
+
+DEFAULT_BACKEND = "sentence-transformers"
+
+# (model_name, backend) -> {"model": model, "refs": referans sayısı}
+_models: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_lock = threading.RLock()
+
+
+def _load_model(model_name: str, backend: str) -> Any:
+    """Modeli backend'e göre yükle"""
+    if backend == "sentence-transformers":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name)
+
+    raise ValueError(f"Bilinmeyen model backend'i: {backend}")
+
+
+def acquire_model(model_name: str, backend: str = DEFAULT_BACKEND) -> Any:
+    """
+    Modeli al (yüklü değilse yükle) ve referans sayısını artır
+
+    Args:
+        model_name: HuggingFace model adı (örn: "BAAI/bge-m3")
+        backend: Model backend'i
+
+    Returns:
+        Paylaşılan model nesnesi
+    """
+    key = (model_name, backend)
+
+    # Kilit yükleme boyunca tutulur; aynı modeli isteyen diğer thread'ler bekler
+    with _lock:
+        entry = _models.get(key)
+        if entry is None:
+            entry = {"model": _load_model(model_name, backend), "refs": 0}
+            _models[key] = entry
+        else:
+            print(f"♻️  Model zaten yüklü, paylaşılıyor: {model_name} ({entry['refs']} kullanıcı)")
+
+        entry["refs"] += 1
+        return entry["model"]
+
+
+def release_model(model_name: str, backend: str = DEFAULT_BACKEND, unload: bool = False):
+    """
+    Model referansını bırak
+
+    Args:
+        model_name: Model adı
+        backend: Model backend'i
+        unload: True ise referans kalmadığında model bellekten atılır
+    """
+    key = (model_name, backend)
+
+    with _lock:
+        entry = _models.get(key)
+        if entry is None:
+            return
+
+        entry["refs"] = max(0, entry["refs"] - 1)
+        if unload and entry["refs"] == 0:
+            _unload_key(key)
+
+
+def unload_model(model_name: str, backend: str = DEFAULT_BACKEND, force: bool = False) -> bool:
+    """
+    Modeli bellekten at
+
+    Args:
+        model_name: Model adı
+        backend: Model backend'i
+        force: True ise hâlâ kullanan varken de atılır
+
+    Returns:
+        Model atıldıysa True
+    """
+    key = (model_name, backend)
+
+    with _lock:
+        entry = _models.get(key)
+        if entry is None:
+            return False
+        if entry["refs"] > 0 and not force:
+            print(f"⚠️  Model hâlâ kullanımda ({entry['refs']} kullanıcı): {model_name}")
+            return False
+
+        _unload_key(key)
+        return True
+
+
+def _unload_key(key: Tuple[str, str]):
+    """Kaydı sil ve belleği serbest bırak (kilit altında çağrılır)"""
+    del _models[key]
+    gc.collect()
+
+    # GPU belleğini de boşalt (torch yüklüyse)
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+    print(f"🗑️  Model bellekten atıldı: {key[0]}")
+
+
+def loaded_models() -> List[Dict[str, Any]]:
+    """Yüklü modellerin listesini döndür"""
+    with _lock:
+        return [
+            {"model_name": name, "backend": backend, "refs": entry["refs"]}
+            for (name, backend), entry in _models.items()
+        ]
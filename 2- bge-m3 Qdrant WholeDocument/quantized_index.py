@@ -0,0 +1,386 @@
+"""
+Kuantize Vektör Index'i
+=======================
+Flat index tüm float32 vektörleri RAM'de tutar (1024 boyutta vektör başına
+4 KB). Bu index RAM'de sıkıştırılmış kodlar tutar, tam vektörleri diskte
+(np.memmap) bırakır. Kuantizasyon türleri:
+
+- "int8" (skaler): her boyut kendi ölçek / ofsetiyle 255 seviyeye indirilir
+  (x ≈ ofset + ölçek * kod). Ölçek / ofset örnek vektörlerin boyut başına
+  alt / üst quantile'larından çıkarılır (uç değerler kırpılır). Sorgu da
+  int8'e indirilir, skor tamsayı iç çarpımdır (int32 birikim):
+  q·x ≈ q·ofset + adım * (kodlar · q_kod). Vektör başına boyut kadar byte.
+- "binary" (işaret): her boyut 1 bit, merkezlenmiş vektörün işareti
+  (x_i > ortalama_i). Skor Hamming uzaklığıdır (bitwise_xor + popcount,
+  64 bitlik kelimeler üzerinde). Sorgu merkezlenmez: q·x ile q·(x - ortalama)
+  aynı sırayı verir. Vektör başına boyut / 8 byte (1024 boyut: 128 byte).
+
+Yeniden skorlama: kodlarla seçilen en iyi top_k * oversampling aday diskteki
+float32 vektörlerle tam skorlanır (sıralama ve skorlar tam aramayla aynı
+ölçekte). Binary kodların sıralaması kaba olduğundan daha yüksek oversampling
+gerekir.
+
+Dosyalar (FlatIndex dosyalarına ek olarak; tam vektörler diskte kalır):
+    quantizer.npz : Kuantizasyon parametreleri (train ile)
+    codes.q       : (n, kod genişliği) kodlar
+
+RAM: vektör başına kod + 24 byte ID eşlemesi. Index vektör eklenmeden önce
+train() ile eğitilmelidir. exact_search() kodları kullanmadan diskteki tam
+vektörlerle arar.
+
+NOT: Bu modül tüm retriever sistem klasörlerinde birebir aynıdır.
+"""
+
+import math
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vector_index import FlatIndex, GATHER_RATIO, grow_rows, read_rows, top_k_indices, write_atomic
+
+QUANTIZER_FILE = "quantizer.npz"
+CODES_FILE = "codes.q"
+
+INT8_MAX = 127
+WORD_BYTES = 8  # Binary kodlar 64 bitlik kelimelere hizalanır
+ENCODE_BATCH_SIZE = 16384  # Kodlamada tek seferde işlenen vektör
+
+# Varsayılan parametreler (index.json'da yoksa)
+DEFAULT_QUANTILE = 0.99
+DEFAULT_OVERSAMPLING = 4.0
+
+
+class ScalarQuantizer:
+    """Boyut başına ölçek / ofsetle int8 kuantizasyon"""
+
+    dtype = np.int8
+
+    def __init__(self, offset: np.ndarray, scale: np.ndarray):
+        self.offset = np.asarray(offset, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray, quantile: float = DEFAULT_QUANTILE) -> "ScalarQuantizer":
+        """
+        Örnek vektörlerden ölçek / ofset çıkar
+
+        Args:
+            vectors: (n, dim) örnekler
+            quantile: Boyut başına aralığın üst sınırı (1 - quantile alt sınır)
+        """
+        low = np.quantile(vectors, 1 - quantile, axis=0)
+        high = np.quantile(vectors, quantile, axis=0)
+        offset = (high + low) / 2
+        scale = np.maximum((high - low) / (2 * INT8_MAX), 1e-12)
+        return cls(offset, scale)
+
+    @classmethod
+    def load(cls, path: Path) -> "ScalarQuantizer":
+        with np.load(path) as data:
+            return cls(data["offset"], data["scale"])
+
+    def save(self, path: Path):
+        np.savez(path, offset=self.offset, scale=self.scale)
+
+    @property
+    def nbytes(self) -> int:
+        return self.offset.nbytes + self.scale.nbytes
+
+    @staticmethod
+    def code_width(dim: int) -> int:
+        """Vektör başına kod byte'ı"""
+        return dim
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """(n, dim) float32 → (n, dim) int8 (aralık dışı değerler kırpılır)"""
+        codes = np.rint((vectors - self.offset) / self.scale)
+        return np.clip(codes, -INT8_MAX, INT8_MAX).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Kodlardan yaklaşık vektörler"""
+        return self.offset + self.scale * codes.astype(np.float32)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """
+        Kodların sorguyla yaklaşık iç çarpımı
+
+        q·x ≈ q·ofset + Σ (q_i ölçek_i) kod_i; ağırlıklar da int8'e indirilir,
+        toplam tamsayı iç çarpımdır (int32 birikim: 1024 * 127² taşmaz).
+        """
+        weights = query * self.scale
+        step = max(float(np.abs(weights).max()) / INT8_MAX, 1e-12)
+        query_codes = np.rint(weights / step).astype(np.int8)
+        dots = np.einsum("ij,j->i", codes, query_codes, dtype=np.int32, casting="unsafe")
+        return float(query @ self.offset) + step * dots.astype(np.float32)
+
+
+def popcount_rows(words: np.ndarray) -> np.ndarray:
+    """(n, kelime) uint64 dizisinin satır başına 1 bit sayısı"""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int32)
+    return _POPCOUNT_TABLE[words.view(np.uint8)].sum(axis=1, dtype=np.int32)
+
+
+_POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+class BinaryQuantizer:
+    """Boyut başına 1 bit: merkezlenmiş vektörün işareti"""
+
+    dtype = np.uint8
+
+    def __init__(self, center: np.ndarray):
+        self.center = np.asarray(center, dtype=np.float32)
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray, quantile: float = DEFAULT_QUANTILE) -> "BinaryQuantizer":
+        """
+        Örnek vektörlerin boyut başına ortalaması (eşik)
+
+        Args:
+            vectors: (n, dim) örnekler
+            quantile: Kullanılmaz (ScalarQuantizer ile aynı arayüz)
+        """
+        return cls(vectors.mean(axis=0))
+
+    @classmethod
+    def load(cls, path: Path) -> "BinaryQuantizer":
+        with np.load(path) as data:
+            return cls(data["center"])
+
+    def save(self, path: Path):
+        np.savez(path, center=self.center)
+
+    @property
+    def nbytes(self) -> int:
+        return self.center.nbytes
+
+    @staticmethod
+    def code_width(dim: int) -> int:
+        """Vektör başına kod byte'ı (64 bitlik kelimelere yuvarlanır)"""
+        return math.ceil(dim / (8 * WORD_BYTES)) * WORD_BYTES
+
+    def _pack(self, bits: np.ndarray) -> np.ndarray:
+        """(n, dim) bool → (n, kod genişliği) uint8 (dolgu bitleri 0)"""
+        packed = np.packbits(bits, axis=1)
+        padding = self.code_width(bits.shape[1]) - packed.shape[1]
+        return np.pad(packed, ((0, 0), (0, padding))) if padding else packed
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """(n, dim) float32 → (n, kod genişliği) uint8 işaret bitleri"""
+        return self._pack(vectors > self.center)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """
+        Kodların sorguyla benzerliği: -Hamming(işaret(q), kod)
+
+        Yüksek skor daha yakın (tam skorlarla aynı yön); değerler sadece
+        aday sıralaması içindir.
+        """
+        query_words = self._pack(query.reshape(1, -1) > 0).view(np.uint64)
+        words = np.ascontiguousarray(codes).view(np.uint64)
+        return -popcount_rows(np.bitwise_xor(words, query_words)).astype(np.float32)
+
+
+# Kuantizasyon türü → sınıf (index.json'daki "quantization" alanı)
+QUANTIZERS = {
+    "int8": ScalarQuantizer,
+    "binary": BinaryQuantizer,
+}
+
+
+class QuantizedIndex(FlatIndex):
+    """Kuantize kodlar üzerinde tarama + diskteki tam vektörlerle yeniden skorlama"""
+
+    INDEX_TYPE = "quantized"
+
+    def __init__(self, path: Path, mmap: bool = True, oversampling: Optional[float] = None, **search_params):
+        """
+        Mevcut index'i aç
+
+        Args:
+            path: Index klasörü
+            mmap: Yok sayılır (tam vektörler her zaman np.memmap ile okunur)
+            oversampling: Yeniden skorlanan aday oranı (top_k katı, None ise index.json'daki değer)
+            **search_params: Diğer index türlerinin arama ayarları (yok sayılır)
+        """
+        super().__init__(path, mmap=True)
+
+        self.quantization = self.meta.get("quantization", "int8")
+        if self.quantization not in QUANTIZERS:
+            raise ValueError(f"Bilinmeyen kuantizasyon: {self.quantization} "
+                             f"(seçenekler: {', '.join(QUANTIZERS)})")
+        self.quantile = float(self.meta.get("quantile", DEFAULT_QUANTILE))
+        self.oversampling = float(oversampling or self.meta.get("oversampling", DEFAULT_OVERSAMPLING))
+
+        quantizer_class = QUANTIZERS[self.quantization]
+        self.quantizer = None
+        if (self.path / QUANTIZER_FILE).exists():
+            self.quantizer = quantizer_class.load(self.path / QUANTIZER_FILE)
+
+        # Kodlar (kapasite ikiye katlanarak büyür; geçerli kısım [:_coded])
+        self.code_width = quantizer_class.code_width(self.dim)
+        self._codes = read_rows(self.path / CODES_FILE, quantizer_class.dtype, self.code_width)
+        self._coded = len(self._codes)
+
+        # Vektörü yazılmış ama kodlanmamış satırlar (yarıda kalan indexleme)
+        missing = len(self._ids) - self._coded
+        if missing > 0 and self.is_trained:
+            print(f"🔧 Kuantizasyon: kodlanmamış {missing:,} satır kodlanıyor...")
+            self._encode_rows(self._coded, len(self._ids))
+
+    @classmethod
+    def create(
+        cls,
+        path: Path,
+        dim: int,
+        metric: str = "Cosine",
+        mmap: bool = True,
+        quantization: str = "int8",
+        quantile: float = DEFAULT_QUANTILE,
+        oversampling: float = DEFAULT_OVERSAMPLING
+    ) -> "QuantizedIndex":
+        """Boş (eğitilmemiş) kuantize index oluştur (parametreler index.json'a yazılır)"""
+        if quantization not in QUANTIZERS:
+            raise ValueError(f"Bilinmeyen kuantizasyon: {quantization} (seçenekler: {', '.join(QUANTIZERS)})")
+        return super().create(
+            path, dim, metric=metric, mmap=True,
+            quantization=quantization, quantile=quantile, oversampling=oversampling
+        )
+
+    # =========================================================================
+    # EĞİTİM VE KODLAMA
+    # =========================================================================
+
+    @property
+    def is_trained(self) -> bool:
+        return self.quantizer is not None
+
+    def train(self, vectors):
+        """
+        Kuantizasyon parametrelerini örnek vektörlerle çıkar
+
+        Index'te vektör varsa yeni parametrelerle yeniden kodlanır.
+
+        Args:
+            vectors: (n, dim) örnekler (örn: embedding deposundan)
+        """
+        sample = self._prepare(vectors)
+        print(f"🎯 Kuantizasyon ({self.quantization}) eğitiliyor: {len(sample):,} örnek...")
+
+        self.quantizer = QUANTIZERS[self.quantization].fit(sample, quantile=self.quantile)
+        self.quantizer.save(self.path / QUANTIZER_FILE)
+
+        if len(self._ids):
+            self._coded = 0
+            self._encode_rows(0, len(self._ids))
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        if not self.is_trained:
+            raise RuntimeError("Kuantize index eğitilmemiş: vektör eklemeden önce train() çağrılmalı")
+        return self.quantizer.encode(vectors)
+
+    def _encode_rows(self, start: int, end: int):
+        """Diskteki [start, end) satırlarını kodla ve kod dosyasını yeniden yaz"""
+        matrix = self.matrix
+        for block_start in range(start, end, ENCODE_BATCH_SIZE):
+            block_end = min(end, block_start + ENCODE_BATCH_SIZE)
+            self._store_codes(block_start, self._encode(np.asarray(matrix[block_start:block_end])))
+        self._coded = end
+        self._codes[:end].tofile(self.path / CODES_FILE)
+
+    def _store_codes(self, start: int, codes: np.ndarray):
+        """Kodları RAM dizisine yaz (gerekirse kapasiteyi büyüt)"""
+        self._codes = grow_rows(self._codes, start + len(codes))
+        self._codes[start:start + len(codes)] = codes
+
+    def _append(self, ids: np.ndarray, vectors: np.ndarray):
+        """Yeni satırları kodla ve vektör / kod dosyalarının sonuna ekle"""
+        codes = self._encode(vectors)
+        start = len(self._ids)
+        super()._append(ids, vectors)
+
+        with open(self.path / CODES_FILE, "ab") as f:
+            f.write(codes.tobytes())
+        self._store_codes(start, codes)
+        self._coded = len(self._ids)
+
+    def _overwrite(self, rows, vectors: np.ndarray):
+        """Güncellenen satırları yeniden kodla"""
+        codes = self._encode(vectors)
+        super()._overwrite(rows, vectors)
+
+        with open(self.path / CODES_FILE, "r+b") as f:
+            for row, row_codes in zip(rows, codes):
+                f.seek(int(row) * self.code_width * codes.itemsize)
+                f.write(row_codes.tobytes())
+        self._codes[rows] = codes
+
+    def _compact(self, keep: np.ndarray):
+        """Silinen satırların kodlarını da çıkar"""
+        super()._compact(keep)
+        coded = keep[:self._coded]
+        self._codes = self._codes[:self._coded][coded]
+        self._coded = len(self._codes)
+        write_atomic(self.path / CODES_FILE, lambda f: f.write(self._codes.tobytes()))
+
+    # =========================================================================
+    # OKUMA
+    # =========================================================================
+
+    def search(
+        self,
+        query,
+        top_k: int,
+        allowed_ids: Optional[Sequence[int]] = None,
+        score_threshold: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Kodlar üzerinde tarama, adaylarda tam skor (FlatIndex.search ile aynı arayüz)
+
+        Filtrede izin verilen satırlar azsa (GATHER_RATIO altı) sadece o
+        satırların kodları skorlanır. score_threshold tam skorlara uygulanır.
+        """
+        if not self._coded:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        query = self.prepare_query(query)
+        codes = self._codes[:self._coded]
+
+        rows = None
+        if allowed_ids is None:
+            approx = self.quantizer.scores(codes, query)
+        else:
+            rows = self.rows_for(allowed_ids)
+            if len(rows) < GATHER_RATIO * self._coded:
+                approx = self.quantizer.scores(codes[rows], query)
+            else:
+                approx = self.quantizer.scores(codes, query)[rows]
+
+        # Yeniden skorlama: en iyi top_k * oversampling aday tam vektörlerle
+        best = top_k_indices(approx, max(top_k, math.ceil(top_k * self.oversampling)))
+        candidates = rows[best] if rows is not None else best
+        scores = self.exact_scores(candidates, query)
+
+        best = top_k_indices(scores, top_k)
+        ids, scores = self._ids[candidates[best]], scores[best]
+
+        if score_threshold is not None:
+            keep = scores >= score_threshold
+            ids, scores = ids[keep], scores[keep]
+        return ids, scores
+
+    def stats(self) -> Dict[str, Any]:
+        """Index boyutu, RAM'deki kodlar ve parametreler"""
+        stats = super().stats()
+        code_bytes = self._coded * self.code_width * self._codes.itemsize
+        model_bytes = self.quantizer.nbytes if self.is_trained else 0
+        stats.update(
+            ram_bytes=stats["ram_bytes"] + code_bytes + model_bytes,
+            code_bytes=code_bytes,
+            trained=self.is_trained,
+            quantization=self.quantization,
+            oversampling=self.oversampling
+        )
+        return stats
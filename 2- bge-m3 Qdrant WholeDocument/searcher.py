@@ -5,25 +5,72 @@ Kullanıcı sorgularına göre tarif arama
 """
 
 from typing import List, Dict, Any, Optional
-from config import DEFAULT_TOP_K, SCORE_THRESHOLD
+from config import DEFAULT_TOP_K, SCORE_THRESHOLD, SEARCH_MODE, COLBERT_CANDIDATES
 from embedder import get_embedder
-from database import get_database
+from database import get_database, SEARCH_MODES
+from ingredient_index import IngredientFilter
+from colbert_index import open_colbert_index
+
+# Dense adayları ColBERT token vektörleriyle yeniden sıralayan mod (Qdrant dışında)
+LATE_INTERACTION_MODE = "colbert"
 
 
 class RecipeSearcher:
     """Tarif arama sınıfı"""
     
-    def __init__(self):
-        """Embedder ve database bağlantılarını başlat"""
-        self.embedder = get_embedder()
+    def __init__(self, lazy: bool = False):
+        """
+        Database bağlantısını başlat ve aramanın gerektirdiği modeli hazırla
+        
+        Args:
+            lazy: True ise model ilk sorguda hazırlanır (main.py search: model arka
+                planda yüklenirken prompt beklemez). Varsayılan olarak her şey burada
+                yüklenir; sys.path'i sonradan geri alan çağıranlar (değerlendirme,
+                RAG pipeline) tek başına sorgu çalıştırabilen bir searcher alır.
+        """
+        self._embedder = None
+        self._colbert_index = None
+        self._colbert_path = None
         self.db = get_database()
+        if not lazy:
+            self.prepare()
+    
+    @property
+    def embedder(self):
+        """Embedder'ı ilk kullanımda al (arka planda yükleniyorsa bekler)"""
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+    
+    def prepare(self, mode: Optional[str] = None):
+        """Arama modunun gerektirdiği model, katman ve index'leri şimdi yükle"""
+        mode = mode or SEARCH_MODE
+        self.embedder.load_heads(sparse=mode in ("sparse", "hybrid"), colbert=mode == LATE_INTERACTION_MODE)
+        if mode == LATE_INTERACTION_MODE:
+            self.colbert_index
+    
+    @property
+    def colbert_index(self):
+        """Sıkıştırılmış ColBERT index'ini ilk kullanımda aç (memmap; yeni collection sürümüne geçilince yeniden)"""
+        path = self.db.colbert_index_path()
+        if self._colbert_index is None or self._colbert_path != path:
+            self._colbert_path = path
+            self._colbert_index = open_colbert_index(path)
+            if self._colbert_index is None:
+                raise ValueError(
+                    f"'{LATE_INTERACTION_MODE}' araması için ColBERT index'i yok "
+                    f"('python main.py index-colbert' ile oluşturun)"
+                )
+        return self._colbert_index
     
     def search(
         self, 
         query: str, 
         top_k: int = DEFAULT_TOP_K,
         score_threshold: float = None,
-        ingredient_filter: List[str] = None
+        ingredient_filter: List[str] = None,
+        mode: Optional[str] = None,
+        hydrate: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Tarif ara
@@ -32,23 +79,147 @@ class RecipeSearcher:
             query: Kullanıcı sorgusu (örn: "tavuklu makarna", "elimde patates var")
             top_k: Döndürülecek sonuç sayısı
             score_threshold: Minimum benzerlik skoru
-            ingredient_filter: Belirli malzemeleri içeren tarifleri filtrele
+            ingredient_filter: Malzeme filtresi - liste (herhangi biri) veya
+                {"any": [...], "all": [...], "none": [...]} (bkz. ingredient_index.py)
+            mode: "dense", "sparse", "hybrid", "binary" veya "colbert" (None ise config'den)
+            hydrate: False ise sadece ID, skor ve başlık döner (tam tarif doküman
+                deposundan okunmaz; örn: retrieval değerlendirmesi)
         
         Returns:
             Bulunan tarifler listesi
         """
-        # Sorguyu vektöre dönüştür
-        query_vector = self.embedder.embed_query(query)
+        mode = mode or SEARCH_MODE
+        if mode == LATE_INTERACTION_MODE:
+            results = self._search_colbert(query, top_k, ingredient_filter)
+            return self.db.hydrate(results) if hydrate else results
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Bilinmeyen arama modu: {mode}")
+        
+        # Sorguyu vektöre dönüştür (hybrid: tek forward pass'te dense + sparse)
+        query_vector, sparse_vector = None, None
+        if mode in ("dense", "binary"):
+            query_vector = self.embedder.embed_query(query)
+        elif mode == "sparse":
+            sparse_vector = self.embedder.embed_query_sparse(query)
+        else:
+            query_vector, sparse_vector = self.embedder.embed_query_hybrid(query)
         
         # Veritabanında ara
         results = self.db.search(
             query_vector=query_vector,
             top_k=top_k,
             score_threshold=score_threshold or SCORE_THRESHOLD,
-            ingredient_filter=ingredient_filter
+            ingredient_filter=ingredient_filter,
+            sparse_vector=sparse_vector,
+            mode=mode
         )
         
-        return results
+        # Tam tarif sadece döndürülen sonuçlar için okunur
+        return self.db.hydrate(results) if hydrate else results
+    
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: int = DEFAULT_TOP_K,
+        score_threshold: float = None,
+        ingredient_filters: Optional[List[Optional[IngredientFilter]]] = None,
+        mode: Optional[str] = None,
+        hydrate: bool = True
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla sorguyu birlikte ara
+        
+        Sorgular tek batch'te embed edilir ve veritabanında tek çağrıyla
+        skorlanır (search'ü sorgu başına çağırmaktan çok daha hızlı).
+
+        Args:
+            queries: Kullanıcı sorguları
+            top_k: Sorgu başına sonuç sayısı
+            score_threshold: Minimum benzerlik skoru
+            ingredient_filters: Sorgu başına malzeme filtresi (None: filtre yok)
+            mode: "dense", "sparse", "hybrid", "binary" veya "colbert" (None ise config'den)
+            hydrate: False ise sadece ID, skor ve başlık döner
+        
+        Returns:
+            Sorgu başına bulunan tarifler listesi (sorgu sırasıyla)
+        """
+        mode = mode or SEARCH_MODE
+        if not queries:
+            return []
+        
+        if mode == LATE_INTERACTION_MODE:
+            batch = self._search_colbert_batch(queries, top_k, ingredient_filters)
+        else:
+            if mode not in SEARCH_MODES:
+                raise ValueError(f"Bilinmeyen arama modu: {mode}")
+            
+            # Tüm sorgular tek forward pass'te (hybrid: dense + sparse birlikte)
+            query_vectors, sparse_vectors = None, None
+            if mode in ("dense", "binary"):
+                query_vectors = self.embedder.embed_queries(queries)
+            else:
+                query_vectors, sparse_vectors = self.embedder.embed_batch_hybrid(queries)
+                if mode == "sparse":
+                    query_vectors = None
+            
+            batch = self.db.search_batch(
+                query_vectors=query_vectors,
+                top_k=top_k,
+                score_threshold=score_threshold or SCORE_THRESHOLD,
+                ingredient_filters=ingredient_filters,
+                sparse_vectors=sparse_vectors,
+                mode=mode
+            )
+        
+        # Tüm sonuçların tam tarifleri tek sorguda okunur (listeler yerinde güncellenir)
+        if hydrate:
+            self.db.hydrate([r for results in batch for r in results])
+        return batch
+    
+    def _search_colbert(
+        self,
+        query: str,
+        top_k: int,
+        ingredient_filter: List[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Tek sorgunun late interaction araması (bkz. _search_colbert_batch)"""
+        return self._search_colbert_batch([query], top_k, [ingredient_filter])[0]
+    
+    def _search_colbert_batch(
+        self,
+        queries: List[str],
+        top_k: int,
+        ingredient_filters: Optional[List[Optional[IngredientFilter]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Late interaction araması
+        
+        Dense vektörle COLBERT_CANDIDATES aday alınır, adaylar sorgu ve tarif
+        token vektörleri arasındaki MaxSim skoruyla yeniden sıralanır. Sorguların
+        dense ve ColBERT vektörleri tek forward pass'te üretilir.
+        
+        Aday kaybı olmaması için ilk aşamada skor eşiği uygulanmaz.
+        """
+        query_vectors, query_tokens = self.embedder.embed_batch_colbert(queries)
+        
+        batch = self.db.search_batch(
+            query_vectors=query_vectors,
+            top_k=max(COLBERT_CANDIDATES, top_k),
+            score_threshold=None,
+            ingredient_filters=ingredient_filters,
+            mode="dense"
+        )
+        
+        for candidates, tokens in zip(batch, query_tokens):
+            if not candidates:
+                continue
+            scores = self.colbert_index.maxsim(tokens, [c["id"] for c in candidates])
+            for candidate, score in zip(candidates, scores):
+                candidate["dense_score"] = candidate["score"]
+                candidate["score"] = float(score)
+            candidates.sort(key=lambda c: c["score"], reverse=True)
+        
+        return [candidates[:top_k] for candidates in batch]
     
     def search_by_ingredients(
         self, 
@@ -90,7 +261,10 @@ class RecipeSearcher:
             Bulunan tarifler listesi
         """
         query = f"{recipe_name} tarifi nasıl yapılır"
-        return self.search(query=query, top_k=top_k)
+        
+        # Yemek adları tam kelime eşleşmesinden faydalanır: sparse alan varsa hybrid ara
+        mode = "hybrid" if self.db.has_sparse else "dense"
+        return self.search(query=query, top_k=top_k, mode=mode)
     
     def get_similar_recipes(
         self, 
@@ -117,10 +291,10 @@ class RecipeSearcher:
         query_vector = self.embedder.embed_single(text)
         
         # +1 çünkü kendisi de sonuçlarda olacak, onu çıkaracağız
-        results = self.db.search(query_vector=query_vector, top_k=top_k + 1)
+        results = self.db.search(query_vector=query_vector, top_k=top_k + 1, mode="dense")
         
         # Kendisini çıkar
-        return [r for r in results if r['id'] != recipe_id][:top_k]
+        return self.db.hydrate([r for r in results if r['id'] != recipe_id][:top_k])
 
 
 def format_recipe_result(recipe: Dict[str, Any], show_instructions: bool = False) -> str:
@@ -178,11 +352,11 @@ def format_search_results(
 # Singleton instance
 _searcher_instance = None
 
-def get_searcher() -> RecipeSearcher:
-    """Searcher singleton instance döndür"""
+def get_searcher(lazy: bool = False) -> RecipeSearcher:
+    """Searcher singleton instance döndür (lazy: bkz. RecipeSearcher)"""
     global _searcher_instance
     if _searcher_instance is None:
-        _searcher_instance = RecipeSearcher()
+        _searcher_instance = RecipeSearcher(lazy=lazy)
     return _searcher_instance
 
 
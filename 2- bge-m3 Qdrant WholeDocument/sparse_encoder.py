@@ -0,0 +1,91 @@
+"""
+BGE-M3 Sparse (Lexical) Vektör Modülü
+=====================================
+BGE-M3, dense vektörün yanında her token için öğrenilmiş bir ağırlık da üretir
+(lexical weights). Bu ağırlıklar, son katman token çıktılarına uygulanan küçük
+bir lineer katmandan (sparse_linear.pt) gelir.
+
+Dense vektör ile aynı forward pass'in token çıktıları kullanıldığı için
+sparse vektör ek bir model çağrısı gerektirmez. Ayrıca FlagEmbedding
+bağımlılığına gerek kalmaz; sadece model reposundaki ağırlık dosyası indirilir.
+
+Sparse vektör formatı: {token_id: ağırlık} (Qdrant SparseVector'e çevrilir)
+"""
+
+from typing import Dict, Iterable
+
+# BGE-M3 reposundaki sparse katman ağırlıkları
+SPARSE_HEAD_FILE = "sparse_linear.pt"
+
+
+def load_sparse_head(model_name: str):
+    """
+    Sparse ağırlık katmanını yükle (hidden_size -> 1)
+
+    Args:
+        model_name: HuggingFace model adı (örn: "BAAI/bge-m3")
+
+    Returns:
+        torch.nn.Linear katmanı (eval modunda)
+    """
+    import torch
+    from huggingface_hub import hf_hub_download
+
+    path = hf_hub_download(repo_id=model_name, filename=SPARSE_HEAD_FILE)
+    state = torch.load(path, map_location="cpu")
+
+    head = torch.nn.Linear(state["weight"].shape[1], 1)
+    head.load_state_dict(state)
+    head.eval()
+
+    print(f"✅ Sparse katman yüklendi: {model_name}/{SPARSE_HEAD_FILE}")
+    return head
+
+
+def lexical_weights(
+    token_embeddings,
+    input_ids,
+    attention_mask,
+    head,
+    skip_ids: Iterable[int]
+) -> Dict[int, float]:
+    """
+    Tek bir metnin token çıktılarından sparse vektör üret
+
+    Aynı token birden fazla geçiyorsa en yüksek ağırlık tutulur.
+    Özel token'lar (CLS, EOS, PAD, UNK) atlanır.
+
+    Args:
+        token_embeddings: (seq_len, hidden_size) son katman çıktıları
+        input_ids: (seq_len,) token id'leri
+        attention_mask: (seq_len,) padding maskesi
+        head: load_sparse_head ile yüklenen katman
+        skip_ids: Atlanacak token id'leri
+
+    Returns:
+        {token_id: ağırlık} sözlüğü
+    """
+    import torch
+
+    if head.weight.device != token_embeddings.device:
+        head.to(token_embeddings.device)
+
+    with torch.no_grad():
+        weights = torch.relu(head(token_embeddings.float())).squeeze(-1)
+
+    skip_ids = set(skip_ids)
+    result = {}
+    for token_id, weight, mask in zip(input_ids.tolist(), weights.tolist(), attention_mask.tolist()):
+        if not mask or token_id in skip_ids or weight <= 0:
+            continue
+        if weight > result.get(token_id, 0.0):
+            result[token_id] = weight
+
+    return result
+
+
+def sparse_dot(a: Dict[int, float], b: Dict[int, float]) -> float:
+    """İki sparse vektörün iç çarpımı (lexical eşleşme skoru)"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b[token_id] for token_id, weight in a.items() if token_id in b)
@@ -0,0 +1,134 @@
+"""
+Indexer Testleri
+================
+Tam indexleme (yeni collection sürümü) tariflerin point ID'lerini korumalı:
+tarif recipe_key ile eşleşir, yeni tarifler en büyük ID'den sonra ID alır.
+
+Model indirilmez: embedder yerine tarif başlığından üretilen sabit vektörler;
+collection yerel backend ile geçici klasörde kurulur.
+
+Kullanım:
+    python -m pytest test_indexer.py
+"""
+
+import hashlib
+import json
+import zlib
+
+import numpy as np
+import pytest
+
+import config
+import database
+import indexer
+from colbert_index import ResidualCodec, ColbertIndexWriter
+from database import recipe_key
+
+
+def recipe(n: int, steps: int = 2) -> dict:
+    return {
+        "title": f"Tarif {n}",
+        "url": f"https://example.com/tarif-{n}",
+        "ingredients": [f"malzeme{n}", "tuz"],
+        "instructions": [f"Adım {i}." for i in range(steps)]
+    }
+
+
+def vector(recipe: dict) -> list:
+    rng = np.random.default_rng(zlib.crc32(recipe["title"].encode("utf-8")))
+    return rng.normal(size=config.EMBEDDING_DIM).tolist()
+
+
+class FakeEmbedder:
+    """Başlıktan sabit vektör (SentenceTransformer yerine)"""
+
+    def embed_recipes(self, batch):
+        return [vector(r) for r in batch]
+
+    def embed_recipes_hybrid(self, batch):
+        return self.embed_recipes(batch), [{1: 0.5} for _ in batch]
+
+
+@pytest.fixture
+def local_index(tmp_path, monkeypatch):
+    """Yerel backend'li geçici collection; veri dosyasını yazan fonksiyon döner"""
+    monkeypatch.setattr(database, "DB_BACKEND", "local")
+    monkeypatch.setattr(database, "LOCAL_DB_PATH", tmp_path / "local_db")
+    monkeypatch.setattr(database, "COLBERT_INDEX_DIR", tmp_path / "colbert")
+    monkeypatch.setattr(database, "_db_instance", None)
+    monkeypatch.setattr(indexer, "EMBEDDING_STORE_DIR", tmp_path / "embedding_store")
+    monkeypatch.setattr(indexer, "get_embedder", lambda: FakeEmbedder())
+    # Depo sürümü veri dosyasına bağlı (dosya değişince yeniden embed edilir)
+    monkeypatch.setattr(
+        indexer, "embedding_signature",
+        lambda path: {"data": hashlib.sha1(open(path, "rb").read()).hexdigest()}
+    )
+
+    data_file = tmp_path / "recipes.jsonl"
+
+    def write(recipes):
+        with open(data_file, "w", encoding="utf-8") as f:
+            for r in recipes:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        return str(data_file)
+
+    yield write
+    database.get_database().close()
+
+
+def key_ids() -> dict:
+    return {key: point_id for point_id, key, _ in database.get_database().indexed_recipes()}
+
+
+def test_full_reindex_keeps_point_ids(local_index):
+    recipes = [recipe(n) for n in range(6)]
+    data_file = local_index(recipes)
+    indexer.index_all_recipes(recreate=True, file_path=data_file, workers=0)
+    first = key_ids()
+    assert sorted(first.values()) == list(range(6))
+
+    # Tarif silinir, sıra değişir, yeni tarif başa eklenir, bir tarif değişir
+    changed = dict(recipes[3], ingredients=["yeni malzeme"])
+    recipes = [recipe(6)] + [r for r in reversed(recipes) if r is not recipes[1] and r is not recipes[3]] + [changed]
+    local_index(recipes)
+    indexer.index_incremental(file_path=data_file)
+    after_incremental = key_ids()
+    assert after_incremental[recipe_key(recipe(6))] == 6
+    assert recipe_key(recipe(1)) not in after_incremental
+
+    # Yeni embedding'lerle ve kayıtlı embedding'lerle tam indexleme
+    indexer.index_all_recipes(recreate=True, file_path=data_file, workers=0)
+    assert key_ids() == after_incremental
+    indexer.index_all_recipes(recreate=True, file_path=data_file, workers=0)
+    assert key_ids() == after_incremental
+
+    # Artımlı indexleme olmadan yeni tarif: en büyük ID'den sonra
+    recipes = [recipe(7)] + recipes[::-1]
+    local_index(recipes)
+    indexer.index_all_recipes(recreate=True, file_path=data_file, workers=0)
+    final = key_ids()
+    assert final == {**after_incremental, recipe_key(recipe(7)): 7}
+
+    db = database.get_database()
+    for r in recipes:
+        point_id = final[recipe_key(r)]
+        assert db.get_recipe_by_id(point_id)["title"] == r["title"]
+        assert db.search(vector(r), top_k=1, mode="dense")[0]["id"] == point_id
+
+
+def test_colbert_index_explicit_doc_ids(tmp_path):
+    rng = np.random.default_rng(0)
+    docs = [rng.normal(size=(n, 16)).astype(np.float32) for n in (3, 5, 4)]
+    docs = [d / np.linalg.norm(d, axis=1, keepdims=True) for d in docs]
+    codec = ResidualCodec.train(np.concatenate(docs), 4, nbits=8)
+
+    writer = ColbertIndexWriter(tmp_path / "colbert", codec)
+    writer.add(docs[:2], [7, 2])
+    writer.add(docs[2:], [4])
+    index = writer.commit()
+
+    assert index.num_docs == 3
+    assert len(index.doc_vectors(7)) == 3 and len(index.doc_vectors(4)) == 4
+    scores = index.maxsim(docs[1], [2, 7, 0, 99])
+    assert scores[0] > 0.9 and scores[0] > scores[1]
+    assert scores[2] == 0 and scores[3] == 0
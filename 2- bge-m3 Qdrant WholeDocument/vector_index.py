@@ -0,0 +1,526 @@
+"""
+Süreç İçi Vektör Index'i
+========================
+Qdrant'ın gömülü (local) modu tüm point'leri Python nesnelerine yükleyip
+skorları Python'da hesaplar. Bu modül vektörleri tek bir bitişik float32
+matriste tutar; sorgu tek bir matris-vektör çarpımı ve argpartition ile
+cevaplanır (20 bin x 1024 boyutta birkaç milisaniye).
+
+Dosyalar (index klasöründe):
+    index.json   : Index türü, boyut, metrik
+    vectors.f32  : (n, dim) float32 satırlar (Cosine metriğinde normalize)
+    ids.i64      : Satır başına point ID'si
+
+Sorgu batch'leri (search_batch) tek bir matris-matris çarpımıyla skorlanır.
+
+Yeni satırlar dosyaların sonuna eklenir, mevcut ID'ler yerinde güncellenir.
+Silinen ID'lerin satırları dosyalardan çıkarılır (delete: kalan satırlar
+sırası korunarak sıkıştırılır; artımlı indexlemede silme seyrektir).
+Matris ilk aramada yüklenir (mmap=True ise np.memmap ile açılır ve RAM'e
+kopyalanmaz; sayfalar işletim sistemi önbelleğinden okunur). RAM'deki matris
+eklemelerde kapasitesi ikiye katlanarak büyür (dosyadan yeniden okunmaz).
+
+Yaklaşık (ANN) index türleri bu sınıftan türer ve ayrı modüllerdedir
+(bkz. INDEX_TYPES); vektör dosyaları tüm türlerde aynıdır.
+
+NOT: Bu modül tüm retriever sistem klasörlerinde birebir aynıdır.
+"""
+
+import importlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Desteklenen metrikler (Qdrant DISTANCE_METRIC adlarıyla)
+METRICS = ("Cosine", "Dot")
+
+INDEX_META_FILE = "index.json"
+VECTORS_FILE = "vectors.f32"
+IDS_FILE = "ids.i64"
+
+# İzin verilen satır oranı bunun altındaysa sadece o satırlar skorlanır
+GATHER_RATIO = 0.25
+
+# search_batch'te tek çarpımda skorlanan en fazla sorgu (skor matrisi: sorgu x satır float32)
+SEARCH_BATCH_SIZE = 256
+
+# ID eşlemesinin vektör başına RAM'i (ids + sıralı ids + satırları, int64)
+ID_MAP_BYTES = 24
+
+# Silmede dosyaları yeniden yazarken tek seferde kopyalanan satır
+COMPACT_BATCH_SIZE = 16384
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Satırları birim uzunluğa getir"""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """En yüksek k skorun indeksleri (skora göre azalan)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def read_rows(path: Path, dtype, width: Optional[int] = None) -> np.ndarray:
+    """Satır dosyasını oku (yoksa boş dizi)"""
+    data = np.fromfile(path, dtype=dtype) if path.exists() else np.zeros(0, dtype=dtype)
+    if not width:
+        return data
+    # Yarıda kalmış son satır atılır (kodlanmamış sayılır)
+    return data[:len(data) // width * width].reshape(-1, width)
+
+
+def write_atomic(path: Path, write):
+    """Dosyayı .tmp olarak yaz ve yerine taşı (yarıda kalan yazma eskiyi bozmaz)"""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def grow_rows(array: np.ndarray, count: int) -> np.ndarray:
+    """Dizinin satır kapasitesini en az count'a büyüt (ikiye katlayarak)"""
+    if count <= len(array):
+        return array
+    grown = np.empty((max(count, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class FlatIndex:
+    """Bitişik float32 matris üzerinde tam (exact) arama"""
+
+    INDEX_TYPE = "flat"
+
+    def __init__(self, path: Path, mmap: bool = False, **search_params):
+        """
+        Mevcut index'i aç
+
+        Args:
+            path: Index klasörü
+            mmap: True ise vektör matrisi np.memmap ile açılır
+            **search_params: Index türüne özel arama ayarları (flat'te yok sayılır)
+        """
+        self.path = Path(path)
+        self.mmap = mmap
+
+        meta_path = self.path / INDEX_META_FILE
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Vektör index'i bulunamadı: {self.path}")
+        with open(meta_path, "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        self.dim = self.meta["dim"]
+        self.metric = self.meta["metric"]
+
+        # ID → satır eşlemesi: ID'ye göre sıralı ID'ler ve satırları (searchsorted;
+        # vektör başına 16 byte, dict'e göre milyonlarca noktada çok daha küçük)
+        self._ids = np.fromfile(self.path / IDS_FILE, dtype=np.int64)
+        self._order = np.argsort(self._ids, kind="stable")
+        self._sorted_ids = self._ids[self._order]
+
+        # Yüklenmiş matris (arama için; RAM modunda satır sayısından büyük olabilir, bkz. matrix)
+        self._matrix = None
+
+    @classmethod
+    def create(cls, path: Path, dim: int, metric: str = "Cosine", mmap: bool = False, **params) -> "FlatIndex":
+        """
+        Boş index oluştur
+
+        Args:
+            path: Index klasörü (oluşturulur)
+            dim: Vektör boyutu
+            metric: "Cosine" veya "Dot"
+            **params: Index türüne özel parametreler (index.json'a yazılır)
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Desteklenmeyen metrik: {metric} (seçenekler: {', '.join(METRICS)})")
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / VECTORS_FILE).write_bytes(b"")
+        (path / IDS_FILE).write_bytes(b"")
+
+        meta = {"type": cls.INDEX_TYPE, "dim": dim, "metric": metric, **params}
+        with open(path / INDEX_META_FILE, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        return cls(path, mmap=mmap)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids
+
+    # =========================================================================
+    # YAZMA
+    # =========================================================================
+
+    def _prepare(self, vectors) -> np.ndarray:
+        """Vektörleri (n, dim) float32'ye çevir (Cosine'de normalize)"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        return normalize_rows(vectors).astype(np.float32) if self.metric == "Cosine" else vectors
+
+    def add(self, ids: Sequence[int], vectors) -> int:
+        """
+        Vektörleri ekle (ID zaten varsa satırı yerinde güncellenir)
+
+        Returns:
+            Yazılan vektör sayısı
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = self._prepare(vectors)
+        if len(ids) != len(vectors):
+            raise ValueError(f"ID sayısı ({len(ids)}) ile vektör sayısı ({len(vectors)}) farklı")
+
+        rows = self._lookup(ids)
+        existing = rows >= 0
+
+        if existing.any():
+            self._overwrite(rows[existing], vectors[existing])
+
+        new = ~existing
+        if new.any():
+            new_ids = ids[new]
+            # Aynı batch'te tekrar eden ID'lerde son vektör geçerli
+            _, last = np.unique(new_ids[::-1], return_index=True)
+            keep = np.sort(len(new_ids) - 1 - last)
+            self._append(new_ids[keep], vectors[new][keep])
+
+        self._on_write()
+        return len(ids)
+
+    def _append(self, ids: np.ndarray, vectors: np.ndarray):
+        """Yeni satırları dosyaların sonuna ekle"""
+        start = len(self._ids)
+        with open(self.path / VECTORS_FILE, "ab") as f:
+            f.write(np.ascontiguousarray(vectors).tobytes())
+        with open(self.path / IDS_FILE, "ab") as f:
+            f.write(ids.tobytes())
+
+        self._ids = np.concatenate([self._ids, ids])
+
+        # Sıralı eşlemeye birleştir (aynı konuma eklenenler de sıralı kalsın)
+        by_id = np.argsort(ids, kind="stable")
+        positions = np.searchsorted(self._sorted_ids, ids[by_id])
+        self._sorted_ids = np.insert(self._sorted_ids, positions, ids[by_id])
+        self._order = np.insert(self._order, positions, start + by_id)
+
+        # Yüklenmiş RAM matrisi büyütülür (memmap _on_write'ta yeniden açılır)
+        if self._matrix is not None and not self.mmap:
+            count = len(self._ids)
+            if count > len(self._matrix):
+                grown = np.empty((max(count, 2 * len(self._matrix)), self.dim), dtype=np.float32)
+                grown[:start] = self._matrix[:start]
+                self._matrix = grown
+            self._matrix[start:count] = vectors
+
+    def _overwrite(self, rows, vectors: np.ndarray):
+        """Mevcut satırları dosyada yerinde güncelle"""
+        row_bytes = self.dim * 4
+        with open(self.path / VECTORS_FILE, "r+b") as f:
+            for row, vector in zip(rows, vectors):
+                f.seek(row * row_bytes)
+                f.write(vector.tobytes())
+
+        if self._matrix is not None and not self.mmap:
+            self._matrix[rows] = vectors
+
+    def _on_write(self):
+        """Yazmadan sonra memmap'i yeniden açılmak üzere bırak (boyutu sabittir)"""
+        if self.mmap:
+            self._matrix = None
+
+    def delete(self, ids: Sequence[int]) -> int:
+        """
+        ID'leri index'ten sil (index'te olmayanlar atlanır)
+
+        Kalan satırlar sıraları korunarak sıkıştırılır; dosyalar yeniden
+        yazıldığı için maliyet satır sayısıyla doğrusaldır.
+
+        Returns:
+            Silinen vektör sayısı
+        """
+        rows = np.unique(self.rows_for(ids))
+        if not len(rows):
+            return 0
+
+        keep = np.ones(len(self._ids), dtype=bool)
+        keep[rows] = False
+        self._compact(keep)
+        return len(rows)
+
+    def _compact(self, keep: np.ndarray):
+        """Sadece keep satırlarını bırak (vektör ve ID dosyaları yeniden yazılır)"""
+        matrix = self.matrix
+
+        def write_vectors(f):
+            for start in range(0, len(keep), COMPACT_BATCH_SIZE):
+                block = keep[start:start + COMPACT_BATCH_SIZE]
+                f.write(np.ascontiguousarray(matrix[start:start + len(block)][block]).tobytes())
+
+        write_atomic(self.path / VECTORS_FILE, write_vectors)
+        self._ids = self._ids[keep]
+        write_atomic(self.path / IDS_FILE, lambda f: f.write(self._ids.tobytes()))
+
+        self._order = np.argsort(self._ids, kind="stable")
+        self._sorted_ids = self._ids[self._order]
+        # Matris bir sonraki erişimde yeni dosyadan yüklenir
+        self._matrix = None
+
+    @property
+    def is_trained(self) -> bool:
+        """Vektör eklenebilir mi (eğitim gerektiren türlerde train'den sonra)"""
+        return True
+
+    def train(self, vectors):
+        """Örnek vektörlerle index yapılarını eğit (flat index'te gerekmez)"""
+
+    def flush(self):
+        """Bellekteki yapıları diske yaz (flat index'te her yazma anında kalıcıdır)"""
+
+    # =========================================================================
+    # OKUMA
+    # =========================================================================
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """(n, dim) vektör matrisi (ilk erişimde yüklenir)"""
+        if self._matrix is None:
+            self._matrix = self._load_matrix()
+        return self._matrix[:len(self._ids)]
+
+    def _load_matrix(self) -> np.ndarray:
+        count = len(self._ids)
+        if not count:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        if self.mmap:
+            return np.memmap(self.path / VECTORS_FILE, dtype=np.float32, mode="r", shape=(count, self.dim))
+        return np.fromfile(self.path / VECTORS_FILE, dtype=np.float32, count=count * self.dim).reshape(count, self.dim)
+
+    def _lookup(self, ids: Sequence[int]) -> np.ndarray:
+        """ID'lerin satır numaraları (index'te olmayanlar -1)"""
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        if not len(self._sorted_ids):
+            return np.full(len(ids), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self._sorted_ids, ids), len(self._sorted_ids) - 1)
+        return np.where(self._sorted_ids[positions] == ids, self._order[positions], -1)
+
+    def rows_for(self, ids: Sequence[int]) -> np.ndarray:
+        """ID'lerin satır numaraları (index'te olmayanlar atlanır)"""
+        rows = self._lookup(ids)
+        return rows[rows >= 0]
+
+    def get_vectors(self, ids: Sequence[int]) -> np.ndarray:
+        """ID'lerin saklanan vektörleri"""
+        return np.asarray(self.matrix[self.rows_for(ids)])
+
+    def exact_scores(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Satırların tam skorları (mmap'te disk sırasıyla okunur; yeniden sıralama için)"""
+        disk_order = np.argsort(rows)
+        scores = np.empty(len(rows), dtype=np.float32)
+        scores[disk_order] = self.matrix[rows[disk_order]] @ query
+        return scores
+
+    def prepare_query(self, query) -> np.ndarray:
+        """Sorgu vektörünü index metriğine hazırla"""
+        query = np.asarray(query, dtype=np.float32)
+        return normalize_rows(query) if self.metric == "Cosine" else query
+
+    def search(
+        self,
+        query,
+        top_k: int,
+        allowed_ids: Optional[Sequence[int]] = None,
+        score_threshold: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        En benzer vektörleri bul
+
+        Args:
+            query: (dim,) sorgu vektörü
+            top_k: Sonuç sayısı
+            allowed_ids: Sadece bu ID'ler arasında ara (filtre)
+            score_threshold: Minimum skor
+
+        Returns:
+            (ID'ler, skorlar) - skora göre azalan
+        """
+        query = self.prepare_query(query)
+        rows, scores = self._score(query, allowed_ids)
+        return self._top_k(rows, scores, top_k, score_threshold)
+
+    def _top_k(
+        self,
+        rows: Optional[np.ndarray],
+        scores: np.ndarray,
+        top_k: int,
+        score_threshold: Optional[float]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Skorlanan satırlardan en iyi k sonucun (ID'ler, skorlar) çifti"""
+        best = top_k_indices(scores, top_k)
+        best_rows = rows[best] if rows is not None else best
+        ids, scores = self._ids[best_rows], scores[best]
+
+        if score_threshold is not None:
+            keep = scores >= score_threshold
+            ids, scores = ids[keep], scores[keep]
+        return ids, scores
+
+    def search_batch(
+        self,
+        queries,
+        top_k: int,
+        allowed_ids: Optional[Sequence[Optional[Sequence[int]]]] = None,
+        score_threshold: Optional[float] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Birden fazla sorguyu birlikte ara
+
+        Flat index'te sorgular tek bir matris-matris çarpımıyla skorlanır;
+        yaklaşık türler (search'ü kendi yapısıyla yapanlar) sorguları sırayla arar.
+
+        Args:
+            queries: (q, dim) sorgu vektörleri
+            top_k: Sorgu başına sonuç sayısı
+            allowed_ids: Sorgu başına izin verilen ID'ler (None: filtre yok)
+            score_threshold: Minimum skor
+
+        Returns:
+            Sorgu başına (ID'ler, skorlar) - skora göre azalan
+        """
+        if type(self).search is FlatIndex.search:
+            return self.exact_search_batch(queries, top_k, allowed_ids=allowed_ids, score_threshold=score_threshold)
+
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        allowed_ids = allowed_ids if allowed_ids is not None else [None] * len(queries)
+        return [
+            self.search(query, top_k, allowed_ids=allowed, score_threshold=score_threshold)
+            for query, allowed in zip(queries, allowed_ids)
+        ]
+
+    def exact_search_batch(
+        self,
+        queries,
+        top_k: int,
+        allowed_ids: Optional[Sequence[Optional[Sequence[int]]]] = None,
+        score_threshold: Optional[float] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Sorguların tam araması (SEARCH_BATCH_SIZE'lık bloklarda tek matris-matris çarpımı)"""
+        queries = self.prepare_query(np.asarray(queries, dtype=np.float32).reshape(-1, self.dim))
+        allowed_ids = allowed_ids if allowed_ids is not None else [None] * len(queries)
+
+        results = []
+        for start in range(0, len(queries), SEARCH_BATCH_SIZE):
+            block = self.matrix @ queries[start:start + SEARCH_BATCH_SIZE].T
+            for scores, allowed in zip(block.T, allowed_ids[start:start + SEARCH_BATCH_SIZE]):
+                rows = None
+                if allowed is not None:
+                    rows = self.rows_for(allowed)
+                    scores = scores[rows]
+                results.append(self._top_k(rows, scores, top_k, score_threshold))
+        return results
+
+    def exact_search(
+        self,
+        query,
+        top_k: int,
+        allowed_ids: Optional[Sequence[int]] = None,
+        score_threshold: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Tüm (veya izin verilen) vektörlerde tam arama (yaklaşık türlerde de; recall referansı)"""
+        return FlatIndex.search(self, query, top_k, allowed_ids=allowed_ids, score_threshold=score_threshold)
+
+    def _score(self, query: np.ndarray, allowed_ids: Optional[Sequence[int]]):
+        """
+        Tüm (veya izin verilen) satırların skorları
+
+        Returns:
+            (satır numaraları veya None (tüm satırlar), skorlar)
+        """
+        if allowed_ids is None:
+            return None, self.matrix @ query
+
+        rows = self.rows_for(allowed_ids)
+        if len(rows) < GATHER_RATIO * len(self._ids):
+            return rows, self.matrix[rows] @ query
+
+        scores = self.matrix @ query
+        return rows, scores[rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Index boyutu ve bellek kullanımı
+
+        vector_bytes diskteki float32 vektörler, ram_bytes arama için RAM'de
+        tutulan yapılardır (mmap modunda vektörler hariç, ID eşlemesi dahil).
+        """
+        count = len(self._ids)
+        vector_bytes = count * self.dim * 4
+        return {
+            "type": self.INDEX_TYPE,
+            "count": count,
+            "dim": self.dim,
+            "metric": self.metric,
+            "mmap": self.mmap,
+            "vector_bytes": vector_bytes,
+            "bytes_per_vector": self.dim * 4,
+            "ram_bytes": (0 if self.mmap else vector_bytes) + count * ID_MAP_BYTES
+        }
+
+    def close(self):
+        """Bekleyen yazmaları kaydet ve yüklenmiş matrisi bırak (memmap dosyası kapanır)"""
+        self.flush()
+        self._matrix = None
+
+
+# Index türü → (modül, sınıf) (index.json'daki "type" alanı; modül ilk kullanımda yüklenir)
+INDEX_TYPES = {
+    "flat": ("vector_index", "FlatIndex"),
+    "hnsw": ("hnsw_index", "HNSWIndex"),
+    "ivf_pq": ("ivfpq_index", "IVFPQIndex"),
+    "quantized": ("quantized_index", "QuantizedIndex"),
+}
+
+
+def index_class(index_type: str):
+    """Index türünün sınıfı"""
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Bilinmeyen index türü: {index_type} (seçenekler: {', '.join(INDEX_TYPES)})")
+    module_name, class_name = INDEX_TYPES[index_type]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_vector_index(path: Path, index_type: str, dim: int, metric: str = "Cosine", mmap: bool = False, **params):
+    """
+    Verilen türde boş index oluştur
+
+    Args:
+        **params: Index türüne özel kurulum parametreleri (örn: HNSW için M)
+    """
+    return index_class(index_type).create(path, dim, metric=metric, mmap=mmap, **params)
+
+
+def open_vector_index(path: Path, mmap: bool = False, **search_params):
+    """
+    Kayıtlı index'i türüne göre aç
+
+    Args:
+        **search_params: Index türüne özel arama ayarları (örn: HNSW için ef_search)
+    """
+    with open(Path(path) / INDEX_META_FILE, "r", encoding="utf-8") as f:
+        index_type = json.load(f)["type"]
+    return index_class(index_type)(path, mmap=mmap, **search_params)
@@ -0,0 +1,160 @@
+"""
+Soğuk Başlangıç Benchmark'ı
+===========================
+`main.py search` açılışının ne kadar sürdüğünü ölçer.
+
+Her ölçüm temiz bir Python sürecinde yapılır (import önbelleği olmadan):
+- import        : config/embedder/database/searcher modüllerinin importu
+- prompt        : Arka plan ısınması başlatılıp veritabanı açılana kadar geçen süre
+                  (prompt'un kullanıcıya göründüğü an)
+- model_import  : torch + sentence-transformers importu
+- model_load    : Model ağırlıklarının yüklenmesi
+- warmup        : İlk encode (ısınma)
+- first_query   : Prompt açıldıktan hemen sonra gelen ilk sorgunun süresi
+                  ("lazy" modunda model hazır değilse bekleme dahil)
+- warm_query    : Isınmış modelle ikinci sorgu
+
+Kullanım:
+    python coldstart_benchmark.py              # 3 tekrar, lazy + eager
+    python coldstart_benchmark.py --runs 5
+    python coldstart_benchmark.py --mode lazy
+"""
+
+import os
+import sys
+import json
+import time
+import subprocess
+from pathlib import Path
+
+# Alt sürecin sonuç satırını diğer çıktılardan ayırmak için önek
+RESULT_PREFIX = "COLDSTART_RESULT "
+
+BENCHMARK_QUERY = "fırında tavuk but"
+MODES = ("lazy", "eager")
+
+
+def _run_child(mode: str):
+    """Tek bir soğuk başlangıcı ölç (temiz alt süreçte çalışır)"""
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
+
+    timings = {}
+    start = time.perf_counter()
+
+    import embedder
+    from searcher import RecipeSearcher
+    timings["import"] = time.perf_counter() - start
+
+    if mode == "lazy":
+        # main.py search ile aynı sıra: ısınma arka planda, prompt hemen
+        embedder.start_background_warmup()
+        searcher = RecipeSearcher(lazy=True)
+        searcher.db.get_collection_info()
+        prompt_time = time.perf_counter()
+        timings["prompt"] = prompt_time - start
+
+        searcher.search(BENCHMARK_QUERY, top_k=5)
+        timings["first_query"] = time.perf_counter() - prompt_time
+    else:
+        # Her şey prompt'tan önce senkron yüklenir
+        t = time.perf_counter()
+        import sentence_transformers  # noqa: F401
+        timings["model_import"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        model = embedder.get_embedder()
+        timings["model_load"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        model.embed_batch([embedder.WARMUP_TEXT])
+        timings["warmup"] = time.perf_counter() - t
+
+        searcher = RecipeSearcher()
+        searcher.db.get_collection_info()
+        prompt_time = time.perf_counter()
+        timings["prompt"] = prompt_time - start
+
+        searcher.search(BENCHMARK_QUERY, top_k=5)
+        timings["first_query"] = time.perf_counter() - prompt_time
+
+    t = time.perf_counter()
+    searcher.search(BENCHMARK_QUERY, top_k=5)
+    timings["warm_query"] = time.perf_counter() - t
+    timings["total"] = time.perf_counter() - start
+
+    searcher.db.close()
+    print(RESULT_PREFIX + json.dumps(timings))
+
+
+def measure(mode: str) -> dict:
+    """Yeni bir süreçte tek ölçüm yap"""
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--child", mode],
+        cwd=str(Path(__file__).resolve().parent),
+        capture_output=True,
+        text=True,
+        encoding="utf-8"
+    )
+
+    for line in result.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+
+    raise RuntimeError(f"Ölçüm başarısız ({mode}):\n{result.stderr[-2000:]}")
+
+
+def run_benchmark(runs: int = 3, modes: tuple = MODES) -> dict:
+    """Her mod için runs adet soğuk başlangıç ölç, ortalamaları döndür"""
+    from config import MODEL_NAME
+
+    print("🚀 Soğuk Başlangıç Benchmark'ı")
+    print(f"📦 Model: {MODEL_NAME} | Tekrar: {runs}")
+
+    summary = {}
+    for mode in modes:
+        samples = []
+        for i in range(runs):
+            print(f"⏱️  [{mode}] ölçüm {i+1}/{runs}...")
+            samples.append(measure(mode))
+
+        keys = samples[0].keys()
+        summary[mode] = {k: sum(s[k] for s in samples) / len(samples) for k in keys}
+
+    print_summary(summary)
+    return summary
+
+
+def print_summary(summary: dict):
+    """Mod bazında ortalama süreleri yazdır"""
+    keys = ["import", "model_import", "model_load", "warmup", "prompt",
+            "first_query", "warm_query", "total"]
+
+    print("\n" + "=" * 60)
+    print("📊 SOĞUK BAŞLANGIÇ SÜRELERİ (ortalama, saniye)")
+    print("=" * 60)
+    print(f"{'Adım':<16}" + "".join(f"{mode:>12}" for mode in summary))
+    print("-" * 60)
+
+    for key in keys:
+        row = f"{key:<16}"
+        for timings in summary.values():
+            row += f"{timings[key]:>11.2f}s" if key in timings else f"{'-':>12}"
+        print(row)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Soğuk başlangıç süresi ölçümü')
+    parser.add_argument('--runs', type=int, default=3, help='Mod başına tekrar sayısı')
+    parser.add_argument('--mode', choices=MODES, nargs='+', default=list(MODES),
+                        help='Ölçülecek modlar')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(args.child)
+    else:
+        run_benchmark(args.runs, tuple(args.mode))
@@ -18,27 +18,147 @@ QDRANT_PATH = BASE_DIR / "qdrant_data"
 # ============================================================
 MODEL_NAME = "intfloat/multilingual-e5-large"
 USE_FP16 = True  # GPU bellek optimizasyonu için
+MODEL_BACKEND = "sentence-transformers"  # Paylaşılan model kaydındaki backend anahtarı
 EMBEDDING_DIM = 1024  # E5-Large dense vector boyutu
 
 # E5 modeli prefix kullanır
 QUERY_PREFIX = "query: "
 PASSAGE_PREFIX = "passage: "
 
+# ============================================================
+# SEKANS UZUNLUĞU / KIRPMA AYARLARI
+# ============================================================
+MAX_SEQ_LENGTH = 512  # Model girdisi için en fazla token (E5-Large: 512)
+
+# Kırpma stratejisi:
+#   "head"         : İlk MAX_SEQ_LENGTH token kullanılır (model varsayılanı)
+#   "head_tail"    : Metnin başından ve sonundan yarı yarıya token alınır
+#   "instructions" : Başlık ve malzemeler korunur, yapılış MAX_INSTRUCTION_TOKENS ile sınırlanır
+TRUNCATION_STRATEGY = "head"
+MAX_INSTRUCTION_TOKENS = 256  # "instructions" stratejisinde yapılış için token sınırı
+
+# ============================================================
+# BOYUT İNDİRGEME AYARLARI
+# ============================================================
+# Saklanan vektörleri daha küçük boyuta indir (None: kapalı, örn: 256 veya 384)
+REDUCED_DIM = None
+
+# İndirgeme yöntemi:
+#   "pca"      : Korpustan alınan örnekler üzerinde PCA fit edilir
+#   "truncate" : İlk REDUCED_DIM boyut alınır (sadece Matryoshka ile eğitilmiş modeller için)
+REDUCTION_METHOD = "pca"
+PCA_FIT_SAMPLES = 4096  # PCA fit için embed edilecek tarif sayısı
+
 # ============================================================
 # QDRANT AYARLARI
 # ============================================================
 COLLECTION_NAME = "recipes"
 DISTANCE_METRIC = "Cosine"  # Cosine, Euclid, Dot
 
+# Sürümlü collection'lar (kesintisiz yeniden indexleme)
+# COLLECTION_NAME bir alias'tır: tam indexleme {COLLECTION_NAME}_v{n} sürümüne yapılır,
+# doğrulanınca alias atomik olarak yeni sürüme çevrilir (arama indexleme boyunca eski sürümde)
+COLLECTION_KEEP_VERSIONS = 1   # Alias çevrildikten sonra saklanan eski sürüm sayısı (geri dönüş için)
+SWAP_VERIFY_SAMPLES = 20       # Alias çevrilmeden önce yeni sürümde denenen örnek sorgu sayısı
+SWAP_VERIFY_TOP_K = 10         # Örnek sorguda tarifin kendisinin aranacağı ilk sonuç sayısı
+SWAP_VERIFY_MIN_RECALL = 0.9   # Örnek sorgularda tarifin kendisini bulma oranı alt sınırı
+
+# ============================================================
+# VERİTABANI BACKEND AYARLARI
+# ============================================================
+# "qdrant" : Qdrant gömülü (local) modu (QDRANT_PATH)
+# "local"  : Süreç içi NumPy index'i (LOCAL_DB_PATH) - vektörler bitişik
+#            float32 matriste, tarifler SQLite doküman deposunda; sorgu tek
+#            matris-vektör çarpımı (Cosine / Dot)
+DB_BACKEND = "qdrant"
+LOCAL_DB_PATH = BASE_DIR / "local_db"  # Collection başına bir alt klasör
+LOCAL_INDEX_MMAP = False  # True: vektör matrisi RAM'e kopyalanmaz, np.memmap ile okunur
+
+# Yerel vektör index türü (yeni collection'larda; mevcut collection kendi türüyle açılır):
+#   "flat" : Tam arama (tüm vektörler skorlanır)
+#   "hnsw"   : HNSW grafı ile yaklaşık arama (bkz. hnsw_index.py) - gecikme
+#              nokta sayısıyla doğrusal artmaz
+#   "ivf_pq" : IVF + product quantization (bkz. ivfpq_index.py) - RAM'de vektör
+#              başına ~100 byte kod, tam vektörler diskte (milyonlarca tarif için)
+# Recall / gecikme / bellek dengesi için: 5- Retriever Evaluation/ann_benchmark.py
+LOCAL_INDEX_TYPE = "flat"
+HNSW_M = 16  # Düğüm başına bağlantı (seviye 0'da 2*M; graf belleği ~ 2*M*4 byte / vektör)
+HNSW_EF_CONSTRUCTION = 200  # Eklemede aday listesi genişliği (kalite ↔ kurulum süresi)
+HNSW_EF_SEARCH = 64  # Aramada aday listesi genişliği (recall ↔ gecikme, yeniden kurmadan değişir)
+
+# IVF-PQ (merkezler ve kod kitapları embedding deposundaki ilk INDEX_TRAIN_SAMPLES vektörle eğitilir)
+IVF_NLIST = 256  # Kaba merkez (liste) sayısı (~ 4 * sqrt(vektör sayısı))
+IVF_NPROBE = 16  # Sorguda taranan liste sayısı (recall ↔ gecikme, yeniden kurmadan değişir)
+PQ_M = 64  # Vektör başına kod byte'ı (vektör boyutunu tam bölmeli)
+IVF_RERANK = 100  # Diskteki tam vektörlerle yeniden skorlanan aday sayısı (0: kapalı)
+
+# Eğitim gerektiren index'ler (IVF-PQ, kuantizasyon) için embedding deposundan alınan örnek
+INDEX_TRAIN_SAMPLES = 65536
+
+# ============================================================
+# VEKTÖR KUANTİZASYON AYARLARI
+# ============================================================
+# Vektörler RAM'de sıkıştırılmış kodlarla taranır, en iyi adaylar tam
+# (float32) vektörlerle yeniden skorlanır:
+#   None   : Kuantizasyon yok
+#   "int8" : Boyut başına ölçek / ofsetle skaler kuantizasyon (RAM ~4 kat azalır)
+# Qdrant'ta collection'ın ScalarQuantization ayarına karşılık gelir (gömülü
+# mod kuantizasyonu yok sayar, sunucu modunda etkilidir). Yerel backend'de
+# kuantize flat index kurulur (bkz. quantized_index.py; LOCAL_INDEX_TYPE="flat").
+QUANTIZATION = None
+QUANTIZATION_QUANTILE = 0.99  # Boyut başına aralık; dışında kalan uç değerler kırpılır
+QUANTIZATION_OVERSAMPLING = 4.0  # Tam vektörlerle yeniden skorlanan aday: top_k * oversampling
+
 # ============================================================
 # INDEXLEME AYARLARI
 # ============================================================
 BATCH_SIZE = 32  # Embedding batch boyutu
 INDEX_BATCH_SIZE = 100  # Qdrant'a yazma batch boyutu
 
+# Indexleme pipeline'ı: okuma → embedding → yazma aşamaları ayrı thread'lerde (bkz. index_pipeline.py)
+PIPELINE_QUEUE_SIZE = 4  # Aşamalar arası kuyrukta bekleyen en fazla batch
+UPLOAD_PARALLEL = 1  # Qdrant upload_points paralel yükleme süreci (sunucu modunda >1 olabilir)
+
+# Çok süreçli CPU embedding (index_all_recipes)
+EMBED_WORKERS = 0  # Worker süreç sayısı (0: tek süreç, havuz kullanılmaz)
+EMBED_WORKER_THREADS = None  # Worker başına torch thread sayısı (None: çekirdek / worker)
+
+# ============================================================
+# ADAPTİF BATCH AYARLARI
+# ============================================================
+# Açıksa embed_batch sabit batch boyutu yerine batch'leri token sayılarından
+# tahmin edilen aktivasyon belleğine göre oluşturur (bkz. adaptive_batch.py):
+# uzun metinler küçük, kısa metinler büyük batch'lerde; OOM'da küçültülür
+ADAPTIVE_BATCHING = True
+EMBED_MEMORY_BUDGET_MB = None  # Aktivasyon bütçesi (None: GPU boş belleğin %80'i, CPU kullanılabilir RAM'in %50'si)
+ADAPTIVE_MAX_BATCH_SIZE = 256  # Kısa metinlerde de aşılmayan batch üst sınırı
+
+# ============================================================
+# EMBEDDING DEPOSU AYARLARI
+# ============================================================
+# Indexleme önce embedding'leri sürümlü depoya yazar (v1, v2, ...),
+# index depodan kurulur. Aynı ayarlarla tekrar indexlemede model çalıştırılmaz.
+EMBEDDING_STORE_DIR = BASE_DIR / "embedding_store"
+EMBEDDING_SHARD_SIZE = 4096  # Shard başına vektör sayısı
+
+# ============================================================
+# CPU THREAD AYARLARI
+# ============================================================
+# 'python main.py tune' ile bu makinede ölçülen thread / batch ayarı.
+# Dosya varsa RecipeEmbedder yüklenirken uygulanır (yoksa torch varsayılanları).
+THREAD_CONFIG_FILE = BASE_DIR / "thread_config.json"
+TUNE_BATCH_SIZES = [8, 16, 32, 64]  # Throughput ölçümünde denenecek batch boyutları
+
 # ============================================================
 # ARAMA AYARLARI
 # ============================================================
 DEFAULT_TOP_K = 5  # Varsayılan sonuç sayısı
 SCORE_THRESHOLD = 0.3  # Minimum benzerlik skoru (0-1 arası)
 
+# ============================================================
+# SORGU MİKRO-BATCHING AYARLARI
+# ============================================================
+QUERY_BATCHING = False  # Eşzamanlı embed_query çağrılarını tek forward pass'te topla
+QUERY_BATCH_MAX_WAIT_MS = 5  # İlk sorgudan sonra en fazla bekleme süresi (ms)
+QUERY_BATCH_MAX_SIZE = 32  # Bir batch'teki en fazla sorgu sayısı
+
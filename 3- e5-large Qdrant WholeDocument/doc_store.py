@@ -0,0 +1,177 @@
+"""
+Tarif Doküman Deposu
+====================
+Tam tarifleri (başlık, URL, malzemeler, yapılış) ID ile saklayan SQLite
+deposu. Vektör index'i yalnızca ID ve vektör tutar; sonuçların tarif
+bilgileri buradan tek sorguyla okunur.
+
+- Her tablo: id INTEGER PRIMARY KEY, doc TEXT (JSON)
+- Aynı dosyada birden fazla tablo olabilir (örn: tarifler ve chunk'lar)
+- Filtreler SQLite JSON fonksiyonlarıyla (json_each / json_extract) uygulanır
+- Sadece bazı alanlar gerekiyorsa (örn: başlık) alanlar SQLite'ta çıkarılır,
+  tam doküman Python'da çözülmez
+
+NOT: Bu modül tüm retriever sistem klasörlerinde birebir aynıdır.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# SQLite tek sorguda en fazla bu kadar parametre kabul eder (eski sürümlerde 999)
+MAX_SQL_PARAMS = 900
+
+_TABLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_FIELD_NAME = _TABLE_NAME
+
+
+class DocumentStore:
+    """ID → JSON doküman deposu (SQLite)"""
+
+    def __init__(self, path: Path, table: str = "docs"):
+        """
+        Args:
+            path: SQLite dosyası (yoksa oluşturulur)
+            table: Tablo adı
+        """
+        if not _TABLE_NAME.match(table):
+            raise ValueError(f"Geçersiz tablo adı: {table}")
+
+        self.path = Path(path)
+        self.table = table
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Arama thread'lerinden de okunur (erişim kilitle sıralanır)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} (id INTEGER PRIMARY KEY, doc TEXT NOT NULL)")
+        self._conn.commit()
+
+    # =========================================================================
+    # YAZMA
+    # =========================================================================
+
+    def put_many(self, items: Iterable[Tuple[int, Dict[str, Any]]]) -> int:
+        """
+        Dokümanları ekle veya güncelle
+
+        Args:
+            items: (id, doküman) çiftleri
+
+        Returns:
+            Yazılan doküman sayısı
+        """
+        rows = [(int(doc_id), json.dumps(doc, ensure_ascii=False)) for doc_id, doc in items]
+        with self._lock:
+            self._conn.executemany(f"INSERT OR REPLACE INTO {self.table} (id, doc) VALUES (?, ?)", rows)
+            self._conn.commit()
+        return len(rows)
+
+    def delete_many(self, ids: Sequence[int]) -> int:
+        """Dokümanları sil"""
+        deleted = 0
+        with self._lock:
+            for chunk in _chunks(ids):
+                cursor = self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE id IN ({_placeholders(chunk)})", chunk
+                )
+                deleted += cursor.rowcount
+            self._conn.commit()
+        return deleted
+
+    def clear(self):
+        """Tüm dokümanları sil"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    # =========================================================================
+    # OKUMA
+    # =========================================================================
+
+    def get(self, doc_id: int) -> Optional[Dict[str, Any]]:
+        """Tek doküman (yoksa None)"""
+        return self.get_many([doc_id]).get(int(doc_id))
+
+    def get_many(self, ids: Sequence[int], fields: Optional[Sequence[str]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Dokümanları tek seferde oku: {id: doküman}
+
+        Args:
+            ids: Doküman ID'leri
+            fields: Sadece bu alanlar (None ise tam doküman)
+        """
+        ids = [int(i) for i in ids]
+        column = "doc" if fields is None else _json_object(fields)
+        result = {}
+        with self._lock:
+            for chunk in _chunks(ids):
+                rows = self._conn.execute(
+                    f"SELECT id, {column} FROM {self.table} WHERE id IN ({_placeholders(chunk)})", chunk
+                ).fetchall()
+                result.update((doc_id, json.loads(doc)) for doc_id, doc in rows)
+        return result
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def all_ids(self) -> List[int]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(f"SELECT id FROM {self.table} ORDER BY id")]
+
+    def ids_where(self, field: str, value: Any) -> List[int]:
+        """Alanı değere eşit olan dokümanların ID'leri"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM {self.table} WHERE json_extract(doc, ?) = ?", (f"$.{field}", value)
+            )
+            return [row[0] for row in rows]
+
+    def ids_matching_any(self, field: str, texts: Sequence[str]) -> List[int]:
+        """
+        Liste alanının herhangi bir elemanı metinlerden birini içeren dokümanlar
+
+        Qdrant'ın liste alanı üzerindeki MatchText koşulları (should) ile aynı
+        anlam: alt metin eşleşmesi, büyük/küçük harf duyarsız (ASCII).
+        """
+        if not texts:
+            return []
+        conditions = " OR ".join("item.value LIKE ?" for _ in texts)
+        params = [f"$.{field}"] + [f"%{text}%" for text in texts]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT d.id FROM {self.table} d, json_each(d.doc, ?) item WHERE {conditions}",
+                params
+            )
+            return [row[0] for row in rows]
+
+    def size_bytes(self) -> int:
+        """Dosya boyutu (WAL hariç)"""
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _json_object(fields: Sequence[str]) -> str:
+    """Alanları dokümandan çıkaran SQL ifadesi (json_object)"""
+    for field in fields:
+        if not _FIELD_NAME.match(field):
+            raise ValueError(f"Geçersiz alan adı: {field}")
+    return "json_object(" + ", ".join(f"'{field}', json_extract(doc, '$.{field}')" for field in fields) + ")"
+
+
+def _placeholders(values: Sequence) -> str:
+    return ", ".join("?" for _ in values)
+
+
+def _chunks(values: Sequence, size: int = MAX_SQL_PARAMS):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
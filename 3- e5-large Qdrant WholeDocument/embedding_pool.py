@@ -0,0 +1,136 @@
+"""
+Çok Süreçli Embedding Havuzu
+============================
+CPU'da indexleme için N adet embedding worker süreci başlatır.
+
+- Her worker kendi model kopyasını yükler
+- Her worker sabit sayıda torch thread'i ile çalışır
+- Batch'ler worker'lara dağıtılır, sonuçlar sırayla geri toplanır
+"""
+
+import os
+import multiprocessing as mp
+from collections import deque
+from typing import Iterable, Iterator, List, Tuple, Any, Optional
+
+# Worker süreç içindeki embedder (her süreçte bir tane)
+_worker_embed_fn = None
+
+
+def _init_worker(num_threads: int, method_name: str, memory_budget_fraction: float = 1.0):
+    """Worker sürecini hazırla: thread sayısını sabitle ve modeli yükle"""
+    global _worker_embed_fn
+
+    # torch import edilmeden önce thread havuzlarını sınırla
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    os.environ["MKL_NUM_THREADS"] = str(num_threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+    import torch
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Paralel iş başladıysa değiştirilemez
+
+    from embedder import RecipeEmbedder
+    # Adaptif batch bellek bütçesi worker'lar arasında bölünür
+    embedder = RecipeEmbedder(
+        apply_thread_settings=False,
+        memory_budget_fraction=memory_budget_fraction
+    )
+    _worker_embed_fn = getattr(embedder, method_name)
+
+
+def _embed_batch(batch: List[Any]) -> Any:
+    """Worker içinde tek bir batch'i embed et"""
+    return _worker_embed_fn(batch)
+
+
+class EmbeddingPool:
+    """Batch'leri birden fazla süreçte embed eden havuz"""
+
+    def __init__(
+        self,
+        num_workers: int,
+        threads_per_worker: Optional[int] = None,
+        method_name: str = "embed_recipes"
+    ):
+        """
+        Worker süreçlerini başlat
+
+        Args:
+            num_workers: Worker süreç sayısı
+            threads_per_worker: Worker başına torch thread sayısı
+                (None ise çekirdek sayısı worker'lara bölünür)
+            method_name: Worker'da çağrılacak RecipeEmbedder metodu
+        """
+        if num_workers < 1:
+            raise ValueError(f"Geçersiz worker sayısı: {num_workers}")
+
+        if threads_per_worker is None:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // num_workers)
+
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+
+        print(f"🔄 Embedding havuzu başlatılıyor: {num_workers} worker x {threads_per_worker} thread")
+
+        # fork + torch thread havuzları sorunlu olduğu için spawn kullan
+        ctx = mp.get_context("spawn")
+        self._pool = ctx.Pool(
+            processes=num_workers,
+            initializer=_init_worker,
+            initargs=(threads_per_worker, method_name, 1 / num_workers)
+        )
+
+    def imap(
+        self,
+        batches: Iterable[List[Any]],
+        max_pending: Optional[int] = None
+    ) -> Iterator[Tuple[List[Any], Any]]:
+        """
+        Batch'leri worker'lara dağıt, sonuçları giriş sırasıyla döndür
+
+        Bellekte en fazla max_pending batch bekler; böylece tüm veri
+        dosyası kuyruğa dolmadan sonuçlar DB writer'a akıtılabilir.
+
+        Yields:
+            (batch, embedding_sonucu) tuple'ları
+        """
+        max_pending = max_pending or self.num_workers * 2
+        pending = deque()
+
+        for batch in batches:
+            pending.append((batch, self._pool.apply_async(_embed_batch, (batch,))))
+
+            if len(pending) >= max_pending:
+                done_batch, result = pending.popleft()
+                yield done_batch, result.get()
+
+        while pending:
+            done_batch, result = pending.popleft()
+            yield done_batch, result.get()
+
+    def close(self):
+        """Worker süreçlerini kapat"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def terminate(self):
+        """Worker süreçlerini hemen sonlandır"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
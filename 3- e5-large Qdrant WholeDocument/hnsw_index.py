@@ -0,0 +1,460 @@
+"""
+HNSW Vektör Index'i
+===================
+Hierarchical Navigable Small World grafı ile yaklaşık (ANN) arama. Flat
+index tüm vektörleri skorlar (maliyet nokta sayısıyla doğrusal); HNSW sorguyu
+graf üzerinde açgözlü gezinerek birkaç yüz vektör skoruyla cevaplar.
+
+- Her vektör rastgele bir seviyeye atanır (seviye l olasılığı ~ M^-l)
+- Üst seviyeler seyrek "otoyol" katmanlarıdır; arama en üstten açgözlü iner
+- Seviye 0'da ef_search genişliğinde best-first arama yapılır
+
+Parametreler:
+    M               : Düğüm başına bağlantı (seviye 0'da 2*M)
+    ef_construction : Eklemede aday listesi genişliği (kalite ↔ kurulum süresi)
+    ef_search       : Aramada aday listesi genişliği (recall ↔ gecikme)
+
+Vektör dosyaları FlatIndex ile aynıdır (vectors.f32, ids.i64); graf ayrı
+dosyalarda tutulur:
+    hnsw_links0.npy : (n, 2*M) int32 seviye 0 komşuları (-1 ile dolgulu, mmap ile açılabilir)
+    hnsw_upper.npz  : Üst seviyelerin komşu listeleri (CSR)
+    hnsw.json       : Giriş noktası, en üst seviye, graftaki düğüm sayısı
+
+Eklemeler artımlıdır (yeni satırlar grafa bağlanır, güncellenen satırların
+komşuları yeniden seçilir); graf flush() / close() ile diske yazılır. Grafa
+yazılmadan kalan satırlar index açılırken grafa eklenir. Silinen düğümler
+graftan çıkarılır; komşusunu kaybeden düğümlerin komşuları yeniden seçilir.
+
+NOT: Bu modül tüm retriever sistem klasörlerinde birebir aynıdır.
+"""
+
+import heapq
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vector_index import FlatIndex, GATHER_RATIO, top_k_indices, write_atomic
+
+LINKS0_FILE = "hnsw_links0.npy"
+UPPER_FILE = "hnsw_upper.npz"
+GRAPH_META_FILE = "hnsw.json"
+
+# Varsayılan parametreler (index.json'da yoksa)
+DEFAULT_M = 16
+DEFAULT_EF_CONSTRUCTION = 200
+DEFAULT_EF_SEARCH = 64
+
+
+class HNSWIndex(FlatIndex):
+    """Float32 vektörler üzerinde HNSW graf araması"""
+
+    INDEX_TYPE = "hnsw"
+
+    def __init__(self, path: Path, mmap: bool = False, ef_search: Optional[int] = None, **search_params):
+        """
+        Mevcut index'i aç
+
+        Args:
+            path: Index klasörü
+            mmap: True ise vektör matrisi ve seviye 0 grafı np.memmap ile açılır
+            ef_search: Arama genişliği (None ise index.json'daki değer)
+            **search_params: Diğer index türlerinin arama ayarları (yok sayılır)
+        """
+        super().__init__(path, mmap=mmap)
+
+        self.M = int(self.meta.get("M", DEFAULT_M))
+        self.ef_construction = int(self.meta.get("ef_construction", DEFAULT_EF_CONSTRUCTION))
+        self.ef_search = int(ef_search or self.meta.get("ef_search", DEFAULT_EF_SEARCH))
+        self.seed = int(self.meta.get("seed", 0))
+        self._level_mult = 1.0 / math.log(max(self.M, 2))
+
+        self._load_graph()
+
+        # Seviye ataması tekrarlanabilir (aynı sırayla eklenen veri aynı grafı verir)
+        self._rng = np.random.default_rng([self.seed, self._graph_count])
+
+        # Vektörü yazılmış ama grafa eklenmemiş satırlar (yarıda kalan indexleme)
+        missing = len(self._ids) - self._graph_count
+        if missing > 0:
+            print(f"🔧 HNSW grafına eksik {missing:,} satır ekleniyor...")
+            for row in range(self._graph_count, len(self._ids)):
+                self._link(row)
+            self.flush()
+
+    @classmethod
+    def create(
+        cls,
+        path: Path,
+        dim: int,
+        metric: str = "Cosine",
+        mmap: bool = False,
+        M: int = DEFAULT_M,
+        ef_construction: int = DEFAULT_EF_CONSTRUCTION,
+        ef_search: int = DEFAULT_EF_SEARCH,
+        seed: int = 0
+    ) -> "HNSWIndex":
+        """Boş HNSW index'i oluştur (parametreler index.json'a yazılır)"""
+        return super().create(
+            path, dim, metric=metric, mmap=mmap,
+            M=M, ef_construction=ef_construction, ef_search=ef_search, seed=seed
+        )
+
+    # =========================================================================
+    # GRAF DEPOLAMA
+    # =========================================================================
+
+    def _load_graph(self):
+        """Grafı diskten yükle (yoksa boş graf)"""
+        self._links0 = np.full((0, 2 * self.M), -1, dtype=np.int32)
+        self._degree0 = np.zeros(0, dtype=np.int32)
+        self._levels = np.zeros(0, dtype=np.int8)
+        self._upper: List[Dict[int, List[int]]] = []  # seviye - 1 → {satır: komşular}
+        self._entry, self._max_level, self._graph_count = -1, -1, 0
+        self._dirty = False
+
+        meta_path = self.path / GRAPH_META_FILE
+        if not meta_path.exists():
+            return
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            graph_meta = json.load(f)
+        count = graph_meta["count"]
+
+        links0 = np.load(self.path / LINKS0_FILE, mmap_mode="r" if self.mmap else None)
+        self._links0 = links0[:count]
+        self._degree0 = (np.asarray(self._links0) >= 0).sum(axis=1).astype(np.int32)
+        self._levels = np.zeros(count, dtype=np.int8)
+
+        with np.load(self.path / UPPER_FILE) as upper:
+            for level in range(1, graph_meta["max_level"] + 1):
+                nodes = upper[f"nodes_{level}"].tolist()
+                offsets = upper[f"offsets_{level}"]
+                links = upper[f"links_{level}"]
+                self._upper.append({
+                    node: links[offsets[i]:offsets[i + 1]].tolist()
+                    for i, node in enumerate(nodes)
+                })
+                self._levels[nodes] = level
+
+        self._entry = graph_meta["entry"]
+        self._max_level = graph_meta["max_level"]
+        self._graph_count = count
+
+    def flush(self):
+        """Grafı diske yaz (dosyalar önce .tmp olarak yazılıp değiştirilir)"""
+        if not self._dirty:
+            return
+
+        count = self._graph_count
+        upper = {}
+        for level, neighbors in enumerate(self._upper, start=1):
+            nodes = sorted(neighbors)
+            lists = [neighbors[node] for node in nodes]
+            upper[f"nodes_{level}"] = np.array(nodes, dtype=np.int32)
+            upper[f"offsets_{level}"] = np.cumsum([0] + [len(l) for l in lists]).astype(np.int64)
+            upper[f"links_{level}"] = np.array([n for l in lists for n in l], dtype=np.int32)
+
+        write_atomic(self.path / LINKS0_FILE, lambda f: np.save(f, np.asarray(self._links0[:count])))
+        write_atomic(self.path / UPPER_FILE, lambda f: np.savez(f, **upper))
+        # Meta en son yazılır (graftaki düğüm sayısı bu dosyadan okunur)
+        graph_meta = {"count": count, "entry": self._entry, "max_level": self._max_level}
+        write_atomic(self.path / GRAPH_META_FILE, lambda f: f.write(json.dumps(graph_meta).encode()))
+
+        self._dirty = False
+
+    def _ensure_capacity(self, count: int):
+        """Seviye 0 dizilerini en az count satıra büyüt (memmap ise RAM'e kopyalanır)"""
+        if count <= len(self._links0) and not isinstance(self._links0, np.memmap):
+            return
+
+        capacity = max(count, 2 * len(self._links0), 1024)
+        links0 = np.full((capacity, 2 * self.M), -1, dtype=np.int32)
+        degree0 = np.zeros(capacity, dtype=np.int32)
+        levels = np.zeros(capacity, dtype=np.int8)
+
+        used = self._graph_count
+        links0[:used] = self._links0[:used]
+        degree0[:used] = self._degree0[:used]
+        levels[:used] = self._levels[:used]
+        self._links0, self._degree0, self._levels = links0, degree0, levels
+
+    def _neighbors(self, row: int, level: int) -> List[int]:
+        if level == 0:
+            return self._links0[row, :self._degree0[row]].tolist()
+        return self._upper[level - 1].get(row, [])
+
+    def _set_neighbors(self, row: int, level: int, neighbors: List[int]):
+        if level == 0:
+            self._links0[row] = -1
+            self._links0[row, :len(neighbors)] = neighbors
+            self._degree0[row] = len(neighbors)
+        else:
+            self._upper[level - 1][row] = list(neighbors)
+
+    def _max_links(self, level: int) -> int:
+        return 2 * self.M if level == 0 else self.M
+
+    # =========================================================================
+    # YAZMA
+    # =========================================================================
+
+    def add(self, ids: Sequence[int], vectors) -> int:
+        """
+        Vektörleri ekle ve grafa bağla (ID zaten varsa komşuları yeniden seçilir)
+
+        Returns:
+            Yazılan vektör sayısı
+        """
+        count = super().add(ids, vectors)
+
+        # Yeni satırlar artan sırayla (graf satır sırasıyla büyür)
+        for row in np.unique(self.rows_for(np.asarray(ids, dtype=np.int64))).tolist():
+            self._link(row)
+        self._dirty = True
+        return count
+
+    def _compact(self, keep: np.ndarray):
+        """Silinen satırları graftan çıkar ve kalan satır numaralarına göre yeniden yaz"""
+        count = self._graph_count
+        super()._compact(keep)
+
+        # Eski satır → yeni satır (silinenler -1)
+        new_row = np.cumsum(keep) - 1
+        new_row[~keep] = -1
+        graph_keep = keep[:count]
+
+        # Seviye 0: silinen komşular atılır, geçerli komşular başa kaydırılır
+        links0 = np.asarray(self._links0[:count])[graph_keep]
+        mapped = np.where(links0 >= 0, new_row[np.maximum(links0, 0)], -1).astype(np.int32)
+        damaged = set(np.flatnonzero(((links0 >= 0) & (mapped < 0)).any(axis=1)).tolist())
+        mapped = np.take_along_axis(mapped, np.argsort(mapped < 0, axis=1, kind="stable"), axis=1)
+
+        self._links0 = mapped
+        self._degree0 = (mapped >= 0).sum(axis=1).astype(np.int32)
+        self._levels = self._levels[:count][graph_keep]
+        self._graph_count = int(graph_keep.sum())
+
+        upper = []
+        for neighbors in self._upper:
+            level_links = {}
+            for node, links in neighbors.items():
+                if not keep[node]:
+                    continue
+                kept = [int(new_row[n]) for n in links if keep[n]]
+                if len(kept) < len(links):
+                    damaged.add(int(new_row[node]))
+                level_links[int(new_row[node])] = kept
+            upper.append(level_links)
+
+        # Giriş noktası silindiyse en üst seviyedeki kalan düğüm
+        self._max_level = int(self._levels.max()) if self._graph_count else -1
+        self._upper = upper[:max(self._max_level, 0)]
+        if self._entry >= 0 and keep[self._entry] and self._levels[new_row[self._entry]] == self._max_level:
+            self._entry = int(new_row[self._entry])
+        else:
+            self._entry = int(np.argmax(self._levels)) if self._graph_count else -1
+
+        self._dirty = True
+        for row in sorted(damaged):
+            self._link(row)
+
+    def _random_level(self) -> int:
+        return int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+
+    def _link(self, row: int):
+        """Satırı grafa bağla (yeni satır veya vektörü güncellenen satır)"""
+        if row >= self._graph_count:
+            level = self._random_level()
+            self._ensure_capacity(row + 1)
+            self._levels[row] = level
+            self._graph_count = row + 1
+            while len(self._upper) < level:
+                self._upper.append({})
+        else:
+            self._ensure_capacity(self._graph_count)
+            level = int(self._levels[row])
+
+        if self._entry < 0:
+            self._entry, self._max_level = row, level
+            return
+
+        vectors = self.matrix
+        query = vectors[row]
+
+        # Düğümün seviyesine kadar açgözlü iniş
+        current = [(float(vectors[self._entry] @ query), self._entry)]
+        for level_c in range(self._max_level, level, -1):
+            current = self._search_layer(query, current, 1, level_c)[:1]
+
+        for level_c in range(min(level, self._max_level), -1, -1):
+            found = self._search_layer(query, current, self.ef_construction, level_c)
+            candidates = [(score, node) for score, node in found if node != row]
+            neighbors = self._select_neighbors(candidates, self.M)
+
+            self._set_neighbors(row, level_c, neighbors)
+            for node in neighbors:
+                self._add_link(node, row, level_c)
+            current = found
+
+        if level > self._max_level:
+            self._entry, self._max_level = row, level
+
+    def _add_link(self, node: int, new: int, level: int):
+        """node'un komşularına new'i ekle (liste doluysa komşular yeniden seçilir)"""
+        neighbors = self._neighbors(node, level)
+        if new in neighbors:
+            return
+        if len(neighbors) < self._max_links(level):
+            self._set_neighbors(node, level, neighbors + [new])
+            return
+
+        candidates = neighbors + [new]
+        scores = self.matrix[candidates] @ self.matrix[node]
+        order = np.argsort(-scores, kind="stable")
+        ranked = [(float(scores[i]), candidates[i]) for i in order]
+        self._set_neighbors(node, level, self._select_neighbors(ranked, self._max_links(level)))
+
+    def _select_neighbors(self, candidates: List[Tuple[float, int]], m: int) -> List[int]:
+        """
+        Komşu seçme sezgiseli (HNSW makalesi, Algoritma 4)
+
+        Aday, seçilmiş bir komşuya sorgudan daha yakınsa atlanır (graf farklı
+        yönlere bağlanır); boş kalan yerler atlanan en yakın adaylarla doldurulur.
+
+        Args:
+            candidates: (skor, satır) - skora göre azalan
+            m: En fazla komşu sayısı
+        """
+        if len(candidates) <= m:
+            return [node for _, node in candidates]
+
+        rows = [node for _, node in candidates]
+        block = self.matrix[rows]
+        pairwise = block @ block.T
+
+        # closest[i]: adayın seçilmiş komşulara en yüksek benzerliği
+        closest = np.full(len(rows), -np.inf, dtype=np.float32)
+        selected, pruned = [], []
+        for i, (score, _) in enumerate(candidates):
+            if len(selected) >= m:
+                break
+            if closest[i] > score:
+                pruned.append(i)
+            else:
+                selected.append(i)
+                np.maximum(closest, pairwise[i], out=closest)
+
+        selected += pruned[:m - len(selected)]
+        return [rows[i] for i in selected]
+
+    # =========================================================================
+    # OKUMA
+    # =========================================================================
+
+    def _search_layer(self, query: np.ndarray, entries: List[Tuple[float, int]], ef: int, level: int) -> List[Tuple[float, int]]:
+        """
+        Tek seviyede best-first arama
+
+        Args:
+            entries: Başlangıç düğümleri (skor, satır)
+            ef: Tutulacak en iyi sonuç sayısı
+
+        Returns:
+            (skor, satır) listesi - skora göre azalan, en fazla ef eleman
+        """
+        vectors = self.matrix
+        visited = {node for _, node in entries}
+        candidates = [(-score, node) for score, node in entries]  # en yüksek skor önce
+        results = list(entries)  # en düşük skor önce (min-heap)
+        heapq.heapify(candidates)
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            neg_score, node = heapq.heappop(candidates)
+            if -neg_score < results[0][0] and len(results) >= ef:
+                break
+
+            neighbors = [n for n in self._neighbors(node, level) if n not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+
+            # Komşular tek matris-vektör çarpımıyla skorlanır
+            for score, neighbor in zip((vectors[neighbors] @ query).tolist(), neighbors):
+                if len(results) < ef or score > results[0][0]:
+                    heapq.heappush(candidates, (-score, neighbor))
+                    heapq.heappush(results, (score, neighbor))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+
+        return sorted(results, reverse=True)
+
+    def _knn(self, query: np.ndarray, ef: int) -> List[Tuple[float, int]]:
+        """Sorguya en yakın ef düğüm (skor, satır)"""
+        current = [(float(self.matrix[self._entry] @ query), self._entry)]
+        for level in range(self._max_level, 0, -1):
+            current = self._search_layer(query, current, 1, level)[:1]
+        return self._search_layer(query, current, max(ef, 1), 0)
+
+    def search(
+        self,
+        query,
+        top_k: int,
+        allowed_ids: Optional[Sequence[int]] = None,
+        score_threshold: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Graf üzerinde yaklaşık arama (FlatIndex.search ile aynı arayüz)
+
+        Filtrede izin verilen satırlar azsa (GATHER_RATIO altı) sadece onlar
+        tam skorlanır; aksi halde ef izin oranıyla büyütülüp sonuçlar süzülür.
+        """
+        if not len(self._ids):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        ef = max(self.ef_search, top_k)
+        allowed = None
+        if allowed_ids is not None:
+            rows = self.rows_for(allowed_ids)
+            if len(rows) < GATHER_RATIO * len(self._ids):
+                return super().search(query, top_k, allowed_ids=allowed_ids, score_threshold=score_threshold)
+            allowed = np.zeros(len(self._ids), dtype=bool)
+            allowed[rows] = True
+            ef = int(ef * len(self._ids) / len(rows))
+
+        found = self._knn(self.prepare_query(query), ef)
+        rows = np.array([node for _, node in found], dtype=np.int64)
+        scores = np.array([score for score, _ in found], dtype=np.float32)
+
+        if allowed is not None:
+            keep = allowed[rows]
+            rows, scores = rows[keep], scores[keep]
+
+        best = top_k_indices(scores, top_k)
+        ids, scores = self._ids[rows[best]], scores[best]
+
+        if score_threshold is not None:
+            keep = scores >= score_threshold
+            ids, scores = ids[keep], scores[keep]
+        return ids, scores
+
+    def stats(self) -> Dict[str, Any]:
+        """Index boyutu, graf belleği ve parametreler"""
+        stats = super().stats()
+        graph_bytes = self._graph_count * 2 * self.M * 4 + sum(
+            len(neighbors) * 4 for level in self._upper for neighbors in level.values()
+        )
+        stats.update(
+            graph_bytes=graph_bytes,
+            ram_bytes=stats["ram_bytes"] + graph_bytes,
+            M=self.M,
+            ef_construction=self.ef_construction,
+            ef_search=self.ef_search,
+            max_level=self._max_level
+        )
+        return stats
@@ -0,0 +1,365 @@
+"""
+IVF-PQ Vektör Index'i
+=====================
+1024 boyutlu float32 vektör 4 KB'tır; milyonlarca tarifte matris RAM'e
+sığmaz. IVF-PQ vektörleri RAM'de birkaç on byte'lık kodlarla tutar:
+
+- IVF (inverted file): k-means ile nlist kaba merkez; her vektör en yakın
+  merkezin listesine düşer, sorgu sadece en yakın nprobe listeyi tarar
+- PQ (product quantization): vektörün merkezine göre farkı (residual) m alt
+  vektöre bölünür; her alt vektör 256 elemanlı kod kitabında 1 byte'lık kodla
+  temsil edilir (m=64: vektör başına 64 byte)
+- ADC (asimetrik skor): sorgu sıkıştırılmaz; sorgu alt vektörlerinin kod
+  kitaplarıyla iç çarpım tablosu (m x 256) sorgu başına bir kez hesaplanır,
+  aday skoru q·merkez + tablodan okunan m değerin toplamıdır
+
+Yeniden sıralama (rerank > 0): ADC'nin en iyi rerank adayı diskteki tam
+vektörlerle (np.memmap, RAM'e yüklenmez) tam skorlanır.
+
+Dosyalar (FlatIndex dosyalarına ek olarak; tam vektörler diskte kalır):
+    ivfpq.npz       : Kaba merkezler ve PQ kod kitapları (train ile)
+    ivfpq_codes.u8  : (n, m) uint8 PQ kodları
+    ivfpq_lists.i32 : Satır başına liste (merkez) numarası
+
+RAM: vektör başına m byte kod + 8 byte liste yapıları + 24 byte ID eşlemesi
+(m=64: 96 byte). Index vektör eklenmeden önce train() ile eğitilmelidir.
+
+NOT: Bu modül tüm retriever sistem klasörlerinde birebir aynıdır.
+"""
+
+import math
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vector_index import FlatIndex, GATHER_RATIO, grow_rows, read_rows, top_k_indices, write_atomic
+
+MODEL_FILE = "ivfpq.npz"
+CODES_FILE = "ivfpq_codes.u8"
+LISTS_FILE = "ivfpq_lists.i32"
+
+CODEBOOK_SIZE = 256  # 8 bit kod
+KMEANS_ITERATIONS = 20
+ASSIGN_BATCH_SIZE = 16384  # Merkez atamasında tek seferde işlenen vektör
+
+# Varsayılan parametreler (index.json'da yoksa)
+DEFAULT_NLIST = 256
+DEFAULT_M = 64
+DEFAULT_NPROBE = 16
+DEFAULT_RERANK = 100
+
+
+def nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Her vektörün Öklid olarak en yakın merkezi (parçalar halinde)"""
+    # argmin ||x - c||² = argmax (x·c - ||c||² / 2)
+    half_norms = 0.5 * (centroids * centroids).sum(axis=1)
+    assignment = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BATCH_SIZE):
+        block = vectors[start:start + ASSIGN_BATCH_SIZE] @ centroids.T - half_norms
+        assignment[start:start + len(block)] = block.argmax(axis=1)
+    return assignment
+
+
+def kmeans(vectors: np.ndarray, n_clusters: int, iterations: int = KMEANS_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """
+    Öklid k-means (Lloyd)
+
+    Boş kalan merkezler rastgele örneklerle yeniden başlatılır.
+
+    Returns:
+        (min(n_clusters, örnek sayısı), boyut) float32 merkezler
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = nearest_centroids(vectors, centroids)
+
+        # Küme toplamları: atamaya göre sırala, ardışık blokları topla
+        order = np.argsort(assignment, kind="stable")
+        sorted_assignment = assignment[order]
+        starts = np.flatnonzero(np.r_[True, sorted_assignment[1:] != sorted_assignment[:-1]])
+        clusters = sorted_assignment[starts]
+        counts = np.diff(np.r_[starts, len(order)])
+        centroids[clusters] = np.add.reduceat(vectors[order], starts, axis=0) / counts[:, None]
+
+        empty = np.setdiff1d(np.arange(n_clusters), clusters)
+        if len(empty):
+            centroids[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+
+    return centroids
+
+
+class IVFPQIndex(FlatIndex):
+    """PQ kodları üzerinde IVF araması (tam vektörler diskte)"""
+
+    INDEX_TYPE = "ivf_pq"
+
+    def __init__(
+        self,
+        path: Path,
+        mmap: bool = True,
+        nprobe: Optional[int] = None,
+        rerank: Optional[int] = None,
+        **search_params
+    ):
+        """
+        Mevcut index'i aç
+
+        Args:
+            path: Index klasörü
+            mmap: Yok sayılır (tam vektörler her zaman np.memmap ile okunur)
+            nprobe: Taranacak liste sayısı (None ise index.json'daki değer)
+            rerank: Tam vektörle yeniden skorlanacak aday (0: kapalı, None ise index.json)
+            **search_params: Diğer index türlerinin arama ayarları (yok sayılır)
+        """
+        super().__init__(path, mmap=True)
+
+        self.nlist = int(self.meta.get("nlist", DEFAULT_NLIST))
+        self.m = int(self.meta.get("m", DEFAULT_M))
+        self.nprobe = int(nprobe or self.meta.get("nprobe", DEFAULT_NPROBE))
+        self.rerank = int(self.meta.get("rerank", DEFAULT_RERANK) if rerank is None else rerank)
+        self.seed = int(self.meta.get("seed", 0))
+        self.dsub = self.dim // self.m
+
+        self.centroids = None
+        self.codebooks = None
+        if (self.path / MODEL_FILE).exists():
+            with np.load(self.path / MODEL_FILE) as model:
+                self.centroids = model["centroids"]
+                self.codebooks = model["codebooks"]
+
+        # Kodlar ve listeler (kapasite ikiye katlanarak büyür; geçerli kısım [:len])
+        self._codes = read_rows(self.path / CODES_FILE, np.uint8, self.m)
+        self._lists = read_rows(self.path / LISTS_FILE, np.int32)
+        self._coded = min(len(self._codes), len(self._lists))
+        self._list_rows = None  # Liste sırasına dizilmiş satırlar (ilk aramada)
+        self._list_offsets = None
+
+        # Vektörü yazılmış ama kodlanmamış satırlar (yarıda kalan indexleme)
+        missing = len(self._ids) - self._coded
+        if missing > 0 and self.is_trained:
+            print(f"🔧 IVF-PQ: kodlanmamış {missing:,} satır kodlanıyor...")
+            self._encode_rows(self._coded, len(self._ids))
+
+    @classmethod
+    def create(
+        cls,
+        path: Path,
+        dim: int,
+        metric: str = "Cosine",
+        mmap: bool = True,
+        nlist: int = DEFAULT_NLIST,
+        m: int = DEFAULT_M,
+        nprobe: int = DEFAULT_NPROBE,
+        rerank: int = DEFAULT_RERANK,
+        seed: int = 0
+    ) -> "IVFPQIndex":
+        """Boş (eğitilmemiş) IVF-PQ index'i oluştur (parametreler index.json'a yazılır)"""
+        if dim % m:
+            raise ValueError(f"Vektör boyutu ({dim}) PQ alt vektör sayısına ({m}) tam bölünmeli")
+        return super().create(
+            path, dim, metric=metric, mmap=True,
+            nlist=nlist, m=m, nprobe=nprobe, rerank=rerank, seed=seed
+        )
+
+    # =========================================================================
+    # EĞİTİM VE KODLAMA
+    # =========================================================================
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, vectors):
+        """
+        Kaba merkezleri ve PQ kod kitaplarını örnek vektörlerle eğit
+
+        Index'te vektör varsa yeni modelle yeniden kodlanır.
+
+        Args:
+            vectors: (n, dim) örnekler (örn: embedding deposundan)
+        """
+        sample = self._prepare(vectors)
+        print(f"🎯 IVF-PQ eğitiliyor: {len(sample):,} örnek, {self.nlist} liste, "
+              f"{self.m} alt vektör x {CODEBOOK_SIZE} kod...")
+
+        centroids = kmeans(sample, self.nlist, seed=self.seed)
+        residuals = sample - centroids[nearest_centroids(sample, centroids)]
+        codebooks = np.stack([
+            kmeans(residuals[:, j * self.dsub:(j + 1) * self.dsub], CODEBOOK_SIZE, seed=self.seed + 1 + j)
+            for j in range(self.m)
+        ])
+
+        self.centroids, self.codebooks = centroids, codebooks
+        np.savez(self.path / MODEL_FILE, centroids=centroids, codebooks=codebooks)
+
+        if len(self._ids):
+            self._coded = 0
+            self._encode_rows(0, len(self._ids))
+
+    def _encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vektörlerin (liste numaraları, PQ kodları)"""
+        if not self.is_trained:
+            raise RuntimeError("IVF-PQ index'i eğitilmemiş: vektör eklemeden önce train() çağrılmalı")
+
+        lists = nearest_centroids(vectors, self.centroids)
+        residuals = vectors - self.centroids[lists]
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        for j in range(self.m):
+            codes[:, j] = nearest_centroids(residuals[:, j * self.dsub:(j + 1) * self.dsub], self.codebooks[j])
+        return lists.astype(np.int32), codes
+
+    def _encode_rows(self, start: int, end: int):
+        """Diskteki [start, end) satırlarını kodla ve kod dosyalarını yeniden yaz"""
+        matrix = self.matrix
+        for block_start in range(start, end, ASSIGN_BATCH_SIZE):
+            block_end = min(end, block_start + ASSIGN_BATCH_SIZE)
+            lists, codes = self._encode(np.asarray(matrix[block_start:block_end]))
+            self._store_codes(block_start, lists, codes)
+        self._coded = end
+
+        self._codes[:end].tofile(self.path / CODES_FILE)
+        self._lists[:end].tofile(self.path / LISTS_FILE)
+        self._list_rows = None
+
+    def _store_codes(self, start: int, lists: np.ndarray, codes: np.ndarray):
+        """Kodları RAM dizilerine yaz (gerekirse kapasiteyi büyüt)"""
+        end = start + len(codes)
+        self._codes = grow_rows(self._codes, end)
+        self._lists = grow_rows(self._lists, end)
+        self._codes[start:end] = codes
+        self._lists[start:end] = lists
+
+    def _append(self, ids: np.ndarray, vectors: np.ndarray):
+        """Yeni satırları kodla ve vektör / kod dosyalarının sonuna ekle"""
+        lists, codes = self._encode(vectors)
+        start = len(self._ids)
+        super()._append(ids, vectors)
+
+        with open(self.path / CODES_FILE, "ab") as f:
+            f.write(codes.tobytes())
+        with open(self.path / LISTS_FILE, "ab") as f:
+            f.write(lists.tobytes())
+        self._store_codes(start, lists, codes)
+        self._coded = len(self._ids)
+        self._list_rows = None
+
+    def _overwrite(self, rows, vectors: np.ndarray):
+        """Güncellenen satırları yeniden kodla (liste değişebilir)"""
+        lists, codes = self._encode(vectors)
+        super()._overwrite(rows, vectors)
+
+        with open(self.path / CODES_FILE, "r+b") as codes_file, open(self.path / LISTS_FILE, "r+b") as lists_file:
+            for row, row_codes, row_list in zip(rows, codes, lists):
+                codes_file.seek(int(row) * self.m)
+                codes_file.write(row_codes.tobytes())
+                lists_file.seek(int(row) * 4)
+                lists_file.write(row_list.tobytes())
+
+        self._codes[rows] = codes
+        self._lists[rows] = lists
+        self._list_rows = None
+
+    def _compact(self, keep: np.ndarray):
+        """Silinen satırların kodlarını ve liste numaralarını da çıkar"""
+        super()._compact(keep)
+        coded = keep[:self._coded]
+        self._codes = self._codes[:self._coded][coded]
+        self._lists = self._lists[:self._coded][coded]
+        self._coded = len(self._codes)
+        write_atomic(self.path / CODES_FILE, lambda f: f.write(self._codes.tobytes()))
+        write_atomic(self.path / LISTS_FILE, lambda f: f.write(self._lists.tobytes()))
+        self._list_rows = None
+
+    # =========================================================================
+    # OKUMA
+    # =========================================================================
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(liste sırasına dizilmiş satırlar, liste başlangıçları) - yazmadan sonra yeniden kurulur"""
+        if self._list_rows is None:
+            lists = self._lists[:self._coded]
+            self._list_rows = np.argsort(lists, kind="stable").astype(np.int32)
+            self._list_offsets = np.searchsorted(lists[self._list_rows], np.arange(len(self.centroids) + 1))
+        return self._list_rows, self._list_offsets
+
+    def _adc_scores(self, query: np.ndarray, coarse: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Satırların ADC skorları: q·merkez + Σ_j tablo[j, kod_j]"""
+        table = np.einsum("jd,jkd->jk", query.reshape(self.m, self.dsub), self.codebooks)
+        codes = self._codes[rows]
+        return coarse[self._lists[rows]] + table[np.arange(self.m), codes].sum(axis=1)
+
+    def search(
+        self,
+        query,
+        top_k: int,
+        allowed_ids: Optional[Sequence[int]] = None,
+        score_threshold: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        En yakın nprobe listede ADC araması (FlatIndex.search ile aynı arayüz)
+
+        Filtrede izin verilen satırlar azsa (GATHER_RATIO altı) listeler yerine
+        doğrudan o satırlar skorlanır; aksi halde nprobe izin oranıyla büyütülür.
+        """
+        if not self._coded:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        query = self.prepare_query(query)
+        coarse = self.centroids @ query
+        nprobe = self.nprobe
+
+        candidates, allowed = None, None
+        if allowed_ids is not None:
+            allowed_rows = self.rows_for(allowed_ids)
+            if len(allowed_rows) < GATHER_RATIO * self._coded:
+                candidates = allowed_rows
+            else:
+                allowed = np.zeros(self._coded, dtype=bool)
+                allowed[allowed_rows] = True
+                nprobe = math.ceil(nprobe * self._coded / len(allowed_rows))
+
+        if candidates is None:
+            list_rows, offsets = self._inverted_lists()
+            probe = top_k_indices(coarse, nprobe)
+            candidates = np.concatenate([list_rows[offsets[l]:offsets[l + 1]] for l in probe])
+            if allowed is not None:
+                candidates = candidates[allowed[candidates]]
+
+        scores = self._adc_scores(query, coarse, candidates)
+        best = top_k_indices(scores, max(top_k, self.rerank))
+        rows, scores = candidates[best], scores[best]
+
+        # Yeniden sıralama: adaylar diskteki tam vektörlerle (satır sırasıyla okunur)
+        if self.rerank:
+            scores = self.exact_scores(rows, query)
+
+        best = top_k_indices(scores, top_k)
+        ids, scores = self._ids[rows[best]], scores[best]
+
+        if score_threshold is not None:
+            keep = scores >= score_threshold
+            ids, scores = ids[keep], scores[keep]
+        return ids, scores
+
+    def stats(self) -> Dict[str, Any]:
+        """Index boyutu, RAM'deki kodlar ve parametreler"""
+        stats = super().stats()
+        model_bytes = 0
+        if self.is_trained:
+            model_bytes = self.centroids.nbytes + self.codebooks.nbytes
+        stats.update(
+            ram_bytes=stats["ram_bytes"] + self._coded * (self.m + 8) + model_bytes,
+            code_bytes=self._coded * self.m,
+            trained=self.is_trained,
+            nlist=self.nlist,
+            m=self.m,
+            nprobe=self.nprobe,
+            rerank=self.rerank
+        )
+        return stats
+
@@ -0,0 +1,131 @@
+"""
+Sorgu Mikro-Batching Modülü
+===========================
+Eşzamanlı gelen sorgu metinlerini birkaç milisaniye toplayıp
+tek bir batch forward pass ile embed eder.
+
+- Çağıranlar Future (veya asyncio) ile sonucu bekler
+- İlk sorgudan sonra en fazla max_wait_ms beklenir
+- Bir batch en fazla max_batch_size sorgu içerir
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from queue import Queue, Empty
+from typing import Callable, List, Dict, Any
+
+# Kuyruğu kapatmak için işaret
+_STOP = object()
+
+
+class QueryBatcher:
+    """Eşzamanlı sorguları mikro-batch'lere toplayan zamanlayıcı"""
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        max_wait_ms: float = 5,
+        max_batch_size: int = 32
+    ):
+        """
+        Arka plan thread'ini başlat
+
+        Args:
+            embed_fn: Metin listesini vektör listesine dönüştüren fonksiyon
+            max_wait_ms: İlk sorgudan sonra batch için en fazla bekleme (ms)
+            max_batch_size: Bir forward pass'teki en fazla sorgu sayısı
+        """
+        self.embed_fn = embed_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+
+        self._queue = Queue()
+        self._batches = 0
+        self._queries = 0
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="query-batcher",
+            daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Sorguyu kuyruğa ekle, sonucu taşıyan Future döndür"""
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str, timeout: float = None) -> List[float]:
+        """Sorguyu embed et (batch tamamlanana kadar bekler)"""
+        return self.submit(text).result(timeout)
+
+    async def embed_async(self, text: str) -> List[float]:
+        """Sorguyu asyncio içinden embed et"""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _run(self):
+        """Kuyruktan batch topla ve embed et"""
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            items = [first]
+            stop = False
+            deadline = time.perf_counter() + self.max_wait
+
+            # Süre dolana veya batch dolana kadar topla
+            while len(items) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                items.append(item)
+
+            self._flush(items)
+
+            if stop:
+                return
+
+    def _flush(self, items: List[tuple]):
+        """Toplanan sorguları tek forward pass ile embed et"""
+        # İptal edilen istekleri atla
+        items = [(text, f) for text, f in items if f.set_running_or_notify_cancel()]
+        if not items:
+            return
+
+        try:
+            vectors = self.embed_fn([text for text, _ in items])
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        for (_, future), vector in zip(items, vectors):
+            future.set_result(vector)
+
+        self._batches += 1
+        self._queries += len(items)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batch istatistiklerini döndür"""
+        return {
+            "batches": self._batches,
+            "queries": self._queries,
+            "avg_batch_size": self._queries / self._batches if self._batches else 0.0
+        }
+
+    def close(self):
+        """Bekleyen sorguları işle ve thread'i durdur"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
@@ -8,22 +8,45 @@ from typing import List, Dict, Any, Optional
 from config import DEFAULT_TOP_K, SCORE_THRESHOLD
 from embedder import get_embedder
 from database import get_database
+from ingredient_index import IngredientFilter
 
 
 class RecipeSearcher:
     """Tarif arama sınıfı"""
     
-    def __init__(self):
-        """Embedder ve database bağlantılarını başlat"""
-        self.embedder = get_embedder()
+    def __init__(self, lazy: bool = False):
+        """
+        Database bağlantısını başlat ve aramanın gerektirdiği modeli hazırla
+        
+        Args:
+            lazy: True ise model ilk sorguda hazırlanır (main.py search: model arka
+                planda yüklenirken prompt beklemez). Varsayılan olarak her şey burada
+                yüklenir; sys.path'i sonradan geri alan çağıranlar (değerlendirme,
+                RAG pipeline) tek başına sorgu çalıştırabilen bir searcher alır.
+        """
+        self._embedder = None
         self.db = get_database()
+        if not lazy:
+            self.prepare()
+    
+    @property
+    def embedder(self):
+        """Embedder'ı ilk kullanımda al (arka planda yükleniyorsa bekler)"""
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+    
+    def prepare(self):
+        """Sorgu modelini şimdi yükle"""
+        self.embedder
     
     def search(
         self, 
         query: str, 
         top_k: int = DEFAULT_TOP_K,
         score_threshold: float = None,
-        ingredient_filter: List[str] = None
+        ingredient_filter: List[str] = None,
+        hydrate: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Tarif ara
@@ -32,7 +55,10 @@ class RecipeSearcher:
             query: Kullanıcı sorgusu (örn: "tavuklu makarna", "elimde patates var")
             top_k: Döndürülecek sonuç sayısı
             score_threshold: Minimum benzerlik skoru
-            ingredient_filter: Belirli malzemeleri içeren tarifleri filtrele
+            ingredient_filter: Malzeme filtresi - liste (herhangi biri) veya
+                {"any": [...], "all": [...], "none": [...]} (bkz. ingredient_index.py)
+            hydrate: False ise sadece ID, skor ve başlık döner (tam tarif doküman
+                deposundan okunmaz; örn: retrieval değerlendirmesi)
         
         Returns:
             Bulunan tarifler listesi
@@ -48,7 +74,50 @@ class RecipeSearcher:
             ingredient_filter=ingredient_filter
         )
         
-        return results
+        # Tam tarif sadece döndürülen sonuçlar için okunur
+        return self.db.hydrate(results) if hydrate else results
+    
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: int = DEFAULT_TOP_K,
+        score_threshold: float = None,
+        ingredient_filters: Optional[List[Optional[IngredientFilter]]] = None,
+        hydrate: bool = True
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla sorguyu birlikte ara
+        
+        Sorgular tek batch'te embed edilir ve veritabanında tek çağrıyla
+        skorlanır (search'ü sorgu başına çağırmaktan çok daha hızlı).
+        
+        Args:
+            queries: Kullanıcı sorguları
+            top_k: Sorgu başına sonuç sayısı
+            score_threshold: Minimum benzerlik skoru
+            ingredient_filters: Sorgu başına malzeme filtresi (None: filtre yok)
+            hydrate: False ise sadece ID, skor ve başlık döner
+        
+        Returns:
+            Sorgu başına bulunan tarifler listesi (sorgu sırasıyla)
+        """
+        if not queries:
+            return []
+        
+        # Tüm sorgular tek forward pass'te (query prefix otomatik eklenir)
+        query_vectors = self.embedder.embed_queries(queries)
+        
+        batch = self.db.search_batch(
+            query_vectors=query_vectors,
+            top_k=top_k,
+            score_threshold=score_threshold or SCORE_THRESHOLD,
+            ingredient_filters=ingredient_filters
+        )
+        
+        # Tüm sonuçların tam tarifleri tek sorguda okunur (listeler yerinde güncellenir)
+        if hydrate:
+            self.db.hydrate([r for results in batch for r in results])
+        return batch
     
     def search_by_ingredients(
         self, 
@@ -120,7 +189,7 @@ class RecipeSearcher:
         results = self.db.search(query_vector=query_vector, top_k=top_k + 1)
         
         # Kendisini çıkar
-        return [r for r in results if r['id'] != recipe_id][:top_k]
+        return self.db.hydrate([r for r in results if r['id'] != recipe_id][:top_k])
 
 
 def format_recipe_result(recipe: Dict[str, Any], show_instructions: bool = False) -> str:
@@ -178,11 +247,11 @@ def format_search_results(
 # Singleton instance
 _searcher_instance = None
 
-def get_searcher() -> RecipeSearcher:
-    """Searcher singleton instance döndür"""
+def get_searcher(lazy: bool = False) -> RecipeSearcher:
+    """Searcher singleton instance döndür (lazy: bkz. RecipeSearcher)"""
     global _searcher_instance
     if _searcher_instance is None:
-        _searcher_instance = RecipeSearcher()
+        _searcher_instance = RecipeSearcher(lazy=lazy)
     return _searcher_instance
 
 
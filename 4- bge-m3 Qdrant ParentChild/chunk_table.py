@@ -0,0 +1,147 @@
+"""
+Chunk → Parent Offset Tablosu
+=============================
+Tarif başına değişken sayıda chunk için point ID'lerini yönetir.
+
+Chunk'lar tarif sırasıyla ardışık ID alır; tablo yalnızca her tarifin
+ilk chunk ID'sini tutar (CSR formatındaki indptr gibi):
+
+    offsets[p]                     : p. tarifin ilk chunk ID'si
+    offsets[p + 1] - offsets[p]    : p. tarifin chunk sayısı
+    offsets[-1]                    : toplam chunk sayısı
+
+- Tarif başına 8 byte (array('q')), 100 bin tarif için ~800 KB
+- chunk → parent: ikili arama (bisect / np.searchsorted)
+- Sabit chunk sayısında (eski düzen) ID'ler parent_id * n + chunk_idx ile aynıdır
+- Silinen tariflerin ID'leri boş aralık (0 chunk) olarak kalır
+"""
+
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Any, Iterable
+
+import numpy as np
+
+
+class ChunkTable:
+    """Tarif (parent) → chunk ID aralığı tablosu"""
+
+    def __init__(self, offsets: Iterable[int] = (0,)):
+        self.offsets = array('q', offsets)
+
+    @classmethod
+    def fixed(cls, num_parents: int, chunks_per_parent: int) -> "ChunkTable":
+        """Her tarifte aynı sayıda chunk olan tablo"""
+        return cls(range(0, (num_parents + 1) * chunks_per_parent, chunks_per_parent))
+
+    @classmethod
+    def from_counts(cls, parent_ids: Iterable[int], chunk_counts: Iterable[int]) -> "ChunkTable":
+        """
+        Verilen tariflere chunk aralığı ayrılmış tablo
+
+        Tarifler herhangi bir sırayla verilebilir; listede olmayan ID'ler
+        boş aralık alır. Ayrılan tarifler allocate ile aynı chunk sayısıyla yazılır.
+        """
+        parent_ids = np.asarray(list(parent_ids), dtype=np.int64)
+        sizes = np.zeros(int(parent_ids.max()) + 1 if len(parent_ids) else 0, dtype=np.int64)
+        sizes[parent_ids] = np.asarray(list(chunk_counts), dtype=np.int64)
+        return cls(np.concatenate([[0], np.cumsum(sizes)]).tolist())
+
+    @classmethod
+    def load(cls, path: Path) -> "ChunkTable":
+        """Kayıtlı tabloyu yükle"""
+        return cls(np.load(path).tolist())
+
+    def save(self, path: Path):
+        """Tabloyu .npy olarak kaydet"""
+        np.save(path, self.as_array())
+
+    def as_array(self) -> np.ndarray:
+        """Offset'lerin numpy görünümü (kopyasız)"""
+        return np.frombuffer(self.offsets, dtype=np.int64)
+
+    @property
+    def num_parents(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_chunks(self) -> int:
+        return self.offsets[-1]
+
+    def chunk_range(self, parent_id: int) -> range:
+        """Tarifin chunk ID aralığı"""
+        if not 0 <= parent_id < self.num_parents:
+            raise KeyError(f"Tarif bulunamadı: parent_id={parent_id}")
+        return range(self.offsets[parent_id], self.offsets[parent_id + 1])
+
+    def parent_of(self, chunk_id: int) -> int:
+        """Chunk'ın ait olduğu tarif"""
+        if not 0 <= chunk_id < self.num_chunks:
+            raise KeyError(f"Chunk bulunamadı: chunk_id={chunk_id}")
+        return bisect_right(self.offsets, chunk_id) - 1
+
+    def parents_of(self, chunk_ids) -> np.ndarray:
+        """Birden fazla chunk'ın tarifleri (vektörel)"""
+        return np.searchsorted(self.as_array(), np.asarray(chunk_ids), side="right") - 1
+
+    def chunks_of(self, parent_ids) -> np.ndarray:
+        """Birden fazla tarifin tüm chunk ID'leri (vektörel; tabloda olmayan tarifler atlanır)"""
+        offsets = self.as_array()
+        parent_ids = np.asarray(parent_ids, dtype=np.int64).reshape(-1)
+        parent_ids = parent_ids[(parent_ids >= 0) & (parent_ids < self.num_parents)]
+        starts = offsets[parent_ids]
+        counts = offsets[parent_ids + 1] - starts
+        # Her tarifin aralığı: başlangıç + (0 .. chunk sayısı - 1)
+        group_starts = np.cumsum(counts) - counts
+        return np.arange(counts.sum()) + np.repeat(starts - group_starts, counts)
+
+    def allocate(self, parent_id: int, num_chunks: int) -> int:
+        """
+        Tarif için chunk ID'leri ayır
+
+        Yeni tarifler sırayla eklenir. Mevcut bir tarif aynı chunk sayısıyla
+        yeniden yazılabilir (ID'ler değişmez).
+
+        Returns:
+            Tarifin ilk chunk ID'si
+        """
+        if parent_id == self.num_parents:
+            self.offsets.append(self.offsets[-1] + num_chunks)
+            return self.offsets[parent_id]
+
+        if parent_id > self.num_parents:
+            raise ValueError(f"Tarifler sırayla eklenmeli: beklenen {self.num_parents}, gelen {parent_id}")
+
+        existing = self.chunk_range(parent_id)
+        if len(existing) != num_chunks:
+            raise ValueError(
+                f"Tarif {parent_id} için chunk sayısı değişti ({len(existing)} → {num_chunks}); "
+                f"collection'ı yeniden indexleyin"
+            )
+        return existing.start
+
+    def stats(self, parent_ids=None) -> Dict[str, Any]:
+        """
+        Tarif başına chunk sayısı istatistikleri
+
+        Args:
+            parent_ids: Sayılacak tarifler (None ise tablodaki tümü). Silinen ya da
+                chunk sayısı değiştiği için taşınan tariflerin aralıkları tabloda
+                kalır; canlı tarifler verilirse bunlar sayılmaz.
+        """
+        counts = np.diff(self.as_array())
+        if parent_ids is not None:
+            parent_ids = np.asarray(parent_ids, dtype=np.int64).reshape(-1)
+            counts = counts[parent_ids[(parent_ids >= 0) & (parent_ids < self.num_parents)]]
+
+        if not len(counts):
+            return {"parents": 0, "chunks": 0, "min": 0, "mean": 0.0, "max": 0}
+
+        return {
+            "parents": len(counts),
+            "chunks": int(counts.sum()),
+            "min": int(counts.min()),
+            "mean": float(counts.mean()),
+            "max": int(counts.max())
+        }
@@ -0,0 +1,98 @@
+"""
+Chunking Stratejileri - Parent-Child
+====================================
+Bir tarifin hangi chunk'lara bölüneceğini belirler. Embedder (chunk metinleri)
+ve veritabanı (chunk payload'ları) aynı düzeni kullanır.
+
+Stratejiler:
+    "fields"         : Tarif başına 2 chunk - başlık + malzemeler, başlık + yapılış
+    "sliding_window" : Başlık + malzemeler chunk'ı ve yapılış cümleleri üzerinde
+                       kayan pencereler (tarif başına değişken sayıda chunk)
+
+Kayan pencere chunk'ları kısa olduğu için chunk başına encode maliyeti düşer;
+eşleşen pencere RAG'de bağlam parçası (snippet) olarak döndürülür.
+
+NOT: Strateji ve pencere ayarları parametre olarak verilir (config'den okumaz);
+evaluator varyantları config'i değiştirdiğinde bu modül yeniden yüklenmez.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import CHUNK_TYPE_INGREDIENTS, CHUNK_TYPE_INSTRUCTIONS
+
+CHUNKING_STRATEGIES = ("fields", "sliding_window")
+
+# Cümle sonu: noktalama + boşluk
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+def split_sentences(instructions: List[str]) -> List[str]:
+    """Yapılış adımlarını cümlelere ayır (boş cümleler atlanır)"""
+    sentences = []
+    for step in instructions:
+        sentences.extend(s.strip() for s in _SENTENCE_END.split(step) if s.strip())
+    return sentences
+
+
+def window_ranges(num_sentences: int, size: int, stride: int) -> List[Tuple[int, int]]:
+    """
+    Kayan pencere aralıkları
+
+    Son pencere metnin sonuna hizalanır; böylece son cümleler de
+    tam boyutlu bir pencerede yer alır.
+
+    Args:
+        num_sentences: Cümle sayısı
+        size: Pencere başına cümle sayısı
+        stride: Pencereler arası kayma (size'dan küçükse pencereler örtüşür)
+
+    Returns:
+        [start, end) aralıkları (en az bir pencere)
+    """
+    if size < 1 or stride < 1:
+        raise ValueError(f"Geçersiz pencere ayarı: boyut={size}, kayma={stride}")
+
+    if num_sentences <= size:
+        return [(0, num_sentences)]
+
+    ranges = [(start, start + size) for start in range(0, num_sentences - size + 1, stride)]
+    if ranges[-1][1] < num_sentences:
+        ranges.append((num_sentences - size, num_sentences))
+    return ranges
+
+
+def chunk_layout(
+    recipe: Dict[str, Any],
+    strategy: str,
+    window_sentences: int,
+    window_stride: int
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    Tarifin chunk düzeni
+
+    Args:
+        recipe: Tarif dictionary
+        strategy: "fields" veya "sliding_window"
+        window_sentences: Pencere başına cümle sayısı ("sliding_window")
+        window_stride: Pencereler arası kayma ("sliding_window")
+
+    Returns:
+        [(chunk_type, snippet), ...] - snippet pencerenin yapılış metnidir
+        (malzeme chunk'ında ve "fields" stratejisinde None)
+    """
+    if strategy not in CHUNKING_STRATEGIES:
+        raise ValueError(f"Bilinmeyen chunking stratejisi: {strategy} "
+                         f"(seçenekler: {', '.join(CHUNKING_STRATEGIES)})")
+
+    layout = [(CHUNK_TYPE_INGREDIENTS, None)]
+
+    if strategy == "fields":
+        layout.append((CHUNK_TYPE_INSTRUCTIONS, None))
+        return layout
+
+    sentences = split_sentences(recipe.get("instructions", []))
+    for start, end in window_ranges(len(sentences), window_sentences, window_stride):
+        layout.append((CHUNK_TYPE_INSTRUCTIONS, " ".join(sentences[start:end])))
+
+    return layout
@@ -14,67 +14,552 @@ if sys.platform == 'win32':
         sys.stdout.reconfigure(encoding='utf-8')
         sys.stderr.reconfigure(encoding='utf-8')
 
-from typing import List, Dict, Any, Optional
+import json
+import math
+import hashlib
+import heapq
+import shutil
+import copy
+import re
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Iterable, Tuple
 from collections import defaultdict
+import numpy as np
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance, 
     VectorParams, 
     PointStruct,
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
     Filter,
     FieldCondition,
     MatchValue,
-    MatchText
+    MatchAny,
+    MatchText,
+    FilterSelector,
+    SparseVectorParams,
+    SparseVector,
+    Prefetch,
+    FusionQuery,
+    Fusion,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    QuantizationSearchParams,
+    QueryRequest,
+    BinaryQuantization,
+    BinaryQuantizationConfig
 )
 from config import (
     QDRANT_PATH, 
     COLLECTION_NAME, 
+    COLLECTION_KEEP_VERSIONS,
     EMBEDDING_DIM, 
     DISTANCE_METRIC,
     INDEX_BATCH_SIZE,
+    UPLOAD_PARALLEL,
     CHUNK_TYPE_INGREDIENTS,
     CHUNK_TYPE_INSTRUCTIONS,
-    CHUNKS_PER_RECIPE
+    CHUNKS_PER_RECIPE,
+    CHUNKING_STRATEGY,
+    PARENT_AGGREGATION,
+    PARENT_GROUP_SIZE,
+    PARENT_AGGREGATION_DECAY,
+    PARENT_CANDIDATES,
+    WINDOW_SENTENCES,
+    WINDOW_STRIDE,
+    SPARSE_VECTORS,
+    SPARSE_VECTOR_NAME,
+    SEARCH_MODE,
+    HYBRID_PREFETCH_LIMIT,
+    DB_BACKEND,
+    LOCAL_DB_PATH,
+    LOCAL_INDEX_MMAP,
+    LOCAL_INDEX_TYPE,
+    HNSW_M,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
+    IVF_NLIST,
+    IVF_NPROBE,
+    PQ_M,
+    IVF_RERANK,
+    QUANTIZATION,
+    QUANTIZATION_QUANTILE,
+    QUANTIZATION_OVERSAMPLING
 )
+from chunking import chunk_layout
+from chunk_table import ChunkTable
+from ingredient_index import IngredientIndex, IngredientFilter, parse_filter
+
+
+# Desteklenen arama modları (bkz. config.SEARCH_MODE)
+SEARCH_MODES = ("dense", "sparse", "hybrid", "binary")
+
+# Arama sonucunda dönen özet alanlar (tam tarif hydrate ile doküman deposundan)
+SUMMARY_FIELDS = ("title",)
+
+# Chunk skorlarını tarif skoruna indirgeme yöntemleri (bkz. config.PARENT_AGGREGATION)
+AGGREGATIONS = ("max", "sum", "weighted")
+
+# Doküman deposu olan collection'larda aramada chunk payload'ından okunan alanlar
+# (tarif özeti parent başına bir kez doküman deposundan)
+CHUNK_RESULT_FIELDS = ["parent_id", "chunk_type", "snippet"]
+
+# Artımlı indexleme için tarif başına saklanan anahtar alanları (bkz. recipe_key, content_hash)
+INDEX_KEY_FIELDS = ("recipe_key", "content_hash")
+
+# Collection'daki anahtarlar okunurken tek istekte gelen point sayısı
+SCROLL_BATCH_SIZE = 1000
+
+
+def to_sparse_vector(weights: Dict[int, float]) -> SparseVector:
+    """{token_id: ağırlık} sözlüğünü Qdrant SparseVector'e çevir"""
+    return SparseVector(indices=list(weights.keys()), values=list(weights.values()))
+
+
+def recipe_key(recipe: Dict[str, Any]) -> str:
+    """Tarifin kalıcı anahtarı: URL'in hash'i (URL yoksa başlığın)"""
+    source = recipe.get("url") or recipe.get("title", "")
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def content_hash(recipe: Dict[str, Any]) -> str:
+    """Tarif içeriğinin hash'i (artımlı indexlemede değişen tarifleri bulmak için)"""
+    content = json.dumps(recipe, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def recipe_payload(recipe: Dict[str, Any]) -> Dict[str, Any]:
+    """Tarifin saklanan alanları (chunk payload'ı / doküman deposu kaydı)"""
+    return {
+        "title": recipe.get("title", ""),
+        "url": recipe.get("url", ""),
+        "ingredients": recipe.get("ingredients", []),
+        "instructions": recipe.get("instructions", []),
+        # Arama için ek alanlar
+        "ingredient_count": len(recipe.get("ingredients", [])),
+        "instruction_count": len(recipe.get("instructions", [])),
+        # Artımlı indexleme
+        "recipe_key": recipe_key(recipe),
+        "content_hash": content_hash(recipe)
+    }
+
+
+def recipe_index_payload(recipe: Dict[str, Any]) -> Dict[str, Any]:
+    """Doküman deposu olan collection'larda chunk payload'ının tarif kısmı (tam tarif depoda)"""
+    return {
+        "title": recipe.get("title", ""),
+        "ingredient_count": len(recipe.get("ingredients", [])),
+        "instruction_count": len(recipe.get("instructions", [])),
+        "recipe_key": recipe_key(recipe),
+        "content_hash": content_hash(recipe)
+    }
+
+
+def recipe_summary(parent_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Arama sonucu özeti (ID, başlık) - tarifin geri kalanı hydrate ile eklenir"""
+    result = {"id": parent_id}
+    result.update({field: payload.get(field, "") for field in SUMMARY_FIELDS})
+    return result
+
+
+def recipe_result(parent_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Saklanan alanlardan tarif dictionary'si oluştur"""
+    return {
+        "id": parent_id,
+        "title": payload.get("title", ""),
+        "url": payload.get("url", ""),
+        "ingredients": payload.get("ingredients", []),
+        "instructions": payload.get("instructions", [])
+    }
+
+
+def aggregate_scores(scores: Sequence[float], aggregation: str) -> float:
+    """Tarifin chunk skorlarını (azalan sırada) tek skora indir"""
+    if aggregation == "max":
+        return scores[0]
+    if aggregation == "sum":
+        return sum(scores)
+    return sum(score * PARENT_AGGREGATION_DECAY ** rank for rank, score in enumerate(scores))
+
+
+def top_parents(
+    hits: Iterable[Tuple[int, float, Any]],
+    top_k: int,
+    aggregation: str = "max"
+) -> List[Tuple[int, float, List[Any]]]:
+    """
+    Chunk isabetlerini parent'a göre grupla ve en iyi top_k tarifi seç
+    
+    Parent başına en fazla PARENT_GROUP_SIZE chunk tutulur ("max"ta sadece en
+    iyisi), tarifler birleşik skorlarına göre heap ile seçilir.
+    
+    Args:
+        hits: (parent_id, skor, isabet) üçlüleri - skora göre azalan
+        top_k: Tarif sayısı
+        aggregation: "max", "sum" veya "weighted"
+    
+    Returns:
+        [(parent_id, tarif skoru, isabetler (en iyisi başta)), ...] - skora göre azalan
+    """
+    group_size = 1 if aggregation == "max" else PARENT_GROUP_SIZE
+    groups = {}
+    for parent_id, score, hit in hits:
+        group = groups.setdefault(parent_id, ([], []))
+        if len(group[0]) < group_size:
+            group[0].append(score)
+            group[1].append(hit)
+    
+    best = heapq.nlargest(
+        top_k,
+        ((aggregate_scores(scores, aggregation), parent_id, group_hits) for parent_id, (scores, group_hits) in groups.items()),
+        key=lambda item: item[0]
+    )
+    return [(parent_id, score, group_hits) for score, parent_id, group_hits in best]
+
+
+def quantization_config():
+    """Qdrant collection'ının kuantizasyon ayarı (config.QUANTIZATION)"""
+    if not QUANTIZATION:
+        return None
+    if QUANTIZATION == "int8":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=QUANTIZATION_QUANTILE, always_ram=True)
+        )
+    if QUANTIZATION == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    raise ValueError(f"Bilinmeyen kuantizasyon: {QUANTIZATION} (seçenekler: int8, binary)")
+
+
+def version_name(version: int) -> str:
+    """Sürümlü collection adı (COLLECTION_NAME alias'ı bunlardan birini gösterir)"""
+    return f"{COLLECTION_NAME}_v{version}"
+
+
+def parse_version(name: str) -> Optional[int]:
+    """Sürümlü collection adındaki sürüm numarası (sürümlü değilse None)"""
+    match = re.fullmatch(rf"{re.escape(COLLECTION_NAME)}_v(\d+)", name)
+    return int(match.group(1)) if match else None
 
 
 class RecipeDatabase:
     """Qdrant vektör veritabanı işlemleri (Parent-Child)"""
     
-    def __init__(self):
-        """Veritabanı bağlantısı oluştur"""
-        print(f"🔄 Qdrant veritabanına bağlanılıyor: {QDRANT_PATH}")
-        import warnings
-        warnings.filterwarnings("ignore", category=UserWarning)
-        self.client = QdrantClient(path=str(QDRANT_PATH))
-        print("✅ Veritabanı bağlantısı başarılı!")
+    def __init__(self, collection: Optional[str] = None, client: Optional[QdrantClient] = None):
+        """
+        Veritabanı bağlantısı oluştur
+        
+        Args:
+            collection: Açılacak collection (None ise COLLECTION_NAME alias'ının gösterdiği sürüm)
+            client: Paylaşılan istemci (gömülü Qdrant klasörü tek istemciyle açılabilir)
+        """
+        if client is None:
+            print(f"🔄 Qdrant veritabanına bağlanılıyor: {QDRANT_PATH}")
+            import warnings
+            warnings.filterwarnings("ignore", category=UserWarning)
+            client = QdrantClient(path=str(QDRANT_PATH))
+            print("✅ Veritabanı bağlantısı başarılı!")
+        self.client = client
+        
+        # Fiziksel collection (sürüm); aramalar alias yerine doğrudan buna gider
+        self.collection = collection or self._resolve_alias()
+        
+        # Boyut indirgeme projeksiyonu (collection metadata'sından yüklenir)
+        self.projector = None
+        self._load_projector()
+        
+        # Collection'da sparse vektör alanı var mı (eski collection'larda yok)
+        self.has_sparse = self._detect_sparse()
+        
+        # Collection'da binary kodlar var mı ("binary" arama modu için)
+        self.has_binary = self._detect_binary()
+        
+        # Chunking stratejisi ve chunk → parent offset tablosu
+        self.chunking = CHUNKING_STRATEGY
+        self.chunk_table = ChunkTable()
+        self._load_chunk_table()
+        
+        # Tam tarifler ayrı doküman deposunda mı (eski collection'larda chunk payload'ında)
+        self.docs = None
+        self._open_doc_store()
+        
+        # Malzeme ters index'i (malzeme filtresi için; eski collection'larda yok)
+        self.ingredients = self._load_ingredient_index()
+    
+    def _projection_path(self) -> Path:
+        """Projeksiyon parametrelerinin kaydedildiği dosya"""
+        return Path(QDRANT_PATH) / f"{self.collection}_projection.npz"
+    
+    def _doc_store_path(self) -> Path:
+        """Tam tariflerin saklandığı doküman deposu (chunk payload'ı sadece özet tutar)"""
+        return Path(QDRANT_PATH) / f"{self.collection}_docs.sqlite"
+    
+    def _ingredient_index_path(self) -> Path:
+        """Malzeme ters index'inin kaydedildiği dosya (parent ID'leri üzerinde)"""
+        return Path(QDRANT_PATH) / f"{self.collection}_ingredients.npz"
+    
+    def _load_ingredient_index(self) -> Optional[IngredientIndex]:
+        """Kayıtlı malzeme index'ini yükle (yoksa None)"""
+        if not self.collection_exists() or not self._ingredient_index_path().exists():
+            return None
+        return IngredientIndex.load(self._ingredient_index_path())
+    
+    def _load_projector(self):
+        """Collection metadata'sında kayıtlı projeksiyonu yükle"""
+        self.projector = None
+        if not self.collection_exists():
+            return
+        
+        info = self.client.get_collection(self.collection)
+        metadata = getattr(info.config, "metadata", None) or {}
+        projection = metadata.get("projection")
+        
+        if projection:
+            from dim_reduction import VectorProjector
+            self.projector = VectorProjector.load(Path(QDRANT_PATH) / projection["file"])
+            print(f"📐 Boyut indirgeme: {projection['method']} "
+                  f"{projection['input_dim']} → {projection['output_dim']}")
+    
+    def _open_doc_store(self):
+        """Collection metadata'sında kayıtlı doküman deposunu aç"""
+        if not self.collection_exists():
+            return
+        
+        info = self.client.get_collection(self.collection)
+        metadata = getattr(info.config, "metadata", None) or {}
+        
+        if metadata.get("doc_store"):
+            from doc_store import DocumentStore
+            self.docs = DocumentStore(Path(QDRANT_PATH) / metadata["doc_store"])
+    
+    def _close_doc_store(self, remove: bool = False):
+        """Doküman deposunu kapat (remove=True ise dosyayı da sil)"""
+        if getattr(self, "docs", None) is not None:
+            self.docs.close()
+            self.docs = None
+        if remove and self._doc_store_path().exists():
+            self._doc_store_path().unlink()
+    
+    def _chunk_table_path(self) -> Path:
+        """Chunk offset tablosunun kaydedildiği dosya"""
+        return Path(QDRANT_PATH) / f"{self.collection}_chunk_offsets.npy"
+    
+    def _load_chunk_table(self):
+        """
+        Collection'ın chunking stratejisini ve offset tablosunu yükle
+        
+        Tablo dosyası olmayan (eski) collection'larda her tarifte
+        CHUNKS_PER_RECIPE chunk olduğu varsayılır.
+        """
+        if not self.collection_exists():
+            return
+        
+        info = self.client.get_collection(self.collection)
+        metadata = getattr(info.config, "metadata", None) or {}
+        self.chunking = metadata.get("chunking", {}).get("strategy", "fields")
+        
+        if self._chunk_table_path().exists():
+            self.chunk_table = ChunkTable.load(self._chunk_table_path())
+        else:
+            num_parents = (info.points_count or 0) // CHUNKS_PER_RECIPE
+            self.chunk_table = ChunkTable.fixed(num_parents, CHUNKS_PER_RECIPE)
+    
+    def save_chunk_table(self):
+        """Offset tablosunu kaydet (indexleme sonunda çağrılır)"""
+        self.chunk_table.save(self._chunk_table_path())
+    
+    def reserve_chunks(self, parent_ids: Sequence[int], chunk_counts: Sequence[int]):
+        """
+        Yeni (boş) collection'da tariflerin chunk aralıklarını önceden ayır
+        
+        Tam indexlemede tarifler eski parent ID'lerini korur; ID'ler dosya
+        sırasıyla artmadığından aralıklar yazımdan önce ayrılır.
+        """
+        self.chunk_table = ChunkTable.from_counts(parent_ids, chunk_counts)
+    
+    def chunks_per_parent(self) -> int:
+        """Tarif başına ortalama chunk sayısı (yukarı yuvarlanmış, arama limiti için)"""
+        mean = self.chunk_table.stats()["mean"]
+        return max(CHUNKS_PER_RECIPE, math.ceil(mean))
+    
+    def _project_chunks(self, chunk_embeddings: List[tuple]) -> List[tuple]:
+        """Chunk embedding'lerine projeksiyonu uygula: [(chunk_type, embedding, *sparse), ...]"""
+        if self.projector is None or not chunk_embeddings:
+            return chunk_embeddings
+        
+        projected = self.projector.transform_list([chunk[1] for chunk in chunk_embeddings])
+        return [(chunk[0], emb, *chunk[2:]) for chunk, emb in zip(chunk_embeddings, projected)]
+    
+    def _chunk_vector(self, embedding: List[float], sparse: tuple):
+        """Chunk'ın Qdrant vektörü (sparse varsa dense "" alanında, sparse kendi alanında)"""
+        if sparse and self.has_sparse:
+            return {"": embedding, SPARSE_VECTOR_NAME: to_sparse_vector(sparse[0])}
+        return embedding
+    
+    def _detect_sparse(self) -> bool:
+        """Collection'da SPARSE_VECTOR_NAME sparse alanı var mı kontrol et"""
+        if not self.collection_exists():
+            return False
+        
+        info = self.client.get_collection(self.collection)
+        sparse_config = info.config.params.sparse_vectors or {}
+        return SPARSE_VECTOR_NAME in sparse_config
+    
+    def _detect_binary(self) -> bool:
+        """Collection binary kuantizasyonla mı oluşturulmuş"""
+        if not self.collection_exists():
+            return False
+        
+        info = self.client.get_collection(self.collection)
+        return isinstance(info.config.quantization_config, BinaryQuantization)
     
     def close(self):
-        """Veritabanı bağlantısını kapat"""
+        """Veritabanı bağlantısını ve doküman deposunu kapat"""
+        self._close_doc_store()
         try:
             if hasattr(self, 'client') and self.client is not None:
                 self.client.close()
         except Exception:
             pass  # Kapanış hatalarını yoksay
     
+    def flush(self):
+        """Malzeme index'ini diske yaz (Qdrant'ta upsert zaten kalıcıdır)"""
+        if self.ingredients is not None:
+            self.ingredients.save(self._ingredient_index_path())
+    
+    def index_needs_training(self) -> bool:
+        """Index vektör eklenmeden önce eğitilmeli mi (Qdrant'ta hayır)"""
+        return False
+    
+    def train_index(self, vectors):
+        """Index'i örnek vektörlerle eğit (Qdrant'ta gerekmez)"""
+        pass
+    
     def collection_exists(self) -> bool:
         """Collection var mı kontrol et"""
-        collections = self.client.get_collections().collections
-        return any(c.name == COLLECTION_NAME for c in collections)
+        return self.collection in self._collection_names()
+    
+    def _collection_names(self) -> List[str]:
+        """Veritabanındaki tüm collection'lar"""
+        return [c.name for c in self.client.get_collections().collections]
+    
+    def _alias_target(self) -> Optional[str]:
+        """COLLECTION_NAME alias'ının gösterdiği collection (alias yoksa None)"""
+        for alias in self.client.get_aliases().aliases:
+            if alias.alias_name == COLLECTION_NAME:
+                return alias.collection_name
+        return None
+    
+    def _resolve_alias(self) -> str:
+        """Açılacak collection: alias'ın gösterdiği sürüm, alias yoksa eski (sürümsüz) collection"""
+        return self._alias_target() or COLLECTION_NAME
+    
+    def _point_alias(self, collection: str):
+        """Alias'ı collection'a çevir (silme ve oluşturma tek istekte, atomik)"""
+        operations = []
+        if self._alias_target() is not None:
+            operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=COLLECTION_NAME)))
+        operations.append(CreateAliasOperation(
+            create_alias=CreateAlias(collection_name=collection, alias_name=COLLECTION_NAME)
+        ))
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+    
+    def _open_collection(self, collection: str) -> "RecipeDatabase":
+        """Aynı istemciyle başka bir collection'ı aç"""
+        return RecipeDatabase(collection, client=self.client)
+    
+    def _release(self):
+        """Collection'a ait açık dosyaları kapat (istemci açık kalır)"""
+        self._close_doc_store()
+    
+    def versions(self) -> List[str]:
+        """Sürümlü collection'lar (eskiden yeniye)"""
+        return sorted(
+            (name for name in self._collection_names() if parse_version(name) is not None),
+            key=parse_version
+        )
     
-    def create_collection(self, recreate: bool = False):
+    def staging(self) -> "RecipeDatabase":
+        """
+        Tam indexleme için yeni bir sürüm aç ({COLLECTION_NAME}_v{n+1})
+        
+        Arama promote çağrılana kadar mevcut sürümden devam eder.
+        """
+        name = version_name(max((parse_version(v) for v in self.versions()), default=0) + 1)
+        print(f"🏗️  Yeni sürüm: {name} (arama {self.collection} üzerinden devam ediyor)")
+        return self._open_collection(name)
+    
+    def promote(self, staging: "RecipeDatabase", keep: int = COLLECTION_KEEP_VERSIONS):
+        """
+        İndexlenip doğrulanmış sürümü yayına al
+        
+        Bu nesne (aramada kullanılan singleton) yeni sürümün durumunu tek
+        sözlük güncellemesiyle devralır, ardından alias yeni sürüme çevrilir
+        (yeni açılan bağlantılar alias üzerinden yeni sürümü görür) ve eski
+        sürümler silinir. Alias'tan önceki düzende oluşturulmuş sürümsüz
+        collection için bkz. _retire_legacy.
+        
+        Args:
+            staging: staging() ile açılıp indexlenmiş sürüm
+            keep: Saklanacak eski sürüm sayısı (geri dönüş için)
+        """
+        retired = copy.copy(self)
+        vars(self).update(vars(staging))
+        retired._release()
+        
+        if COLLECTION_NAME in self._collection_names():
+            self._retire_legacy()
+        
+        self._point_alias(self.collection)
+        print(f"🔀 Alias güncellendi: {COLLECTION_NAME} → {self.collection}")
+        self.drop_old_versions(keep)
+    
+    def drop_old_versions(self, keep: int = COLLECTION_KEEP_VERSIONS):
+        """Aktif sürümden eski sürümleri sil (en yeni keep tanesi kalır; daha yeni sürümlere dokunulmaz)"""
+        current = parse_version(self.collection)
+        if current is None:
+            return
+        
+        older = [name for name in self.versions() if parse_version(name) < current]
+        for name in older[:max(len(older) - keep, 0)]:
+            self._drop_version(name)
+    
+    def _drop_version(self, name: str):
+        """Eski bir sürümü ve dosyalarını sil"""
+        self._open_collection(name).delete_collection()
+    
+    def _retire_legacy(self):
+        """
+        Sürümsüz eski collection'ı kaldır
+        
+        Qdrant'ta collection yeniden adlandırılamaz ve alias bir collection ile
+        aynı adı taşıyamaz; bu yüzden eski collection ilk promote'ta hemen
+        silinir (COLLECTION_KEEP_VERSIONS kapsamında saklanmaz, bu sürüme geri
+        dönülemez).
+        """
+        print(f"🗑️  Sürümsüz eski collection kaldırılıyor (geri dönüş için saklanmaz): {COLLECTION_NAME}")
+        self._open_collection(COLLECTION_NAME).delete_collection()
+    
+    def create_collection(self, recreate: bool = False, projector=None):
         """
         Collection oluştur
         
         Args:
             recreate: True ise mevcut collection silinip yeniden oluşturulur
+            projector: Boyut indirgeme projeksiyonu (VectorProjector, isteğe bağlı)
         """
         if self.collection_exists():
             if recreate:
-                print(f"🗑️  Mevcut collection siliniyor: {COLLECTION_NAME}")
-                self.client.delete_collection(COLLECTION_NAME)
+                print(f"🗑️  Mevcut collection siliniyor: {self.collection}")
+                self.client.delete_collection(self.collection)
+                self._close_doc_store(remove=True)
+                self._ingredient_index_path().unlink(missing_ok=True)
             else:
-                print(f"ℹ️  Collection zaten mevcut: {COLLECTION_NAME}")
+                print(f"ℹ️  Collection zaten mevcut: {self.collection}")
                 return
         
         # Distance metric mapping
@@ -84,14 +569,52 @@ class RecipeDatabase:
             "Dot": Distance.DOT
         }
         
-        print(f"📦 Collection oluşturuluyor: {COLLECTION_NAME}")
+        # Projeksiyon varsa parametreleri kaydet ve metadata'ya yaz
+        vector_size = EMBEDDING_DIM
+        extra_params = {}
+        if projector is not None:
+            projector.save(self._projection_path())
+            vector_size = projector.output_dim
+            extra_params["metadata"] = {
+                "projection": projector.to_metadata(self._projection_path().name)
+            }
+        
+        # Chunking stratejisi (offset tablosu ayrı dosyada)
+        chunking = {"strategy": CHUNKING_STRATEGY, "table_file": self._chunk_table_path().name}
+        if CHUNKING_STRATEGY == "sliding_window":
+            chunking.update(window_sentences=WINDOW_SENTENCES, window_stride=WINDOW_STRIDE)
+        extra_params.setdefault("metadata", {})["chunking"] = chunking
+        
+        # Tam tarifler doküman deposunda; chunk payload'ında sadece özet alanlar kalır
+        extra_params["metadata"]["doc_store"] = self._doc_store_path().name
+        
+        # BGE-M3 sparse vektörleri için ayrı alan (dense vektör isimsiz kalır)
+        if SPARSE_VECTORS:
+            extra_params["sparse_vectors_config"] = {SPARSE_VECTOR_NAME: SparseVectorParams()}
+        
+        # Skaler kuantizasyon (aramada kodlarla aday seçimi + tam vektörle yeniden skorlama)
+        if QUANTIZATION:
+            extra_params["quantization_config"] = quantization_config()
+        
+        print(f"📦 Collection oluşturuluyor: {self.collection} ({vector_size} boyut)")
         self.client.create_collection(
-            collection_name=COLLECTION_NAME,
+            collection_name=self.collection,
             vectors_config=VectorParams(
-                size=EMBEDDING_DIM,
+                size=vector_size,
                 distance=distance_map.get(DISTANCE_METRIC, Distance.COSINE)
-            )
+            ),
+            **extra_params
         )
+        self.projector = projector
+        self.has_sparse = SPARSE_VECTORS
+        self.has_binary = QUANTIZATION == "binary"
+        self.chunking = CHUNKING_STRATEGY
+        self.chunk_table = ChunkTable()
+        
+        from doc_store import DocumentStore
+        self.docs = DocumentStore(self._doc_store_path())
+        self.docs.clear()
+        self.ingredients = IngredientIndex()
         print("✅ Collection başarıyla oluşturuldu!")
     
     def get_collection_info(self) -> Dict[str, Any]:
@@ -99,24 +622,106 @@ class RecipeDatabase:
         if not self.collection_exists():
             return {"exists": False}
         
-        info = self.client.get_collection(COLLECTION_NAME)
+        info = self.client.get_collection(self.collection)
         
-        # Chunk sayısından tarif sayısını hesapla
-        chunks_count = info.points_count
-        recipes_count = chunks_count // CHUNKS_PER_RECIPE if chunks_count else 0
+        # Tarif sayısı offset tablosundan (silinen / taşınan tariflerin aralıkları hariç)
+        stats = self.chunk_table.stats(self.docs.all_ids() if self.docs is not None else None)
         
         return {
             "exists": True,
-            "points_count": chunks_count,
-            "recipes_count": recipes_count,
-            "chunks_per_recipe": CHUNKS_PER_RECIPE,
+            "points_count": info.points_count,
+            "recipes_count": stats["parents"],
+            "chunks_per_recipe": round(stats["mean"], 2),
+            "chunks_per_recipe_range": (stats["min"], stats["max"]),
+            "chunking": self.chunking,
+            "vector_dim": self.projector.output_dim if self.projector else EMBEDDING_DIM,
+            "projection": self.projector.method if self.projector else None,
+            "sparse": self.has_sparse,
+            "quantization": QUANTIZATION if info.config.quantization_config else None,
+            "doc_store_bytes": self.docs.size_bytes() if self.docs is not None else None,
             "status": info.status
         }
     
+    def _upload(self, points: List[PointStruct]):
+        """
+        Point'leri toplu yükle
+        
+        upload_points listeyi INDEX_BATCH_SIZE'lık parçalara böler;
+        UPLOAD_PARALLEL > 1 ise parçalar paralel süreçlerle gönderilir.
+        """
+        self.client.upload_points(
+            collection_name=self.collection,
+            points=points,
+            batch_size=INDEX_BATCH_SIZE,
+            parallel=UPLOAD_PARALLEL,
+            wait=True
+        )
+    
+    def _chunk_points(
+        self,
+        recipe: Dict[str, Any],
+        chunk_embeddings: List[tuple],
+        parent_id: int
+    ) -> List[PointStruct]:
+        """
+        Bir tarifin chunk point'lerini oluştur
+        
+        Point ID'leri offset tablosundan ayrılır: tablodaki ilk chunk ID + chunk_idx
+        ("fields" stratejisinde parent_id * CHUNKS_PER_RECIPE + chunk_idx ile aynı).
+        """
+        layout = chunk_layout(recipe, self.chunking, WINDOW_SENTENCES, WINDOW_STRIDE)
+        if len(layout) != len(chunk_embeddings):
+            raise ValueError(
+                f"Tarif {parent_id}: {len(chunk_embeddings)} chunk embedding'i var, "
+                f"'{self.chunking}' düzeni {len(layout)} chunk bekliyor"
+            )
+        
+        # Boyut indirgeme (sorgularla aynı projeksiyon)
+        chunk_embeddings = self._project_chunks(chunk_embeddings)
+        first_chunk_id = self.chunk_table.allocate(parent_id, len(chunk_embeddings))
+        
+        # Doküman deposu varsa tarifin sadece özeti chunk payload'ına yazılır
+        recipe_fields = recipe_index_payload(recipe) if self.docs is not None else recipe_payload(recipe)
+        
+        points = []
+        for chunk_idx, (chunk_type, embedding, *sparse) in enumerate(chunk_embeddings):
+            payload = {
+                # Parent bilgileri (özet veya tam tarif)
+                "parent_id": parent_id,
+                **recipe_fields,
+                
+                # Chunk bilgileri
+                "chunk_type": chunk_type,
+                "chunk_idx": chunk_idx
+            }
+            
+            # Kayan pencere metni (RAG bağlamı için eşleşen bölüm)
+            snippet = layout[chunk_idx][1]
+            if snippet is not None:
+                payload["snippet"] = snippet
+            
+            points.append(PointStruct(
+                id=first_chunk_id + chunk_idx,
+                vector=self._chunk_vector(embedding, sparse),
+                payload=payload
+            ))
+        
+        return points
+    
+    def _store_recipes(self, recipes: List[Dict[str, Any]], parent_ids: Sequence[int], replace: bool = False):
+        """Tam tarifleri doküman deposuna (depo yoksa tarifler chunk payload'ında), malzemeleri ters index'e yaz"""
+        if self.docs is not None:
+            self.docs.put_many(zip(parent_ids, (recipe_payload(r) for r in recipes)))
+        if self.ingredients is not None:
+            # Üzerine yazılan tariflerin eski malzeme kelimeleri silinir
+            if replace:
+                self.ingredients.remove(parent_ids)
+            self.ingredients.add_many((i, r.get("ingredients", [])) for i, r in zip(parent_ids, recipes))
+    
     def insert_recipe_chunks(
         self, 
         recipe: Dict[str, Any],
-        chunk_embeddings: List[tuple],  # [(chunk_type, embedding), ...]
+        chunk_embeddings: List[tuple],  # [(chunk_type, embedding[, sparse]), ...]
         parent_id: int
     ) -> int:
         """
@@ -125,44 +730,17 @@ class RecipeDatabase:
         Args:
             recipe: Tarif dictionary
             chunk_embeddings: [(chunk_type, embedding), ...] listesi
+                (sparse vektörlü chunk'lar: (chunk_type, embedding, sparse))
             parent_id: Parent (tarif) ID'si
         
         Returns:
             Eklenen chunk sayısı
         """
-        points = []
-        
-        for chunk_idx, (chunk_type, embedding) in enumerate(chunk_embeddings):
-            # Her chunk için benzersiz ID: parent_id * CHUNKS_PER_RECIPE + chunk_idx
-            point_id = parent_id * CHUNKS_PER_RECIPE + chunk_idx
-            
-            point = PointStruct(
-                id=point_id,
-                vector=embedding,
-                payload={
-                    # Parent bilgileri (tam tarif)
-                    "parent_id": parent_id,
-                    "title": recipe.get("title", ""),
-                    "url": recipe.get("url", ""),
-                    "ingredients": recipe.get("ingredients", []),
-                    "instructions": recipe.get("instructions", []),
-                    
-                    # Chunk bilgileri
-                    "chunk_type": chunk_type,
-                    "chunk_idx": chunk_idx,
-                    
-                    # Arama için ek alanlar
-                    "ingredient_count": len(recipe.get("ingredients", [])),
-                    "instruction_count": len(recipe.get("instructions", []))
-                }
-            )
-            points.append(point)
+        points = self._chunk_points(recipe, chunk_embeddings, parent_id)
+        self._store_recipes([recipe], [parent_id], replace=True)
         
         # Veritabanına ekle
-        self.client.upsert(
-            collection_name=COLLECTION_NAME,
-            points=points
-        )
+        self._upload(points)
         
         return len(points)
     
@@ -170,7 +748,9 @@ class RecipeDatabase:
         self, 
         recipes: List[Dict[str, Any]],
         all_chunk_embeddings: List[List[tuple]],  # [[recipe1_chunks], [recipe2_chunks], ...]
-        start_parent_id: int = 0
+        start_parent_id: int = 0,
+        parent_ids: Optional[Sequence[int]] = None,
+        replace: bool = False
     ) -> int:
         """
         Birden fazla tarifin chunk'larını veritabanına ekle
@@ -179,67 +759,253 @@ class RecipeDatabase:
             recipes: Tarif listesi
             all_chunk_embeddings: Her tarif için chunk embedding listesi
             start_parent_id: Başlangıç parent ID'si
+            parent_ids: Tarif başına parent ID'si (verilirse start_parent_id yok sayılır;
+                mevcut veya ayrılmış tarifler aynı chunk sayısıyla yazılır, yeniler sırayla eklenir)
+            replace: True ise mevcut tariflerin üzerine yazılır (eski malzeme kelimeleri silinir)
         
         Returns:
             Eklenen toplam chunk sayısı
         """
+        if parent_ids is None:
+            parent_ids = range(start_parent_id, start_parent_id + len(recipes))
+        parent_ids = [int(i) for i in parent_ids]
         points = []
         
-        for recipe_idx, (recipe, chunk_embeddings) in enumerate(zip(recipes, all_chunk_embeddings)):
-            parent_id = start_parent_id + recipe_idx
-            
-            for chunk_idx, (chunk_type, embedding) in enumerate(chunk_embeddings):
-                point_id = parent_id * CHUNKS_PER_RECIPE + chunk_idx
-                
-                point = PointStruct(
-                    id=point_id,
-                    vector=embedding,
-                    payload={
-                        "parent_id": parent_id,
-                        "title": recipe.get("title", ""),
-                        "url": recipe.get("url", ""),
-                        "ingredients": recipe.get("ingredients", []),
-                        "instructions": recipe.get("instructions", []),
-                        "chunk_type": chunk_type,
-                        "chunk_idx": chunk_idx,
-                        "ingredient_count": len(recipe.get("ingredients", [])),
-                        "instruction_count": len(recipe.get("instructions", []))
-                    }
-                )
-                points.append(point)
+        for parent_id, recipe, chunk_embeddings in zip(parent_ids, recipes, all_chunk_embeddings):
+            points.extend(self._chunk_points(recipe, chunk_embeddings, parent_id))
+        self._store_recipes(recipes, parent_ids, replace)
         
         # Batch olarak ekle
-        self.client.upsert(
-            collection_name=COLLECTION_NAME,
-            points=points
-        )
+        self._upload(points)
         
         return len(points)
     
+    def delete_recipes(self, parent_ids: Sequence[int]) -> int:
+        """
+        Tarifleri tüm chunk'larıyla birlikte sil (doküman deposu kaydı ve malzeme kelimeleri dahil)
+        
+        Offset tablosundaki chunk ID aralıkları korunur (boş kalır); silinen
+        tariflerin ID'leri yeniden kullanılmaz.
+        
+        Returns:
+            Silinen tarif sayısı
+        """
+        parent_ids = [int(i) for i in parent_ids]
+        if not parent_ids:
+            return 0
+        
+        self.client.delete(
+            collection_name=self.collection,
+            points_selector=FilterSelector(
+                filter=Filter(must=[FieldCondition(key="parent_id", match=MatchAny(any=parent_ids))])
+            ),
+            wait=True
+        )
+        if self.docs is not None:
+            self.docs.delete_many(parent_ids)
+        if self.ingredients is not None:
+            self.ingredients.remove(parent_ids)
+        return len(parent_ids)
+    
+    def indexed_recipes(self) -> List[Tuple[int, Optional[str], Optional[str]]]:
+        """
+        Collection'daki tariflerin anahtarları (artımlı indexleme için)
+        
+        Tarif başına ilk chunk'ın (chunk_idx == 0) payload'ı okunur.
+        
+        Returns:
+            [(parent ID, recipe_key, content_hash), ...] - anahtarsız (eski) kayıtlarda None
+        """
+        result = []
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection,
+                scroll_filter=Filter(must=[FieldCondition(key="chunk_idx", match=MatchValue(value=0))]),
+                limit=SCROLL_BATCH_SIZE,
+                offset=offset,
+                with_payload=["parent_id", *INDEX_KEY_FIELDS],
+                with_vectors=False
+            )
+            result.extend(
+                (int(point.payload["parent_id"]), point.payload.get("recipe_key"), point.payload.get("content_hash"))
+                for point in points
+            )
+            if offset is None:
+                return result
+    
     def search(
         self, 
-        query_vector: List[float], 
+        query_vector: Optional[List[float]] = None, 
         top_k: int = 5,
         score_threshold: Optional[float] = None,
         chunk_type_filter: Optional[str] = None,
-        ingredient_filter: Optional[List[str]] = None
+        ingredient_filter: Optional[IngredientFilter] = None,
+        sparse_vector: Optional[Dict[int, float]] = None,
+        mode: Optional[str] = None,
+        aggregation: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Vektör araması yap ve sonuçları parent'a göre grupla
         
         Args:
-            query_vector: Sorgu vektörü
+            query_vector: Sorgu vektörü (dense / hybrid)
             top_k: Döndürülecek benzersiz tarif sayısı
-            score_threshold: Minimum benzerlik skoru
+            score_threshold: Minimum benzerlik skoru (sadece dense / binary modda)
             chunk_type_filter: Sadece belirli chunk türünde ara
-            ingredient_filter: Belirli malzemeleri içeren tarifleri filtrele
+            ingredient_filter: Malzeme filtresi - liste (herhangi biri) veya
+                {"any": [...], "all": [...], "none": [...]} (bkz. ingredient_index.py)
+            sparse_vector: Sorgunun sparse vektörü (sparse / hybrid)
+            mode: "dense", "sparse", "hybrid" veya "binary" (None ise config'den)
+            aggregation: Tarif skoru - "max", "sum" veya "weighted" (None ise config'den)
+        
+        Returns:
+            Bulunan tarifler listesi (parent bazlı, en fazla top_k farklı tarif)
+        """
+        mode = mode or SEARCH_MODE
+        aggregation = aggregation or PARENT_AGGREGATION
+        self._check_search_mode(mode)
+        self._check_aggregation(aggregation)
+        
+        # Boyut indirgeme (index ile aynı projeksiyon)
+        if self.projector is not None and query_vector is not None:
+            query_vector = self.projector.transform(query_vector).tolist()
+        
+        query_filter = self._query_filter(chunk_type_filter, ingredient_filter)
+        parents = self._search_groups(mode, top_k, query_vector, sparse_vector, score_threshold, query_filter, aggregation)
+        return self._grouped_results([parents])[0]
+    
+    def _search_groups(
+        self,
+        mode: str,
+        top_k: int,
+        query_vector: Optional[List[float]],
+        sparse_vector: Optional[Dict[int, float]],
+        score_threshold: Optional[float],
+        query_filter: Optional[Filter],
+        aggregation: str
+    ) -> List[Tuple[int, float, List[Any]]]:
+        """
+        Qdrant'ta parent_id'ye göre gruplanmış arama (query_points_groups)
+        
+        Qdrant grupları en iyi chunk skoruna göre sıralar; "sum" / "weighted"
+        skorlarda top_k * PARENT_CANDIDATES grup alınıp yeniden sıralanır.
+        
+        Returns:
+            top_parents çıktısı (isabetler: chunk ScoredPoint'leri)
+        """
+        group_size = 1 if aggregation == "max" else PARENT_GROUP_SIZE
+        group_limit = top_k if aggregation == "max" else top_k * PARENT_CANDIDATES
+        
+        response = self.client.query_points_groups(
+            collection_name=self.collection,
+            group_by="parent_id",
+            limit=group_limit,
+            group_size=group_size,
+            query_filter=query_filter,
+            with_payload=CHUNK_RESULT_FIELDS if self.docs is not None else True,
+            **self._query_args(mode, group_limit * group_size, query_vector, sparse_vector, score_threshold, query_filter)
+        )
+        
+        hits = ((int(group.id), hit.score, hit) for group in response.groups for hit in group.hits)
+        return top_parents(hits, top_k, aggregation)
+    
+    def search_batch(
+        self,
+        query_vectors: Optional[Sequence[List[float]]] = None,
+        top_k: int = 5,
+        score_threshold: Optional[float] = None,
+        chunk_type_filter: Optional[str] = None,
+        ingredient_filters: Optional[Sequence[Optional[IngredientFilter]]] = None,
+        sparse_vectors: Optional[Sequence[Dict[int, float]]] = None,
+        mode: Optional[str] = None,
+        aggregation: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla sorguyu ara, her sorgunun sonuçlarını parent'a göre grupla
+        
+        "max" modunda sorgular tek istekte gönderilir (query_batch_points).
+        Batch isteği gruplamayı desteklemediği için chunk'lar fazladan alınıp
+        süreç içinde gruplanır; aday chunk'ları top_k'dan az tarife düşen
+        sorgular query_points_groups ile yeniden aranır. "sum" / "weighted"
+        skorlar tarifin tüm chunk'larını gerektirdiğinden bu modlarda sorgular
+        query_points_groups ile tek tek aranır.
+        
+        Args:
+            query_vectors: Sorgu vektörleri (dense / hybrid)
+            top_k: Sorgu başına benzersiz tarif sayısı
+            score_threshold: Minimum benzerlik skoru (sadece dense / binary modda)
+            chunk_type_filter: Sadece belirli chunk türünde ara (tüm sorgular)
+            ingredient_filters: Sorgu başına malzeme filtresi (None: filtre yok)
+            sparse_vectors: Sorguların sparse vektörleri (sparse / hybrid)
+            mode: "dense", "sparse", "hybrid" veya "binary" (None ise config'den)
+            aggregation: Tarif skoru - "max", "sum" veya "weighted" (None ise config'den)
         
         Returns:
-            Bulunan tarifler listesi (parent bazlı, en iyi chunk skoru ile)
+            Sorgu başına bulunan tarifler listesi (sorgu sırasıyla)
         """
-        # Filtre oluştur
+        mode = mode or SEARCH_MODE
+        aggregation = aggregation or PARENT_AGGREGATION
+        self._check_search_mode(mode)
+        self._check_aggregation(aggregation)
+        
+        count = len(query_vectors) if query_vectors is not None else len(sparse_vectors)
+        if not count:
+            return []
+        
+        # Boyut indirgeme (tüm sorgular tek matris çarpımıyla)
+        if self.projector is not None and query_vectors is not None:
+            query_vectors = self.projector.transform(query_vectors).tolist()
+        
+        query_vectors = query_vectors if query_vectors is not None else [None] * count
+        sparse_vectors = sparse_vectors if sparse_vectors is not None else [None] * count
+        ingredient_filters = ingredient_filters if ingredient_filters is not None else [None] * count
+        
+        query_filters = [
+            self._query_filter(chunk_type_filter, ingredient_filter) for ingredient_filter in ingredient_filters
+        ]
+        
+        if aggregation != "max":
+            return self._grouped_results([
+                self._search_groups(mode, top_k, query_vector, sparse_vector, score_threshold, query_filter, aggregation)
+                for query_vector, sparse_vector, query_filter in zip(query_vectors, sparse_vectors, query_filters)
+            ])
+        
+        search_limit = self._search_limit(top_k, aggregation)
+        with_payload = CHUNK_RESULT_FIELDS if self.docs is not None else True
+        
+        requests = []
+        for query_vector, sparse_vector, query_filter in zip(query_vectors, sparse_vectors, query_filters):
+            args = self._query_args(mode, search_limit, query_vector, sparse_vector, score_threshold, query_filter)
+            # QueryRequest'te arama ayarının adı "params"
+            args["params"] = args.pop("search_params", None)
+            requests.append(QueryRequest(limit=search_limit, filter=query_filter, with_payload=with_payload, **args))
+        
+        responses = self.client.query_batch_points(collection_name=self.collection, requests=requests)
+        
+        parents_list = []
+        for i, response in enumerate(responses):
+            hits = ((int(hit.payload["parent_id"]), hit.score, hit) for hit in response.points)
+            parents = top_parents(hits, top_k, aggregation)
+            
+            # Adaylar az sayıda tarifin chunk'larıyla dolmuş: native gruplamayla yeniden ara
+            if len(parents) < top_k and len(response.points) == search_limit:
+                parents = self._search_groups(
+                    mode, top_k, query_vectors[i], sparse_vectors[i], score_threshold, query_filters[i], aggregation
+                )
+            parents_list.append(parents)
+        
+        return self._grouped_results(parents_list)
+    
+    def _query_filter(
+        self,
+        chunk_type_filter: Optional[str],
+        ingredient_filter: Optional[IngredientFilter]
+    ) -> Optional[Filter]:
+        """Chunk türü ve malzeme filtresinden Qdrant filtresi (filtre yoksa None)"""
         must_conditions = []
         should_conditions = []
+        must_not_conditions = []
         
         if chunk_type_filter:
             must_conditions.append(
@@ -249,61 +1015,180 @@ class RecipeDatabase:
                 )
             )
         
-        if ingredient_filter:
-            for ing in ingredient_filter:
-                should_conditions.append(
-                    FieldCondition(
-                        key="ingredients",
-                        match=MatchText(text=ing)
-                    )
+        if ingredient_filter and (self.ingredients is not None or self.docs is not None):
+            # Eşleşen tarifler ters index'ten (veya doküman deposundan) parent ID koşulu olarak
+            parent_ids = self._ingredient_ids(ingredient_filter)
+            must_conditions.append(
+                FieldCondition(
+                    key="parent_id",
+                    match=MatchAny(any=[int(parent_id) for parent_id in parent_ids])
+                )
+            )
+        elif ingredient_filter:
+            # Eski collection'lar: chunk payload'ındaki malzeme listesinde metin eşleşmesi
+            clauses = parse_filter(ingredient_filter)
+            for key, conditions in (("any", should_conditions), ("all", must_conditions), ("none", must_not_conditions)):
+                conditions.extend(
+                    FieldCondition(key="ingredients", match=MatchText(text=ing))
+                    for ing in clauses.get(key, [])
                 )
         
-        query_filter = None
-        if must_conditions or should_conditions:
-            query_filter = Filter(
-                must=must_conditions if must_conditions else None,
-                should=should_conditions if should_conditions else None
+        if not (must_conditions or should_conditions or must_not_conditions):
+            return None
+        return Filter(
+            must=must_conditions if must_conditions else None,
+            should=should_conditions if should_conditions else None,
+            must_not=must_not_conditions if must_not_conditions else None
+        )
+    
+    def _grouped_results(self, parents_list: List[List[Tuple[int, float, List[Any]]]]) -> List[List[Dict[str, Any]]]:
+        """
+        Sorgu başına top_parents çıktısından tarif sonuçları
+        
+        Doküman deposu varsa tarif özetleri tüm sorgular için tek seferde okunur
+        (tarif hydrate ile); eski collection'larda tarif en iyi chunk'ın payload'ındadır.
+        """
+        summaries = {}
+        if self.docs is not None:
+            summaries = self.docs.get_many(
+                {parent_id for parents in parents_list for parent_id, _, _ in parents},
+                fields=SUMMARY_FIELDS
             )
         
-        # Daha fazla sonuç getir (parent'a göre gruplamak için)
-        search_limit = top_k * CHUNKS_PER_RECIPE * 2
+        batch = []
+        for parents in parents_list:
+            results = []
+            for parent_id, score, hits in parents:
+                payload = hits[0].payload
+                if self.docs is not None:
+                    result = recipe_summary(parent_id, summaries.get(parent_id, {}))
+                else:
+                    result = recipe_result(parent_id, payload)
+                result.update(score=score, matched_chunk=payload.get("chunk_type"), snippet=payload.get("snippet"))
+                results.append(result)
+            batch.append(results)
+        return batch
+    
+    def _search_limit(self, top_k: int, aggregation: str) -> int:
+        """Gruplamadan önce alınan chunk sayısı (tarif başına birden fazla chunk eşleşebilir)"""
+        candidates = 2 if aggregation == "max" else PARENT_CANDIDATES
+        return top_k * self.chunks_per_parent() * candidates
+    
+    def _check_aggregation(self, aggregation: str):
+        """Tarif skoru yöntemini kontrol et"""
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Bilinmeyen skor birleştirme: {aggregation} (seçenekler: {', '.join(AGGREGATIONS)})")
+    
+    def _ingredient_ids(self, ingredient_filter: IngredientFilter) -> Sequence[int]:
+        """Malzeme filtresine uyan parent ID'leri (ters index; yoksa doküman deposu taranır)"""
+        if self.ingredients is not None:
+            return self.ingredients.match(ingredient_filter)
         
-        response = self.client.query_points(
-            collection_name=COLLECTION_NAME,
-            query=query_vector,
-            limit=search_limit,
-            score_threshold=score_threshold,
-            query_filter=query_filter
-        )
+        clauses = parse_filter(ingredient_filter)
+        if set(clauses) - {"any"}:
+            raise ValueError(
+                "'all' / 'none' malzeme filtreleri için malzeme index'i gerekli "
+                "(collection'ı yeniden indexleyin)"
+            )
+        return self.docs.ids_matching_any("ingredients", clauses.get("any", []))
+    
+    def hydrate(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Arama sonuçlarına tam tarif bilgilerini ekle (doküman deposundan tek sorguda)
         
-        # Sonuçları parent_id'ye göre grupla
-        # Her parent için en iyi skoru tut
-        parent_results = {}
+        Sadece gösterilecek / LLM'e gönderilecek sonuçlar için çağrılır.
+        Tarifi zaten içeren sonuçlar (eski collection'lar) olduğu gibi kalır.
         
-        for result in response.points:
-            parent_id = result.payload.get("parent_id")
-            score = result.score
-            chunk_type = result.payload.get("chunk_type")
-            
-            if parent_id not in parent_results or score > parent_results[parent_id]["score"]:
-                parent_results[parent_id] = {
-                    "id": parent_id,
-                    "score": score,
-                    "matched_chunk": chunk_type,
-                    "title": result.payload.get("title", ""),
-                    "url": result.payload.get("url", ""),
-                    "ingredients": result.payload.get("ingredients", []),
-                    "instructions": result.payload.get("instructions", [])
-                }
-        
-        # Skora göre sırala ve top_k kadar döndür
-        sorted_results = sorted(
-            parent_results.values(), 
-            key=lambda x: x["score"], 
-            reverse=True
-        )[:top_k]
-        
-        return sorted_results
+        Args:
+            results: search() sonuçları (yerinde güncellenir)
+        
+        Returns:
+            Aynı liste (tarif alanları eklenmiş)
+        """
+        missing = [r["id"] for r in results if "instructions" not in r]
+        if not missing or self.docs is None:
+            return results
+        
+        docs = self.docs.get_many(missing)
+        for result in results:
+            if "instructions" not in result:
+                result.update(recipe_result(result["id"], docs.get(int(result["id"]), {})))
+        return results
+    
+    def _check_search_mode(self, mode: str):
+        """Arama modunu ve collection'ın bu modu destekleyip desteklemediğini kontrol et"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Bilinmeyen arama modu: {mode} (seçenekler: {', '.join(SEARCH_MODES)})")
+        if mode == "binary" and not self.has_binary:
+            raise ValueError(
+                "'binary' araması için collection'da binary kod yok "
+                "(QUANTIZATION=\"binary\" ile yeniden indexleyin)"
+            )
+        if mode in ("sparse", "hybrid") and not self.has_sparse:
+            raise ValueError(
+                f"'{mode}' araması için collection'da sparse vektör yok "
+                f"(SPARSE_VECTORS=True ile yeniden indexleyin)"
+            )
+    
+    def _search_params(self, mode: str) -> Optional[SearchParams]:
+        """
+        Dense aramanın kuantizasyon ayarı
+        
+        int8 collection'da kodlarla aday seçilip tam vektörle yeniden skorlanır.
+        Binary kodlar sadece "binary" modda kullanılır, "dense" mod tam vektörlerle arar.
+        """
+        if mode == "binary":
+            return SearchParams(
+                quantization=QuantizationSearchParams(rescore=True, oversampling=QUANTIZATION_OVERSAMPLING)
+            )
+        if self.has_binary:
+            return SearchParams(quantization=QuantizationSearchParams(ignore=True))
+        if QUANTIZATION:
+            return SearchParams(
+                quantization=QuantizationSearchParams(rescore=True, oversampling=QUANTIZATION_OVERSAMPLING)
+            )
+        return None
+    
+    def _query_args(
+        self,
+        mode: str,
+        limit: int,
+        query_vector: Optional[List[float]],
+        sparse_vector: Optional[Dict[int, float]],
+        score_threshold: Optional[float],
+        query_filter: Optional[Filter]
+    ) -> Dict[str, Any]:
+        """
+        Arama moduna göre query_points parametrelerini oluştur
+        
+        Sparse ve RRF skorları cosine ölçeğinde olmadığı için
+        score_threshold sadece dense modda uygulanır.
+        """
+        if mode in ("dense", "binary"):
+            return {"query": query_vector, "score_threshold": score_threshold, "search_params": self._search_params(mode)}
+        
+        if mode == "sparse":
+            return {"query": to_sparse_vector(sparse_vector), "using": SPARSE_VECTOR_NAME}
+        
+        # Hybrid: iki kanaldan aday al, sıralamaları RRF ile birleştir
+        prefetch_limit = max(HYBRID_PREFETCH_LIMIT, limit)
+        return {
+            "prefetch": [
+                Prefetch(
+                    query=query_vector,
+                    limit=prefetch_limit,
+                    filter=query_filter,
+                    params=self._search_params("dense")
+                ),
+                Prefetch(
+                    query=to_sparse_vector(sparse_vector),
+                    using=SPARSE_VECTOR_NAME,
+                    limit=prefetch_limit,
+                    filter=query_filter
+                )
+            ],
+            "query": FusionQuery(fusion=Fusion.RRF)
+        }
     
     def search_by_chunk_type(
         self,
@@ -328,47 +1213,684 @@ class RecipeDatabase:
             query_vector=query_vector,
             top_k=top_k,
             score_threshold=score_threshold,
-            chunk_type_filter=chunk_type
+            chunk_type_filter=chunk_type,
+            mode="dense"
         )
     
     def get_recipe_by_parent_id(self, parent_id: int) -> Optional[Dict[str, Any]]:
         """Parent ID ile tarif getir"""
-        # Parent'ın ilk chunk'ını getir
-        point_id = parent_id * CHUNKS_PER_RECIPE
+        if self.docs is not None:
+            doc = self.docs.get(parent_id)
+            return recipe_result(parent_id, doc) if doc is not None else None
+        
+        # Eski collection'lar: parent'ın ilk chunk'ını getir
+        try:
+            point_id = self.chunk_table.chunk_range(parent_id).start
+        except KeyError:
+            return None
         
         results = self.client.retrieve(
-            collection_name=COLLECTION_NAME,
+            collection_name=self.collection,
             ids=[point_id]
         )
         
         if results:
-            point = results[0]
+            return recipe_result(results[0].payload.get("parent_id"), results[0].payload)
+        return None
+    
+    def delete_collection(self):
+        """Collection sil"""
+        if self.collection_exists():
+            self.client.delete_collection(self.collection)
+            self._close_doc_store(remove=True)
+            self._ingredient_index_path().unlink(missing_ok=True)
+            self._projection_path().unlink(missing_ok=True)
+            self.ingredients = None
+            self._chunk_table_path().unlink(missing_ok=True)
+            self.chunk_table = ChunkTable()
+            print(f"🗑️  Collection silindi: {self.collection}")
+        else:
+            print(f"ℹ️  Collection bulunamadı: {self.collection}")
+
+
+class LocalRecipeDatabase(RecipeDatabase):
+    """
+    Süreç içi NumPy vektör index'i + SQLite doküman deposu (Qdrant yerine)
+    
+    Chunk vektörleri bitişik bir float32 matriste tutulur ve sorgu tek
+    matris-vektör çarpımı ile cevaplanır. Tarif bilgileri her tarif için
+    bir kez (chunk başına değil) saklanır. Arayüz RecipeDatabase ile aynıdır.
+    
+    Klasör yapısı (LOCAL_DB_PATH / <sürüm>, örn: recipes_v3; bkz. RecipeDatabase.promote):
+        collection.json    : Collection metadata'sı (projeksiyon, chunking)
+        vectors/           : Chunk vektör index'i (flat / HNSW / IVF-PQ / kuantize, bkz. vector_index.py)
+        docs.sqlite        : Tarifler ("docs") ve chunk bilgileri ("chunks")
+        chunk_offsets.npy  : Chunk → parent offset tablosu
+        projection.npz     : Boyut indirgeme parametreleri (varsa)
+    
+    Sadece dense arama desteklenir (sparse / hybrid için Qdrant backend'i).
+    """
+    
+    def __init__(self, collection: Optional[str] = None):
+        """
+        Collection klasörünü aç (yoksa create_collection ile oluşturulur)
+        
+        Args:
+            collection: Açılacak collection klasörü (None ise alias dosyasının gösterdiği sürüm)
+        """
+        self.collection = collection or self._resolve_alias()
+        print(f"🔄 Yerel vektör index'i açılıyor: {self._collection_path()}")
+        self.index = None
+        self.docs = None
+        self.chunks = None
+        self.ingredients = None
+        self.projector = None
+        self.has_sparse = False
+        self.has_binary = False
+        self.chunking = CHUNKING_STRATEGY
+        self.chunk_table = ChunkTable()
+        self._open()
+    
+    def _collection_path(self) -> Path:
+        """Collection klasörü"""
+        return Path(LOCAL_DB_PATH) / self.collection
+    
+    def _metadata_path(self) -> Path:
+        return self._collection_path() / "collection.json"
+    
+    def _projection_path(self) -> Path:
+        """Projeksiyon parametrelerinin kaydedildiği dosya"""
+        return self._collection_path() / "projection.npz"
+    
+    def _ingredient_index_path(self) -> Path:
+        """Malzeme ters index'inin kaydedildiği dosya (parent ID'leri üzerinde)"""
+        return self._collection_path() / "ingredients.npz"
+    
+    def _chunk_table_path(self) -> Path:
+        """Chunk offset tablosunun kaydedildiği dosya"""
+        return self._collection_path() / "chunk_offsets.npy"
+    
+    def _open(self):
+        """Mevcut collection'ın index'ini, doküman deposunu, projeksiyonunu ve chunk tablosunu yükle"""
+        if not self.collection_exists():
+            return
+        
+        from vector_index import open_vector_index
+        
+        self.index = open_vector_index(
+            self._collection_path() / "vectors",
+            mmap=LOCAL_INDEX_MMAP,
+            ef_search=HNSW_EF_SEARCH,
+            nprobe=IVF_NPROBE,
+            rerank=IVF_RERANK,
+            oversampling=QUANTIZATION_OVERSAMPLING
+        )
+        self._open_doc_stores()
+        self.ingredients = self._load_ingredient_index()
+        self._load_projector()
+        self._load_chunk_table()
+        self.has_binary = getattr(self.index, "quantization", None) == "binary"
+        print(f"✅ Yerel index hazır ({len(self.index):,} chunk vektörü)")
+    
+    def _open_doc_stores(self):
+        """Tarif ve chunk tablolarını aç (aynı SQLite dosyası)"""
+        from doc_store import DocumentStore
+        
+        db_path = self._collection_path() / "docs.sqlite"
+        self.docs = DocumentStore(db_path, table="docs")
+        self.chunks = DocumentStore(db_path, table="chunks")
+    
+    def _index_type(self) -> str:
+        """Yeni index'in türü (kuantizasyon açıksa kuantize flat index)"""
+        if not QUANTIZATION:
+            return LOCAL_INDEX_TYPE
+        if LOCAL_INDEX_TYPE != "flat":
+            raise ValueError(f"Kuantizasyon sadece flat index ile kullanılabilir (LOCAL_INDEX_TYPE={LOCAL_INDEX_TYPE})")
+        return "quantized"
+    
+    def _index_params(self) -> Dict[str, Any]:
+        """Yeni index'in türüne özel kurulum parametreleri"""
+        index_type = self._index_type()
+        if index_type == "hnsw":
+            return {"M": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION, "ef_search": HNSW_EF_SEARCH}
+        if index_type == "ivf_pq":
+            return {"nlist": IVF_NLIST, "m": PQ_M, "nprobe": IVF_NPROBE, "rerank": IVF_RERANK}
+        if index_type == "quantized":
             return {
-                "id": point.payload.get("parent_id"),
-                "title": point.payload.get("title", ""),
-                "url": point.payload.get("url", ""),
-                "ingredients": point.payload.get("ingredients", []),
-                "instructions": point.payload.get("instructions", [])
+                "quantization": QUANTIZATION,
+                "quantile": QUANTIZATION_QUANTILE,
+                "oversampling": QUANTIZATION_OVERSAMPLING
             }
-        return None
+        return {}
+    
+    def _read_metadata(self) -> Dict[str, Any]:
+        with open(self._metadata_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    
+    def _load_projector(self):
+        """Collection metadata'sında kayıtlı projeksiyonu yükle"""
+        self.projector = None
+        projection = self._read_metadata().get("projection")
+        
+        if projection:
+            from dim_reduction import VectorProjector
+            self.projector = VectorProjector.load(self._collection_path() / projection["file"])
+            print(f"📐 Boyut indirgeme: {projection['method']} "
+                  f"{projection['input_dim']} → {projection['output_dim']}")
+    
+    def _load_chunk_table(self):
+        """Collection'ın chunking stratejisini ve offset tablosunu yükle"""
+        self.chunking = self._read_metadata().get("chunking", {}).get("strategy", "fields")
+        if self._chunk_table_path().exists():
+            self.chunk_table = ChunkTable.load(self._chunk_table_path())
+    
+    def close(self):
+        """Index ve doküman deposunu kapat"""
+        if self.index is not None:
+            self.index.close()
+        for store in (self.docs, self.chunks):
+            if store is not None:
+                store.close()
+        self.docs, self.chunks = None, None
+    
+    def flush(self):
+        """Index'in bellekteki yapılarını (örn: HNSW grafı) ve malzeme index'ini diske yaz"""
+        if self.index is not None:
+            self.index.flush()
+        if self.ingredients is not None:
+            self.ingredients.save(self._ingredient_index_path())
+    
+    def index_needs_training(self) -> bool:
+        """Index vektör eklenmeden önce eğitilmeli mi (örn: IVF-PQ)"""
+        return self.index is not None and not self.index.is_trained
+    
+    def train_index(self, vectors):
+        """
+        Index'i örnek vektörlerle eğit (indirgenmemiş embedding'ler)
+        
+        Args:
+            vectors: (n, EMBEDDING_DIM) örnekler (örn: embedding deposundan)
+        """
+        if self.projector is not None:
+            vectors = self.projector.transform(vectors)
+        self.index.train(vectors)
+    
+    def collection_exists(self) -> bool:
+        """Collection var mı kontrol et"""
+        return self._metadata_path().exists()
+    
+    def _alias_path(self) -> Path:
+        """COLLECTION_NAME alias'ı: gösterdiği sürüm klasörünün adını tutan dosya"""
+        return Path(LOCAL_DB_PATH) / f"{COLLECTION_NAME}.alias"
+    
+    def _collection_names(self) -> List[str]:
+        """LOCAL_DB_PATH altındaki collection klasörleri"""
+        root = Path(LOCAL_DB_PATH)
+        return [path.name for path in root.iterdir() if path.is_dir()] if root.exists() else []
+    
+    def _alias_target(self) -> Optional[str]:
+        """Alias dosyasındaki sürüm (dosya yoksa None)"""
+        if not self._alias_path().exists():
+            return None
+        return self._alias_path().read_text(encoding="utf-8").strip()
+    
+    def _point_alias(self, collection: str):
+        """Alias dosyasını yeniden yaz (os.replace ile atomik: okuyan eski veya yeni adı görür)"""
+        from vector_index import write_atomic
+        write_atomic(self._alias_path(), lambda f: f.write(collection.encode("utf-8")))
+    
+    def _open_collection(self, collection: str) -> "LocalRecipeDatabase":
+        """Başka bir collection klasörünü aç"""
+        return LocalRecipeDatabase(collection)
+    
+    def _release(self):
+        """Collection'ın index'ini ve doküman deposunu kapat"""
+        self.close()
+    
+    def _drop_version(self, name: str):
+        """Eski sürümün klasörünü sil (index ve doküman deposu açılmaz)"""
+        shutil.rmtree(Path(LOCAL_DB_PATH) / name)
+        print(f"🗑️  Collection silindi: {name}")
+    
+    def _retire_legacy(self):
+        """
+        Sürümsüz eski collection'ı sürüm 0 olarak sakla
+        
+        Alias ayrı bir dosya olduğundan klasör adı çakışmaz; klasör yeniden
+        adlandırılır ve diğer eski sürümler gibi COLLECTION_KEEP_VERSIONS'a
+        göre saklanır / silinir.
+        """
+        target = version_name(0)
+        if target in self._collection_names():
+            return super()._retire_legacy()
+        
+        (Path(LOCAL_DB_PATH) / COLLECTION_NAME).rename(Path(LOCAL_DB_PATH) / target)
+        print(f"📦 Sürümsüz eski collection saklandı: {COLLECTION_NAME} → {target}")
+    
+    def create_collection(self, recreate: bool = False, projector=None):
+        """
+        Collection oluştur
+        
+        Args:
+            recreate: True ise mevcut collection silinip yeniden oluşturulur
+            projector: Boyut indirgeme projeksiyonu (VectorProjector, isteğe bağlı)
+        """
+        from vector_index import create_vector_index
+        
+        if self.collection_exists():
+            if recreate:
+                print(f"🗑️  Mevcut collection siliniyor: {self.collection}")
+                self.close()
+                shutil.rmtree(self._collection_path())
+            else:
+                print(f"ℹ️  Collection zaten mevcut: {self.collection}")
+                return
+        
+        self._collection_path().mkdir(parents=True, exist_ok=True)
+        
+        # Projeksiyon varsa parametreleri kaydet ve metadata'ya yaz
+        vector_size = EMBEDDING_DIM
+        metadata = {}
+        if projector is not None:
+            projector.save(self._projection_path())
+            vector_size = projector.output_dim
+            metadata["projection"] = projector.to_metadata(self._projection_path().name)
+        
+        # Chunking stratejisi (offset tablosu ayrı dosyada)
+        chunking = {"strategy": CHUNKING_STRATEGY, "table_file": self._chunk_table_path().name}
+        if CHUNKING_STRATEGY == "sliding_window":
+            chunking.update(window_sentences=WINDOW_SENTENCES, window_stride=WINDOW_STRIDE)
+        metadata["chunking"] = chunking
+        
+        print(f"📦 Collection oluşturuluyor: {self.collection} ({vector_size} boyut, yerel)")
+        self.index = create_vector_index(
+            self._collection_path() / "vectors",
+            self._index_type(),
+            vector_size,
+            metric=DISTANCE_METRIC,
+            mmap=LOCAL_INDEX_MMAP,
+            **self._index_params()
+        )
+        self.has_binary = getattr(self.index, "quantization", None) == "binary"
+        self._open_doc_stores()
+        self.ingredients = IngredientIndex()
+        
+        # Metadata en son yazılır (collection_exists bu dosyaya bakar)
+        with open(self._metadata_path(), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+        
+        self.projector = projector
+        self.chunking = CHUNKING_STRATEGY
+        self.chunk_table = ChunkTable()
+        print("✅ Collection başarıyla oluşturuldu!")
+    
+    def get_collection_info(self) -> Dict[str, Any]:
+        """Collection bilgilerini getir"""
+        if not self.collection_exists():
+            return {"exists": False}
+        
+        index_stats = self.index.stats()
+        stats = self.chunk_table.stats(self.docs.all_ids())
+        
+        return {
+            "exists": True,
+            "backend": "local",
+            "points_count": index_stats["count"],
+            "recipes_count": stats["parents"],
+            "chunks_per_recipe": round(stats["mean"], 2),
+            "chunks_per_recipe_range": (stats["min"], stats["max"]),
+            "chunking": self.chunking,
+            "vector_dim": index_stats["dim"],
+            "projection": self.projector.method if self.projector else None,
+            "sparse": False,
+            "index_type": index_stats["type"],
+            "ef_search": index_stats.get("ef_search"),
+            "nprobe": index_stats.get("nprobe"),
+            "quantization": index_stats.get("quantization"),
+            "oversampling": index_stats.get("oversampling"),
+            "graph_bytes": index_stats.get("graph_bytes"),
+            "index_ram_bytes": index_stats["ram_bytes"],
+            "vector_bytes": index_stats["vector_bytes"],
+            "doc_store_bytes": self.docs.size_bytes(),
+            "status": "green"
+        }
+    
+    def _insert_chunks(
+        self,
+        recipes: List[Dict[str, Any]],
+        all_chunk_embeddings: List[List[tuple]],
+        parent_ids: Sequence[int],
+        replace: bool = False
+    ) -> int:
+        """Tariflerin chunk vektörlerini index'e, tarif ve chunk bilgilerini depoya yaz"""
+        chunk_ids, vectors, chunk_docs, recipe_docs = [], [], [], []
+        
+        for parent_id, recipe, chunk_embeddings in zip(parent_ids, recipes, all_chunk_embeddings):
+            parent_id = int(parent_id)
+            layout = chunk_layout(recipe, self.chunking, WINDOW_SENTENCES, WINDOW_STRIDE)
+            if len(layout) != len(chunk_embeddings):
+                raise ValueError(
+                    f"Tarif {parent_id}: {len(chunk_embeddings)} chunk embedding'i var, "
+                    f"'{self.chunking}' düzeni {len(layout)} chunk bekliyor"
+                )
+            
+            # Boyut indirgeme (sorgularla aynı projeksiyon)
+            chunk_embeddings = self._project_chunks(chunk_embeddings)
+            first_chunk_id = self.chunk_table.allocate(parent_id, len(chunk_embeddings))
+            recipe_docs.append((parent_id, recipe_payload(recipe)))
+            
+            for chunk_idx, (chunk_type, embedding, *_) in enumerate(chunk_embeddings):
+                chunk_doc = {"parent_id": parent_id, "chunk_type": chunk_type, "chunk_idx": chunk_idx}
+                snippet = layout[chunk_idx][1]
+                if snippet is not None:
+                    chunk_doc["snippet"] = snippet
+                
+                chunk_ids.append(first_chunk_id + chunk_idx)
+                vectors.append(embedding)
+                chunk_docs.append((first_chunk_id + chunk_idx, chunk_doc))
+        
+        self.docs.put_many(recipe_docs)
+        self.chunks.put_many(chunk_docs)
+        if self.ingredients is not None:
+            # Üzerine yazılan tariflerin eski malzeme kelimeleri silinir
+            if replace:
+                self.ingredients.remove([parent_id for parent_id, _ in recipe_docs])
+            self.ingredients.add_many((parent_id, doc["ingredients"]) for parent_id, doc in recipe_docs)
+        return self.index.add(chunk_ids, vectors)
+    
+    def insert_recipe_chunks(
+        self, 
+        recipe: Dict[str, Any],
+        chunk_embeddings: List[tuple],
+        parent_id: int
+    ) -> int:
+        """Tek bir tarifin chunk'larını ekle (sparse vektörler yok sayılır)"""
+        return self._insert_chunks([recipe], [chunk_embeddings], [parent_id], replace=True)
+    
+    def insert_recipes_chunks(
+        self, 
+        recipes: List[Dict[str, Any]],
+        all_chunk_embeddings: List[List[tuple]],
+        start_parent_id: int = 0,
+        parent_ids: Optional[Sequence[int]] = None,
+        replace: bool = False
+    ) -> int:
+        """Birden fazla tarifin chunk'larını ekle (sparse vektörler yok sayılır)"""
+        if parent_ids is None:
+            parent_ids = range(start_parent_id, start_parent_id + len(recipes))
+        return self._insert_chunks(recipes, all_chunk_embeddings, parent_ids, replace=replace)
+    
+    def delete_recipes(self, parent_ids: Sequence[int]) -> int:
+        """Tarifleri chunk vektörleri, chunk kayıtları ve malzeme kelimeleriyle birlikte sil"""
+        parent_ids = [int(i) for i in parent_ids]
+        if not parent_ids:
+            return 0
+        
+        chunk_ids = self.chunk_table.chunks_of(parent_ids).tolist()
+        self.index.delete(chunk_ids)
+        self.chunks.delete_many(chunk_ids)
+        self.docs.delete_many(parent_ids)
+        if self.ingredients is not None:
+            self.ingredients.remove(parent_ids)
+        return len(parent_ids)
+    
+    def indexed_recipes(self) -> List[Tuple[int, Optional[str], Optional[str]]]:
+        """Doküman deposundaki tariflerin anahtarları: [(parent ID, recipe_key, content_hash), ...]"""
+        docs = self.docs.get_many(self.docs.all_ids(), fields=INDEX_KEY_FIELDS)
+        return [(parent_id, doc.get("recipe_key"), doc.get("content_hash")) for parent_id, doc in docs.items()]
+    
+    def search(
+        self, 
+        query_vector: Optional[List[float]] = None, 
+        top_k: int = 5,
+        score_threshold: Optional[float] = None,
+        chunk_type_filter: Optional[str] = None,
+        ingredient_filter: Optional[IngredientFilter] = None,
+        sparse_vector: Optional[Dict[int, float]] = None,
+        mode: Optional[str] = None,
+        aggregation: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Vektör araması yap ve sonuçları parent'a göre grupla
+        (RecipeDatabase.search ile aynı arayüz, sadece dense)
+        
+        Returns:
+            Bulunan tarifler listesi (parent bazlı, en fazla top_k farklı tarif)
+        """
+        mode = mode or SEARCH_MODE
+        aggregation = aggregation or PARENT_AGGREGATION
+        self._check_search_mode(mode)
+        self._check_aggregation(aggregation)
+        
+        # Boyut indirgeme (index ile aynı projeksiyon)
+        if self.projector is not None:
+            query_vector = self.projector.transform(query_vector)
+        
+        allowed_ids = self._allowed_chunk_ids(chunk_type_filter, ingredient_filter)
+        parents = self._search_parents(
+            self._index_search(mode), query_vector, top_k, allowed_ids, score_threshold, aggregation
+        )
+        return self._grouped_results([parents])[0]
+    
+    def search_batch(
+        self,
+        query_vectors: Optional[Sequence[List[float]]] = None,
+        top_k: int = 5,
+        score_threshold: Optional[float] = None,
+        chunk_type_filter: Optional[str] = None,
+        ingredient_filters: Optional[Sequence[Optional[IngredientFilter]]] = None,
+        sparse_vectors: Optional[Sequence[Dict[int, float]]] = None,
+        mode: Optional[str] = None,
+        aggregation: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla sorguyu birlikte ara (RecipeDatabase.search_batch ile aynı arayüz)
+        
+        Sorgular tek bir matris-matris çarpımıyla skorlanır, özet alanlar ve
+        chunk bilgileri tüm sonuçlar için tek sorguda okunur. Adayları top_k'dan
+        az tarife düşen sorgular daha büyük limitle tek tek yeniden aranır.
+        
+        Returns:
+            Sorgu başına bulunan tarifler listesi (sorgu sırasıyla)
+        """
+        mode = mode or SEARCH_MODE
+        aggregation = aggregation or PARENT_AGGREGATION
+        self._check_search_mode(mode)
+        self._check_aggregation(aggregation)
+        
+        if query_vectors is None or not len(query_vectors):
+            return []
+        
+        # Boyut indirgeme (tüm sorgular tek matris çarpımıyla)
+        if self.projector is not None:
+            query_vectors = self.projector.transform(query_vectors)
+        
+        ingredient_filters = ingredient_filters if ingredient_filters is not None else [None] * len(query_vectors)
+        allowed_ids = [self._allowed_chunk_ids(chunk_type_filter, f) for f in ingredient_filters]
+        
+        search_limit = self._search_limit(top_k, aggregation)
+        batch_hits = self._index_search_batch(mode)(
+            query_vectors,
+            search_limit,
+            allowed_ids=None if all(allowed is None for allowed in allowed_ids) else allowed_ids,
+            score_threshold=score_threshold
+        )
+        
+        parents_list = [
+            self._search_parents(
+                self._index_search(mode), query_vector, top_k, allowed, score_threshold, aggregation, hits=hits
+            )
+            for query_vector, allowed, hits in zip(query_vectors, allowed_ids, batch_hits)
+        ]
+        return self._grouped_results(parents_list)
+    
+    def _search_parents(
+        self,
+        search,
+        query_vector,
+        top_k: int,
+        allowed_ids: Optional[np.ndarray],
+        score_threshold: Optional[float],
+        aggregation: str,
+        hits: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> List[Tuple[int, float, List[int]]]:
+        """
+        Chunk'ları parent'a göre grupla; top_k farklı tarif bulunana kadar aday limitini büyüt
+        
+        Bir tarifin birçok chunk'ı adayları doldurduğunda limit ikiye katlanıp
+        yeniden aranır (index'te daha fazla chunk kalmayana kadar). "sum" /
+        "weighted" skorlarda en iyi top_k * PARENT_CANDIDATES aday tarifin tüm
+        chunk'ları tam skorlanıp tarifler birleşik skora göre seçilir.
+        
+        Args:
+            search: Index arama fonksiyonu (bkz. _index_search)
+            hits: İlk limitte önceden alınmış (ID'ler, skorlar) (örn: search_batch)
+        
+        Returns:
+            top_parents çıktısı (isabetler: chunk ID'leri)
+        """
+        limit = self._search_limit(top_k, aggregation)
+        candidates = top_k if aggregation == "max" else top_k * PARENT_CANDIDATES
+        while True:
+            if hits is None:
+                hits = search(query_vector, limit, allowed_ids=allowed_ids, score_threshold=score_threshold)
+            ids, scores = hits
+            
+            parents = top_parents(
+                zip(self.chunk_table.parents_of(ids).tolist(), scores.tolist(), ids.tolist()),
+                candidates
+            )
+            if len(parents) >= top_k or len(ids) < limit:
+                break
+            limit, hits = limit * 2, None
+        
+        if aggregation == "max":
+            return parents
+        return self._aggregate_parents(
+            query_vector, [parent_id for parent_id, _, _ in parents], top_k, allowed_ids, score_threshold, aggregation
+        )
+    
+    def _aggregate_parents(
+        self,
+        query_vector,
+        parent_ids: List[int],
+        top_k: int,
+        allowed_ids: Optional[np.ndarray],
+        score_threshold: Optional[float],
+        aggregation: str
+    ) -> List[Tuple[int, float, List[int]]]:
+        """Aday tariflerin tüm (izin verilen) chunk'larını tam skorla ve tarif skoruna göre seç"""
+        chunk_ids = self.chunk_table.chunks_of(parent_ids)
+        if allowed_ids is not None:
+            chunk_ids = np.intersect1d(chunk_ids, allowed_ids)
+        
+        rows = self.index.rows_for(chunk_ids)
+        scores = self.index.exact_scores(rows, self.index.prepare_query(query_vector))
+        order = np.argsort(-scores, kind="stable")
+        if score_threshold is not None:
+            order = order[scores[order] >= score_threshold]
+        
+        chunk_ids = self.index.ids[rows[order]]
+        return top_parents(
+            zip(self.chunk_table.parents_of(chunk_ids).tolist(), scores[order].tolist(), chunk_ids.tolist()),
+            top_k,
+            aggregation
+        )
+    
+    def _allowed_chunk_ids(
+        self,
+        chunk_type_filter: Optional[str],
+        ingredient_filter: Optional[IngredientFilter]
+    ) -> Optional[np.ndarray]:
+        """Filtreleri izin verilen chunk ID'lerine çevir (malzeme: ters index'te bitmap işlemleri)"""
+        allowed_ids = None
+        if chunk_type_filter:
+            allowed_ids = self.chunks.ids_where("chunk_type", chunk_type_filter)
+        if ingredient_filter:
+            ingredient_chunks = self.chunk_table.chunks_of(self._ingredient_ids(ingredient_filter))
+            allowed_ids = ingredient_chunks if allowed_ids is None else np.intersect1d(allowed_ids, ingredient_chunks)
+        return allowed_ids
+    
+    def _grouped_results(self, parents_list: List[List[Tuple[int, float, List[int]]]]) -> List[List[Dict[str, Any]]]:
+        """Sorgu başına top_parents çıktısından tarif sonuçları (isabetler chunk ID'leri)"""
+        # Özet alanlar ve en iyi chunk'ların bilgileri tüm sorgular için tek sorguda (tam tarif hydrate ile)
+        docs = self.docs.get_many(
+            {parent_id for parents in parents_list for parent_id, _, _ in parents},
+            fields=SUMMARY_FIELDS
+        )
+        chunk_docs = self.chunks.get_many(
+            {chunk_ids[0] for parents in parents_list for _, _, chunk_ids in parents}
+        )
+        
+        batch = []
+        for parents in parents_list:
+            results = []
+            for parent_id, score, chunk_ids in parents:
+                chunk_doc = chunk_docs.get(chunk_ids[0], {})
+                result = recipe_summary(parent_id, docs.get(parent_id, {}))
+                result.update(score=score, matched_chunk=chunk_doc.get("chunk_type"), snippet=chunk_doc.get("snippet"))
+                results.append(result)
+            batch.append(results)
+        return batch
+    
+    def _check_search_mode(self, mode: str):
+        """Arama modunu kontrol et (yerel backend dense ve binary arar)"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Bilinmeyen arama modu: {mode} (seçenekler: {', '.join(SEARCH_MODES)})")
+        if mode in ("sparse", "hybrid"):
+            raise ValueError(f"'{mode}' araması yerel backend'de desteklenmiyor (DB_BACKEND=\"qdrant\" kullanın)")
+        if mode == "binary" and not self.has_binary:
+            raise ValueError(
+                "'binary' araması için index'te binary kod yok "
+                "(QUANTIZATION=\"binary\" ile yeniden indexleyin)"
+            )
+    
+    def _index_search(self, mode: str):
+        """Moda göre index arama fonksiyonu (binary kodlar sadece "binary" modda)"""
+        if self.has_binary and mode != "binary":
+            return self.index.exact_search
+        return self.index.search
+    
+    def _index_search_batch(self, mode: str):
+        """Moda göre index batch arama fonksiyonu"""
+        if self.has_binary and mode != "binary":
+            return self.index.exact_search_batch
+        return self.index.search_batch
+    
+    def get_recipe_by_parent_id(self, parent_id: int) -> Optional[Dict[str, Any]]:
+        """Parent ID ile tarif getir"""
+        doc = self.docs.get(parent_id) if self.docs is not None else None
+        return recipe_result(parent_id, doc) if doc is not None else None
     
     def delete_collection(self):
         """Collection sil"""
         if self.collection_exists():
-            self.client.delete_collection(COLLECTION_NAME)
-            print(f"🗑️  Collection silindi: {COLLECTION_NAME}")
+            self.close()
+            shutil.rmtree(self._collection_path())
+            if self._alias_target() == self.collection:
+                self._alias_path().unlink()
+            self.index = None
+            self.ingredients = None
+            self.chunk_table = ChunkTable()
+            print(f"🗑️  Collection silindi: {self.collection}")
         else:
-            print(f"ℹ️  Collection bulunamadı: {COLLECTION_NAME}")
+            print(f"ℹ️  Collection bulunamadı: {self.collection}")
+
 
+# Desteklenen backend'ler (bkz. config.DB_BACKEND)
+DB_BACKENDS = {"qdrant": RecipeDatabase, "local": LocalRecipeDatabase}
 
 # Singleton instance
 _db_instance = None
 
 def get_database() -> RecipeDatabase:
-    """Database singleton instance döndür"""
+    """Database singleton instance döndür (DB_BACKEND'e göre)"""
     global _db_instance
     if _db_instance is None:
-        _db_instance = RecipeDatabase()
+        if DB_BACKEND not in DB_BACKENDS:
+            raise ValueError(f"Bilinmeyen veritabanı backend'i: {DB_BACKEND} "
+                             f"(seçenekler: {', '.join(DB_BACKENDS)})")
+        _db_instance = DB_BACKENDS[DB_BACKEND]()
     return _db_instance
 
 
@@ -0,0 +1,161 @@
+"""
+Boyut İndirgeme Modülü
+======================
+Saklanan tarif vektörlerini daha küçük boyuta indirme (PCA / prefix truncation)
+
+- "pca"      : Korpustan alınan örnekler üzerinde PCA fit edilir
+- "truncate" : İlk N boyut alınır (Matryoshka ile eğitilmiş modeller için)
+
+Aynı projeksiyon hem indexlemede hem sorguda uygulanır; parametreler
+collection ile birlikte diske kaydedilir.
+"""
+
+from pathlib import Path
+from typing import List, Dict, Any, Union
+
+import numpy as np
+
+REDUCTION_METHODS = ("pca", "truncate")
+
+
+class VectorProjector:
+    """Vektörleri input_dim -> output_dim boyutuna indiren projeksiyon"""
+
+    def __init__(
+        self,
+        method: str,
+        input_dim: int,
+        output_dim: int,
+        mean: np.ndarray = None,
+        components: np.ndarray = None
+    ):
+        """
+        Args:
+            method: "pca" veya "truncate"
+            input_dim: Orijinal embedding boyutu
+            output_dim: İndirgenmiş boyut
+            mean: PCA merkezleme vektörü (input_dim,)
+            components: PCA bileşenleri (output_dim, input_dim)
+        """
+        if method not in REDUCTION_METHODS:
+            raise ValueError(f"Bilinmeyen indirgeme yöntemi: {method}")
+        if output_dim >= input_dim:
+            raise ValueError(f"İndirgenmiş boyut ({output_dim}) orijinalden ({input_dim}) küçük olmalı")
+        if method == "pca" and (mean is None or components is None):
+            raise ValueError("PCA projeksiyonu için mean ve components gerekli")
+
+        self.method = method
+        self.input_dim = input_dim
+        self.output_dim = output_dim
+        self.mean = mean
+        self.components = components
+
+    # =========================================================================
+    # OLUŞTURMA
+    # =========================================================================
+
+    @classmethod
+    def fit_pca(cls, vectors: Union[np.ndarray, List[List[float]]], output_dim: int) -> "VectorProjector":
+        """
+        Örnek vektörler üzerinde PCA fit et
+
+        Args:
+            vectors: (n, input_dim) örnek embedding'ler
+            output_dim: Hedef boyut
+        """
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if len(matrix) < output_dim:
+            raise ValueError(f"PCA için en az {output_dim} örnek gerekli (mevcut: {len(matrix)})")
+
+        mean = matrix.mean(axis=0)
+        # SVD: satırları merkezlenmiş matris -> ilk output_dim sağ tekil vektör
+        _, singular_values, vt = np.linalg.svd(matrix - mean, full_matrices=False)
+
+        projector = cls("pca", matrix.shape[1], output_dim, mean=mean, components=vt[:output_dim].copy())
+
+        explained = (singular_values[:output_dim] ** 2).sum() / (singular_values ** 2).sum()
+        print(f"📊 PCA {matrix.shape[1]} → {output_dim} boyut (açıklanan varyans: {explained:.2%})")
+
+        return projector
+
+    @classmethod
+    def truncation(cls, input_dim: int, output_dim: int) -> "VectorProjector":
+        """Prefix truncation projeksiyonu (ilk output_dim boyut)"""
+        return cls("truncate", input_dim, output_dim)
+
+    # =========================================================================
+    # UYGULAMA
+    # =========================================================================
+
+    def transform(self, vectors: Union[np.ndarray, List[List[float]]]) -> np.ndarray:
+        """
+        Vektörleri indirgenmiş boyuta taşı ve yeniden normalize et
+
+        Args:
+            vectors: (n, input_dim) veya (input_dim,) vektör(ler)
+
+        Returns:
+            (n, output_dim) veya (output_dim,) float32 dizi
+        """
+        matrix = np.asarray(vectors, dtype=np.float32)
+        single = matrix.ndim == 1
+        if single:
+            matrix = matrix[None, :]
+
+        if self.method == "pca":
+            reduced = (matrix - self.mean) @ self.components.T
+        else:
+            reduced = matrix[:, :self.output_dim]
+
+        # Cosine benzerliği için birim uzunluğa getir
+        norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+        reduced = reduced / np.maximum(norms, 1e-12)
+
+        return reduced[0] if single else reduced
+
+    def transform_list(self, vectors: List[List[float]]) -> List[List[float]]:
+        """Vektör listesini dönüştür (Qdrant point'leri için liste döndürür)"""
+        return self.transform(vectors).tolist()
+
+    # =========================================================================
+    # KAYDETME / YÜKLEME
+    # =========================================================================
+
+    def save(self, path: Path):
+        """Projeksiyon parametrelerini .npz olarak kaydet"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays = {}
+        if self.method == "pca":
+            arrays = {"mean": self.mean, "components": self.components}
+
+        np.savez(
+            path,
+            method=np.array(self.method),
+            input_dim=np.array(self.input_dim),
+            output_dim=np.array(self.output_dim),
+            **arrays
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "VectorProjector":
+        """Kaydedilmiş projeksiyonu yükle"""
+        with np.load(path) as data:
+            method = str(data["method"])
+            return cls(
+                method,
+                int(data["input_dim"]),
+                int(data["output_dim"]),
+                mean=data["mean"] if method == "pca" else None,
+                components=data["components"] if method == "pca" else None
+            )
+
+    def to_metadata(self, file_name: str) -> Dict[str, Any]:
+        """Collection metadata'sına yazılacak özet"""
+        return {
+            "method": self.method,
+            "input_dim": self.input_dim,
+            "output_dim": self.output_dim,
+            "file": file_name
+        }
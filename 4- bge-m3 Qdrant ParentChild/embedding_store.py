@@ -0,0 +1,321 @@
+"""
+Sürümlü Embedding Deposu
+========================
+Embedding'leri Qdrant'tan bağımsız olarak diskte saklar.
+
+Yapı:
+    embedding_store/
+        v1/
+            manifest.json        # Model, prefix, metin şablonu hash'i, boyut, shard listesi
+            ids.npy              # Satır başına tarif (parent) ID'si
+            chunk_types.npy      # Satır başına chunk türü kodu (manifest'teki listeye göre)
+            shard_00000.npy      # float32 (satır, boyut) vektörler
+            sparse_00000.npz     # (isteğe bağlı) CSR formatında sparse vektörler
+        v2/
+            ...
+
+- Vektör shard'ları np.load(mmap_mode="r") ile belleğe kopyalanmadan okunur
+- Her sürüm, onu üreten ayarların imzasını (signature) taşır; aynı imzalı
+  sürüm varsa indexleme embedding adımını atlayıp doğrudan depodan kurulur
+- Sürüm önce geçici klasöre yazılır, tamamlanınca yeniden adlandırılır
+"""
+
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+import numpy as np
+
+MANIFEST_FILE = "manifest.json"
+STORE_FORMAT_VERSION = 1
+
+
+def file_sha1(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Dosyanın SHA-1 özetini hesapla (veri dosyası değişti mi?)"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+    """Sürümlü embedding deposu (v1, v2, ... klasörleri)"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def versions(self) -> List[int]:
+        """Tamamlanmış sürüm numaralarını sıralı döndür"""
+        if not self.root.exists():
+            return []
+
+        versions = []
+        for path in self.root.iterdir():
+            if path.is_dir() and path.name.startswith("v") and path.name[1:].isdigit():
+                if (path / MANIFEST_FILE).exists():
+                    versions.append(int(path.name[1:]))
+        return sorted(versions)
+
+    def version_path(self, version: int) -> Path:
+        return self.root / f"v{version}"
+
+    def manifest(self, version: int) -> Dict[str, Any]:
+        """Sürümün manifest'ini oku"""
+        with open(self.version_path(version) / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def find_version(self, signature: Dict[str, Any]) -> Optional[int]:
+        """İmzası eşleşen en yeni sürümü bul (yoksa None)"""
+        for version in reversed(self.versions()):
+            if self.manifest(version).get("signature") == signature:
+                return version
+        return None
+
+    def create(self, signature: Dict[str, Any], dim: int, shard_size: int = 4096) -> "EmbeddingStoreWriter":
+        """Yeni bir sürüm için writer oluştur"""
+        versions = self.versions()
+        version = (versions[-1] + 1) if versions else 1
+        return EmbeddingStoreWriter(self, version, signature, dim, shard_size)
+
+    def open(self, version: Optional[int] = None) -> "EmbeddingStoreReader":
+        """Sürümü okumak için aç (None ise en yeni sürüm)"""
+        if version is None:
+            versions = self.versions()
+            if not versions:
+                raise FileNotFoundError(f"Embedding deposunda sürüm yok: {self.root}")
+            version = versions[-1]
+        return EmbeddingStoreReader(self.version_path(version))
+
+    def delete_version(self, version: int):
+        """Sürümü sil"""
+        shutil.rmtree(self.version_path(version), ignore_errors=True)
+
+
+class EmbeddingStoreWriter:
+    """Embedding'leri shard'lar halinde yeni bir sürüme yazar"""
+
+    def __init__(self, store: EmbeddingStore, version: int, signature: Dict[str, Any],
+                 dim: int, shard_size: int):
+        self.store = store
+        self.version = version
+        self.signature = signature
+        self.dim = dim
+        self.shard_size = shard_size
+
+        # Tamamlanana kadar geçici klasöre yazılır
+        self.path = store.root / f"v{version}.tmp"
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.path.mkdir(parents=True)
+
+        self._ids: List[int] = []
+        self._chunk_types: List[int] = []
+        self._chunk_type_names: List[str] = []
+        self._buffer: List[np.ndarray] = []
+        self._sparse_buffer: List[Dict[int, float]] = []
+        self._buffered = 0
+        self._has_sparse: Optional[bool] = None
+        self._shards: List[Dict[str, Any]] = []
+
+    def add(
+        self,
+        ids: List[int],
+        vectors,
+        sparse: Optional[List[Dict[int, float]]] = None,
+        chunk_types: Optional[List[str]] = None
+    ):
+        """
+        Satır ekle
+
+        Args:
+            ids: Satır başına tarif (parent) ID'si
+            vectors: (n, dim) dense vektörler
+            sparse: Satır başına {token_id: ağırlık} (isteğe bağlı, tüm satırlarda aynı olmalı)
+            chunk_types: Satır başına chunk türü adı (isteğe bağlı)
+        """
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dim:
+            raise ValueError(f"Beklenen boyut (n, {self.dim}), gelen: {matrix.shape}")
+
+        if self._has_sparse is None:
+            self._has_sparse = sparse is not None
+        elif self._has_sparse != (sparse is not None):
+            raise ValueError("Sparse vektörler ya tüm satırlarda ya hiçbirinde olmalı")
+
+        self._ids.extend(int(i) for i in ids)
+        for name in (chunk_types or [""] * len(matrix)):
+            if name not in self._chunk_type_names:
+                self._chunk_type_names.append(name)
+            self._chunk_types.append(self._chunk_type_names.index(name))
+
+        self._buffer.append(matrix)
+        if sparse is not None:
+            self._sparse_buffer.extend(sparse)
+        self._buffered += len(matrix)
+
+        if self._buffered >= self.shard_size:
+            self._flush()
+
+    def _flush(self):
+        """Tampondaki satırları bir shard dosyasına yaz"""
+        if not self._buffered:
+            return
+
+        shard_idx = len(self._shards)
+        shard = {"file": f"shard_{shard_idx:05d}.npy", "rows": self._buffered}
+        np.save(self.path / shard["file"], np.concatenate(self._buffer))
+
+        if self._has_sparse:
+            shard["sparse_file"] = f"sparse_{shard_idx:05d}.npz"
+            _save_sparse(self.path / shard["sparse_file"], self._sparse_buffer)
+
+        self._shards.append(shard)
+        self._buffer, self._sparse_buffer, self._buffered = [], [], 0
+
+    def commit(self) -> int:
+        """Kalan satırları yaz, manifest'i oluştur ve sürümü yayınla"""
+        self._flush()
+
+        np.save(self.path / "ids.npy", np.asarray(self._ids, dtype=np.int64))
+        np.save(self.path / "chunk_types.npy", np.asarray(self._chunk_types, dtype=np.int16))
+
+        manifest = {
+            "format": STORE_FORMAT_VERSION,
+            "version": self.version,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "signature": self.signature,
+            "dim": self.dim,
+            "dtype": "float32",
+            "count": len(self._ids),
+            "sparse": bool(self._has_sparse),
+            "chunk_types": self._chunk_type_names,
+            "shards": self._shards
+        }
+        with open(self.path / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        final_path = self.store.version_path(self.version)
+        self.path.rename(final_path)
+        self.path = final_path
+
+        print(f"💾 Embedding deposu: v{self.version} ({len(self._ids):,} satır, {len(self._shards)} shard)")
+        return self.version
+
+    def abort(self):
+        """Yarım kalan sürümü sil"""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class EmbeddingStoreReader:
+    """Bir sürümü memory-map ile okur"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+        self.ids = np.load(self.path / "ids.npy", mmap_mode="r")
+        self.chunk_type_codes = np.load(self.path / "chunk_types.npy", mmap_mode="r")
+        self._shards = [np.load(self.path / s["file"], mmap_mode="r") for s in self.manifest["shards"]]
+        self._offsets = np.cumsum([0] + [s["rows"] for s in self.manifest["shards"]])
+        self._sparse_cache: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    @property
+    def version(self) -> int:
+        return self.manifest["version"]
+
+    @property
+    def count(self) -> int:
+        return self.manifest["count"]
+
+    @property
+    def dim(self) -> int:
+        return self.manifest["dim"]
+
+    @property
+    def has_sparse(self) -> bool:
+        return self.manifest["sparse"]
+
+    def vectors(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """
+        [start, end) satırlarının vektörleri
+
+        Tek shard içindeki aralıklar kopyalanmadan (memmap görünümü) döner.
+        """
+        end = self.count if end is None else min(end, self.count)
+        parts = []
+        for shard_idx, shard in enumerate(self._shards):
+            lo, hi = self._offsets[shard_idx], self._offsets[shard_idx + 1]
+            if hi <= start or lo >= end:
+                continue
+            parts.append(shard[max(start, lo) - lo:min(end, hi) - lo])
+
+        if not parts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def sparse(self, start: int = 0, end: Optional[int] = None) -> Optional[List[Dict[int, float]]]:
+        """[start, end) satırlarının sparse vektörleri (depoda yoksa None)"""
+        if not self.has_sparse:
+            return None
+
+        end = self.count if end is None else min(end, self.count)
+        rows = []
+        for shard_idx in range(len(self._shards)):
+            lo, hi = self._offsets[shard_idx], self._offsets[shard_idx + 1]
+            if hi <= start or lo >= end:
+                continue
+
+            indptr, indices, values = self._load_sparse(shard_idx)
+            for row in range(max(start, lo) - lo, min(end, hi) - lo):
+                a, b = indptr[row], indptr[row + 1]
+                rows.append(dict(zip(indices[a:b].tolist(), values[a:b].tolist())))
+        return rows
+
+    def chunk_types(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """[start, end) satırlarının chunk türü adları"""
+        names = self.manifest["chunk_types"]
+        return [names[code] for code in self.chunk_type_codes[start:end]]
+
+    def _load_sparse(self, shard_idx: int):
+        """Shard'ın CSR dizilerini yükle (son kullanılan shard önbellekte)"""
+        if shard_idx not in self._sparse_cache:
+            self._sparse_cache.clear()
+            with np.load(self.path / self.manifest["shards"][shard_idx]["sparse_file"]) as data:
+                self._sparse_cache[shard_idx] = (data["indptr"], data["indices"], data["values"])
+        return self._sparse_cache[shard_idx]
+
+    def iter_batches(self, batch_size: int, align_ids: bool = False) -> Iterator[Tuple[int, int]]:
+        """
+        Satırları [start, end) aralıkları halinde gez
+
+        Args:
+            batch_size: Aralık başına satır sayısı
+            align_ids: True ise aynı ID'ye ait satırlar (bir tarifin chunk'ları)
+                iki aralığa bölünmez
+        """
+        start = 0
+        while start < self.count:
+            end = min(start + batch_size, self.count)
+            if align_ids:
+                while end < self.count and self.ids[end] == self.ids[end - 1]:
+                    end += 1
+            yield start, end
+            start = end
+
+
+def _save_sparse(path: Path, rows: List[Dict[int, float]]):
+    """Sparse satırları CSR dizileri olarak kaydet"""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    for i, row in enumerate(rows):
+        indptr[i + 1] = indptr[i] + len(row)
+
+    indices = np.fromiter((k for row in rows for k in row.keys()), dtype=np.int32, count=indptr[-1])
+    values = np.fromiter((v for row in rows for v in row.values()), dtype=np.float32, count=indptr[-1])
+    np.savez(path, indptr=indptr, indices=indices, values=values)
@@ -5,11 +5,39 @@ JSONL dosyasını okuyup Qdrant'a Parent-Child olarak indexleme
 """
 
 import json
-from typing import Generator, Dict, Any, List
+from collections import defaultdict
+from itertools import islice
+from typing import Generator, Dict, Any, List, Iterator, Tuple, Optional, Callable, Sequence
+import numpy as np
 from tqdm import tqdm
-from config import DATA_FILE, BATCH_SIZE, INDEX_BATCH_SIZE, CHUNKS_PER_RECIPE
-from embedder import get_embedder
-from database import get_database
+from config import (
+    DATA_FILE,
+    BATCH_SIZE,
+    INDEX_BATCH_SIZE,
+    PIPELINE_QUEUE_SIZE,
+    CHUNKS_PER_RECIPE,
+    CHUNKING_STRATEGY,
+    WINDOW_SENTENCES,
+    WINDOW_STRIDE,
+    EMBED_WORKERS,
+    EMBED_WORKER_THREADS,
+    EMBEDDING_DIM,
+    REDUCED_DIM,
+    REDUCTION_METHOD,
+    PCA_FIT_SAMPLES,
+    INDEX_TRAIN_SAMPLES,
+    SPARSE_VECTORS,
+    EMBEDDING_STORE_DIR,
+    SWAP_VERIFY_SAMPLES,
+    SWAP_VERIFY_TOP_K,
+    SWAP_VERIFY_MIN_RECALL,
+    EMBEDDING_SHARD_SIZE
+)
+from embedder import get_embedder, embedding_signature
+from embedding_store import EmbeddingStore
+from database import get_database, recipe_key, content_hash
+from chunking import chunk_layout
+from index_pipeline import run_pipeline
 
 
 def load_recipes(file_path: str = None) -> Generator[Dict[str, Any], None, None]:
@@ -53,14 +81,341 @@ def batch_iterator(items: Generator, batch_size: int) -> Generator[List, None, N
         yield batch
 
 
-def index_all_recipes(recreate: bool = True, file_path: str = None):
+def embed_batches(
+    batches: Iterator[List[Dict[str, Any]]],
+    workers: int = 0
+) -> Generator[Tuple[List[Dict[str, Any]], List[List[tuple]]], None, None]:
     """
-    Tüm tarifleri Parent-Child olarak indexle
+    Batch'lerin chunk'larını embed et (tek süreç veya çok süreçli havuz)
+    
+    SPARSE_VECTORS açıksa chunk'lar (chunk_type, embedding, sparse) olarak döner.
+    
+    Args:
+        batches: Tarif batch'leri
+        workers: Worker süreç sayısı (0 ise mevcut süreçte embed edilir)
+    
+    Yields:
+        (batch, all_chunk_embeddings) tuple'ları - giriş sırasıyla
+    """
+    if workers > 0:
+        from embedding_pool import EmbeddingPool
+        
+        with EmbeddingPool(workers, EMBED_WORKER_THREADS, method_name=_embed_method()) as pool:
+            yield from pool.imap(batches)
+        return
+    
+    embed = batch_embedder()
+    for batch in batches:
+        yield embed(batch)
+
+
+def batch_embedder() -> Callable[[List[Dict[str, Any]]], tuple]:
+    """Mevcut süreçte tek bir batch'i (batch, all_chunk_embeddings) olarak embed eden fonksiyon"""
+    embed_fn = getattr(get_embedder(), _embed_method())
+    return lambda batch: (batch, embed_fn(batch))
+
+
+def _embed_method() -> str:
+    """Kullanılacak embedder metodu (sparse açıksa aynı forward pass'te sparse da üretilir)"""
+    return "embed_recipes_chunks_hybrid" if SPARSE_VECTORS else "embed_recipes_chunks"
+
+
+def embedding_pipeline(file_path: str = None, workers: int = 0) -> tuple:
+    """
+    Embedding pipeline'ının kaynağı ve embedding aşaması
+    
+    Worker havuzu yoksa dosya okuma kendi thread'inde, embedding ayrı bir
+    aşamada çalışır. Havuz varsa okuma ve embedding havuzun içinde örtüşür;
+    havuzun çıktısı pipeline'ın kaynağı olur.
+    
+    Returns:
+        (kaynak, aşamalar, kaynak adı, batch boyutu fonksiyonu) - embedding
+        çıktıları (batch, all_chunk_embeddings) tuple'larıdır
+    """
+    batches = batch_iterator(load_recipes(file_path), BATCH_SIZE)
+    
+    if workers > 0:
+        return embed_batches(batches, workers=workers), [], "embedding", lambda item: len(item[0])
+    
+    return batches, [("embedding", batch_embedder())], "okuma", len
+
+
+def build_projector(reader):
+    """
+    Config'e göre boyut indirgeme projeksiyonu oluştur
+    
+    PCA, embedding deposundaki ilk PCA_FIT_SAMPLES tarifin chunk vektörleri
+    üzerinde fit edilir (model tekrar çalıştırılmaz).
+    
+    Args:
+        reader: EmbeddingStoreReader
+    
+    Returns:
+        VectorProjector veya None
+    """
+    if not REDUCED_DIM:
+        return None
+    
+    from dim_reduction import VectorProjector
+    
+    if REDUCTION_METHOD == "truncate":
+        return VectorProjector.truncation(EMBEDDING_DIM, REDUCED_DIM)
+    
+    print(f"\n📐 PCA fit ediliyor ({PCA_FIT_SAMPLES:,} tarif örneği, {REDUCED_DIM} boyut)...")
+    return VectorProjector.fit_pca(reader.vectors(0, PCA_FIT_SAMPLES * CHUNKS_PER_RECIPE), REDUCED_DIM)
+
+
+def embed_to_store(
+    file_path: str = None,
+    workers: int = 0,
+    db=None,
+    ids: Optional[Sequence[int]] = None
+) -> Tuple[int, int, int]:
+    """
+    Tüm tariflerin chunk'larını embed edip embedding deposuna yeni bir sürüm olarak yaz
+    
+    Depoda her chunk bir satırdır: ID = tarifin dosya sırası, chunk türü ayrı tutulur.
+    Okuma, embedding ve yazma ayrı thread'lerde, sınırlı kuyruklarla
+    bağlı aşamalar olarak çalışır (index_pipeline.py). db verilirse
+    chunk'lar aynı pipeline'da veritabanına da yazılır; index için
+    depodan ikinci bir geçiş gerekmez.
+    
+    Args:
+        file_path: JSONL dosya yolu
+        workers: Embedding worker süreç sayısı
+        db: Hazırlanmış (boş) veritabanı (bkz. prepare_direct_index)
+        ids: Dosya sırasıyla parent ID'leri (None ise ID = dosya sırası, bkz. stable_ids)
+    
+    Returns:
+        (oluşturulan sürüm numarası, veritabanına yazılan tarif sayısı, chunk sayısı)
+    """
+    store = EmbeddingStore(EMBEDDING_STORE_DIR)
+    writer = store.create(
+        embedding_signature(file_path or DATA_FILE),
+        EMBEDDING_DIM,
+        shard_size=EMBEDDING_SHARD_SIZE
+    )
+    
+    total_recipes = count_recipes(file_path)
+    print(f"\n🧠 Chunk embedding'leri oluşturuluyor (batch boyutu: {BATCH_SIZE}, worker: {workers or 'yok'})...")
+    
+    source, stages, source_name, size = embedding_pipeline(file_path, workers)
+    next_parent_id = 0
+    
+    def write_store(item):
+        nonlocal next_parent_id
+        batch, all_chunk_embeddings = item
+        ids, vectors, chunk_types, sparse_vectors = [], [], [], []
+        
+        for recipe_idx, chunk_embeddings in enumerate(all_chunk_embeddings):
+            for chunk_type, embedding, *sparse in chunk_embeddings:
+                ids.append(next_parent_id + recipe_idx)
+                vectors.append(embedding)
+                chunk_types.append(chunk_type)
+                sparse_vectors.extend(sparse)
+        
+        writer.add(
+            ids,
+            vectors,
+            sparse=sparse_vectors if SPARSE_VECTORS else None,
+            chunk_types=chunk_types
+        )
+        next_parent_id += len(batch)
+        return (next_parent_id - len(batch), *item)
+    
+    stages = stages + [("depo", write_store)]
+    
+    total_indexed_recipes = total_indexed_chunks = 0
+    if db is not None:
+        if ids is not None:
+            reserve_chunks(db, ids, file_path)
+        
+        def write_db(item):
+            nonlocal total_indexed_recipes, total_indexed_chunks
+            start_parent_id, batch, all_chunk_embeddings = item
+            parent_ids = None if ids is None else ids[start_parent_id:start_parent_id + len(batch)]
+            total_indexed_chunks += db.insert_recipes_chunks(
+                batch, all_chunk_embeddings, start_parent_id, parent_ids=parent_ids
+            )
+            total_indexed_recipes += len(batch)
+        
+        stages.append(("veritabanı", write_db))
+    
+    try:
+        with tqdm(total=total_recipes, desc="Embedding", unit="tarif") as pbar:
+            result = run_pipeline(
+                source,
+                stages,
+                source_name=source_name,
+                queue_size=PIPELINE_QUEUE_SIZE,
+                size=size,
+                on_done=pbar.update
+            )
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        # Point ID'leri offset tablosundan ayrılır; yarıda kalsa da yazılan kısım kaydedilir
+        if db is not None:
+            db.save_chunk_table()
+            db.flush()
+    
+    result.report(unit="tarif")
+    return writer.commit(), total_indexed_recipes, total_indexed_chunks
+
+
+def prepare_direct_index(db, recreate: bool = True):
+    """
+    Index embedding sırasında doğrudan yazılabiliyorsa collection'ı hazırla
+    
+    Chunk'lar embedding pipeline'ında veritabanına da yazılırsa toplam süre
+    embedding süresine yaklaşır. PCA fit'i (depodaki vektörler gerekir),
+    index eğitimi (IVF-PQ) veya mevcut collection'a ekleme durumlarında
+    index depodan ikinci geçişte kurulur.
     
     Args:
+        db: Hedef veritabanı (tam indexlemede yeni sürüm, bkz. RecipeDatabase.staging)
         recreate: True ise mevcut collection silinip yeniden oluşturulur
+    
+    Returns:
+        Hazırlanmış veritabanı veya None (index depodan kurulacak)
+    """
+    if not recreate or (REDUCED_DIM and REDUCTION_METHOD != "truncate"):
+        return None
+    
+    db.create_collection(recreate=True, projector=build_projector(None))
+    
+    if db.index_needs_training():
+        return None
+    return db
+
+
+def build_from_store(
+    version: int = None,
+    recreate: bool = True,
+    file_path: str = None,
+    db=None,
+    ids: Optional[Sequence[int]] = None
+) -> Tuple[int, int]:
+    """
+    Qdrant index'ini embedding deposundan kur (model çalıştırılmaz)
+    
+    Args:
+        version: Depo sürümü (None ise en yeni)
+        recreate: True ise mevcut collection silinip yeniden oluşturulur
+        file_path: Payload için JSONL dosya yolu (depo ile aynı veri)
+        db: Hedef veritabanı (None ise aramada kullanılan collection)
+        ids: Dosya sırasıyla parent ID'leri (None ise ID = dosya sırası, bkz. stable_ids)
+    
+    Returns:
+        (indexlenen tarif sayısı, indexlenen chunk sayısı)
+    """
+    reader = EmbeddingStore(EMBEDDING_STORE_DIR).open(version)
+    print(f"\n📂 Embedding deposu: v{reader.version} ({reader.count:,} chunk vektörü, {reader.dim} boyut)")
+    
+    if db is None:
+        db = get_database()
+    
+    # Boyut indirgeme (yeni collection için; mevcut collection kendi projeksiyonunu kullanır)
+    projector = None
+    if recreate or not db.collection_exists():
+        projector = build_projector(reader)
+    
+    # Collection oluştur
+    db.create_collection(recreate=recreate, projector=projector)
+    if ids is not None:
+        reserve_chunks(db, ids, file_path)
+    
+    # Sıkıştırılmış index'ler (IVF-PQ) vektör eklenmeden önce depodaki örneklerle eğitilir
+    if db.index_needs_training():
+        db.train_index(reader.vectors(0, INDEX_TRAIN_SAMPLES))
+    
+    # Payload'lar veri dosyasından, vektörler depodan (parent sırası = dosya sırası)
+    recipes = load_recipes(file_path)
+    
+    def read_batches():
+        # Bir tarifin chunk'ları iki batch'e bölünmez
+        for start, end in reader.iter_batches(INDEX_BATCH_SIZE, align_ids=True):
+            ids = reader.ids[start:end]
+            vectors = reader.vectors(start, end).tolist()
+            chunk_types = reader.chunk_types(start, end)
+            sparse_vectors = reader.sparse(start, end)
+            
+            # Satırları tarif başına (chunk_type, embedding[, sparse]) listelerine grupla
+            all_chunk_embeddings = []
+            for row in range(end - start):
+                if row == 0 or ids[row] != ids[row - 1]:
+                    all_chunk_embeddings.append([])
+                
+                chunk = (chunk_types[row], vectors[row])
+                if sparse_vectors is not None:
+                    chunk += (sparse_vectors[row],)
+                all_chunk_embeddings[-1].append(chunk)
+            
+            batch = list(islice(recipes, len(all_chunk_embeddings)))
+            yield int(ids[0]), batch, all_chunk_embeddings, end - start
+    
+    total_indexed_chunks = 0
+    total_indexed_recipes = 0
+    
+    def write_db(item):
+        nonlocal total_indexed_chunks, total_indexed_recipes
+        start_parent_id, batch, all_chunk_embeddings, _ = item
+        total_indexed_chunks += db.insert_recipes_chunks(
+            batch,
+            all_chunk_embeddings,
+            start_parent_id=start_parent_id,
+            parent_ids=None if ids is None else ids[start_parent_id:start_parent_id + len(batch)]
+        )
+        total_indexed_recipes += len(batch)
+    
+    # Depo / dosya okuma ile veritabanı yazımı ayrı thread'lerde örtüşür.
+    # Point ID'leri offset tablosundan ayrılır; yarıda kalsa da yazılan kısım kaydedilir
+    try:
+        with tqdm(total=reader.count, desc="İndexleniyor", unit="chunk") as pbar:
+            result = run_pipeline(
+                read_batches(),
+                [("veritabanı", write_db)],
+                queue_size=PIPELINE_QUEUE_SIZE,
+                size=lambda item: item[3],
+                on_done=pbar.update
+            )
+    finally:
+        db.save_chunk_table()
+        db.flush()
+    
+    result.report(unit="chunk")
+    return total_indexed_recipes, total_indexed_chunks
+
+
+def index_all_recipes(
+    recreate: bool = True,
+    file_path: str = None,
+    workers: int = None,
+    reembed: bool = False
+):
+    """
+    Tüm tarifleri Parent-Child olarak indexle
+    
+    Chunk embedding'leri sürümlü depoya yazılır; mümkünse (bkz. prepare_direct_index)
+    aynı pipeline'da veritabanına da yazılır, değilse index depodan kurulur.
+    Aynı ayarlarla (model, chunk şablonları, kırpma, veri) üretilmiş bir
+    sürüm varsa model hiç çalıştırılmaz.
+    
+    Tam indexleme yeni bir collection sürümüne yapılır; arama bu sırada
+    mevcut sürümden devam eder. Tarifler mevcut sürümdeki parent ID'lerini
+    korur (bkz. stable_ids). Yeni sürüm doğrulanınca (verify_version) alias
+    ona çevrilir, doğrulanamazsa silinir.
+    
+    Args:
+        recreate: True ise yeni sürüm kurulup yayına alınır, False ise
+            mevcut collection'a eklenir
         file_path: JSONL dosya yolu
+        workers: Embedding worker süreç sayısı (None ise config'den)
+        reembed: True ise depodaki sürüm yok sayılıp embedding'ler yeniden üretilir
     """
+    workers = EMBED_WORKERS if workers is None else workers
+    
     print("=" * 60)
     print("🚀 PARENT-CHILD TARİF İNDEXLEME BAŞLIYOR")
     print("=" * 60)
@@ -68,42 +423,49 @@ def index_all_recipes(recreate: bool = True, file_path: str = None):
     # Toplam tarif sayısını hesapla
     print("\n📊 Tarif sayısı hesaplanıyor...")
     total_recipes = count_recipes(file_path)
-    total_chunks = total_recipes * CHUNKS_PER_RECIPE
     print(f"📊 Toplam tarif sayısı: {total_recipes:,}")
-    print(f"📊 Oluşturulacak chunk sayısı: {total_chunks:,} ({CHUNKS_PER_RECIPE} chunk/tarif)")
-    
-    # Embedder ve Database başlat
-    embedder = get_embedder()
-    db = get_database()
-    
-    # Collection oluştur
-    db.create_collection(recreate=recreate)
+    if CHUNKING_STRATEGY == "sliding_window":
+        print(f"📊 Chunking: kayan pencere ({WINDOW_SENTENCES} cümle, kayma {WINDOW_STRIDE}) - "
+              f"tarif başına değişken chunk sayısı")
+    else:
+        total_chunks = total_recipes * CHUNKS_PER_RECIPE
+        print(f"📊 Oluşturulacak chunk sayısı: {total_chunks:,} ({CHUNKS_PER_RECIPE} chunk/tarif)")
     
-    # Tarifleri batch'ler halinde işle
-    print(f"\n📥 Tarifler işleniyor (batch boyutu: {BATCH_SIZE})...")
+    # Aynı ayarlarla üretilmiş embedding'ler depoda var mı?
+    store = EmbeddingStore(EMBEDDING_STORE_DIR)
+    version = None if reembed else store.find_version(embedding_signature(file_path or DATA_FILE))
     
-    recipes_generator = load_recipes(file_path)
-    current_parent_id = 0
-    total_indexed_chunks = 0
-    total_indexed_recipes = 0
+    live = get_database()
+    db = live.staging() if recreate else live
+    ids = stable_ids(live, file_path) if recreate else None
     
-    # Progress bar
-    with tqdm(total=total_recipes, desc="İndexleniyor", unit="tarif") as pbar:
-        for batch in batch_iterator(recipes_generator, BATCH_SIZE):
-            # Her tarif için chunk embedding'leri oluştur
-            all_chunk_embeddings = embedder.embed_recipes_chunks(batch)
-            
-            # Veritabanına ekle
-            inserted_chunks = db.insert_recipes_chunks(
-                batch, 
-                all_chunk_embeddings, 
-                start_parent_id=current_parent_id
+    try:
+        if version is None:
+            direct_db = prepare_direct_index(db, recreate)
+            version, total_indexed_recipes, total_indexed_chunks = embed_to_store(
+                file_path, workers=workers, db=direct_db, ids=ids
             )
-            
-            current_parent_id += len(batch)
-            total_indexed_chunks += inserted_chunks
-            total_indexed_recipes += len(batch)
-            pbar.update(len(batch))
+            if direct_db is None:
+                total_indexed_recipes, total_indexed_chunks = build_from_store(
+                    version, recreate=recreate, file_path=file_path, db=db, ids=ids
+                )
+        else:
+            print(f"\n♻️  Kayıtlı embedding'ler kullanılıyor: v{version} (model çalıştırılmayacak)")
+            total_indexed_recipes, total_indexed_chunks = build_from_store(
+                version, recreate=recreate, file_path=file_path, db=db, ids=ids
+            )
+        
+        if recreate:
+            verify_version(db, version, total_indexed_chunks, ids=ids)
+    except BaseException:
+        # Yarım kalan veya doğrulanamayan sürüm yayına alınmaz
+        if recreate:
+            print(f"\n⚠️  Yeni sürüm siliniyor, arama {live.collection} üzerinden devam ediyor")
+            db.delete_collection()
+        raise
+    
+    if recreate:
+        live.promote(db)
     
     print("\n" + "=" * 60)
     print("✅ PARENT-CHILD İNDEXLEME TAMAMLANDI!")
@@ -112,13 +474,288 @@ def index_all_recipes(recreate: bool = True, file_path: str = None):
     print(f"📊 Toplam indexlenen chunk: {total_indexed_chunks:,}")
     
     # Collection bilgisi
-    info = db.get_collection_info()
+    info = live.get_collection_info()
     print(f"📊 Veritabanı vektör sayısı: {info.get('points_count', 'N/A'):,}")
     print(f"📊 Veritabanı tarif sayısı: {info.get('recipes_count', 'N/A'):,}")
     
     return total_indexed_recipes
 
 
+def verify_version(db, version: int, expected_points: int, ids: Optional[Sequence[int]] = None):
+    """
+    Yeni collection sürümünü alias çevrilmeden önce doğrula
+    
+    - Point sayısı indexlenen chunk sayısına eşit olmalı
+    - Embedding deposundan eşit aralıklı SWAP_VERIFY_SAMPLES chunk'ın
+      vektörüyle arama yapılır; chunk'ın tarifi ilk SWAP_VERIFY_TOP_K
+      sonuçta en az SWAP_VERIFY_MIN_RECALL oranında bulunmalı
+    
+    Args:
+        db: Yeni sürüm (bkz. RecipeDatabase.staging)
+        version: İndexlemede kullanılan embedding deposu sürümü
+        expected_points: Beklenen point (chunk) sayısı
+        ids: Dosya sırasıyla parent ID'leri (None ise ID = dosya sırası)
+    
+    Raises:
+        RuntimeError: Doğrulama başarısızsa
+    """
+    print(f"\n🔍 Yeni sürüm doğrulanıyor: {db.collection}")
+    
+    points = db.get_collection_info().get("points_count")
+    if points != expected_points:
+        raise RuntimeError(f"{db.collection}: {points} point var, {expected_points} bekleniyordu")
+    
+    reader = EmbeddingStore(EMBEDDING_STORE_DIR).open(version)
+    rows = np.unique(np.linspace(0, reader.count - 1, min(SWAP_VERIFY_SAMPLES, reader.count)).astype(int))
+    hits = 0
+    for row in rows.tolist():
+        results = db.search(reader.vectors(row, row + 1)[0].tolist(), top_k=SWAP_VERIFY_TOP_K, mode="dense")
+        position = int(reader.ids[row])
+        parent_id = position if ids is None else ids[position]
+        hits += parent_id in {result["id"] for result in results}
+    
+    recall = hits / len(rows) if len(rows) else 1.0
+    print(f"   Point sayısı: {points:,} | Örnek sorgu isabeti: {hits}/{len(rows)} (%{100 * recall:.0f})")
+    if recall < SWAP_VERIFY_MIN_RECALL:
+        raise RuntimeError(
+            f"{db.collection}: örnek sorguların %{100 * recall:.0f}'i chunk'ın tarifini buldu "
+            f"(alt sınır %{100 * SWAP_VERIFY_MIN_RECALL:.0f})"
+        )
+
+
+def upsert_recipe(recipe: Dict[str, Any], parent_id: int) -> int:
+    """
+    Tek bir tarifi (yeniden) indexle
+    
+    Tarifin tüm chunk'ları tek forward pass ile embed edilir ve aynı
+    parent_id'nin chunk point'lerinin üzerine yazılır. Yeni tarif
+    (parent_id = mevcut tarif sayısı) offset tablosunun sonuna eklenir;
+    mevcut tarifin chunk sayısı değiştiyse hata verilir.
+    
+    Args:
+        recipe: Tarif dictionary
+        parent_id: Tarifin parent ID'si
+    
+    Returns:
+        Yazılan chunk sayısı
+    """
+    chunk_embeddings = get_embedder().embed_recipe_chunks(recipe, with_sparse=SPARSE_VECTORS)
+    
+    db = get_database()
+    inserted = db.insert_recipe_chunks(recipe, chunk_embeddings, parent_id)
+    db.save_chunk_table()
+    db.flush()
+    return inserted
+
+
+def diff_recipes(
+    db,
+    indexed: Sequence[Tuple[int, str, str]],
+    file_path: str = None
+) -> Tuple[Dict[int, int], List[int], Dict[str, int]]:
+    """
+    Veri dosyasını collection'daki tariflerle karşılaştır
+    
+    Tarifler recipe_key (URL hash'i) ile eşleşir; aynı anahtarlı birden fazla
+    tarif dosya sırası ve parent ID sırasıyla eşlenir. İçeriği değişen tarif
+    parent ID'sini korur; chunk sayısı değiştiyse (offset tablosundaki aralık
+    yetmez) eski tarif silinip yeni ID ile eklenir. Yeni tarifler offset
+    tablosunun sonundan sırayla ID alır (silinenlerin ID'leri yeniden kullanılmaz).
+    
+    Args:
+        db: Açık veritabanı (offset tablosu ve chunking stratejisi için)
+        indexed: [(parent ID, recipe_key, content_hash), ...] (bkz. db.indexed_recipes)
+        file_path: JSONL dosya yolu
+    
+    Returns:
+        ({dosya sırası: yazılacak parent ID}, silinecek parent ID'ler, sayaçlar)
+    """
+    existing = defaultdict(list)
+    for point_id, key, digest in sorted(indexed):
+        existing[key].append((point_id, digest))
+    
+    next_id = max(max((point_id for point_id, _, _ in indexed), default=-1) + 1, db.chunk_table.num_parents)
+    seen = defaultdict(int)
+    todo = {}
+    relocated = []
+    counts = {"new": 0, "changed": 0, "unchanged": 0}
+    
+    for position, recipe in enumerate(load_recipes(file_path)):
+        key = recipe_key(recipe)
+        match = seen[key]
+        seen[key] += 1
+        
+        if match < len(existing.get(key, ())):
+            point_id, digest = existing[key][match]
+            if digest == content_hash(recipe):
+                counts["unchanged"] += 1
+                continue
+            counts["changed"] += 1
+            
+            num_chunks = len(chunk_layout(recipe, db.chunking, WINDOW_SENTENCES, WINDOW_STRIDE))
+            if num_chunks == len(db.chunk_table.chunk_range(point_id)):
+                todo[position] = point_id
+                continue
+            relocated.append(point_id)
+            todo[position] = next_id
+            next_id += 1
+        else:
+            todo[position] = next_id
+            next_id += 1
+            counts["new"] += 1
+    
+    deleted = [point_id for key, entries in existing.items() for point_id, _ in entries[seen[key]:]]
+    counts["deleted"] = len(deleted)
+    return todo, deleted + relocated, counts
+
+
+def stable_ids(db, file_path: str = None) -> Optional[List[int]]:
+    """
+    Tam indexlemede tariflerin parent ID'leri (dosya sırasıyla)
+    
+    Mevcut collection'daki tarifler recipe_key ile eşleşip parent ID'lerini
+    korur (aynı anahtarlı tarifler diff_recipes'teki gibi dosya ve ID
+    sırasıyla eşlenir); chunk sayısı değişen tarif de ID'sini korur, çünkü
+    yeni sürümün offset tablosu baştan kurulur (bkz. reserve_chunks). Yeni
+    tarifler mevcut en büyük ID'den sonra sırayla ID alır.
+    
+    Args:
+        db: Aramada kullanılan (canlı) collection
+        file_path: JSONL dosya yolu
+    
+    Returns:
+        ID listesi; collection yoksa, recipe_key alanı olmayan (eski) kayıtlar
+        varsa veya ID'ler dosya sırasıyla aynıysa None (ID = dosya sırası)
+    """
+    if not db.collection_exists():
+        return None
+    
+    indexed = db.indexed_recipes()
+    if any(key is None for _, key, _ in indexed):
+        print("⚠️  Collection'da recipe_key alanı olmayan kayıtlar var; ID'ler dosya sırasıyla yeniden verilecek")
+        return None
+    
+    existing = defaultdict(list)
+    for parent_id, key, _ in sorted(indexed):
+        existing[key].append(parent_id)
+    
+    next_id = max((parent_id for parent_id, _, _ in indexed), default=-1) + 1
+    seen = defaultdict(int)
+    ids = []
+    kept = 0
+    
+    for recipe in load_recipes(file_path):
+        key = recipe_key(recipe)
+        match = seen[key]
+        seen[key] += 1
+        
+        if match < len(existing.get(key, ())):
+            ids.append(existing[key][match])
+            kept += 1
+        else:
+            ids.append(next_id)
+            next_id += 1
+    
+    print(f"\n🔗 Parent ID'leri: {kept:,} tarif mevcut ID'sini koruyor, {len(ids) - kept:,} yeni ID")
+    if ids == list(range(len(ids))):
+        return None
+    return ids
+
+
+def reserve_chunks(db, ids: Sequence[int], file_path: str = None):
+    """
+    Yeni (boş) collection'ın offset tablosunda tariflerin chunk aralıklarını ayır
+    
+    Korunan parent ID'leri dosya sırasıyla artmaz; chunk sayıları (embedding
+    gerekmez, bkz. chunking.chunk_layout) önceden hesaplanıp aralıklar ID
+    sırasıyla ayrılır. Aradaki (silinmiş tariflerin) ID'ler boş aralık alır.
+    """
+    chunk_counts = [
+        len(chunk_layout(recipe, db.chunking, WINDOW_SENTENCES, WINDOW_STRIDE))
+        for recipe in load_recipes(file_path)
+    ]
+    db.reserve_chunks(ids, chunk_counts)
+
+
+def index_incremental(file_path: str = None) -> Dict[str, int]:
+    """
+    Sadece yeni ve değişen tarifleri indexle, dosyadan çıkanları sil
+    
+    Collection yoksa tam indexleme yapılır. Değişen tarifler mevcut
+    embedding sürümüyle aynı modelle mevcut süreçte embed edilir
+    (embedding deposuna yazılmaz). Offset tablosu sonunda kaydedilir.
+    
+    Args:
+        file_path: JSONL dosya yolu
+    
+    Returns:
+        Sayaçlar: {"new", "changed", "unchanged", "deleted"}
+    """
+    print("=" * 60)
+    print("🔁 PARENT-CHILD ARTIMLI İNDEXLEME")
+    print("=" * 60)
+    
+    db = get_database()
+    if not db.collection_exists():
+        print("⚠️  Collection bulunamadı, tam indexleme yapılıyor...")
+        total = index_all_recipes(recreate=True, file_path=file_path)
+        return {"new": total, "changed": 0, "unchanged": 0, "deleted": 0}
+    
+    indexed = db.indexed_recipes()
+    if any(key is None for _, key, _ in indexed):
+        raise ValueError(
+            "Collection'da recipe_key alanı olmayan kayıtlar var (eski indexleme); "
+            "bir kez tam indexleme yapın (python main.py index)"
+        )
+    
+    print(f"\n🔍 {len(indexed):,} indexli tarif veri dosyasıyla karşılaştırılıyor...")
+    todo, deleted, counts = diff_recipes(db, indexed, file_path)
+    print(f"   Yeni: {counts['new']:,} | Değişen: {counts['changed']:,} | "
+          f"Aynı: {counts['unchanged']:,} | Silinen: {counts['deleted']:,}")
+    
+    if todo:
+        embed = batch_embedder()
+        
+        def embed_stage(batch):
+            return ([point_id for point_id, _ in batch], *embed([recipe for _, recipe in batch]))
+        
+        def write_db(item):
+            parent_ids, batch, all_chunk_embeddings = item
+            db.insert_recipes_chunks(batch, all_chunk_embeddings, parent_ids=parent_ids, replace=True)
+        
+        changed = (
+            (todo[position], recipe)
+            for position, recipe in enumerate(load_recipes(file_path))
+            if position in todo
+        )
+        
+        try:
+            with tqdm(total=len(todo), desc="İndexleniyor", unit="tarif") as pbar:
+                result = run_pipeline(
+                    batch_iterator(changed, BATCH_SIZE),
+                    [("embedding", embed_stage), ("veritabanı", write_db)],
+                    queue_size=PIPELINE_QUEUE_SIZE,
+                    on_done=pbar.update
+                )
+        finally:
+            db.save_chunk_table()
+            db.flush()
+        result.report(unit="tarif")
+    
+    if deleted:
+        print(f"\n🗑️  {len(deleted):,} tarif siliniyor...")
+        db.delete_recipes(deleted)
+        db.flush()
+    
+    print("\n" + "=" * 60)
+    print("✅ PARENT-CHILD ARTIMLI İNDEXLEME TAMAMLANDI!")
+    print("=" * 60)
+    print(f"📊 Yeni: {counts['new']:,} | Güncellenen: {counts['changed']:,} | "
+          f"Aynı: {counts['unchanged']:,} | Silinen: {counts['deleted']:,}")
+    
+    return counts
+
+
 def verify_index():
     """Index'in doğru çalıştığını kontrol et"""
     print("\n🔍 Index doğrulaması yapılıyor...")
@@ -133,7 +770,7 @@ def verify_index():
     print(f"✅ Collection mevcut")
     print(f"📊 Chunk sayısı: {info.get('points_count', 0):,}")
     print(f"📊 Tarif sayısı: {info.get('recipes_count', 0):,}")
-    print(f"📊 Chunk/Tarif: {info.get('chunks_per_recipe', 0)}")
+    print(f"📊 Chunk/Tarif: {info.get('chunks_per_recipe', 0)} ({info.get('chunking', 'N/A')})")
     print(f"📊 Durum: {info.get('status', 'N/A')}")
     
     # Örnek bir kayıt getir
@@ -9,19 +9,43 @@ from config import (
     DEFAULT_TOP_K, 
     SCORE_THRESHOLD,
     CHUNK_TYPE_INGREDIENTS,
-    CHUNK_TYPE_INSTRUCTIONS
+    CHUNK_TYPE_INSTRUCTIONS,
+    SEARCH_MODE
 )
 from embedder import get_embedder
-from database import get_database
+from database import get_database, SEARCH_MODES
+from ingredient_index import IngredientFilter
 
 
 class RecipeSearcher:
     """Tarif arama sınıfı (Parent-Child)"""
     
-    def __init__(self):
-        """Embedder ve database bağlantılarını başlat"""
-        self.embedder = get_embedder()
+    def __init__(self, lazy: bool = False):
+        """
+        Database bağlantısını başlat ve aramanın gerektirdiği modeli hazırla
+        
+        Args:
+            lazy: True ise model ilk sorguda hazırlanır (main.py search: model arka
+                planda yüklenirken prompt beklemez). Varsayılan olarak her şey burada
+                yüklenir; sys.path'i sonradan geri alan çağıranlar (değerlendirme,
+                RAG pipeline) tek başına sorgu çalıştırabilen bir searcher alır.
+        """
+        self._embedder = None
         self.db = get_database()
+        if not lazy:
+            self.prepare()
+    
+    @property
+    def embedder(self):
+        """Embedder'ı ilk kullanımda al (arka planda yükleniyorsa bekler)"""
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+    
+    def prepare(self, mode: Optional[str] = None):
+        """Arama modunun gerektirdiği model ve katmanları şimdi yükle"""
+        mode = mode or SEARCH_MODE
+        self.embedder.load_heads(sparse=mode in ("sparse", "hybrid"))
     
     def search(
         self, 
@@ -29,7 +53,10 @@ class RecipeSearcher:
         top_k: int = DEFAULT_TOP_K,
         score_threshold: float = None,
         chunk_type: Optional[str] = None,
-        ingredient_filter: List[str] = None
+        ingredient_filter: List[str] = None,
+        mode: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        hydrate: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Tarif ara (tüm chunk'larda veya belirli chunk türünde)
@@ -39,13 +66,29 @@ class RecipeSearcher:
             top_k: Döndürülecek sonuç sayısı
             score_threshold: Minimum benzerlik skoru
             chunk_type: "ingredients" veya "instructions" (None ise hepsinde ara)
-            ingredient_filter: Belirli malzemeleri içeren tarifleri filtrele
+            ingredient_filter: Malzeme filtresi - liste (herhangi biri) veya
+                {"any": [...], "all": [...], "none": [...]} (bkz. ingredient_index.py)
+            mode: "dense", "sparse", "hybrid" veya "binary" (None ise config'den)
+            aggregation: Tarifin chunk skorlarının birleştirilmesi - "max", "sum" veya
+                "weighted" (None ise config'den, bkz. PARENT_AGGREGATION)
+            hydrate: False ise sadece ID, skor, başlık ve eşleşen chunk döner (tam
+                tarif doküman deposundan okunmaz; örn: retrieval değerlendirmesi)
         
         Returns:
             Bulunan tarifler listesi
         """
-        # Sorguyu vektöre dönüştür
-        query_vector = self.embedder.embed_query(query)
+        mode = mode or SEARCH_MODE
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Bilinmeyen arama modu: {mode}")
+        
+        # Sorguyu vektöre dönüştür (hybrid: tek forward pass'te dense + sparse)
+        query_vector, sparse_vector = None, None
+        if mode in ("dense", "binary"):
+            query_vector = self.embedder.embed_query(query)
+        elif mode == "sparse":
+            sparse_vector = self.embedder.embed_query_sparse(query)
+        else:
+            query_vector, sparse_vector = self.embedder.embed_query_hybrid(query)
         
         # Veritabanında ara
         results = self.db.search(
@@ -53,10 +96,75 @@ class RecipeSearcher:
             top_k=top_k,
             score_threshold=score_threshold or SCORE_THRESHOLD,
             chunk_type_filter=chunk_type,
-            ingredient_filter=ingredient_filter
+            ingredient_filter=ingredient_filter,
+            sparse_vector=sparse_vector,
+            mode=mode,
+            aggregation=aggregation
+        )
+        
+        # Tam tarif sadece döndürülen sonuçlar için okunur
+        return self.db.hydrate(results) if hydrate else results
+    
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: int = DEFAULT_TOP_K,
+        score_threshold: float = None,
+        chunk_type: Optional[str] = None,
+        ingredient_filters: Optional[List[Optional[IngredientFilter]]] = None,
+        mode: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        hydrate: bool = True
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla sorguyu birlikte ara
+        
+        Sorgular tek batch'te embed edilir ve veritabanında tek çağrıyla
+        skorlanır (search'ü sorgu başına çağırmaktan çok daha hızlı).
+        
+        Args:
+            queries: Kullanıcı sorguları
+            top_k: Sorgu başına sonuç sayısı
+            score_threshold: Minimum benzerlik skoru
+            chunk_type: "ingredients" veya "instructions" (None ise hepsinde ara)
+            ingredient_filters: Sorgu başına malzeme filtresi (None: filtre yok)
+            mode: "dense", "sparse", "hybrid" veya "binary" (None ise config'den)
+            aggregation: "max", "sum" veya "weighted" (None ise config'den)
+            hydrate: False ise sadece ID, skor, başlık ve eşleşen chunk döner
+        
+        Returns:
+            Sorgu başına bulunan tarifler listesi (sorgu sırasıyla)
+        """
+        mode = mode or SEARCH_MODE
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Bilinmeyen arama modu: {mode}")
+        if not queries:
+            return []
+        
+        # Tüm sorgular tek forward pass'te (hybrid: dense + sparse birlikte)
+        query_vectors, sparse_vectors = None, None
+        if mode in ("dense", "binary"):
+            query_vectors = self.embedder.embed_queries(queries)
+        else:
+            query_vectors, sparse_vectors = self.embedder.embed_batch_hybrid(queries)
+            if mode == "sparse":
+                query_vectors = None
+        
+        batch = self.db.search_batch(
+            query_vectors=query_vectors,
+            top_k=top_k,
+            score_threshold=score_threshold or SCORE_THRESHOLD,
+            chunk_type_filter=chunk_type,
+            ingredient_filters=ingredient_filters,
+            sparse_vectors=sparse_vectors,
+            mode=mode,
+            aggregation=aggregation
         )
         
-        return results
+        # Tüm sonuçların tam tarifleri tek sorguda okunur (listeler yerinde güncellenir)
+        if hydrate:
+            self.db.hydrate([r for results in batch for r in results])
+        return batch
     
     def search_by_ingredients(
         self, 
@@ -125,7 +233,10 @@ class RecipeSearcher:
             Bulunan tarifler listesi
         """
         query = f"{recipe_name} tarifi nasıl yapılır"
-        return self.search(query=query, top_k=top_k)
+        
+        # Yemek adları tam kelime eşleşmesinden faydalanır: sparse alan varsa hybrid ara
+        mode = "hybrid" if self.db.has_sparse else "dense"
+        return self.search(query=query, top_k=top_k, mode=mode)
     
     def get_similar_recipes(
         self, 
@@ -152,10 +263,10 @@ class RecipeSearcher:
         query_vector = self.embedder.embed_single(text)
         
         # +1 çünkü kendisi de sonuçlarda olacak
-        results = self.db.search(query_vector=query_vector, top_k=top_k + 1)
+        results = self.db.search(query_vector=query_vector, top_k=top_k + 1, mode="dense")
         
         # Kendisini çıkar
-        return [r for r in results if r['id'] != recipe_id][:top_k]
+        return self.db.hydrate([r for r in results if r['id'] != recipe_id][:top_k])
 
 
 def format_recipe_result(recipe: Dict[str, Any], show_instructions: bool = False) -> str:
@@ -178,6 +289,10 @@ def format_recipe_result(recipe: Dict[str, Any], show_instructions: bool = False
     chunk_emoji = "📦" if matched_chunk == "ingredients" else "📝" if matched_chunk == "instructions" else "📄"
     output.append(f"   {chunk_emoji} Eşleşen: {matched_chunk or 'N/A'}")
     
+    # Kayan pencere stratejisinde eşleşen yapılış bölümü
+    if recipe.get('snippet'):
+        output.append(f"   💬 {recipe['snippet'][:150]}{'...' if len(recipe['snippet']) > 150 else ''}")
+    
     output.append(f"   🔗 {recipe.get('url', 'N/A')}")
     
     # Malzemeler
@@ -219,11 +334,11 @@ def format_search_results(
 # Singleton instance
 _searcher_instance = None
 
-def get_searcher() -> RecipeSearcher:
-    """Searcher singleton instance döndür"""
+def get_searcher(lazy: bool = False) -> RecipeSearcher:
+    """Searcher singleton instance döndür (lazy: bkz. RecipeSearcher)"""
     global _searcher_instance
     if _searcher_instance is None:
-        _searcher_instance = RecipeSearcher()
+        _searcher_instance = RecipeSearcher(lazy=lazy)
     return _searcher_instance
 
 
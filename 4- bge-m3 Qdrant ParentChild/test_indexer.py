@@ -0,0 +1,130 @@
+"""
+Indexer Testleri
+================
+Tam indexleme (yeni collection sürümü) tariflerin parent ID'lerini korumalı:
+tarif recipe_key ile eşleşir (chunk sayısı değişse de), yeni tarifler en
+büyük ID'den sonra ID alır.
+
+Model indirilmez: embedder yerine tarif başlığından üretilen sabit vektörler;
+collection yerel backend ile geçici klasörde, kayan pencere chunking ile kurulur.
+
+Kullanım:
+    python -m pytest test_indexer.py
+"""
+
+import hashlib
+import json
+import zlib
+
+import numpy as np
+import pytest
+
+import config
+import database
+import indexer
+from chunking import chunk_layout
+from database import recipe_key
+
+
+def recipe(n: int, steps: int = 2) -> dict:
+    return {
+        "title": f"Tarif {n}",
+        "url": f"https://example.com/tarif-{n}",
+        "ingredients": [f"malzeme{n}", "tuz"],
+        "instructions": [f"Adım {i} {n}." for i in range(steps)]
+    }
+
+
+def vector(recipe: dict, chunk_idx: int = 0) -> list:
+    seed = zlib.crc32(f"{recipe['title']}/{chunk_idx}".encode("utf-8"))
+    return np.random.default_rng(seed).normal(size=config.EMBEDDING_DIM).tolist()
+
+
+class FakeEmbedder:
+    """Başlık ve chunk sırasından sabit vektör (SentenceTransformer yerine)"""
+
+    def embed_recipes_chunks(self, batch):
+        return [
+            [
+                (chunk_type, vector(r, chunk_idx))
+                for chunk_idx, (chunk_type, _) in enumerate(
+                    chunk_layout(r, "sliding_window", config.WINDOW_SENTENCES, config.WINDOW_STRIDE)
+                )
+            ]
+            for r in batch
+        ]
+
+    def embed_recipes_chunks_hybrid(self, batch):
+        return [[chunk + ({1: 0.5},) for chunk in chunks] for chunks in self.embed_recipes_chunks(batch)]
+
+
+@pytest.fixture
+def local_index(tmp_path, monkeypatch):
+    """Yerel backend'li geçici collection; veri dosyasını yazan fonksiyon döner"""
+    monkeypatch.setattr(database, "DB_BACKEND", "local")
+    monkeypatch.setattr(database, "LOCAL_DB_PATH", tmp_path / "local_db")
+    monkeypatch.setattr(database, "CHUNKING_STRATEGY", "sliding_window")
+    monkeypatch.setattr(database, "_db_instance", None)
+    monkeypatch.setattr(indexer, "EMBEDDING_STORE_DIR", tmp_path / "embedding_store")
+    monkeypatch.setattr(indexer, "get_embedder", lambda: FakeEmbedder())
+    # Depo sürümü veri dosyasına bağlı (dosya değişince yeniden embed edilir)
+    monkeypatch.setattr(
+        indexer, "embedding_signature",
+        lambda path: {"data": hashlib.sha1(open(path, "rb").read()).hexdigest()}
+    )
+
+    data_file = tmp_path / "recipes.jsonl"
+
+    def write(recipes):
+        with open(data_file, "w", encoding="utf-8") as f:
+            for r in recipes:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        return str(data_file)
+
+    yield write
+    database.get_database().close()
+
+
+def key_ids() -> dict:
+    return {key: parent_id for parent_id, key, _ in database.get_database().indexed_recipes()}
+
+
+def test_full_reindex_keeps_point_ids(local_index):
+    recipes = [recipe(n) for n in range(6)]
+    data_file = local_index(recipes)
+    indexer.index_all_recipes(recreate=True, file_path=data_file, workers=0)
+    first = key_ids()
+    assert sorted(first.values()) == list(range(6))
+
+    # Tarif silinir, sıra değişir, yeni tarif başa eklenir, bir tarifin chunk sayısı değişir
+    changed = recipe(3, steps=9)
+    recipes = [recipe(6)] + [r for r in reversed(recipes) if r is not recipes[1] and r is not recipes[3]] + [changed]
+    local_index(recipes)
+    indexer.index_incremental(file_path=data_file)
+    after_incremental = key_ids()
+    assert after_incremental[recipe_key(recipe(6))] == 6
+    assert recipe_key(recipe(1)) not in after_incremental
+    # Artımlı indexlemede chunk sayısı değişen tarif yeni ID alır (offset aralığı yetmez)
+    assert after_incremental[recipe_key(changed)] == 7
+
+    # Yeni embedding'lerle ve kayıtlı embedding'lerle tam indexleme
+    indexer.index_all_recipes(recreate=True, file_path=data_file, workers=0)
+    assert key_ids() == after_incremental
+    indexer.index_all_recipes(recreate=True, file_path=data_file, workers=0)
+    assert key_ids() == after_incremental
+
+    # Artımlı indexleme olmadan yeni tarif: en büyük ID'den sonra
+    recipes = [recipe(7)] + recipes[::-1]
+    local_index(recipes)
+    indexer.index_all_recipes(recreate=True, file_path=data_file, workers=0)
+    final = key_ids()
+    assert final == {**after_incremental, recipe_key(recipe(7)): 8}
+
+    db = database.get_database()
+    for r in recipes:
+        parent_id = final[recipe_key(r)]
+        assert db.get_recipe_by_parent_id(parent_id)["title"] == r["title"]
+        num_chunks = len(chunk_layout(r, "sliding_window", config.WINDOW_SENTENCES, config.WINDOW_STRIDE))
+        assert len(db.chunk_table.chunk_range(parent_id)) == num_chunks
+        assert db.search(vector(r, num_chunks - 1), top_k=1, mode="dense")[0]["id"] == parent_id
+
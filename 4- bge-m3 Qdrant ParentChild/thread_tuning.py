@@ -0,0 +1,276 @@
+"""
+CPU Thread Ayarı Modülü
+=======================
+Embedding inference için torch thread sayılarını bu makinede ölçerek seçer.
+
+- Her (intra-op, inter-op) kombinasyonu ayrı bir süreçte denenir
+  (inter-op thread sayısı süreç başına yalnızca bir kez ayarlanabilir)
+- embed_query gecikmesi ve embed_batch throughput'u ölçülür
+- Seçilen ayar THREAD_CONFIG_FILE'a yazılır; RecipeEmbedder yüklenirken uygular
+
+Seçim: thread sayıları en düşük sorgu gecikmesine (p50) göre, batch boyutu
+bu thread ayarında en yüksek throughput'a göre belirlenir.
+"""
+
+import os
+import json
+import time
+import platform
+import statistics
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+# Gecikme ölçümünde kullanılan örnek sorgular
+SAMPLE_QUERIES = [
+    "tavuklu makarna",
+    "elimde patates ve soğan var ne yapabilirim",
+    "fırında kolay tatlı",
+    "karnıyarık nasıl yapılır",
+    "glutensiz kahvaltılık",
+]
+
+DEFAULT_BATCH_SIZES = (8, 16, 32, 64)
+
+
+def host_fingerprint() -> Dict[str, Any]:
+    """Ayarların ölçüldüğü makineyi tanımlayan bilgiler"""
+    return {
+        "cpu_count": os.cpu_count(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+    }
+
+
+def default_thread_candidates() -> List[int]:
+    """Denenecek intra-op thread sayıları: 1, 2, 4, ... ve çekirdek sayısı"""
+    cpu_count = os.cpu_count() or 1
+    candidates = []
+    n = 1
+    while n < cpu_count:
+        candidates.append(n)
+        n *= 2
+    candidates.append(cpu_count)
+    return candidates
+
+
+# =========================================================================
+# AYAR DOSYASI
+# =========================================================================
+
+def load_thread_config(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Kayıtlı thread ayarını oku
+
+    Dosya başka bir makinede (farklı çekirdek sayısı) üretildiyse yok sayılır.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        settings = json.load(f)
+
+    if settings.get("host", {}).get("cpu_count") != os.cpu_count():
+        print(f"⚠️  {path.name} farklı bir makine için ölçülmüş, yok sayılıyor "
+              f"('python main.py tune' ile yeniden ölçün)")
+        return None
+
+    return settings
+
+
+def apply_thread_config(settings: Dict[str, Any]) -> bool:
+    """
+    Thread ayarını torch'a uygula (model yüklenmeden önce çağrılmalı)
+
+    Returns:
+        Ayar uygulandıysa True
+    """
+    if not settings:
+        return False
+
+    import torch
+
+    torch.set_num_threads(settings["intra_op_threads"])
+    try:
+        torch.set_num_interop_threads(settings["inter_op_threads"])
+    except RuntimeError:
+        pass  # Paralel iş başladıysa değiştirilemez (örn: model daha önce kullanıldı)
+
+    print(f"🧵 Thread ayarı: intra-op={settings['intra_op_threads']}, "
+          f"inter-op={settings['inter_op_threads']}, batch={settings['batch_size']}")
+    return True
+
+
+# =========================================================================
+# ÖLÇÜM
+# =========================================================================
+
+def load_sample_texts(data_file: Path, limit: int) -> List[str]:
+    """Veri dosyasından throughput ölçümü için tarif metinleri oluştur"""
+    texts = []
+    with open(data_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            recipe = json.loads(line)
+            texts.append(
+                f"{recipe.get('title', '')}\n"
+                f"Malzemeler: {', '.join(recipe.get('ingredients', []))}\n"
+                f"Yapılışı: {' '.join(recipe.get('instructions', []))}"
+            )
+            if len(texts) >= limit:
+                break
+    return texts
+
+
+def _benchmark_setting(
+    intra: int,
+    inter: int,
+    batch_sizes: List[int],
+    texts: List[str],
+    query_repeats: int
+) -> Dict[str, Any]:
+    """Tek bir thread ayarını ölç (ayrı süreçte çalışır)"""
+    os.environ["OMP_NUM_THREADS"] = str(intra)
+    os.environ["MKL_NUM_THREADS"] = str(intra)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+    import torch
+    torch.set_num_threads(intra)
+    torch.set_num_interop_threads(inter)
+
+    from embedder import RecipeEmbedder
+    embedder = RecipeEmbedder(apply_thread_settings=False)
+    embedder.batch_sizer = None  # Sabit batch boyutları ölçülür
+
+    # Isınma
+    embedder.embed_batch(texts[:2])
+
+    latencies = []
+    for _ in range(query_repeats):
+        for query in SAMPLE_QUERIES:
+            start = time.perf_counter()
+            embedder.embed_query(query)
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    throughput = {}
+    for batch_size in batch_sizes:
+        embedder.batch_size = batch_size
+        start = time.perf_counter()
+        embedder.embed_batch(texts)
+        throughput[batch_size] = len(texts) / (time.perf_counter() - start)
+
+    return {
+        "intra_op_threads": intra,
+        "inter_op_threads": inter,
+        "query_p50_ms": statistics.median(latencies) * 1000,
+        "query_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "throughput": throughput,
+    }
+
+
+def run_tuning(
+    output_path: Path,
+    data_file: Path,
+    thread_candidates: List[int] = None,
+    interop_candidates: List[int] = None,
+    batch_sizes: List[int] = None,
+    sample_size: int = 128,
+    query_repeats: int = 10
+) -> Dict[str, Any]:
+    """
+    Thread / batch kombinasyonlarını ölç ve en iyisini kaydet
+
+    Args:
+        output_path: Seçilen ayarın yazılacağı JSON dosyası
+        data_file: Örnek tarif metinleri için veri dosyası
+        thread_candidates: Denenecek intra-op thread sayıları
+        interop_candidates: Denenecek inter-op thread sayıları
+        batch_sizes: Denenecek embed_batch boyutları
+        sample_size: Throughput ölçümündeki metin sayısı
+        query_repeats: Her örnek sorgunun tekrar sayısı
+
+    Returns:
+        Kaydedilen ayar
+    """
+    thread_candidates = thread_candidates or default_thread_candidates()
+    interop_candidates = interop_candidates or [1, 2]
+    batch_sizes = list(batch_sizes or DEFAULT_BATCH_SIZES)
+
+    texts = load_sample_texts(data_file, sample_size)
+    combos = [(intra, inter) for intra in thread_candidates for inter in interop_candidates]
+
+    print("🚀 Thread ayarı ölçülüyor")
+    print(f"🖥️  Çekirdek: {os.cpu_count()} | Kombinasyon: {len(combos)} | Batch boyutları: {batch_sizes}")
+
+    results = []
+    ctx = mp.get_context("spawn")
+
+    for i, (intra, inter) in enumerate(combos, 1):
+        print(f"\n⏱️  [{i}/{len(combos)}] intra-op={intra}, inter-op={inter}")
+
+        # Her kombinasyon temiz bir süreçte (torch thread havuzları sıfırdan)
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+            try:
+                result = executor.submit(
+                    _benchmark_setting, intra, inter, batch_sizes, texts, query_repeats
+                ).result()
+            except Exception as e:
+                print(f"❌ Ölçüm başarısız: {e}")
+                continue
+
+        best_tp = max(result["throughput"].values())
+        print(f"   sorgu p50: {result['query_p50_ms']:.1f} ms | en iyi throughput: {best_tp:.1f} metin/s")
+        results.append(result)
+
+    if not results:
+        raise RuntimeError("Hiçbir thread ayarı ölçülemedi")
+
+    best = min(results, key=lambda r: r["query_p50_ms"])
+    best_batch = max(best["throughput"], key=best["throughput"].get)
+
+    settings = {
+        "intra_op_threads": best["intra_op_threads"],
+        "inter_op_threads": best["inter_op_threads"],
+        "batch_size": best_batch,
+        "query_p50_ms": best["query_p50_ms"],
+        "throughput": best["throughput"][best_batch],
+        "host": host_fingerprint(),
+        "tuned_at": datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+    }
+
+    output_path = Path(output_path)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(settings, f, indent=2, ensure_ascii=False)
+
+    print_tuning_table(results, batch_sizes)
+    print(f"\n✅ Seçilen ayar: intra-op={settings['intra_op_threads']}, "
+          f"inter-op={settings['inter_op_threads']}, batch={best_batch}")
+    print(f"💾 Kaydedildi: {output_path}")
+
+    return settings
+
+
+def print_tuning_table(results: List[Dict[str, Any]], batch_sizes: List[int]):
+    """Ölçüm sonuçlarını tablo olarak yazdır"""
+    print("\n" + "=" * 80)
+    print("📊 THREAD AYARI SONUÇLARI (throughput: metin/s)")
+    print("=" * 80)
+
+    header = f"{'intra':>6} {'inter':>6} {'p50 ms':>9} {'p95 ms':>9}"
+    header += "".join(f"{'b=' + str(b):>10}" for b in batch_sizes)
+    print(header)
+    print("-" * len(header))
+
+    for r in sorted(results, key=lambda r: r["query_p50_ms"]):
+        row = f"{r['intra_op_threads']:>6} {r['inter_op_threads']:>6} "
+        row += f"{r['query_p50_ms']:>9.1f} {r['query_p95_ms']:>9.1f}"
+        row += "".join(f"{r['throughput'][b]:>10.1f}" for b in batch_sizes)
+        print(row)
@@ -0,0 +1,211 @@
+"""
+ANN (Yaklaşık Arama) Benchmark Aracı
+====================================
+Yerel backend'le indexlenmiş bir sistemin vektörleri üzerinde her index
+ayarını (örn: HNSW M / ef_construction, IVF-PQ nlist / m, int8 kuantizasyon)
+geçici bir klasörde kurar ve her arama ayarı kombinasyonunda (örn: ef_search,
+nprobe x rerank, oversampling) ölçer:
+1. Recall@k: tam (flat) aramanın ilk k sonucundan kaçı bulundu
+2. Sorgu gecikmesi (p50 / p95) ve kurulum (eğitim dahil) süresi
+3. Vektör başına RAM (arama için bellekte tutulan yapılar)
+
+Sorgular evaluation set sorularıdır (sistemin kendi embedder'ı ile).
+Böylece her dağıtım için bir çalışma noktası seçilebilir.
+
+Kullanım:
+    python ann_benchmark.py                                # config'deki sistem ve ayarlar
+    python ann_benchmark.py --system bge_m3_parentchild_local --k 5 10
+"""
+
+import json
+import time
+import tempfile
+import importlib
+import itertools
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from config import (
+    RETRIEVER_SYSTEMS, RESULTS_DIR,
+    ANN_BENCHMARK_SYSTEM, ANN_BENCHMARK_K, ANN_BENCHMARK_INDEXES, ANN_TRAIN_SAMPLES
+)
+from evaluator import load_evaluation_set, system_path, import_system_modules
+
+# Kurulumda index'e tek seferde eklenen vektör sayısı
+ADD_BATCH_SIZE = 1000
+
+
+def load_system_vectors(system_key: str, questions: list) -> dict:
+    """
+    Sistemin yerel index vektörlerini ve sorgu vektörlerini yükle
+
+    Returns:
+        {"ids", "vectors", "queries", "metric", "vector_index" (modül)}
+    """
+    with system_path(system_key) as system_info:
+        modules = import_system_modules(system_info.get('config_overrides'))
+        vector_index = importlib.import_module("vector_index")
+
+        db = modules["database"].get_database()
+        if getattr(db, "index", None) is None:
+            raise RuntimeError(
+                f"{system_key} için yerel index bulunamadı "
+                f"(DB_BACKEND=\"local\" ile indexleyin: python evaluator.py --system {system_key} --build)"
+            )
+
+        ids = np.array(db.index.ids)
+        vectors = np.array(db.index.matrix)
+        metric = db.index.metric
+
+        # Sorgular tek batch'te embed edilir, index ile aynı projeksiyondan geçer
+        embedder = modules["embedder"].get_embedder()
+        queries = embedder.embed_queries([q['question'] for q in questions])
+        if db.projector is not None:
+            queries = db.projector.transform(queries)
+        db.close()
+
+    return {
+        "ids": ids,
+        "vectors": vectors,
+        "queries": np.asarray(queries, dtype=np.float32),
+        "metric": metric,
+        "vector_index": vector_index
+    }
+
+
+def build_index(vector_index, path: Path, index_type: str, data: dict, build_params: dict):
+    """Index'i kur (gerekirse eğit), kurulum süresini ölç"""
+    index = vector_index.create_vector_index(
+        path, index_type, data["vectors"].shape[1], metric=data["metric"], **build_params
+    )
+
+    start_time = time.time()
+    if not index.is_trained:
+        index.train(data["vectors"][:ANN_TRAIN_SAMPLES])
+    for start in range(0, len(data["ids"]), ADD_BATCH_SIZE):
+        end = start + ADD_BATCH_SIZE
+        index.add(data["ids"][start:end], data["vectors"][start:end])
+    index.flush()
+    return index, time.time() - start_time
+
+
+def measure(index, queries: np.ndarray, k_values: list, truth: dict) -> dict:
+    """Tüm sorgularda recall@k ve gecikme"""
+    top_k = max(k_values)
+    latencies, found = [], []
+    for query in queries:
+        start_time = time.perf_counter()
+        ids, _ = index.search(query, top_k)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+        found.append(ids.tolist())
+
+    result = {
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p95_ms": float(np.percentile(latencies, 95)),
+        "latency_avg_ms": float(np.mean(latencies))
+    }
+    for k in k_values:
+        hits = [len(set(ids[:k]) & set(exact[:k])) / max(1, len(exact[:k])) for ids, exact in zip(found, truth[k])]
+        result[f"recall@{k}"] = float(np.mean(hits))
+    return result
+
+
+def run_benchmark(system_key: str = None, k_values: list = None):
+    """Flat referans ve her index / arama ayarı için ölçüm"""
+    system_key = system_key or ANN_BENCHMARK_SYSTEM
+    k_values = k_values or [ANN_BENCHMARK_K]
+
+    print("🚀 ANN Benchmark Başlıyor")
+    print(f"📦 Sistem: {RETRIEVER_SYSTEMS[system_key]['name']}")
+
+    questions = load_evaluation_set()
+    data = load_system_vectors(system_key, questions)
+    vector_index = data["vector_index"]
+    print(f"📝 {len(data['ids']):,} vektör ({data['vectors'].shape[1]} boyut), {len(data['queries'])} sorgu")
+
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="ann_benchmark_") as tmp_dir:
+        # Referans: tam arama
+        print(f"\n{'='*60}\n⚙️  flat (tam arama)\n{'='*60}")
+        flat, build_time = build_index(vector_index, Path(tmp_dir) / "flat", "flat", data, {})
+        top_k = max(k_values)
+        truth_ids = [ids.tolist() for ids, _ in flat.search_batch(data["queries"], top_k)]
+        truth = {k: [ids[:k] for ids in truth_ids] for k in k_values}
+
+        runs.append(dict(
+            label="flat", type="flat", build={}, search={}, build_time_s=build_time,
+            stats=flat.stats(), **measure(flat, data["queries"], k_values, truth)
+        ))
+        flat.close()
+
+        for idx, setting in enumerate(ANN_BENCHMARK_INDEXES):
+            build_params = setting.get("build", {})
+            label = setting["type"] + "".join(f" {key}={value}" for key, value in build_params.items())
+            print(f"\n{'='*60}\n⚙️  {label}\n{'='*60}")
+
+            index, build_time = build_index(
+                vector_index, Path(tmp_dir) / f"index_{idx}", setting["type"], data, build_params
+            )
+            print(f"⏱️  Kurulum: {build_time:.1f}s")
+
+            # Arama parametrelerinin tüm kombinasyonları (index yeniden kurulmaz)
+            search = setting.get("search", {})
+            search_grid = [dict(zip(search, values)) for values in itertools.product(*search.values())]
+            for search_params in search_grid:
+                for name, value in search_params.items():
+                    setattr(index, name, value)
+                run_label = label + "".join(f" {name}={value}" for name, value in search_params.items())
+                result = measure(index, data["queries"], k_values, truth)
+                runs.append(dict(
+                    label=run_label, type=setting["type"], build=build_params, search=search_params,
+                    build_time_s=build_time, stats=index.stats(), **result
+                ))
+                print(f"  {run_label}: recall@{k_values[0]}={result[f'recall@{k_values[0]}']*100:.1f}% "
+                      f"p50={result['latency_p50_ms']:.2f}ms")
+            index.close()
+
+    # Sonuçları kaydet
+    RESULTS_DIR.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    result_file = RESULTS_DIR / f"ann_benchmark_{timestamp}.json"
+
+    with open(result_file, 'w', encoding='utf-8') as f:
+        json.dump({"system": system_key, "k_values": k_values, "runs": runs}, f, indent=2, ensure_ascii=False)
+
+    print(f"\n💾 Sonuçlar kaydedildi: {result_file}")
+
+    print_benchmark_table(runs, k_values)
+    return runs
+
+
+def print_benchmark_table(runs: list, k_values: list):
+    """Recall / gecikme / bellek tablosu"""
+    print("\n" + "="*100)
+    print("📊 ANN SONUÇLARI (recall: tam aramaya göre)")
+    print("="*100)
+
+    recall_headers = " ".join(f"{f'R@{k}':<8}" for k in k_values)
+    print(f"{'Ayar':<44} {recall_headers} {'p50':<9} {'p95':<9} {'Kurulum':<9} {'RAM/vektör':<10}")
+    print("-"*100)
+
+    for r in runs:
+        stats = r["stats"]
+        ram_per_vector = stats["ram_bytes"] / max(1, stats["count"])
+        recalls = " ".join(f"{r[f'recall@{k}']*100:<7.1f}%" for k in k_values)
+        print(f"{r['label']:<44} {recalls} {r['latency_p50_ms']:<7.2f}ms {r['latency_p95_ms']:<7.2f}ms "
+              f"{r['build_time_s']:<8.1f}s {ram_per_vector:<10.0f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='ANN index ayarları: tam aramaya göre recall@k, gecikme, bellek')
+    parser.add_argument('--system', type=str, default=None,
+                        help=f'Yerel backend\'li sistem (varsayılan: {ANN_BENCHMARK_SYSTEM})')
+    parser.add_argument('--k', type=int, nargs='+', default=None,
+                        help='Recall için k değerleri (örn: --k 5 10)')
+
+    args = parser.parse_args()
+    run_benchmark(system_key=args.system, k_values=args.k)
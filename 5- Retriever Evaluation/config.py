@@ -28,16 +28,231 @@ RETRIEVER_SYSTEMS = {
         "name": "E5-Large WholeDocument", 
         "path": PROJECT_DIR / "3- e5-large Qdrant WholeDocument",
         "embedding_model": "intfloat/multilingual-e5-large",
-        "chunking": "WholeDocument"
+        "chunking": "WholeDocument",
+        # E5-Large en fazla 512 token alır (8192 / 1024 satırları bu sistemde anlamsız)
+        "truncation_sweep": [
+            {"MAX_SEQ_LENGTH": 512, "TRUNCATION_STRATEGY": "head"},
+            {"MAX_SEQ_LENGTH": 512, "TRUNCATION_STRATEGY": "head_tail"},
+            {"MAX_SEQ_LENGTH": 512, "TRUNCATION_STRATEGY": "instructions", "MAX_INSTRUCTION_TOKENS": 256},
+            {"MAX_SEQ_LENGTH": 256, "TRUNCATION_STRATEGY": "head"},
+            {"MAX_SEQ_LENGTH": 256, "TRUNCATION_STRATEGY": "instructions", "MAX_INSTRUCTION_TOKENS": 128},
+        ]
     },
     "bge_m3_parentchild": {
         "name": "BGE-M3 Parent-Child",
         "path": PROJECT_DIR / "4- bge-m3 Qdrant ParentChild",
         "embedding_model": "BAAI/bge-m3",
         "chunking": "Parent-Child"
+    },
+    
+    # --------------------------------------------------------
+    # VARYANTLAR (config_overrides ile ayrı collection'a indexlenir)
+    # "baseline" sistemine göre Recall/MRR farkı raporlanır.
+    # Index: python evaluator.py --system <varyant> --build
+    # --------------------------------------------------------
+    "bge_m3_wholedoc_pca256": {
+        "name": "BGE-M3 WholeDocument PCA-256",
+        "path": PROJECT_DIR / "2- bge-m3 Qdrant WholeDocument",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "WholeDocument",
+        "baseline": "bge_m3_wholedoc",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_pca256",
+            "REDUCED_DIM": 256,
+            "REDUCTION_METHOD": "pca"
+        }
+    },
+    "bge_m3_parentchild_pca256": {
+        "name": "BGE-M3 Parent-Child PCA-256",
+        "path": PROJECT_DIR / "4- bge-m3 Qdrant ParentChild",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "Parent-Child",
+        "baseline": "bge_m3_parentchild",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_parent_child_pca256",
+            "REDUCED_DIM": 256,
+            "REDUCTION_METHOD": "pca"
+        }
+    },
+    "bge_m3_wholedoc_hybrid": {
+        "name": "BGE-M3 WholeDocument Dense+Sparse (RRF)",
+        "path": PROJECT_DIR / "2- bge-m3 Qdrant WholeDocument",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "WholeDocument",
+        "baseline": "bge_m3_wholedoc",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_sparse",
+            "SPARSE_VECTORS": True,
+            "SEARCH_MODE": "hybrid"
+        }
+    },
+    "bge_m3_wholedoc_sparse": {
+        # bge_m3_wholedoc_hybrid ile aynı collection (sadece sorgu modu farklı)
+        "name": "BGE-M3 WholeDocument Sparse",
+        "path": PROJECT_DIR / "2- bge-m3 Qdrant WholeDocument",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "WholeDocument",
+        "baseline": "bge_m3_wholedoc",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_sparse",
+            "SPARSE_VECTORS": True,
+            "SEARCH_MODE": "sparse"
+        }
+    },
+    "bge_m3_parentchild_hybrid": {
+        "name": "BGE-M3 Parent-Child Dense+Sparse (RRF)",
+        "path": PROJECT_DIR / "4- bge-m3 Qdrant ParentChild",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "Parent-Child",
+        "baseline": "bge_m3_parentchild",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_parent_child_sparse",
+            "SPARSE_VECTORS": True,
+            "SEARCH_MODE": "hybrid"
+        }
+    },
+    "bge_m3_parentchild_window": {
+        "name": "BGE-M3 Parent-Child Sliding Window",
+        "path": PROJECT_DIR / "4- bge-m3 Qdrant ParentChild",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "Parent-Child (Sliding Window)",
+        "baseline": "bge_m3_parentchild",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_parent_child_window",
+            "CHUNKING_STRATEGY": "sliding_window",
+            "WINDOW_SENTENCES": 3,
+            "WINDOW_STRIDE": 2
+        }
+    },
+    "bge_m3_wholedoc_local": {
+        # Aynı vektörler, Qdrant yerine süreç içi NumPy index'i (embedding deposundan kurulur)
+        "name": "BGE-M3 WholeDocument (Yerel NumPy)",
+        "path": PROJECT_DIR / "2- bge-m3 Qdrant WholeDocument",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "WholeDocument",
+        "baseline": "bge_m3_wholedoc",
+        "config_overrides": {
+            "DB_BACKEND": "local"
+        }
+    },
+    "e5_large_wholedoc_local": {
+        "name": "E5-Large WholeDocument (Yerel NumPy)",
+        "path": PROJECT_DIR / "3- e5-large Qdrant WholeDocument",
+        "embedding_model": "intfloat/multilingual-e5-large",
+        "chunking": "WholeDocument",
+        "baseline": "e5_large_wholedoc",
+        "config_overrides": {
+            "DB_BACKEND": "local"
+        }
+    },
+    "bge_m3_parentchild_local": {
+        "name": "BGE-M3 Parent-Child (Yerel NumPy)",
+        "path": PROJECT_DIR / "4- bge-m3 Qdrant ParentChild",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "Parent-Child",
+        "baseline": "bge_m3_parentchild",
+        "config_overrides": {
+            "DB_BACKEND": "local"
+        }
+    },
+    "bge_m3_wholedoc_hnsw": {
+        # Yerel backend, flat tarama yerine HNSW grafı (bkz. ann_benchmark.py)
+        "name": "BGE-M3 WholeDocument (Yerel HNSW)",
+        "path": PROJECT_DIR / "2- bge-m3 Qdrant WholeDocument",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "WholeDocument",
+        "baseline": "bge_m3_wholedoc_local",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_hnsw",
+            "DB_BACKEND": "local",
+            "LOCAL_INDEX_TYPE": "hnsw"
+        }
+    },
+    "bge_m3_wholedoc_ivfpq": {
+        # Yerel backend, IVF-PQ kodları (RAM'de ~100 byte / vektör) + tam vektörle yeniden sıralama
+        "name": "BGE-M3 WholeDocument (Yerel IVF-PQ)",
+        "path": PROJECT_DIR / "2- bge-m3 Qdrant WholeDocument",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "WholeDocument",
+        "baseline": "bge_m3_wholedoc_local",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_ivfpq",
+            "DB_BACKEND": "local",
+            "LOCAL_INDEX_TYPE": "ivf_pq"
+        }
+    },
+    "bge_m3_wholedoc_int8": {
+        # Qdrant skaler (int8) kuantizasyon + tam vektörle yeniden skorlama
+        "name": "BGE-M3 WholeDocument (int8 Kuantizasyon)",
+        "path": PROJECT_DIR / "2- bge-m3 Qdrant WholeDocument",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "WholeDocument",
+        "baseline": "bge_m3_wholedoc",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_int8",
+            "QUANTIZATION": "int8"
+        }
+    },
+    "bge_m3_wholedoc_local_int8": {
+        # Yerel backend, RAM'de int8 kodlar (~1 KB / vektör), tam vektörler diskte
+        "name": "BGE-M3 WholeDocument (Yerel int8)",
+        "path": PROJECT_DIR / "2- bge-m3 Qdrant WholeDocument",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "WholeDocument",
+        "baseline": "bge_m3_wholedoc_local",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_int8",
+            "DB_BACKEND": "local",
+            "QUANTIZATION": "int8"
+        }
+    },
+    "bge_m3_wholedoc_binary": {
+        # Yerel backend, binary kodlarla (128 byte / vektör) Hamming ön filtresi + tam vektörle yeniden skorlama
+        "name": "BGE-M3 WholeDocument (Yerel Binary)",
+        "path": PROJECT_DIR / "2- bge-m3 Qdrant WholeDocument",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "WholeDocument",
+        "baseline": "bge_m3_wholedoc_local",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_binary",
+            "DB_BACKEND": "local",
+            "QUANTIZATION": "binary",
+            "QUANTIZATION_OVERSAMPLING": 16.0,
+            "SEARCH_MODE": "binary"
+        }
+    },
+    "bge_m3_parentchild_binary": {
+        "name": "BGE-M3 Parent-Child (Yerel Binary)",
+        "path": PROJECT_DIR / "4- bge-m3 Qdrant ParentChild",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "Parent-Child",
+        "baseline": "bge_m3_parentchild_local",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_parent_child_binary",
+            "DB_BACKEND": "local",
+            "QUANTIZATION": "binary",
+            "QUANTIZATION_OVERSAMPLING": 16.0,
+            "SEARCH_MODE": "binary"
+        }
+    },
+    "bge_m3_wholedoc_colbert": {
+        # Dense ilk aşama + sıkıştırılmış ColBERT token vektörleriyle MaxSim yeniden sıralama
+        "name": "BGE-M3 WholeDocument Late Interaction",
+        "path": PROJECT_DIR / "2- bge-m3 Qdrant WholeDocument",
+        "embedding_model": "BAAI/bge-m3",
+        "chunking": "WholeDocument",
+        "baseline": "bge_m3_wholedoc",
+        "config_overrides": {
+            "COLLECTION_NAME": "recipes_colbert",
+            "LATE_INTERACTION": True,
+            "SEARCH_MODE": "colbert"
+        }
     }
 }
 
+# Varsayılan olarak değerlendirilen sistemler (varyantlar hariç)
+DEFAULT_SYSTEMS = [key for key, info in RETRIEVER_SYSTEMS.items() if "baseline" not in info]
+
 # ============================================================
 # DEĞERLENDİRME AYARLARI
 # ============================================================
@@ -47,6 +262,50 @@ DEFAULT_K = 5
 # Metrik eşik değerleri
 SIMILARITY_THRESHOLD = 0.3
 
+# ============================================================
+# KIRPMA (TRUNCATION) SWEEP AYARLARI
+# ============================================================
+# truncation_sweep.py her ayar için ayrı bir collection'a indexler,
+# indexleme süresini ve Recall/MRR değerlerini ölçer.
+# Varsayılan liste BGE-M3 (8192 token) içindir; daha kısa bağlamlı modeller
+# RETRIEVER_SYSTEMS içinde kendi "truncation_sweep" listesini tanımlar.
+TRUNCATION_SWEEP_SETTINGS = [
+    {"MAX_SEQ_LENGTH": 8192, "TRUNCATION_STRATEGY": "head"},
+    {"MAX_SEQ_LENGTH": 1024, "TRUNCATION_STRATEGY": "head"},
+    {"MAX_SEQ_LENGTH": 512, "TRUNCATION_STRATEGY": "head"},
+    {"MAX_SEQ_LENGTH": 512, "TRUNCATION_STRATEGY": "head_tail"},
+    {"MAX_SEQ_LENGTH": 512, "TRUNCATION_STRATEGY": "instructions", "MAX_INSTRUCTION_TOKENS": 256},
+    {"MAX_SEQ_LENGTH": 256, "TRUNCATION_STRATEGY": "instructions", "MAX_INSTRUCTION_TOKENS": 128},
+]
+
+# ============================================================
+# LATE INTERACTION BENCHMARK AYARLARI
+# ============================================================
+# late_interaction_benchmark.py: dense baseline ile "colbert" varyantını
+# farklı aday sayılarında karşılaştırır (Recall/MRR, gecikme, tarif başına bellek)
+LATE_INTERACTION_BASELINE = "bge_m3_wholedoc"
+LATE_INTERACTION_VARIANT = "bge_m3_wholedoc_colbert"
+LATE_INTERACTION_CANDIDATES = [25, 50, 100, 200]
+
+# ============================================================
+# ANN (YAKLAŞIK ARAMA) BENCHMARK AYARLARI
+# ============================================================
+# ann_benchmark.py: yerel backend'le indexlenmiş sistemin vektörleri üzerinde
+# her index ayarını geçici klasörde kurar; tam (flat) aramaya göre recall@k,
+# sorgu gecikmesi (p50/p95), kurulum süresi ve bellek ölçülür.
+# "build": kurulum parametreleri, "search": denenecek arama ayarları (tüm kombinasyonlar)
+ANN_BENCHMARK_SYSTEM = "bge_m3_wholedoc_local"
+ANN_BENCHMARK_K = 10
+ANN_TRAIN_SAMPLES = 65536  # Eğitim gerektiren index'ler (IVF-PQ, kuantizasyon) için örnek sayısı
+ANN_BENCHMARK_INDEXES = [
+    {"type": "hnsw", "build": {"M": 16, "ef_construction": 200}, "search": {"ef_search": [16, 32, 64, 128, 256]}},
+    {"type": "hnsw", "build": {"M": 32, "ef_construction": 200}, "search": {"ef_search": [16, 32, 64, 128, 256]}},
+    {"type": "ivf_pq", "build": {"nlist": 256, "m": 64}, "search": {"nprobe": [4, 8, 16, 32], "rerank": [0, 50, 200]}},
+    {"type": "ivf_pq", "build": {"nlist": 256, "m": 32}, "search": {"nprobe": [8, 16, 32], "rerank": [0, 50, 200]}},
+    {"type": "quantized", "build": {"quantization": "int8"}, "search": {"oversampling": [1.0, 2.0, 4.0, 8.0]}},
+    {"type": "quantized", "build": {"quantization": "binary"}, "search": {"oversampling": [4.0, 8.0, 16.0, 32.0]}},
+]
+
 # ============================================================
 # ÇIKTI AYARLARI
 # ============================================================
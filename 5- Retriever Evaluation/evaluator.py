@@ -7,6 +7,7 @@ Kullanım:
     python evaluator.py                    # Tüm sistemler, k=5
     python evaluator.py --k 10             # k=10 ile test
     python evaluator.py --system bge_m3_wholedoc  # Tek sistem
+    python evaluator.py --system bge_m3_wholedoc bge_m3_wholedoc_pca256 --build  # Varyantı indexle ve karşılaştır
 """
 
 import os
@@ -14,6 +15,8 @@ import sys
 import json
 import time
 import atexit
+import importlib
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -32,7 +35,7 @@ def _cleanup():
 atexit.register(_cleanup)
 
 from config import (
-    RETRIEVER_SYSTEMS, K_VALUES, DEFAULT_K,
+    RETRIEVER_SYSTEMS, DEFAULT_SYSTEMS, K_VALUES, DEFAULT_K,
     EVALUATION_SET_PATH, RESULTS_DIR, PROJECT_DIR
 )
 from metrics import calculate_all_metrics, aggregate_metrics
@@ -45,29 +48,77 @@ def load_evaluation_set():
     return data['questions']
 
 
-def load_retriever(system_key: str):
-    """Retriever sistemini yükle"""
+# Her retriever sisteminde aynı isimle bulunan modüller
+# (model_registry bilerek listede yok: tüm sistemler aynı kayıt defterini
+# paylaşır, böylece bge-m3 süreç içinde bir kez yüklenir)
+SYSTEM_MODULES = ["config", "embedder", "database", "indexer", "searcher"]
+
+
+def _purge_system_modules():
+    """Sistem modüllerini sys.modules'tan temizle (farklı sistemler çakışmasın)"""
+    for name in SYSTEM_MODULES:
+        sys.modules.pop(name, None)
+
+
+@contextmanager
+def system_path(system_key: str):
+    """
+    Sistem klasörünü geçici olarak sys.path'e ekle
+    
+    Giriş ve çıkışta sistem modülleri temizlenir; böylece her sistem
+    kendi config/embedder/database modüllerini yükler.
+    """
     system_info = RETRIEVER_SYSTEMS[system_key]
-    system_path = str(system_info['path'])
     
-    # Path'i ekle
     original_path = sys.path.copy()
-    sys.path.insert(0, system_path)
-    
-    # Config modülünü temizle (farklı config'ler çakışmasın)
-    if 'config' in sys.modules:
-        del sys.modules['config']
-    if 'searcher' in sys.modules:
-        del sys.modules['searcher']
+    sys.path.insert(0, str(system_info['path']))
+    _purge_system_modules()
     
     try:
-        from searcher import RecipeSearcher
-        searcher = RecipeSearcher()
-        return searcher, system_info
+        yield system_info
     finally:
         sys.path = original_path
-        if 'config' in sys.modules:
-            del sys.modules['config']
+        _purge_system_modules()
+
+
+def import_system_modules(config_overrides: dict = None) -> dict:
+    """
+    Aktif sistemin modüllerini import et (system_path içinde çağrılmalı)
+    
+    Args:
+        config_overrides: Modüller import edilmeden önce sistem config'ine yazılacak değerler
+    
+    Returns:
+        {"config": ..., "embedder": ..., "database": ..., "indexer": ..., "searcher": ...}
+    """
+    system_config = importlib.import_module("config")
+    for key, value in (config_overrides or {}).items():
+        setattr(system_config, key, value)
+    
+    modules = {"config": system_config}
+    for name in SYSTEM_MODULES[1:]:
+        modules[name] = importlib.import_module(name)
+    return modules
+
+
+def load_retriever(system_key: str, config_overrides: dict = None):
+    """Retriever sistemini yükle (varyantlar kendi config_overrides'ı ile)"""
+    with system_path(system_key) as system_info:
+        overrides = dict(system_info.get('config_overrides', {}), **(config_overrides or {}))
+        modules = import_system_modules(overrides)
+        # Model ve arama modunun katmanları burada, sistem klasörü sys.path'teyken
+        # yüklenir (lazy=False); sorgular context dışında çalışır
+        searcher = modules["searcher"].RecipeSearcher(lazy=False)
+    return searcher, system_info
+
+
+def build_system_index(system_key: str):
+    """Sistemi (varyant ayarları ile) kendi collection'ına indexle"""
+    with system_path(system_key) as system_info:
+        print(f"\n🏗️  Index oluşturuluyor: {system_info['name']}")
+        modules = import_system_modules(system_info.get('config_overrides'))
+        modules["indexer"].index_all_recipes(recreate=True, workers=0)
+        modules["database"].get_database().close()
 
 
 def evaluate_system(system_key: str, questions: list, k_values: list = None):
@@ -83,21 +134,34 @@ def evaluate_system(system_key: str, questions: list, k_values: list = None):
     searcher, system_info = load_retriever(system_key)
     print(f"✅ Model hazır: {system_info['embedding_model']}")
     
+    try:
+        return evaluate_searcher(searcher, questions, k_values)
+    finally:
+        searcher.db.close()
+        # Referansı bırak; model kayıt defterinde kalır, sonraki sistem yeniden kullanır
+        searcher.embedder.close()
+
+
+def evaluate_searcher(searcher, questions: list, k_values: list = None):
+    """Yüklenmiş bir searcher'ı tüm k değerleri için değerlendir"""
+    k_values = k_values or K_VALUES
     results = {}
     
+    # Tüm sorular tek batch'te aranır (tek forward pass + tek skorlama çağrısı).
+    # En büyük k ile aranır, küçük k'lar ilk k sonuçtur (sıralama k'dan bağımsız).
+    # Sadece başlık ve skor gerekli: tam tarifler okunmaz.
+    start_time = time.time()
+    batch_results = searcher.search_batch([q['question'] for q in questions], top_k=max(k_values), hydrate=False)
+    latency = (time.time() - start_time) * 1000 / max(1, len(questions))
+    print(f"⚡ {len(questions)} soru tek batch'te arandı (soru başına {latency:.1f}ms)")
+    
     for k in k_values:
         print(f"\n--- k={k} ---")
         all_metrics = []
         
         for i, q in enumerate(questions):
-            question = q['question']
             expected = q.get('expected_recipes', [])
-            is_impossible = q.get('category') == 'impossible'
-            
-            # Arama yap
-            start_time = time.time()
-            search_results = searcher.search(question, top_k=k)
-            latency = (time.time() - start_time) * 1000
+            search_results = batch_results[i][:k]
             
             # Sonuçları al
             retrieved_titles = [r.get('title', '') for r in search_results]
@@ -114,10 +178,6 @@ def evaluate_system(system_key: str, questions: list, k_values: list = None):
             metrics['question_id'] = q['id']
             
             all_metrics.append(metrics)
-            
-            # Progress
-            if (i + 1) % 10 == 0:
-                print(f"  İlerleme: {i+1}/{len(questions)}")
         
         # Aggregate
         agg = aggregate_metrics(all_metrics)
@@ -137,10 +197,16 @@ def evaluate_system(system_key: str, questions: list, k_values: list = None):
     return results
 
 
-def run_full_evaluation(k_values: list = None, systems: list = None):
+def run_full_evaluation(k_values: list = None, systems: list = None, build: bool = False):
     """Tüm sistemleri değerlendir"""
     k_values = k_values or K_VALUES
-    systems = systems or list(RETRIEVER_SYSTEMS.keys())
+    systems = systems or DEFAULT_SYSTEMS
+    
+    # Varyantların index'lerini oluştur (isteğe bağlı)
+    if build:
+        for system_key in systems:
+            if RETRIEVER_SYSTEMS[system_key].get('config_overrides'):
+                build_system_index(system_key)
     
     print("🚀 Retriever Değerlendirmesi Başlıyor")
     print(f"📝 k değerleri: {k_values}")
@@ -187,6 +253,7 @@ def run_full_evaluation(k_values: list = None, systems: list = None):
     
     # Final karşılaştırma tablosu
     print_comparison_table(all_results, k_values)
+    print_variant_impact(all_results, k_values)
     
     return all_results
 
@@ -214,17 +281,52 @@ def print_comparison_table(all_results: dict, k_values: list):
                 print(f"{name:<30} {recall:<10.2f}% {hit_rate:<10.2f}% {mrr:<10.3f} {latency:<10.0f}ms")
 
 
+def print_variant_impact(all_results: dict, k_values: list):
+    """Varyantların baseline sisteme göre Recall/MRR/Latency farkını yazdır"""
+    variants = [
+        key for key in all_results
+        if RETRIEVER_SYSTEMS[key].get('baseline') in all_results
+    ]
+    if not variants:
+        return
+    
+    print("\n" + "="*80)
+    print("📉 VARYANT ETKİSİ (baseline'a göre)")
+    print("="*80)
+    
+    for k in k_values:
+        print(f"\n--- k={k} ---")
+        print(f"{'Varyant':<30} {'ΔRecall':<10} {'ΔHit Rate':<10} {'ΔMRR':<10} {'ΔLatency':<10}")
+        print("-"*70)
+        
+        for key in variants:
+            baseline_key = RETRIEVER_SYSTEMS[key]['baseline']
+            if f'k={k}' not in all_results[key] or f'k={k}' not in all_results[baseline_key]:
+                continue
+            
+            agg = all_results[key][f'k={k}']['aggregated']
+            base = all_results[baseline_key][f'k={k}']['aggregated']
+            name = RETRIEVER_SYSTEMS[key]['name']
+            
+            d_recall = (agg.get(f'recall@{k}', 0) - base.get(f'recall@{k}', 0)) * 100
+            d_hit = (agg.get(f'hit_rate@{k}', 0) - base.get(f'hit_rate@{k}', 0)) * 100
+            d_mrr = agg.get(f'mrr@{k}', 0) - base.get(f'mrr@{k}', 0)
+            d_latency = agg.get('latency_avg_ms', 0) - base.get('latency_avg_ms', 0)
+            
+            print(f"{name:<30} {d_recall:<+9.2f}% {d_hit:<+9.2f}% {d_mrr:<+10.3f} {d_latency:<+9.0f}ms")
+
+
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description='Retriever Değerlendirmesi')
     parser.add_argument('--k', type=int, nargs='+', default=K_VALUES,
                         help='Test edilecek k değerleri (örn: --k 5 10)')
-    parser.add_argument('--system', type=str, default=None,
-                        help='Tek sistem test et (örn: --system bge_m3_wholedoc)')
+    parser.add_argument('--system', type=str, nargs='+', default=None,
+                        help='Test edilecek sistem(ler) (örn: --system bge_m3_wholedoc)')
+    parser.add_argument('--build', action='store_true',
+                        help='Varyant sistemleri değerlendirmeden önce indexle')
     
     args = parser.parse_args()
     
-    systems = [args.system] if args.system else None
-    run_full_evaluation(k_values=args.k, systems=systems)
-
+    run_full_evaluation(k_values=args.k, systems=args.system, build=args.build)
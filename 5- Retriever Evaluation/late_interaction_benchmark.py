@@ -0,0 +1,149 @@
+"""
+Late Interaction (ColBERT) Benchmark Aracı
+==========================================
+BGE-M3 WholeDocument dense araması ile "colbert" modunu karşılaştırır:
+1. Recall / Hit Rate / MRR ve sorgu gecikmesi (her aday sayısı için)
+2. Tarif başına bellek: dense vektör, sıkıştırılmış token index'i ve
+   sıkıştırmasız float32 token vektörleri
+
+Kullanım:
+    python late_interaction_benchmark.py --build          # Varyant index'ini kur ve ölç
+    python late_interaction_benchmark.py --k 5 10
+    python late_interaction_benchmark.py --candidates 50 100
+"""
+
+import json
+from datetime import datetime
+
+from config import (
+    RETRIEVER_SYSTEMS, DEFAULT_K, RESULTS_DIR,
+    LATE_INTERACTION_BASELINE, LATE_INTERACTION_VARIANT, LATE_INTERACTION_CANDIDATES
+)
+from evaluator import (
+    load_evaluation_set, load_retriever, build_system_index, evaluate_searcher
+)
+
+
+def dense_memory(searcher) -> dict:
+    """Dense collection'ın tarif başına vektör belleği (payload hariç)"""
+    info = searcher.db.get_collection_info()
+    return {
+        "vector_dim": info.get("vector_dim"),
+        "bytes_per_doc": info.get("vector_dim", 0) * 4
+    }
+
+
+def evaluate_run(system_key: str, questions: list, k_values: list, overrides: dict = None) -> dict:
+    """Sistemi (ek config ayarları ile) yükle ve değerlendir"""
+    searcher, system_info = load_retriever(system_key, overrides)
+    try:
+        results = evaluate_searcher(searcher, questions, k_values)
+        memory = dense_memory(searcher)
+        if searcher.db.get_collection_info().get("late_interaction"):
+            memory["colbert"] = searcher.colbert_index.memory_stats()
+    finally:
+        searcher.db.close()
+
+    return {
+        "system": system_key,
+        "name": system_info["name"],
+        "overrides": overrides or {},
+        "memory": memory,
+        "results": {k: v['aggregated'] for k, v in results.items()}
+    }
+
+
+def run_benchmark(k_values: list = None, candidates: list = None, build: bool = False):
+    """Dense baseline ve her aday sayısında late interaction araması"""
+    k_values = k_values or [DEFAULT_K]
+    candidates = candidates or LATE_INTERACTION_CANDIDATES
+
+    print("🚀 Late Interaction Benchmark Başlıyor")
+    print(f"📦 Baseline: {RETRIEVER_SYSTEMS[LATE_INTERACTION_BASELINE]['name']}")
+    print(f"📦 Varyant: {RETRIEVER_SYSTEMS[LATE_INTERACTION_VARIANT]['name']}")
+    print(f"📝 Aday sayıları: {candidates} | k değerleri: {k_values}")
+
+    if build:
+        build_system_index(LATE_INTERACTION_VARIANT)
+
+    questions = load_evaluation_set()
+
+    print(f"\n{'='*60}\n⚙️  Dense (baseline)\n{'='*60}")
+    runs = [dict(evaluate_run(LATE_INTERACTION_BASELINE, questions, k_values), label="dense")]
+
+    for n in candidates:
+        print(f"\n{'='*60}\n⚙️  ColBERT (aday: {n})\n{'='*60}")
+        run = evaluate_run(LATE_INTERACTION_VARIANT, questions, k_values, {"COLBERT_CANDIDATES": n})
+        runs.append(dict(run, label=f"colbert@{n}"))
+
+    # Sonuçları kaydet
+    RESULTS_DIR.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    result_file = RESULTS_DIR / f"late_interaction_{timestamp}.json"
+
+    with open(result_file, 'w', encoding='utf-8') as f:
+        json.dump(runs, f, indent=2, ensure_ascii=False)
+
+    print(f"\n💾 Sonuçlar kaydedildi: {result_file}")
+
+    print_memory_table(runs)
+    print_benchmark_table(runs, k_values)
+
+    return runs
+
+
+def print_memory_table(runs: list):
+    """Tarif başına bellek tablosu"""
+    print("\n" + "="*80)
+    print("💾 TARİF BAŞINA BELLEK")
+    print("="*80)
+
+    dense = runs[0]["memory"]
+    print(f"Dense vektör ({dense['vector_dim']} boyut, float32):   {dense['bytes_per_doc'] / 1024:>8.1f} KB")
+
+    colbert = next((r["memory"]["colbert"] for r in runs if "colbert" in r["memory"]), None)
+    if colbert is None:
+        print("ColBERT index bulunamadı (--build ile kurun)")
+        return
+
+    print(f"ColBERT token / tarif:                {colbert['tokens_per_doc']:>8.1f}")
+    print(f"ColBERT sıkıştırılmış:                {colbert['bytes_per_doc'] / 1024:>8.1f} KB "
+          f"({colbert['bytes_per_token']} byte/token)")
+    print(f"ColBERT float32 (sıkıştırmasız):      {colbert['float32_bytes_per_doc'] / 1024:>8.1f} KB "
+          f"(x{colbert['float32_bytes_per_doc'] / max(1, colbert['bytes_per_doc']):.1f})")
+
+
+def print_benchmark_table(runs: list, k_values: list):
+    """Recall/MRR ve gecikme tablosu"""
+    print("\n" + "="*80)
+    print("📊 LATE INTERACTION SONUÇLARI")
+    print("="*80)
+
+    for k in k_values:
+        print(f"\n--- k={k} ---")
+        print(f"{'Ayar':<16} {'Recall':<10} {'Hit Rate':<10} {'MRR':<10} {'Latency':<10}")
+        print("-"*60)
+
+        for r in runs:
+            agg = r['results'].get(f'k={k}', {})
+            recall = agg.get(f'recall@{k}', 0) * 100
+            hit_rate = agg.get(f'hit_rate@{k}', 0) * 100
+            mrr = agg.get(f'mrr@{k}', 0)
+            latency = agg.get('latency_avg_ms', 0)
+
+            print(f"{r['label']:<16} {recall:<9.2f}% {hit_rate:<9.2f}% {mrr:<10.3f} {latency:<8.0f}ms")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Late interaction (ColBERT) vs dense: Recall/MRR, gecikme, bellek')
+    parser.add_argument('--k', type=int, nargs='+', default=[DEFAULT_K],
+                        help='Test edilecek k değerleri (örn: --k 5 10)')
+    parser.add_argument('--candidates', type=int, nargs='+', default=None,
+                        help='Yeniden sıralanacak dense aday sayıları (örn: --candidates 50 100)')
+    parser.add_argument('--build', action='store_true',
+                        help='Varyant collection\'ını ve ColBERT index\'ini önce kur')
+
+    args = parser.parse_args()
+    run_benchmark(k_values=args.k, candidates=args.candidates, build=args.build)
@@ -0,0 +1,136 @@
+"""
+Evaluator Testleri
+==================
+load_retriever ile yüklenen searcher, sistem klasörü sys.path'ten
+çıkarıldıktan sonra da (evaluate_searcher) sorgu çalıştırabilmeli.
+
+Model indirilmez: paylaşılan model kayıt defterine küçük bir sahte model
+konur; collection yerel backend ile geçici klasörde kurulur.
+
+Kullanım:
+    python -m pytest test_evaluator.py
+"""
+
+import sys
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from config import RETRIEVER_SYSTEMS
+from evaluator import system_path, import_system_modules, load_retriever, evaluate_searcher
+
+SYSTEM_KEY = "bge_m3_wholedoc"
+
+RECIPES = [
+    {"title": "Tavuk Sote", "url": "u0", "ingredients": ["tavuk", "biber", "soğan"], "instructions": ["Tavuğu sotele."]},
+    {"title": "Mercimek Çorbası", "url": "u1", "ingredients": ["mercimek", "havuç"], "instructions": ["Mercimeği haşla."]},
+    {"title": "Fırın Makarna", "url": "u2", "ingredients": ["makarna", "süt", "kaşar"], "instructions": ["Fırında pişir."]},
+]
+
+QUESTIONS = [
+    {"id": 1, "question": "tavuk sote", "expected_recipes": ["Tavuk Sote"]},
+    {"id": 2, "question": "mercimek çorbası", "expected_recipes": ["Mercimek Çorbası"]},
+]
+
+
+class FakeTokenizer:
+    """Kelime başına bir token"""
+    all_special_ids = [0, 2]
+
+    def __call__(self, texts, truncation=True, max_length=512, **kwargs):
+        return {"input_ids": [[0] + [1] * min(len(text.split()), max_length - 2) + [2] for text in texts]}
+
+
+class FakeModel:
+    """SentenceTransformer yerine: kelime hash'lerinden normalize vektör"""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.max_seq_length = 512
+        self.device = "cpu"
+        self.tokenizer = FakeTokenizer()
+        config = SimpleNamespace(hidden_size=64, num_attention_heads=4)
+        self._modules = [SimpleNamespace(auto_model=SimpleNamespace(config=config))]
+
+    def __getitem__(self, idx):
+        return self._modules[idx]
+
+    def parameters(self):
+        yield SimpleNamespace(element_size=lambda: 4)
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in text.lower().replace(".", " ").replace(",", " ").split():
+            vector[zlib.crc32(word.encode("utf-8")) % self.dim] += 1.0
+        return vector / max(np.linalg.norm(vector), 1e-9)
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        if isinstance(texts, str):
+            return self.embed(texts)
+        return np.stack([self.embed(text) for text in texts])
+
+
+@pytest.fixture
+def local_system(tmp_path, monkeypatch):
+    """Sahte modelli, yerel backend'li geçici sistem (config override'ları döner)"""
+    # Sistem klasörünün modülleri (model kayıt defteri hariç) temizlenir:
+    # sorgunun ihtiyaç duyduğu her modül load_retriever içinde import edilmeli
+    names = [
+        path.stem for path in RETRIEVER_SYSTEMS[SYSTEM_KEY]["path"].glob("*.py")
+        if path.stem != "model_registry"
+    ]
+    saved = {name: sys.modules.pop(name) for name in names if name in sys.modules}
+
+    overrides = {
+        "DB_BACKEND": "local",
+        "LOCAL_DB_PATH": tmp_path / "local_db",
+        "THREAD_CONFIG_FILE": tmp_path / "thread_config.json",
+        "SEARCH_MODE": "dense",
+    }
+
+    with system_path(SYSTEM_KEY):
+        modules = import_system_modules(overrides)
+        system_config = modules["config"]
+
+        # Model kayıt defteri sistemler arasında paylaşılır (evaluator temizlemez)
+        import model_registry
+        model = FakeModel(system_config.EMBEDDING_DIM)
+        monkeypatch.setitem(
+            model_registry._models,
+            (system_config.MODEL_NAME, system_config.MODEL_BACKEND),
+            {"model": model, "refs": 0}
+        )
+
+        db = modules["database"].get_database()
+        db.create_collection()
+        texts = [f"{r['title']} {' '.join(r['ingredients'])}" for r in RECIPES]
+        db.insert_recipes(RECIPES, model.encode(texts).tolist(), 0)
+        db.flush()
+        db.close()
+
+    for name in names:
+        sys.modules.pop(name, None)
+
+    yield overrides
+
+    for name in names:
+        sys.modules.pop(name, None)
+    sys.modules.update(saved)
+
+
+def test_load_retriever_then_evaluate_outside_system_path(local_system):
+    searcher, system_info = load_retriever(SYSTEM_KEY, local_system)
+    assert str(system_info["path"]) not in sys.path
+
+    try:
+        results = evaluate_searcher(searcher, QUESTIONS, k_values=[1, 3])
+    finally:
+        searcher.db.close()
+
+    assert results["k=1"]["aggregated"]["recall@1"] == 1.0
+    assert len(results["k=3"]["detailed"]) == len(QUESTIONS)
@@ -0,0 +1,157 @@
+"""
+Kırpma (Truncation) Sweep Aracı
+===============================
+Her max sekans uzunluğu / kırpma stratejisi ayarı için:
+1. Tarifleri ayrı bir collection'a indexler (embedding dahil süre ölçülür;
+   kayıtlı embedding deposu kullanılmaz)
+2. Retriever değerlendirmesini çalıştırır (Recall/MRR)
+
+Böylece daha ucuz bir ayar kanıta dayalı seçilebilir.
+
+Kullanım:
+    python truncation_sweep.py --system bge_m3_wholedoc
+    python truncation_sweep.py --system bge_m3_parentchild --k 5 10
+    python truncation_sweep.py --system bge_m3_wholedoc --keep   # Sweep collection'larını silme
+"""
+
+import json
+import time
+import shutil
+import tempfile
+import importlib
+from datetime import datetime
+from pathlib import Path
+
+from config import (
+    RETRIEVER_SYSTEMS, DEFAULT_K, RESULTS_DIR,
+    TRUNCATION_SWEEP_SETTINGS
+)
+from evaluator import (
+    load_evaluation_set, system_path, import_system_modules, evaluate_searcher
+)
+
+
+def setting_label(setting: dict) -> str:
+    """Ayarı kısa bir etikete dönüştür (örn: 512/instructions:256)"""
+    label = f"{setting['MAX_SEQ_LENGTH']}/{setting['TRUNCATION_STRATEGY']}"
+    if setting['TRUNCATION_STRATEGY'] == "instructions":
+        label += f":{setting.get('MAX_INSTRUCTION_TOKENS', '-')}"
+    return label
+
+
+def run_setting(system_key: str, setting_idx: int, setting: dict,
+                questions: list, k_values: list, keep: bool = False) -> dict:
+    """Tek bir ayarı indexle ve değerlendir"""
+    # Embedding'ler geçici bir depoya yazılır: kayıtlı sürüm kullanılırsa model
+    # çalışmaz ve süre ölçümü anlamsızlaşır; sweep sürümleri de asıl indexlemeye kalmaz
+    store_dir = Path(tempfile.mkdtemp(prefix="embedding_store_sweep_"))
+
+    try:
+        with system_path(system_key):
+            # Her ayar kendi collection'ına indexlenir (canlı collection'a dokunulmaz)
+            base_collection = importlib.import_module("config").COLLECTION_NAME
+            overrides = dict(
+                setting,
+                COLLECTION_NAME=f"{base_collection}_sweep_{setting_idx}",
+                EMBEDDING_STORE_DIR=store_dir
+            )
+            modules = import_system_modules(overrides)
+
+            start_time = time.time()
+            indexed = modules["indexer"].index_all_recipes(recreate=True, workers=0, reembed=True)
+            index_time = time.time() - start_time
+
+            searcher = modules["searcher"].RecipeSearcher()
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+    try:
+        results = evaluate_searcher(searcher, questions, k_values)
+    finally:
+        if not keep:
+            searcher.db.delete_collection()
+        searcher.db.close()
+
+    return {
+        "setting": setting,
+        "label": setting_label(setting),
+        "collection": overrides["COLLECTION_NAME"],
+        "indexed_recipes": indexed,
+        "index_time_s": index_time,
+        "recipes_per_s": indexed / index_time if index_time else 0.0,
+        "results": {k: v['aggregated'] for k, v in results.items()}
+    }
+
+
+def run_sweep(system_key: str, settings: list = None, k_values: list = None, keep: bool = False):
+    """Tüm kırpma ayarlarını sırayla dene"""
+    settings = settings or RETRIEVER_SYSTEMS[system_key].get("truncation_sweep", TRUNCATION_SWEEP_SETTINGS)
+    k_values = k_values or [DEFAULT_K]
+
+    print("🚀 Kırpma Sweep Başlıyor")
+    print(f"📦 Sistem: {RETRIEVER_SYSTEMS[system_key]['name']}")
+    print(f"📝 Ayar sayısı: {len(settings)} | k değerleri: {k_values}")
+
+    questions = load_evaluation_set()
+    sweep_results = []
+
+    for idx, setting in enumerate(settings):
+        print(f"\n{'='*60}")
+        print(f"⚙️  [{idx+1}/{len(settings)}] {setting_label(setting)}")
+        print(f"{'='*60}")
+
+        try:
+            sweep_results.append(run_setting(system_key, idx, setting, questions, k_values, keep))
+        except Exception as e:
+            print(f"❌ {setting_label(setting)} hatası: {e}")
+            import traceback
+            traceback.print_exc()
+
+    # Sonuçları kaydet
+    RESULTS_DIR.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    result_file = RESULTS_DIR / f"truncation_sweep_{system_key}_{timestamp}.json"
+
+    with open(result_file, 'w', encoding='utf-8') as f:
+        json.dump(sweep_results, f, indent=2, ensure_ascii=False)
+
+    print(f"\n💾 Sonuçlar kaydedildi: {result_file}")
+
+    print_sweep_table(sweep_results, k_values)
+
+    return sweep_results
+
+
+def print_sweep_table(sweep_results: list, k_values: list):
+    """Indexleme süresi vs Recall/MRR tablosu yazdır"""
+    print("\n" + "="*80)
+    print("📊 KIRPMA SWEEP SONUÇLARI")
+    print("="*80)
+
+    for k in k_values:
+        print(f"\n--- k={k} ---")
+        print(f"{'Ayar':<28} {'Index':<12} {'Tarif/s':<10} {'Recall':<10} {'MRR':<10}")
+        print("-"*70)
+
+        for r in sweep_results:
+            agg = r['results'].get(f'k={k}', {})
+            recall = agg.get(f'recall@{k}', 0) * 100
+            mrr = agg.get(f'mrr@{k}', 0)
+
+            print(f"{r['label']:<28} {r['index_time_s']:<10.0f}s {r['recipes_per_s']:<10.1f} "
+                  f"{recall:<9.2f}% {mrr:<10.3f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Kırpma ayarı sweep (indexleme süresi vs Recall/MRR)')
+    parser.add_argument('--system', type=str, required=True,
+                        help='Test edilecek sistem (örn: --system bge_m3_wholedoc)')
+    parser.add_argument('--k', type=int, nargs='+', default=[DEFAULT_K],
+                        help='Test edilecek k değerleri (örn: --k 5 10)')
+    parser.add_argument('--keep', action='store_true',
+                        help='Sweep collection\'larını silme')
+
+    args = parser.parse_args()
+    run_sweep(args.system, k_values=args.k, keep=args.keep)
@@ -51,6 +51,10 @@ def format_context(recipes: list, max_length: int = 3000) -> str:
         
         part = f"[{i}] {title}\nMalzemeler: {ing_text}\nYapılış: {inst_text}\n"
         
+        # Parent-Child kayan pencere sonuçlarında soruyla eşleşen yapılış bölümü
+        if recipe.get("snippet"):
+            part += f"İlgili bölüm: {recipe['snippet']}\n"
+        
         if total_length + len(part) > max_length:
             break
         
@@ -86,6 +86,11 @@ class RAGPipeline:
         retriever = get_global_retriever()
         return retriever.search(query, top_k=top_k)
     
+    def search_batch(self, queries: List[str], top_k: int = DEFAULT_TOP_K) -> List[List[Dict]]:
+        """Birden fazla sorguyu tek batch'te ara (tek forward pass + tek skorlama çağrısı)"""
+        retriever = get_global_retriever()
+        return retriever.search_batch(queries, top_k=top_k)
+    
     def query_retriever_only(self, question: str, top_k: int = DEFAULT_TOP_K) -> Dict:
         """Retriever-Only modu"""
         import time
@@ -113,10 +118,16 @@ class RAGPipeline:
             "mode": "llm_only"
         }
     
-    def query_rag(self, question: str, top_k: int = DEFAULT_TOP_K) -> Dict:
-        """RAG modu: Retriever + LLM"""
+    def query_rag(self, question: str, top_k: int = DEFAULT_TOP_K, recipes: Optional[List[Dict]] = None) -> Dict:
+        """
+        RAG modu: Retriever + LLM
+        
+        recipes verilirse retriever atlanır (örn: search_batch ile önceden
+        alınmış sonuçlar; değerlendirmede her model için yeniden arama yapılmaz).
+        """
         # 1. Retriever
-        recipes = self.search(question, top_k=top_k)
+        if recipes is None:
+            recipes = self.search(question, top_k=top_k)
         
         # 2. Prompt oluştur
         prompt = create_rag_prompt(question, recipes)
@@ -33,7 +33,7 @@ RESULTS_DIR = BASE_DIR / "results"
 
 # RAG Pipeline import
 sys.path.insert(0, str(PROJECT_DIR / "6- RAG Pipeline"))
-from rag_pipeline import RAGPipeline, get_global_retriever
+from rag_pipeline import RAGPipeline, get_global_retriever, DEFAULT_TOP_K
 from metrics import calculate_llm_metrics, aggregate_llm_metrics
 
 # Retriever'ı baştan yükle (Qdrant lock sorunu için)
@@ -142,8 +142,21 @@ def evaluate_llm_only(model_key: str, questions: list) -> dict:
     return {"model": config["name"], "mode": "llm_only", "aggregated": agg, "results": results}
 
 
-def evaluate_rag(model_key: str, questions: list) -> dict:
-    """RAG + LLM değerlendirme"""
+def retrieve_all(questions: list) -> list:
+    """
+    Tüm soruların tariflerini tek batch'te getir (tek forward pass + tek skorlama)
+    
+    Sonuçlar model bağımsızdır: her modelin RAG değerlendirmesinde yeniden kullanılır.
+    """
+    print(f"\n🔎 {len(questions)} soru için tarifler getiriliyor (tek batch)...")
+    start_time = time.time()
+    retrieved = get_global_retriever().search_batch([q["question"] for q in questions], top_k=DEFAULT_TOP_K)
+    print(f"✅ Tarifler hazır ({(time.time() - start_time) * 1000:.0f}ms)")
+    return retrieved
+
+
+def evaluate_rag(model_key: str, questions: list, retrieved: list = None) -> dict:
+    """RAG + LLM değerlendirme (retrieved: retrieve_all sonuçları, yoksa soru başına arama)"""
     config = MODELS[model_key]
     print(f"\n{'='*60}")
     print(f"📊 {config['name']} - RAG + LLM")
@@ -169,7 +182,7 @@ def evaluate_rag(model_key: str, questions: list) -> dict:
             print(f"  [{i}/{len(questions)}] {question[:40]}...", end=" ", flush=True)
             
             try:
-                result = rag.query_rag(question)
+                result = rag.query_rag(question, recipes=retrieved[i - 1] if retrieved else None)
                 prediction = result["answer"]
                 context = result.get("context", "")
                 latency = result["llm_result"]["latency_ms"]
@@ -239,6 +252,13 @@ def run_full_evaluation(model_keys: list = None, max_questions: int = 10):
     questions = load_questions(max_questions)
     print(f"\n📝 {len(questions)} soru | Modeller: {', '.join(model_keys)}")
     
+    # Retrieval tüm modeller için bir kez
+    retrieved = None
+    try:
+        retrieved = retrieve_all(questions)
+    except Exception as e:
+        print(f"⚠️ Toplu arama başarısız, soru başına aranacak: {e}")
+    
     all_results = {}
     
     for key in model_keys:
@@ -250,7 +270,7 @@ def run_full_evaluation(model_keys: list = None, max_questions: int = 10):
         all_results[f"{key}_llm_only"] = result
         
         # RAG + LLM
-        result = evaluate_rag(key, questions)
+        result = evaluate_rag(key, questions, retrieved)
         all_results[f"{key}_rag"] = result
     
     # Kaydet